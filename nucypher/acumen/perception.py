@@ -18,11 +18,11 @@
 
 import random
 import weakref
+from collections import OrderedDict
 from collections.abc import KeysView
-from typing import Optional, Dict, Iterable, List, Tuple, NamedTuple, Union, Any
+from typing import Optional, Dict, Iterable, List, Tuple, NamedTuple, Union, Any, Callable, Hashable
 
 import binascii
-import itertools
 import maya
 from bytestring_splitter import BytestringSplitter
 from eth_typing import ChecksumAddress
@@ -55,6 +55,136 @@ class StateDiff(NamedTuple):
         return not self.this_node_updated and not self.nodes_updated and not self.nodes_removed
 
 
+class FleetMerkleTree:
+    """
+    A persistent hexary Merkle trie of node metadata, keyed by the hash of the checksum address
+    (which keeps the trie balanced no matter what the addresses look like).
+
+    A subtree holding a single node is just that node's leaf, and any larger subtree
+    branches on the next hex digit of the keys it holds; so the shape of the trie,
+    and its checksum, depends only on the recorded nodes, not on the order they were added.
+
+    Updates return a new tree which shares everything but the path to the updated leaf
+    with the old one, so only ``O(log N)`` hashes are recalculated,
+    and the old tree stays valid for the fleet state that references it.
+    """
+
+    _BRANCHING = 16
+    EMPTY_CHECKSUM = keccak_digest(b"")
+
+    class _Leaf(NamedTuple):
+        key: str
+        checksum_address: ChecksumAddress
+        hash: bytes
+
+    class _Branch(NamedTuple):
+        children: Tuple[Optional[Union['FleetMerkleTree._Leaf', 'FleetMerkleTree._Branch']], ...]
+        hash: bytes
+
+    def __init__(self, root: Optional[Union[_Leaf, _Branch]] = None):
+        self._root = root
+
+    @property
+    def checksum(self) -> bytes:
+        return self._root.hash if self._root is not None else self.EMPTY_CHECKSUM
+
+    @staticmethod
+    def _key(checksum_address: ChecksumAddress) -> str:
+        return keccak_digest(checksum_address.encode()).hex()
+
+    @classmethod
+    def _make_leaf(cls, checksum_address: ChecksumAddress, metadata: bytes) -> _Leaf:
+        key = cls._key(checksum_address)
+        return cls._Leaf(key=key,
+                         checksum_address=checksum_address,
+                         hash=keccak_digest(bytes.fromhex(key) + keccak_digest(metadata)))
+
+    @classmethod
+    def _make_branch(cls, children) -> Optional[Union[_Leaf, _Branch]]:
+        present = [child for child in children if child is not None]
+        if not present:
+            return None
+        if len(present) == 1 and isinstance(present[0], cls._Leaf):
+            # A lone node is represented by its leaf, wherever it is in the trie.
+            return present[0]
+        branch_hash = keccak_digest(b"".join(bytes([index]) + child.hash
+                                             for index, child in enumerate(children) if child is not None))
+        return cls._Branch(children=tuple(children), hash=branch_hash)
+
+    @classmethod
+    def _insert(cls, node, leaf: _Leaf, depth: int):
+        if node is None:
+            return leaf
+        if isinstance(node, cls._Leaf):
+            if node.key == leaf.key:
+                return leaf
+            children = [None] * cls._BRANCHING
+            children[int(node.key[depth], 16)] = node
+        else:
+            children = list(node.children)
+        index = int(leaf.key[depth], 16)
+        children[index] = cls._insert(children[index], leaf, depth + 1)
+        return cls._make_branch(children)
+
+    @classmethod
+    def _remove(cls, node, key: str, depth: int):
+        if node is None:
+            return None
+        if isinstance(node, cls._Leaf):
+            return None if node.key == key else node
+        children = list(node.children)
+        index = int(key[depth], 16)
+        children[index] = cls._remove(children[index], key, depth + 1)
+        return cls._make_branch(children)
+
+    def with_updates(self,
+                     nodes_updated: Dict[ChecksumAddress, bytes],
+                     nodes_removed: Iterable[ChecksumAddress]
+                     ) -> 'FleetMerkleTree':
+        """
+        Returns a new tree with the given addresses mapped to the new metadata, and the removed ones gone.
+        """
+        root = self._root
+        for checksum_address in nodes_removed:
+            root = self._remove(root, self._key(checksum_address), 0)
+        for checksum_address, metadata in nodes_updated.items():
+            root = self._insert(root, self._make_leaf(checksum_address, metadata), 0)
+        return FleetMerkleTree(root)
+
+    @classmethod
+    def _contains_leaf(cls, node, leaf: _Leaf, depth: int) -> bool:
+        while isinstance(node, cls._Branch):
+            node = node.children[int(leaf.key[depth], 16)]
+            depth += 1
+        return node is not None and node.hash == leaf.hash
+
+    def addresses_updated_since(self, other: 'FleetMerkleTree') -> List[ChecksumAddress]:
+        """
+        Returns the addresses of the nodes in this tree which are absent from ``other`` or have different metadata there.
+        Subtrees with matching checksums are skipped, so this is proportional to the size of the difference.
+        """
+        addresses = []
+
+        def collect(ours, theirs, depth):
+            if ours is None or (theirs is not None and ours.hash == theirs.hash):
+                return
+            if isinstance(ours, self._Leaf):
+                if not self._contains_leaf(theirs, ours, depth):
+                    addresses.append(ours.checksum_address)
+                return
+            for index, child in enumerate(ours.children):
+                if isinstance(theirs, self._Branch):
+                    their_child = theirs.children[index]
+                elif isinstance(theirs, self._Leaf) and int(theirs.key[depth], 16) == index:
+                    their_child = theirs
+                else:
+                    their_child = None
+                collect(child, their_child, depth + 1)
+
+        collect(self._root, other._root, 0)
+        return addresses
+
+
 class FleetState:
     """
     Fleet state as perceived by a local Ursula.
@@ -77,18 +207,22 @@ class FleetState:
         this_node_ref = weakref.ref(this_node) if this_node is not None else None
         # Using empty checksum so that JSON library is not confused.
         # Plus, we do need some checksum anyway. It's a legitimate state after all.
-        return cls(checksum=keccak_digest(b"").hex(),
+        tree = FleetMerkleTree()
+        return cls(checksum=tree.checksum.hex(),
                    nodes={},
                    this_node_ref=this_node_ref,
-                   this_node_metadata=None)
+                   this_node_metadata=None,
+                   tree=tree)
 
     def __init__(self,
                  checksum: str,
                  nodes: Dict[ChecksumAddress, 'Ursula'],
                  this_node_ref: Optional[weakref.ReferenceType],
-                 this_node_metadata: Optional[bytes]):
+                 this_node_metadata: Optional[bytes],
+                 tree: FleetMerkleTree):
 
         self.checksum = checksum
+        self._tree = tree
         self.nickname = Nickname.from_seed(checksum, length=1)
         self._nodes = nodes
         self.timestamp = maya.now()
@@ -134,42 +268,50 @@ class FleetState:
             this_node = self._this_node_ref()
             this_node_metadata = bytes(this_node)
             this_node_updated = self._this_node_metadata != this_node_metadata
-            this_node_list = [this_node]
         else:
+            this_node = None
             this_node_metadata = self._this_node_metadata
             this_node_updated = False
-            this_node_list = []
 
         diff = self._calculate_diff(this_node_updated, nodes_to_add, nodes_to_remove)
 
         if not diff.empty():
-            # TODO: if nodes were kept in a Merkle tree,
-            # we'd have to only recalculate log(N) checksums.
-            # Is it worth it?
             nodes = dict(self._nodes)
             nodes_to_add_dict = {node.checksum_address: node for node in nodes_to_add}
+            metadata_updated = {}
             for checksum_address in diff.nodes_updated:
                 new_node = nodes_to_add_dict[checksum_address]
                 new_node.mature()
                 nodes[checksum_address] = new_node
+                metadata_updated[checksum_address] = bytes(new_node)
             for checksum_address in diff.nodes_removed:
                 del nodes[checksum_address]
+            if this_node_updated:
+                metadata_updated[this_node.checksum_address] = this_node_metadata
 
-            all_nodes_sorted = sorted(itertools.chain(this_node_list, nodes.values()),
-                                      key=lambda node: node.checksum_address)
-            joined_metadata = b"".join(bytes(node) for node in all_nodes_sorted)
-            checksum = keccak_digest(joined_metadata).hex()
+            # Only the paths to the updated leaves get rehashed.
+            tree = self._tree.with_updates(nodes_updated=metadata_updated, nodes_removed=diff.nodes_removed)
+            checksum = tree.checksum.hex()
         else:
             nodes = self._nodes
+            tree = self._tree
             checksum = self.checksum
 
         new_state = FleetState(checksum=checksum,
                                nodes=nodes,
                                this_node_ref=self._this_node_ref,
-                               this_node_metadata=this_node_metadata)
+                               this_node_metadata=this_node_metadata,
+                               tree=tree)
 
         return new_state, diff
 
+    def nodes_updated_since(self, other: 'FleetState') -> List['Ursula']:
+        """
+        Returns the known nodes which are not in ``other``, or have different metadata there.
+        """
+        updated_addresses = set(self._tree.addresses_updated_since(other._tree))
+        return [node for checksum_address, node in self._nodes.items() if checksum_address in updated_addresses]
+
     @property
     def population(self) -> int:
         """Returns the number of all known nodes, including itself, if applicable."""
@@ -249,18 +391,23 @@ class FleetSensor:
     """
     log = Logger("Learning")
 
+    _RECENT_STATES_LIMIT = 32  # How many full past states to keep for sending updates since them
+
     def __init__(self, domain: str, this_node: Optional['Ursula'] = None):
 
         self._domain = domain
 
         self._current_state = FleetState.new(this_node)
         self._archived_states = [self._current_state.archived()]
+        self._recent_states = OrderedDict([(self._current_state.checksum, self._current_state)])
+        self._payloads = {}  # Serialized views of the current state, see `cached_payload()`
         self._remote_states = {}
         self._remote_last_seen = {}
 
         # temporary accumulator for new nodes to avoid updating the fleet state every time
         self._nodes_to_add = set()
         self._nodes_to_remove = set()  # Beginning of bucketing.
+        self._nodes_forgotten = 0
 
         self._auto_update_state = False
 
@@ -359,6 +506,7 @@ class FleetSensor:
         self._nodes_to_add = set()
         self._nodes_to_remove = set()
         self._current_state = new_state
+        self._payloads = {}
 
         # TODO: set a limit on the number of archived states?
         # Two ways to collect archived states:
@@ -369,14 +517,48 @@ class FleetSensor:
             archived_state = new_state.archived()
             self._archived_states.append(archived_state)
 
+            self._recent_states[new_state.checksum] = new_state
+            self._recent_states.move_to_end(new_state.checksum)
+            while len(self._recent_states) > self._RECENT_STATES_LIMIT:
+                self._recent_states.popitem(last=False)
+
         return diff
 
+    def cached_payload(self, key: Hashable, producer: Callable[[], bytes]) -> bytes:
+        """
+        Returns the payload for ``key`` derived from the current fleet state,
+        calling ``producer`` for it only once per recorded state.
+        """
+        payloads = self._payloads  # Replaced (not cleared) in `record_fleet_state()`, so it can't go stale under us
+        try:
+            return payloads[key]
+        except KeyError:
+            payload = producer()
+            payloads[key] = payload
+            return payload
+
+    def recent_state(self, checksum: str) -> Optional[FleetState]:
+        """
+        Returns one of the recent fleet states (including the current one) by its checksum,
+        or ``None`` if it has not been seen recently.
+        """
+        return self._recent_states.get(checksum)
+
     def shuffled(self):
         return self._current_state.shuffled()
 
     def mark_as(self, label: Exception, node: 'Ursula'):
         # TODO: for now we're not using `label` in any way, so we're just ignoring it
         self._nodes_to_remove.add(node.checksum_address)
+        self._nodes_forgotten += 1
+
+    @property
+    def nodes_forgotten(self) -> int:
+        """
+        How many times a node has been marked for removal, so that learners can tell
+        whether they forgot somebody since they last synced with a teacher.
+        """
+        return self._nodes_forgotten
 
     def record_remote_fleet_state(self,
                                   checksum_address: ChecksumAddress,
@@ -396,6 +578,12 @@ class FleetSensor:
         self._remote_last_seen[checksum_address] = maya.now()
         self._remote_states[checksum_address] = state
 
+    def remote_fleet_state(self, checksum_address: ChecksumAddress) -> Optional[ArchivedFleetState]:
+        """
+        Returns the last fleet state reported by the given node, if any.
+        """
+        return self._remote_states.get(checksum_address)
+
     def status_info(self, checksum_address_or_node: Union[ChecksumAddress, 'Ursula']) -> 'RemoteUrsulaStatus':
 
         if isinstance(checksum_address_or_node, str):
@@ -15,20 +15,20 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from bisect import bisect_right
-
 import random
 import sys
+from itertools import accumulate
 from constant_sorrow.constants import (  # type: ignore
     CONTRACT_CALL,
     TRANSACTION,
-    CONTRACT_ATTRIBUTE
+    CONTRACT_ATTRIBUTE,
+    PER_BLOCK,
+    PER_PERIOD
 )
 from eth_typing.encoding import HexStr
 from eth_typing.evm import ChecksumAddress
 from eth_utils.address import to_checksum_address
 from hexbytes.main import HexBytes
-from itertools import accumulate
 from typing import Dict, Iterable, List, Tuple, Type, Union, Any, Optional, cast
 from web3.contract import Contract, ContractFunction
 from web3.types import Wei, Timestamp, TxReceipt, TxParams, Nonce
@@ -141,6 +141,13 @@ class EthereumContractAgent:
     def contract_address(self) -> ChecksumAddress:
         return self.__contract.address
 
+    def batch_call(self, contract_functions: Iterable[ContractFunction]) -> List[Any]:
+        """
+        Calls all the given contract functions at once, returning their results in order.
+        See `BlockchainInterface.batch_call`.
+        """
+        return self.blockchain.batch_call(contract_functions)
+
     @property  # type: ignore
     @contract_api(CONTRACT_ATTRIBUTE)
     def owner(self) -> Optional[ChecksumAddress]:
@@ -232,16 +239,20 @@ class StakingEscrowAgent(EthereumContractAgent):
     class NotEnoughStakers(Exception):
         """Raised when the are not enough stakers available to complete an operation"""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__stakers_samplers = dict()  # (period, duration, population) -> WeightedSampler of the active stakers
+
     #
     # Staker Network Status
     #
 
-    @contract_api(CONTRACT_CALL)
+    @contract_api(CONTRACT_CALL, cache=PER_BLOCK)
     def get_staker_population(self) -> int:
         """Returns the number of stakers on the blockchain"""
         return self.contract.functions.getStakersLength().call()
 
-    @contract_api(CONTRACT_CALL)
+    @contract_api(CONTRACT_CALL, cache=PER_BLOCK)
     def get_current_period(self) -> Period:
         """Returns the current period"""
         return self.contract.functions.getCurrentPeriod().call()
@@ -250,7 +261,7 @@ class StakingEscrowAgent(EthereumContractAgent):
     def get_stakers(self) -> List[ChecksumAddress]:
         """Returns a list of stakers"""
         num_stakers: int = self.get_staker_population()
-        stakers: List[ChecksumAddress] = [self.contract.functions.stakers(i).call() for i in range(num_stakers)]
+        stakers: List[ChecksumAddress] = self.batch_call(self.contract.functions.stakers(i) for i in range(num_stakers))
         return stakers
 
     @contract_api(CONTRACT_CALL)
@@ -262,15 +273,15 @@ class StakingEscrowAgent(EthereumContractAgent):
         The third contains stakers that have missed commitments before current period
         """
 
-        num_stakers: int = self.get_staker_population()
+        stakers: List[ChecksumAddress] = self.get_stakers()
         current_period: Period = self.get_current_period()
         active_stakers: List[ChecksumAddress] = list()
         pending_stakers: List[ChecksumAddress] = list()
         missing_stakers: List[ChecksumAddress] = list()
 
-        for i in range(num_stakers):
-            staker = self.contract.functions.stakers(i).call()
-            last_committed_period = self.get_last_committed_period(staker)
+        last_committed_periods = self.batch_call(self.contract.functions.getLastCommittedPeriod(staker)
+                                                 for staker in stakers)
+        for staker, last_committed_period in zip(stakers, last_committed_periods):
             if last_committed_period == current_period + 1:
                 active_stakers.append(staker)
             elif last_committed_period == current_period:
@@ -321,6 +332,59 @@ class StakingEscrowAgent(EthereumContractAgent):
         all_locked_tokens, _stakers = self.get_all_active_stakers(periods=periods, pagination_size=pagination_size)
         return all_locked_tokens
 
+    @contract_api(CONTRACT_CALL)
+    def get_locked_tokens_projection(self, periods: int) -> Dict[int, NuNits]:
+        """
+        Returns the tokens locked by active stakers in each one of the next `periods` periods, keyed by
+        their offset from the current period - as `get_all_locked_tokens` would, for each one of them.
+
+        Instead of scanning all the stakers once per period, the sub-stakes of the active stakers
+        are read once (in batches), and locked tokens are projected from them.
+        """
+        if not periods > 0:
+            raise ValueError("Period must be > 0")
+
+        current_period: Period = self.get_current_period()
+        stakers: List[ChecksumAddress] = self.get_stakers()
+        functions = self.contract.functions
+        results = self.batch_call(function
+                                  for staker in stakers
+                                  for function in (functions.stakerInfo(staker), functions.getSubStakesLength(staker)))
+
+        substake_functions: List[ContractFunction] = list()
+        for staker, info, stakes_length in zip(stakers, results[::2], results[1::2]):
+            current_committed_period, next_committed_period = info[1:3]
+            if current_period not in (current_committed_period, next_committed_period):
+                continue  # Only stakers which committed to the current period are active
+            for stake_index in range(stakes_length):
+                substake_functions.append(functions.getSubStakeInfo(staker, stake_index))
+                substake_functions.append(functions.getLastPeriodOfSubStake(staker, stake_index))
+
+        results = self.batch_call(substake_functions)
+        substakes = (SubStakeInfo(first_period, last_period, locked_value)
+                     for (first_period, *others, locked_value), last_period in zip(results[::2], results[1::2]))
+        return self.project_locked_tokens(substakes=substakes, current_period=current_period, periods=periods)
+
+    @staticmethod
+    def project_locked_tokens(substakes: Iterable[SubStakeInfo],
+                              current_period: Period,
+                              periods: int
+                              ) -> Dict[int, NuNits]:
+        """
+        Sums the value of `substakes` locked in each one of the next `periods` periods after `current_period`.
+        Sub-stakes lock their value over a range of periods, so they are added to a difference array
+        (+value where the range starts, -value right after it ends), whose running total is the projection.
+        """
+        deltas = [0] * (periods + 2)
+        for first_period, last_period, locked_value in substakes:
+            start = max(first_period - current_period, 1)
+            end = min(last_period - current_period, periods)
+            if start <= end:
+                deltas[start] += locked_value
+                deltas[end + 1] -= locked_value
+        locked_tokens = accumulate(deltas[1:periods + 1])
+        return {offset: NuNits(tokens) for offset, tokens in enumerate(locked_tokens, start=1)}
+
     #
     # StakingEscrow Contract API
     #
@@ -355,7 +419,7 @@ class StakingEscrowAgent(EthereumContractAgent):
         info: list = self.contract.functions.stakerInfo(staker_address).call()
         return StakerInfo(*info[0:9])
 
-    @contract_api(CONTRACT_CALL)
+    @contract_api(CONTRACT_CALL, cache=PER_BLOCK)
     def get_locked_tokens(self, staker_address: ChecksumAddress, periods: int = 0) -> NuNits:
         """
         Returns the amount of tokens this staker has locked
@@ -388,8 +452,13 @@ class StakingEscrowAgent(EthereumContractAgent):
         stakes_length: int = self.contract.functions.getSubStakesLength(staker_address).call()
         if stakes_length == 0:
             return iter(())  # Empty iterable, There are no stakes
-        for stake_index in range(stakes_length):
-            yield self.get_substake_info(staker_address=staker_address, stake_index=stake_index)
+        functions = self.contract.functions
+        results = self.batch_call(function
+                                  for stake_index in range(stakes_length)
+                                  for function in (functions.getSubStakeInfo(staker_address, stake_index),
+                                                   functions.getLastPeriodOfSubStake(staker_address, stake_index)))
+        for (first_period, *others, locked_value), last_period in zip(results[::2], results[1::2]):
+            yield SubStakeInfo(first_period, last_period, locked_value)
 
     @contract_api(TRANSACTION)
     def deposit_tokens(self,
@@ -494,7 +563,7 @@ class StakingEscrowAgent(EthereumContractAgent):
         period: int = self.contract.functions.getLastCommittedPeriod(staker_address).call()
         return Period(period)
 
-    @contract_api(CONTRACT_CALL)
+    @contract_api(CONTRACT_CALL, cache=PER_BLOCK)
     def get_worker_from_staker(self, staker_address: ChecksumAddress) -> ChecksumAddress:
         worker: str = self.contract.functions.getWorkerFromStaker(staker_address).call()
         return to_checksum_address(worker)
@@ -655,7 +724,7 @@ class StakingEscrowAgent(EthereumContractAgent):
                                                               transacting_power=transacting_power)
         return receipt
 
-    @contract_api(CONTRACT_CALL)
+    @contract_api(CONTRACT_CALL, cache=PER_PERIOD)
     def staking_parameters(self) -> StakingEscrowParameters:
         parameter_signatures = (
 
@@ -694,9 +763,7 @@ class StakingEscrowAgent(EthereumContractAgent):
         Returns an iterator of all staker addresses via cumulative sum, on-network.
         Staker addresses are returned in the order in which they registered with the StakingEscrow contract's ledger
         """
-        for index in range(self.get_staker_population()):
-            staker_address: ChecksumAddress = self.contract.functions.stakers(index).call()
-            yield staker_address
+        yield from self.get_stakers()
 
     def get_stakers_reservoir(self,
                               duration: int,
@@ -704,24 +771,40 @@ class StakingEscrowAgent(EthereumContractAgent):
                               pagination_size: Optional[int] = None
                               ) -> 'StakersReservoir':
 
-        n_tokens, stakers_map = self.get_all_active_stakers(periods=duration,
-                                                            pagination_size=pagination_size)
+        sampler = self.__get_stakers_sampler(duration=duration, pagination_size=pagination_size).copy()
 
         filtered_out = 0
         if without:
             for address in without:
-                if address in stakers_map:
-                    n_tokens -= stakers_map[address]
-                    del stakers_map[address]
+                if address in sampler:
+                    sampler.remove(address)
                     filtered_out += 1
 
-        self.log.debug(f"Got {len(stakers_map)} stakers with {n_tokens} total tokens "
+        self.log.debug(f"Got {len(sampler)} stakers with {sampler.total} total tokens "
                        f"({filtered_out} filtered out)")
 
-        if n_tokens == 0:
+        if sampler.total == 0:
             raise self.NotEnoughStakers(f'There are no locked tokens for duration {duration}.')
 
-        return StakersReservoir(stakers_map)
+        return StakersReservoir.from_sampler(sampler)
+
+    def __get_stakers_sampler(self, duration: int, pagination_size: Optional[int]) -> 'WeightedSampler':
+        """
+        Stakes only become active from one period to the next, so the sampler of the active stakers
+        is built once per period (and duration, and number of stakers), and copied for each reservoir.
+        """
+        current_period = self.get_current_period()
+        key = (current_period, duration, self.get_staker_population())
+        try:
+            return self.__stakers_samplers[key]
+        except KeyError:
+            _n_tokens, stakers_map = self.get_all_active_stakers(periods=duration, pagination_size=pagination_size)
+            sampler = WeightedSampler(stakers_map)
+            self.__stakers_samplers = {sampler_key: period_sampler
+                                       for sampler_key, period_sampler in self.__stakers_samplers.items()
+                                       if sampler_key[0] == current_period}
+            self.__stakers_samplers[key] = sampler
+            return sampler
 
     @contract_api(CONTRACT_CALL)
     def get_completed_work(self, bidder_address: ChecksumAddress) -> Work:
@@ -859,7 +942,7 @@ class PolicyManagerAgent(EthereumContractAgent):
         fee_amount = self.contract.functions.nodes(staker_address).call()[0]
         return fee_amount
 
-    @contract_api(CONTRACT_CALL)
+    @contract_api(CONTRACT_CALL, cache=PER_PERIOD)
     def get_fee_rate_range(self) -> Tuple[Wei, Wei, Wei]:
         """Check minimum, default & maximum fee rate for all policies ('global fee range')"""
         minimum, default, maximum = self.contract.functions.feeRateRange().call()
@@ -940,7 +1023,7 @@ class AdjudicatorAgent(EthereumContractAgent):
     def penalty_history(self, staker_address: str) -> int:
         return self.contract.functions.penaltyHistory(staker_address).call()
 
-    @contract_api(CONTRACT_CALL)
+    @contract_api(CONTRACT_CALL, cache=PER_PERIOD)
     def slashing_parameters(self) -> Tuple[int, ...]:
         parameter_signatures = (
             'hashAlgorithm',                    # Hashing algorithm
@@ -1216,7 +1299,7 @@ class WorkLockAgent(EthereumContractAgent):
         date: int = self.contract.functions.endCancellationDate().call()
         return Timestamp(date)
 
-    @contract_api(CONTRACT_CALL)
+    @contract_api(CONTRACT_CALL, cache=PER_PERIOD)
     def worklock_parameters(self) -> WorklockParameters:
         parameter_signatures = (
             'tokenSupply',
@@ -1490,6 +1573,9 @@ class ContractAgency:
 class WeightedSampler:
     """
     Samples random elements with probabilities proportional to given weights.
+
+    The weights are kept in a Fenwick (binary indexed) tree, so that drawing an element
+    and removing it takes O(log n) time, and building the sampler O(n).
     """
 
     def __init__(self, weighted_elements: Dict[Any, int]):
@@ -1497,9 +1583,87 @@ class WeightedSampler:
             elements, weights = zip(*weighted_elements.items())
         else:
             elements, weights = [], []
-        self.totals = list(accumulate(weights))
         self.elements = elements
-        self.__length = len(self.totals)
+        self.__indices = None  # element -> index, only built if elements are removed by value
+        self.__weights = list(weights)
+        self.__present = bytearray(b'\x01') * len(weights)
+        self.__length = len(weights)
+        self.__total = sum(weights)
+
+        # Fenwick tree, 1-indexed: each node holds the total of the weights in its range.
+        tree = [0] + self.__weights
+        for index in range(1, len(tree)):
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self.__tree = tree
+        self.__top_bit = 1 << (len(weights).bit_length() - 1) if weights else 0
+
+    def copy(self) -> 'WeightedSampler':
+        """
+        A copy of this sampler, which can be drawn from without affecting this one.
+        """
+        sampler = object.__new__(self.__class__)
+        sampler.elements = self.elements
+        sampler.__indices = self.__indices
+        sampler.__weights = self.__weights.copy()
+        sampler.__present = self.__present.copy()
+        sampler.__length = self.__length
+        sampler.__total = self.__total
+        sampler.__tree = self.__tree.copy()
+        sampler.__top_bit = self.__top_bit
+        return sampler
+
+    @property
+    def total(self) -> int:
+        """The total weight of the elements that can still be sampled."""
+        return self.__total
+
+    def __find(self, position: int) -> int:
+        """
+        The index of the first element whose cumulative weight is greater than `position`,
+        ie. the same as `bisect_right(cumulative_weights, position)`.
+        """
+        tree, index, bit = self.__tree, 0, self.__top_bit
+        while bit:
+            next_index = index + bit
+            if next_index < len(tree) and tree[next_index] <= position:
+                index = next_index
+                position -= tree[next_index]
+            bit >>= 1
+        return index
+
+    def __remove_at(self, index: int) -> None:
+        weight = self.__weights[index]
+        self.__weights[index] = 0
+        self.__present[index] = 0
+        self.__length -= 1
+        self.__total -= weight
+        if weight:
+            tree, node = self.__tree, index + 1
+            while node < len(tree):
+                tree[node] -= weight
+                node += node & -node
+
+    def __index_of(self, element) -> Optional[int]:
+        if self.__indices is None:
+            self.__indices = {element: index for index, element in enumerate(self.elements)}
+        index = self.__indices.get(element)
+        if index is None or not self.__present[index]:
+            return None
+        return index
+
+    def __contains__(self, element) -> bool:
+        return self.__index_of(element) is not None
+
+    def remove(self, element) -> None:
+        """
+        Removes ``element``, so that it won't be sampled.
+        """
+        index = self.__index_of(element)
+        if index is None:
+            raise KeyError(element)
+        self.__remove_at(index)
 
     def sample_no_replacement(self, rng, quantity: int) -> list:
         """
@@ -1507,8 +1671,8 @@ class WeightedSampler:
         The probability of an element to appear is proportional
         to the weight provided to the constructor.
 
-        The elements will not repeat; every time an element is sampled its weight is set to 0.
-        (does not mutate the object and only applies to the current invocation of the method).
+        The elements will not repeat; every time an element is sampled it is removed from the sampler
+        (use ``copy()`` to sample from the same elements again).
         """
 
         if quantity == 0:
@@ -1520,18 +1684,10 @@ class WeightedSampler:
         samples = []
 
         for i in range(quantity):
-            position = rng.randint(0, self.totals[-1] - 1)
-            idx = bisect_right(self.totals, position)
+            position = rng.randint(0, self.__total - 1)
+            idx = self.__find(position)
             samples.append(self.elements[idx])
-
-            # Adjust the totals so that they correspond
-            # to the weight of the element `idx` being set to 0.
-            prev_total = self.totals[idx - 1] if idx > 0 else 0
-            weight = self.totals[idx] - prev_total
-            for j in range(idx, len(self.totals)):
-                self.totals[j] -= weight
-
-        self.__length -= quantity
+            self.__remove_at(idx)
 
         return samples
 
@@ -1545,6 +1701,13 @@ class StakersReservoir:
         self._sampler = WeightedSampler(stakers_map)
         self._rng = random.SystemRandom()
 
+    @classmethod
+    def from_sampler(cls, sampler: WeightedSampler) -> 'StakersReservoir':
+        reservoir = cls.__new__(cls)
+        reservoir._sampler = sampler
+        reservoir._rng = random.SystemRandom()
+        return reservoir
+
     def __len__(self):
         return len(self._sampler)
 
@@ -18,15 +18,19 @@
 import eth_utils
 import functools
 import inspect
+import time
 from constant_sorrow.constants import (
     CONTRACT_ATTRIBUTE,
     CONTRACT_CALL,
     TRANSACTION,
     UNKNOWN_CONTRACT_INTERFACE,
-    NO_BLOCKCHAIN_CONNECTION
+    NO_BLOCKCHAIN_CONNECTION,
+    PER_BLOCK,
+    PER_PERIOD
 )
 from datetime import datetime
-from typing import Callable, Optional, Union
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional, Union
 
 from nucypher.types import ContractReturnValue
 from nucypher.utilities.logging import Logger
@@ -38,6 +42,11 @@ ContractInterfaces = Union[
     UNKNOWN_CONTRACT_INTERFACE
 ]
 
+CacheScopes = Union[
+    PER_BLOCK,
+    PER_PERIOD
+]
+
 
 __VERIFIED_ADDRESSES = set()
 
@@ -136,7 +145,123 @@ def save_receipt(actor_method) -> Callable:  # TODO: rename to "save_result"?
 COLLECT_CONTRACT_API = True
 
 
-def contract_api(interface: Optional[ContractInterfaces] = UNKNOWN_CONTRACT_INTERFACE) -> Callable:
+class ContractCallCache:
+    """
+    Read-through cache of the results of the agent methods marked with `contract_api(CONTRACT_CALL, cache=...)`,
+    keyed by contract, method and arguments.
+
+    Results cached `PER_BLOCK` are only reused within the same block. To spare the provider an `eth_blockNumber`
+    request per call, the latest block number is itself re-read at most every `block_number_ttl` seconds:
+    results of a block may therefore still be served up to `block_number_ttl` seconds after the next one was mined.
+
+    Results cached `PER_PERIOD` - contract parameters and the like, which seldom change, and never within a period -
+    are only reused within the same period, as read by `get_current_period`. When that is itself a cached
+    `PER_BLOCK` call (eg. `StakingEscrowAgent.get_current_period`), a new period is noticed with the same delay
+    as a new block.
+    """
+
+    DEFAULT_BLOCK_NUMBER_TTL = 5  # seconds
+
+    def __init__(self,
+                 get_block_number: Callable[[], int],
+                 get_current_period: Callable[[], int],
+                 block_number_ttl: float = DEFAULT_BLOCK_NUMBER_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.block_number_ttl = block_number_ttl
+        self.hits = 0
+        self.misses = 0
+        self.__get_block_number = get_block_number
+        self.__get_current_period = get_current_period
+        self.__clock = clock
+        self.__lock = Lock()
+        self.__block_number = None
+        self.__block_number_expiration = None
+        self.__block_results = dict()  # (block number, key) -> result
+        self.__period = None
+        self.__period_results = dict()  # key -> result, in `__period`
+
+    def __len__(self) -> int:
+        return len(self.__block_results) + len(self.__period_results)
+
+    def clear(self) -> None:
+        """Forgets every cached result, as well as the latest block number."""
+        with self.__lock:
+            self.__block_number = self.__block_number_expiration = None
+            self.__period = None
+            self.__block_results.clear()
+            self.__period_results.clear()
+
+    @property
+    def block_number(self) -> int:
+        now = self.__clock()
+        with self.__lock:
+            if self.__block_number_expiration is not None and now < self.__block_number_expiration:
+                return self.__block_number
+        block_number = self.__get_block_number()
+        with self.__lock:
+            if block_number != self.__block_number:
+                self.__block_results.clear()  # Results of past blocks won't be asked for again.
+                self.__block_number = block_number
+            self.__block_number_expiration = now + self.block_number_ttl
+        return block_number
+
+    def call(self, scope: CacheScopes, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Returns the cached result for `key`, calling `function` to get it on a miss."""
+        try:
+            hash(key)
+        except TypeError:
+            return function()  # Unhashable arguments; not worth caching.
+
+        if scope is PER_BLOCK:
+            block_key = (self.block_number, key)
+            with self.__lock:
+                if block_key in self.__block_results:
+                    self.hits += 1
+                    return self.__block_results[block_key]
+                self.misses += 1
+            result = function()
+            with self.__lock:
+                if block_key[0] == self.__block_number:
+                    self.__block_results[block_key] = result
+            return result
+
+        if scope is PER_PERIOD:
+            period = self.__get_current_period()
+            with self.__lock:
+                if period != self.__period:
+                    self.__period_results.clear()  # Results of past periods won't be asked for again.
+                    self.__period = period
+                if key in self.__period_results:
+                    self.hits += 1
+                    return self.__period_results[key]
+                self.misses += 1
+            result = function()
+            with self.__lock:
+                if period == self.__period:
+                    self.__period_results[key] = result
+            return result
+
+        raise ValueError(f"Unknown cache scope {scope}")
+
+
+def cache_contract_call(agent_method: Callable, scope: CacheScopes) -> Callable:
+    """
+    Serves calls of `agent_method` from the `call_cache` of the agent's blockchain interface, if there is one.
+    """
+
+    @functools.wraps(agent_method)
+    def wrapped(agent, *args, **kwargs):
+        call_cache = getattr(agent.blockchain, 'call_cache', None)
+        if call_cache is None:
+            return agent_method(agent, *args, **kwargs)
+        key = (agent.contract_address, agent_method.__name__, args, tuple(sorted(kwargs.items())))
+        return call_cache.call(scope=scope, key=key, function=lambda: agent_method(agent, *args, **kwargs))
+
+    return wrapped
+
+
+def contract_api(interface: Optional[ContractInterfaces] = UNKNOWN_CONTRACT_INTERFACE,
+                 cache: Optional[CacheScopes] = None) -> Callable:
     """Decorator factory for contract API markers"""
 
     def decorator(agent_method: Callable) -> Callable[..., ContractReturnValue]:
@@ -147,10 +272,14 @@ def contract_api(interface: Optional[ContractInterfaces] = UNKNOWN_CONTRACT_INTE
         If `COLLECT_CONTRACT_API` is True when running tests,
         all marked methods will be collected for automatic mocking
         and integration with pytest fixtures.
+
+        Contract calls can opt in to the `ContractCallCache` with a `cache` scope (`PER_BLOCK` or `PER_PERIOD`).
         """
         if COLLECT_CONTRACT_API:
             agent_method.contract_api = interface
         agent_method = validate_checksum_address(func=agent_method)
+        if cache is not None:
+            agent_method = cache_contract_call(agent_method, scope=cache)
         return agent_method
 
     return decorator
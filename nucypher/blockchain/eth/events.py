@@ -14,27 +14,136 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
+import json
 import os
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, RLock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+import requests
+from eth_utils import event_abi_to_log_topic, to_int
+from hexbytes import HexBytes
+from web3 import HTTPProvider
+from web3._utils.events import get_event_data
 from web3.contract import Contract
+from web3.types import RPCEndpoint
 
-from nucypher.blockchain.eth.interfaces import BlockchainInterfaceFactory
-from nucypher.config.constants import NUCYPHER_EVENTS_THROTTLE_MAX_BLOCKS
+from nucypher.blockchain.eth.interfaces import BlockchainInterface, BlockchainInterfaceFactory
+from nucypher.blockchain.middleware.batch import make_batch_request
+from nucypher.config.constants import NUCYPHER_EVENTS_CONFIRMATIONS, NUCYPHER_EVENTS_THROTTLE_MAX_BLOCKS
+from nucypher.utilities.logging import Logger
+
+
+class BlockTimestamps:
+    """
+    LRU cache of block timestamps, keyed by block number.
+
+    Missing timestamps are fetched in bulk: a single JSON-RPC batch request
+    when the provider is an `HTTPProvider`, or one `getBlock` call per block otherwise.
+    The cache can be shared by several threads.
+    """
+
+    DEFAULT_CACHE_SIZE = 4096  # blocks
+    MAX_BATCH_SIZE = 100  # requests
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self.__timestamps = OrderedDict()
+        self.__lock = Lock()
+
+    def __len__(self):
+        return len(self.__timestamps)
+
+    def get(self, w3, block_number: int, related_block_numbers: Iterable[int] = ()) -> int:
+        """
+        Returns the timestamp of `block_number`.
+        If it has to be fetched, the timestamps of `related_block_numbers` (eg. those of the other
+        events returned along with it) are fetched in the same round-trip.
+        """
+        with self.__lock:
+            try:
+                self.__timestamps.move_to_end(block_number)
+                return self.__timestamps[block_number]
+            except KeyError:
+                pass
+        # Don't fetch more than what we can keep
+        related_block_numbers = tuple(n for n in related_block_numbers if n != block_number)[:self.max_size - 1]
+        return self.fetch(w3, block_numbers=(block_number, *related_block_numbers))[block_number]
+
+    def fetch(self, w3, block_numbers: Iterable[int]) -> Dict[int, int]:
+        """
+        Fetches and caches the timestamps of the `block_numbers` that aren't cached yet,
+        returning the timestamps of all the `block_numbers`.
+        """
+        with self.__lock:
+            timestamps = {n: self.__timestamps[n] for n in set(block_numbers) if n in self.__timestamps}
+        missing = sorted(set(block_numbers).difference(timestamps))
+        if not missing:
+            return timestamps
+        if isinstance(w3.provider, HTTPProvider) and len(missing) > 1:
+            for batch_start in range(0, len(missing), self.MAX_BATCH_SIZE):
+                batch = missing[batch_start:batch_start + self.MAX_BATCH_SIZE]
+                try:
+                    timestamps.update(self._batch_request_timestamps(w3, batch))
+                except (ValueError, requests.exceptions.HTTPError):
+                    # This provider doesn't support batch requests (or gave up on this one);
+                    # fall back to one request per block.
+                    break
+        for block_number in missing:
+            if block_number not in timestamps:
+                timestamps[block_number] = w3.eth.getBlock(block_number)['timestamp']
+        with self.__lock:
+            for block_number in missing:
+                self.__timestamps[block_number] = timestamps[block_number]
+                self.__timestamps.move_to_end(block_number)
+            while len(self.__timestamps) > self.max_size:
+                self.__timestamps.popitem(last=False)
+        return timestamps
+
+    @staticmethod
+    def _batch_request_timestamps(w3, block_numbers: Iterable[int]) -> Dict[int, int]:
+        responses = make_batch_request(w3, [(RPCEndpoint('eth_getBlockByNumber'), [hex(block_number), False])
+                                            for block_number in block_numbers])
+        timestamps = dict()
+        for response in responses:
+            if 'error' in response or not response.get('result'):
+                raise ValueError(f"Batch request for block timestamps failed: {response}")
+            block = response['result']
+            timestamps[to_int(hexstr=block['number'])] = to_int(hexstr=block['timestamp'])
+        return timestamps
 
 
 class EventRecord:
-    def __init__(self, event: dict):
+
+    # Shared by all the event records
+    block_timestamps = BlockTimestamps()
+
+    def __init__(self, event: dict, related_block_numbers: Tuple[int, ...] = ()):
+        """
+        Event timestamps are lazily fetched the first time they are accessed.
+        The `related_block_numbers` are those of the events fetched along with this one,
+        so their timestamps can be fetched in bulk.
+        """
         self.raw_event = dict(event)
         self.args = dict(event['args'])
         self.block_number = event['blockNumber']
         self.transaction_hash = event['transactionHash'].hex()
+        self._related_block_numbers = related_block_numbers
+        self.__timestamp = None
 
-        try:
-            blockchain = BlockchainInterfaceFactory.get_interface()
-        except BlockchainInterfaceFactory.NoRegisteredInterfaces:
-            self.timestamp = None
-        else:
-            self.timestamp = blockchain.client.w3.eth.getBlock(self.block_number)['timestamp'],
+    @property
+    def timestamp(self) -> Optional[int]:
+        if self.__timestamp is None:
+            try:
+                blockchain = BlockchainInterfaceFactory.get_interface()
+            except BlockchainInterfaceFactory.NoRegisteredInterfaces:
+                return None
+            self.__timestamp = self.block_timestamps.get(blockchain.client.w3,
+                                                         block_number=self.block_number,
+                                                         related_block_numbers=self._related_block_numbers)
+        return self.__timestamp
 
     def __repr__(self):
         pairs_to_show = dict(self.args.items())
@@ -67,8 +176,9 @@ class ContractEvents:
                 to_block = 'latest'
 
             entries = event_method.getLogs(fromBlock=from_block, toBlock=to_block, argument_filters=argument_filters)
+            block_numbers = tuple(sorted(set(entry['blockNumber'] for entry in entries)))
             for entry in entries:
-                yield EventRecord(entry)
+                yield EventRecord(entry, related_block_numbers=block_numbers)
         return wrapper
 
     def __getattr__(self, event_name: str):
@@ -82,16 +192,44 @@ class ContractEvents:
 class ContractEventsThrottler:
     """
     Enables Contract events to be retrieved in batches.
+
+    Events are always yielded in block order, but with a `concurrency` greater
+    than 1, that many block ranges are fetched at the same time.
+
+    When `adaptive`, the size of the block ranges starts at `max_blocks_per_call` and
+    then follows the density of events: it grows while calls return few events, and ranges
+    are split in halves when the provider rejects them (eg. "query returned more than
+    10000 results"), or the call times out.
+
+    The last block whose events have all been yielded is kept in `last_scanned_block`;
+    an interrupted scan can be resumed from the block after it. With a `checkpoint_file`,
+    it is also saved there as the scan goes, and a scan of the same events resumes from it.
+    `on_range_scanned`, if given, is called with that block as each block range is done,
+    before the checkpoint is saved (eg. to flush what was written of the events so far).
     """
     # default to 1000 - smallest default heard about so far (alchemy)
     DEFAULT_MAX_BLOCKS_PER_CALL = int(os.environ.get(NUCYPHER_EVENTS_THROTTLE_MAX_BLOCKS, 1000))
 
+    # Adaptive scanning
+    SPARSE_EVENTS_PER_CALL = 100
+    ADAPTIVE_MAX_BLOCKS_PER_CALL = 100_000
+    LIMIT_EXCEEDED_ERROR_CODE = -32005  # EIP-1474
+    RANGE_TOO_LARGE_MESSAGES = ('query returned more than',  # eg. Infura
+                                'response size exceeded',    # eg. Alchemy
+                                'block range',               # eg. "block range is too wide", "exceed maximum block range"
+                                'limit exceeded',
+                                'too many')
+
     def __init__(self,
                  agent: 'EthereumContractAgent',
                  event_name: str,
                  from_block: int,
                  to_block: int = None,  # defaults to latest block
                  max_blocks_per_call: int = DEFAULT_MAX_BLOCKS_PER_CALL,
+                 adaptive: bool = False,
+                 concurrency: int = 1,
+                 checkpoint_file: Optional[str] = None,
+                 on_range_scanned: Optional[Callable[[int], None]] = None,
                  **argument_filters):
         self.event_filter = agent.events[event_name]
         self.from_block = from_block
@@ -100,20 +238,348 @@ class ContractEventsThrottler:
         if self.to_block < self.from_block:
             raise ValueError(f"Invalid events block range: to_block {self.to_block} must be greater than or equal "
                              f"to from_block {self.from_block}")
+        if concurrency < 1:
+            raise ValueError(f"Invalid events concurrency: {concurrency}; it must be at least 1")
 
         self.max_blocks_per_call = max_blocks_per_call
+        self.blocks_per_call = max_blocks_per_call
+        self.adaptive = adaptive
+        self.concurrency = concurrency
         self.argument_filters = argument_filters
+        self.last_scanned_block = from_block - 1
+        self.__lock = Lock()  # Block ranges are sized by the concurrent calls
+
+        self.checkpoint_file = checkpoint_file
+        self.on_range_scanned = on_range_scanned
+        self.__scan_id = dict(contract_address=agent.contract_address,
+                              event_name=event_name,
+                              from_block=from_block,
+                              argument_filters={name: str(value) for name, value in argument_filters.items()})
+        if checkpoint_file:
+            self.__load_checkpoint()
+
+    def __load_checkpoint(self) -> None:
+        try:
+            with open(self.checkpoint_file) as file:
+                checkpoint = json.load(file)
+        except FileNotFoundError:
+            return
+        if checkpoint.get('scan') == self.__scan_id:
+            self.last_scanned_block = min(checkpoint['last_scanned_block'], self.to_block)
+
+    def __save_checkpoint(self) -> None:
+        checkpoint = dict(scan=self.__scan_id, last_scanned_block=self.last_scanned_block)
+        with open(f'{self.checkpoint_file}.tmp', 'w') as file:
+            json.dump(checkpoint, file)
+        os.replace(f'{self.checkpoint_file}.tmp', self.checkpoint_file)
 
     def __iter__(self):
-        current_from_block = self.from_block
-        current_to_block = min(self.from_block + self.max_blocks_per_call, self.to_block)
-        while current_from_block <= current_to_block:
-            for event_record in self.event_filter(from_block=current_from_block,
-                                                  to_block=current_to_block,
-                                                  **self.argument_filters):
-                yield event_record
-            # previous block range is inclusive hence the increment
-            current_from_block = current_to_block + 1
-            # update the 'to block' to the lesser of either the next `max_blocks_per_call` blocks,
-            # or the remainder of blocks
-            current_to_block = min(current_from_block + self.max_blocks_per_call, self.to_block)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency) if self.concurrency > 1 else None
+        next_from_block = self.last_scanned_block + 1
+        try:
+            while next_from_block <= self.to_block:
+                # The next block ranges, one per concurrent call.
+                # Block ranges are inclusive, hence the increments.
+                block_ranges = list()
+                while next_from_block <= self.to_block and len(block_ranges) < self.concurrency:
+                    # the 'to block' is the lesser of either the next `blocks_per_call` blocks,
+                    # or the remainder of blocks
+                    with self.__lock:
+                        to_block = min(next_from_block + self.blocks_per_call, self.to_block)
+                    block_ranges.append((next_from_block, to_block))
+                    next_from_block = to_block + 1
+
+                if executor:
+                    futures = [executor.submit(self._get_events, *block_range) for block_range in block_ranges]
+                    results = (future.result() for future in futures)
+                else:
+                    results = (self._get_events(*block_range) for block_range in block_ranges)
+
+                for (_from_block, to_block), events in zip(block_ranges, results):
+                    yield from events
+                    self.last_scanned_block = to_block
+                    if self.on_range_scanned:
+                        self.on_range_scanned(to_block)
+                    if self.checkpoint_file:
+                        self.__save_checkpoint()
+        finally:
+            if executor:
+                executor.shutdown()
+
+    @classmethod
+    def _range_too_large(cls, error: Exception) -> bool:
+        """Whether `error` means that a call was rejected, or timed out, for asking for too many events at once."""
+        if isinstance(error, requests.exceptions.Timeout):
+            return True
+        rpc_error = error.args[0] if error.args else None
+        if isinstance(rpc_error, dict):
+            if rpc_error.get('code') == cls.LIMIT_EXCEEDED_ERROR_CODE:
+                return True
+            message = str(rpc_error.get('message', ''))
+        else:
+            message = str(rpc_error)
+        return any(hint in message.lower() for hint in cls.RANGE_TOO_LARGE_MESSAGES)
+
+    def _get_events(self, from_block: int, to_block: int) -> List[EventRecord]:
+        try:
+            events = list(self.event_filter(from_block=from_block, to_block=to_block, **self.argument_filters))
+        except (ValueError, requests.exceptions.Timeout) as e:
+            if not self.adaptive or from_block == to_block or not self._range_too_large(e):
+                raise
+            # Too many events for the provider to return; try again in halves.
+            middle_block = from_block + (to_block - from_block) // 2
+            with self.__lock:
+                self.blocks_per_call = middle_block - from_block
+            return self._get_events(from_block, middle_block) + self._get_events(middle_block + 1, to_block)
+
+        if self.adaptive and len(events) < self.SPARSE_EVENTS_PER_CALL:
+            with self.__lock:
+                if to_block - from_block >= self.blocks_per_call:
+                    self.blocks_per_call = min(max(2 * self.blocks_per_call, 1), self.ADAPTIVE_MAX_BLOCKS_PER_CALL)
+        return events
+
+
+class EventSubscription:
+    """
+    The events named `event_name` of `contract` matching `argument_filters`, from `from_block` on,
+    that a `BlockWatcher` hands to `callback`.
+
+    The subscription keeps track of the next event to hand out as a (block number, log index) cursor,
+    so that events already handed out are not handed out again, even from the same block.
+    """
+
+    def __init__(self,
+                 contract: Contract,
+                 event_name: str,
+                 callback: Callable[[EventRecord], Any],
+                 from_block: int,
+                 **argument_filters):
+        self.contract = contract
+        self.event_name = event_name
+        self.event_abi = getattr(contract.events, event_name)._get_event_abi()
+        self.topic = HexBytes(event_abi_to_log_topic(self.event_abi))
+        self.callback = callback
+        self.next_block = from_block
+        self.next_log_index = 0  # Within `next_block`
+        self.argument_filters = argument_filters
+
+    def handed_out(self, log: dict) -> bool:
+        """Whether the event of `log` is behind the cursor of the subscription, ie. was already handed out."""
+        return (log['blockNumber'], log['logIndex']) < (self.next_block, self.next_log_index)
+
+    def move_to(self, block_number: int, log_index: int = 0) -> None:
+        self.next_block, self.next_log_index = block_number, log_index
+
+    def first_indexed_argument(self) -> Optional[Tuple[str, str]]:
+        """Returns the name and type of the first indexed argument of the event, if it has any."""
+        for event_input in self.event_abi['inputs']:
+            if event_input['indexed']:
+                return event_input['name'], event_input['type']
+        return None
+
+    def matches(self, event: dict) -> bool:
+        for name, value in self.argument_filters.items():
+            accepted = value if isinstance(value, (list, tuple)) else (value, )
+            if event['args'].get(name) not in accepted:
+                return False
+        return True
+
+
+class BlockWatcher:
+    """
+    Follows the new blocks of a blockchain on behalf of all the subscribers to its contract events:
+    the logs of all of them are fetched with a single `eth_getLogs` request per range of new blocks,
+    and then handed out to each subscriber.
+
+    Watchers are shared (see `for_blockchain`) and polled on demand; polls closer than `POLLING_INTERVAL`
+    to the previous one don't reach the provider, so that several consumers can poll in a row.
+
+    Only blocks with `confirmations` blocks on top of them are scanned. If a scanned block is later
+    reorganized away (by a reorg deeper than that), the scan resumes after the last scanned block
+    that is still part of the chain, so that subscribers may see some events twice. If none of the
+    last `MAX_REORG_DEPTH` scanned blocks is, it resumes `confirmations` blocks before the oldest of them.
+
+    A subscriber whose callback fails is handed out the events again from the failing one on,
+    at the next poll; the other subscribers are not.
+
+    Only the event metrics collectors follow the watcher. `WorkTracker` reads the chain head itself:
+    it needs an up-to-date block number to replace its pending commitments, and runs on the reactor
+    thread, where the scans and the subscribers' callbacks don't belong. Datastore pruning is time-based
+    and makes no RPC requests, so it has nothing to gain from following new blocks either.
+    """
+
+    POLLING_INTERVAL = 1  # seconds
+    DEFAULT_CONFIRMATIONS = int(os.environ.get(NUCYPHER_EVENTS_CONFIRMATIONS, 12))  # blocks
+    MAX_REORG_DEPTH = 64  # scanned heads
+    MAX_BLOCKS_PER_CALL = ContractEventsThrottler.DEFAULT_MAX_BLOCKS_PER_CALL
+
+    __watchers = dict()  # type: Dict[Tuple[BlockchainInterface, int], BlockWatcher]
+    __watchers_lock = Lock()
+
+    def __init__(self, w3, confirmations: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        if confirmations is None:
+            confirmations = self.DEFAULT_CONFIRMATIONS
+        if confirmations < 0:
+            raise ValueError(f"Invalid number of confirmations: {confirmations}")
+        self.w3 = w3
+        self.confirmations = confirmations
+        self.latest_block_number = None  # type: Optional[int]
+        self.log = Logger(self.__class__.__name__)
+        self.__clock = clock
+        self.__last_poll = None
+        self.__lock = RLock()  # Callbacks may (un)subscribe
+        self.__subscriptions = list()  # type: List[EventSubscription]
+        self.__scanned_heads = deque(maxlen=self.MAX_REORG_DEPTH)  # (block number, block hash) of the last scans
+
+    @classmethod
+    def for_blockchain(cls, blockchain: BlockchainInterface, confirmations: Optional[int] = None) -> 'BlockWatcher':
+        """
+        Returns the watcher shared by everything that follows `blockchain` with as many `confirmations`
+        (by default, `DEFAULT_CONFIRMATIONS`).
+        """
+        if confirmations is None:
+            confirmations = cls.DEFAULT_CONFIRMATIONS
+        with cls.__watchers_lock:
+            try:
+                return cls.__watchers[(blockchain, confirmations)]
+            except KeyError:
+                watcher = cls.__watchers[(blockchain, confirmations)] = cls(w3=blockchain.w3,
+                                                                             confirmations=confirmations)
+                return watcher
+
+    def subscribe(self,
+                  agent: 'EthereumContractAgent',
+                  event_name: str,
+                  callback: Callable[[EventRecord], Any],
+                  from_block: Optional[int] = None,
+                  **argument_filters
+                  ) -> EventSubscription:
+        """
+        Hands the events of `agent`'s contract named `event_name` and matching `argument_filters`
+        to `callback`, from `from_block` (by default, the next block scanned) on.
+        """
+        with self.__lock:
+            if from_block is None:
+                from_block = self.__scanned_heads[-1][0] + 1 if self.__scanned_heads else self.w3.eth.blockNumber
+            subscription = EventSubscription(contract=agent.contract,
+                                             event_name=event_name,
+                                             callback=callback,
+                                             from_block=from_block,
+                                             **argument_filters)
+            self.__subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription) -> None:
+        with self.__lock:
+            self.__subscriptions.remove(subscription)
+
+    def poll(self) -> int:
+        """
+        Scans the new confirmed blocks for the events of all the subscribers, handing them out.
+        Returns the latest block number.
+        """
+        with self.__lock:
+            now = self.__clock()
+            if self.__last_poll is not None and now - self.__last_poll < self.POLLING_INTERVAL:
+                # Same view of the chain as the last poll; only catch up new subscribers with it.
+                if self.__scanned_heads:
+                    self.__scan_up_to(self.__scanned_heads[-1][0])
+                return self.latest_block_number
+            self.__last_poll = now
+
+            self.latest_block_number = self.w3.eth.blockNumber
+            to_block = self.latest_block_number - self.confirmations
+            if self.__scanned_heads and self.__scanned_heads[-1][0] == to_block:
+                self.__scan_up_to(to_block)  # No new confirmed blocks; only catch up new subscribers
+                return self.latest_block_number
+            self.__handle_reorgs()
+            if self.__scan_up_to(to_block):
+                self.__scanned_heads.append((to_block, self.w3.eth.getBlock(to_block)['hash']))
+            return self.latest_block_number
+
+    def __scan_up_to(self, to_block: int) -> bool:
+        subscriptions = [s for s in self.__subscriptions if s.next_block <= to_block]
+        if not subscriptions:
+            return False
+        from_block = min(subscription.next_block for subscription in subscriptions)
+        for batch_start in range(from_block, to_block + 1, self.MAX_BLOCKS_PER_CALL):
+            batch_end = min(batch_start + self.MAX_BLOCKS_PER_CALL - 1, to_block)
+            failed = self.__scan(subscriptions, from_block=batch_start, to_block=batch_end)
+            subscriptions = [subscription for subscription in subscriptions if subscription not in failed]
+            if not subscriptions:
+                break
+        return True
+
+    def __handle_reorgs(self) -> None:
+        """Rewinds the subscriptions to the last scanned head that is still part of the chain, if needed."""
+        oldest_reorganized_block = None
+        while self.__scanned_heads:
+            block_number, block_hash = self.__scanned_heads[-1]
+            block = self.w3.eth.getBlock(block_number)
+            if block is not None and block['hash'] == block_hash:
+                break
+            oldest_reorganized_block = block_number
+            self.__scanned_heads.pop()
+        if oldest_reorganized_block is None:
+            return
+        if self.__scanned_heads:
+            resume_block = self.__scanned_heads[-1][0] + 1
+        else:
+            # Deeper than the kept history: not back to genesis though, just as far as a reorg would be unexpected.
+            resume_block = max(0, oldest_reorganized_block - self.confirmations)
+        self.log.warn(f"Chain reorganization detected; scanning for events again from block {resume_block}")
+        for subscription in self.__subscriptions:
+            if subscription.next_block > resume_block:
+                subscription.move_to(resume_block)
+
+    def __scan(self, subscriptions: List[EventSubscription], from_block: int, to_block: int) -> List[EventSubscription]:
+        """Hands out the events of the blocks in range to the subscribers, returning those whose callback failed."""
+        by_address_and_topic = defaultdict(list)
+        for subscription in subscriptions:
+            by_address_and_topic[(subscription.contract.address, subscription.topic)].append(subscription)
+
+        log_filter = dict(fromBlock=from_block,
+                          toBlock=to_block,
+                          address=sorted({subscription.contract.address for subscription in subscriptions}),
+                          topics=[sorted({subscription.topic.hex() for subscription in subscriptions})])
+
+        # Narrow the logs down to the filtered values of the first indexed argument, if every subscriber filters it.
+        first_indexed_values = set()
+        for subscription in subscriptions:
+            argument = subscription.first_indexed_argument()
+            if argument is None or argument[0] not in subscription.argument_filters:
+                break
+            name, abi_type = argument
+            values = subscription.argument_filters[name]
+            for value in (values if isinstance(values, (list, tuple)) else (values, )):
+                first_indexed_values.add(HexBytes(self.w3.codec.encode_single(abi_type, value)).hex())
+        else:
+            log_filter['topics'].append(sorted(first_indexed_values))
+
+        logs = sorted(self.w3.eth.getLogs(log_filter), key=lambda log: (log['blockNumber'], log['logIndex']))
+        block_numbers = tuple(sorted(set(log['blockNumber'] for log in logs)))
+        failed = list()
+        for log in logs:
+            if not log['topics']:
+                continue
+            for subscription in by_address_and_topic.get((log['address'], HexBytes(log['topics'][0])), ()):
+                if subscription in failed or subscription.handed_out(log):
+                    continue  # Already handed out, or to be handed out again
+                event = get_event_data(self.w3.codec, subscription.event_abi, log)
+                if not subscription.matches(event):
+                    continue
+                try:
+                    subscription.callback(EventRecord(event, related_block_numbers=block_numbers))
+                except Exception as e:
+                    self.log.warn(f"Failed to hand out {subscription.event_name} event "
+                                  f"{log['logIndex']} of block {log['blockNumber']}; "
+                                  f"handing out the events again from there at the next poll: {e!r}")
+                    subscription.move_to(log['blockNumber'], log['logIndex'])
+                    failed.append(subscription)
+                else:
+                    subscription.move_to(log['blockNumber'], log['logIndex'] + 1)
+
+        for subscription in subscriptions:
+            if subscription not in failed and subscription.next_block <= to_block:
+                subscription.move_to(to_block + 1)
+        return failed
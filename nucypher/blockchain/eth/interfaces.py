@@ -19,11 +19,12 @@ import math
 import os
 import pprint
 from eth.typing import TransactionDict
-from typing import Callable, NamedTuple, Tuple, Union, Optional
+from typing import Any, Callable, Iterable, NamedTuple, Tuple, Union, Optional
 from typing import List
 from urllib.parse import urlparse
 
 import requests
+from eth_abi.exceptions import DecodingError
 from eth_tester import EthereumTester
 from eth_tester.exceptions import TransactionFailed as TestTransactionFailed
 from eth_typing import ChecksumAddress
@@ -31,10 +32,12 @@ from eth_utils import to_checksum_address
 from hexbytes.main import HexBytes
 from web3 import Web3, middleware, IPCProvider, WebsocketProvider, HTTPProvider
 from web3.contract import Contract, ContractConstructor, ContractFunction
-from web3.exceptions import ValidationError, TimeExhausted
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.exceptions import BadFunctionCallOutput, ValidationError, TimeExhausted
 from web3.middleware import geth_poa_middleware
 from web3.providers import BaseProvider
-from web3.types import TxReceipt
+from web3.types import BlockIdentifier, RPCEndpoint, TxReceipt
 
 from constant_sorrow.constants import (
     INSUFFICIENT_ETH,
@@ -46,7 +49,7 @@ from constant_sorrow.constants import (
 
 from nucypher.crypto.powers import TransactingPower
 from nucypher.blockchain.eth.clients import EthereumClient, POA_CHAINS, InfuraClient
-from nucypher.blockchain.eth.decorators import validate_checksum_address
+from nucypher.blockchain.eth.decorators import ContractCallCache, validate_checksum_address
 from nucypher.blockchain.eth.providers import (
     _get_HTTP_provider,
     _get_IPC_provider,
@@ -60,6 +63,7 @@ from nucypher.blockchain.eth.sol.compile.compile import multiversion_compile
 from nucypher.blockchain.eth.sol.compile.constants import SOLIDITY_SOURCE_ROOT
 from nucypher.blockchain.eth.sol.compile.types import SourceBundle
 from nucypher.blockchain.eth.utils import get_transaction_name, prettify_eth_amount
+from nucypher.blockchain.middleware.batch import make_batch_request
 from nucypher.characters.control.emitters import JSONRPCStdoutEmitter, StdoutEmitter
 from nucypher.utilities.ethereum import encode_constructor_arguments
 from nucypher.utilities.gas_strategies import (
@@ -85,6 +89,7 @@ class BlockchainInterface:
     TIMEOUT = 600  # seconds  # TODO: Correlate with the gas strategy - #2070
 
     DEFAULT_GAS_STRATEGY = 'fast'
+    BATCH_CALL_SIZE = 500  # eth_calls per JSON-RPC batch request
     GAS_STRATEGIES = WEB3_GAS_STRATEGIES
 
     Web3 = Web3  # TODO: This is name-shadowing the actual Web3. Is this intentional?
@@ -236,6 +241,7 @@ class BlockchainInterface:
         self.w3 = NO_BLOCKCHAIN_CONNECTION
         self.client = NO_BLOCKCHAIN_CONNECTION
         self.is_light = light
+        self.call_cache = None  # See `enable_call_cache`
 
         # TODO: Not ready to give users total flexibility. Let's stick for the moment to known values. See #2447
         if gas_strategy not in ('slow', 'medium', 'fast', 'free', None):  # FIXME: What is 'None' doing here?
@@ -250,6 +256,17 @@ class BlockchainInterface:
     def get_blocktime(self):
         return self.client.get_blocktime()
 
+    def enable_call_cache(self, get_current_period: Callable[[], int], **kwargs) -> ContractCallCache:
+        """
+        Caches the results of the agent methods that opted in to it, sparing repeated requests to the provider.
+        Keyword arguments are passed on to `ContractCallCache`.
+        """
+        if self.call_cache is None:
+            self.call_cache = ContractCallCache(get_block_number=lambda: self.client.block_number,
+                                                get_current_period=get_current_period,
+                                                **kwargs)
+        return self.call_cache
+
     @property
     def is_connected(self) -> bool:
         """
@@ -599,6 +616,8 @@ class BlockchainInterface:
             raise
         else:
             self.log.debug(f"[RECEIPT-{transaction_name}] | txhash: {receipt['transactionHash'].hex()}")
+            if self.call_cache is not None:
+                self.call_cache.clear()  # The transaction may have changed what was cached.
 
         #
         # Confirmations
@@ -663,6 +682,63 @@ class BlockchainInterface:
                                                                 fire_and_forget=fire_and_forget)
         return txhash_or_receipt
 
+    def batch_call(self,
+                   contract_functions: Iterable[ContractFunction],
+                   block_identifier: BlockIdentifier = 'latest'
+                   ) -> List[Any]:
+        """
+        Calls all the given (read-only) contract functions on the same block, returning their results in order,
+        as `ContractFunction.call()` would. Over HTTP, the calls are sent in JSON-RPC batches of `BATCH_CALL_SIZE`;
+        with any other provider, they are sent one after the other as raw `eth_call` requests.
+        """
+        contract_functions = list(contract_functions)
+        if not contract_functions:
+            return []
+
+        # Every call sees the same state, even if blocks are mined in between batches.
+        if block_identifier == 'latest' and len(contract_functions) > 1:
+            block_identifier = self.w3.eth.blockNumber
+        if isinstance(block_identifier, int):
+            block_identifier = hex(block_identifier)
+
+        calls = [{'to': function.address, 'data': function._encode_transaction_data()}
+                 for function in contract_functions]
+        if isinstance(self.provider, HTTPProvider):
+            return_data = []
+            for start in range(0, len(calls), self.BATCH_CALL_SIZE):
+                return_data.extend(self.__batch_request('eth_call', [[call, block_identifier]
+                                                                     for call in calls[start:start + self.BATCH_CALL_SIZE]]))
+        else:
+            return_data = [self.w3.manager.request_blocking('eth_call', [call, block_identifier]) for call in calls]
+
+        return [self.__decode_call_result(function, HexBytes(data))
+                for function, data in zip(contract_functions, return_data)]
+
+    def __batch_request(self, method: str, params: List[list]) -> List[Any]:
+        """
+        Sends a single JSON-RPC batch request to the HTTP provider, through the middleware
+        as any other request (so that it's rate limited, retried, etc.), returning the results in order.
+        """
+        responses = make_batch_request(self.w3, [(RPCEndpoint(method), request_params) for request_params in params])
+        results = []
+        for response in responses:
+            if 'error' in response:
+                raise ValueError(response['error'])  # As web3 does for any other RPC error
+            results.append(response['result'])
+        return results
+
+    def __decode_call_result(self, contract_function: ContractFunction, return_data: HexBytes) -> Any:
+        output_types = get_abi_output_types(contract_function.abi)
+        try:
+            output_data = self.w3.codec.decode_abi(output_types, return_data)
+        except DecodingError as e:
+            raise BadFunctionCallOutput(f"Could not decode contract function call {contract_function.fn_name} "
+                                        f"return data {return_data} for output_types {output_types}") from e
+        normalized_data = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, output_data)
+        if len(normalized_data) == 1:
+            return normalized_data[0]
+        return normalized_data
+
     def get_contract_by_name(self,
                              registry: BaseContractRegistry,
                              contract_name: str,
@@ -32,7 +32,7 @@ from constant_sorrow.constants import (
 )
 from eth_utils import currency, is_checksum_address
 from hexbytes.main import HexBytes
-from twisted.internet import reactor, task
+from twisted.internet import defer, reactor, task
 from web3.exceptions import TransactionNotFound
 
 from nucypher.blockchain.eth.agents import ContractAgency, StakingEscrowAgent
@@ -40,6 +40,7 @@ from nucypher.blockchain.eth.constants import AVERAGE_BLOCK_TIME_IN_SECONDS
 from nucypher.blockchain.eth.decorators import validate_checksum_address
 from nucypher.blockchain.eth.registry import BaseContractRegistry
 from nucypher.blockchain.eth.utils import datetime_at_period
+from nucypher.blockchain.middleware.rate_limit import HIGH_PRIORITY, RPCRateLimiter, rpc_priority
 from nucypher.types import SubStakeInfo, NuNits, StakerInfo, Period
 from nucypher.utilities.gas_strategies import EXPECTED_CONFIRMATION_TIME_IN_SECONDS
 from nucypher.utilities.logging import Logger
@@ -544,6 +545,7 @@ class WorkTracker:
     INTERVAL_CEIL = 60 * 180  # three hours
 
     ALLOWED_DEVIATION = 0.5  # i.e., up to +50% from the expected confirmation time
+    THROTTLED_RETRIES = 3  # quick retries of the work while the RPC provider is throttling requests
 
     def __init__(self, worker, *args, **kwargs):
 
@@ -555,8 +557,10 @@ class WorkTracker:
 
         self.gas_strategy = self.staking_agent.blockchain.gas_strategy
 
-        self._tracking_task = task.LoopingCall(self._do_work)
+        self._tracking_task = task.LoopingCall(self._work_unless_throttled)
         self._tracking_task.clock = self.CLOCK
+        self._throttled_retries = 0
+        self._throttled_retry = None  # The scheduled quick retry, if any
 
         self.__pending = dict()  # TODO: Prime with pending worker transactions
         self.__requirement = None
@@ -583,6 +587,8 @@ class WorkTracker:
         return result
 
     def stop(self) -> None:
+        if self._throttled_retry is not None and self._throttled_retry.active():
+            self._throttled_retry.cancel()
         if self._tracking_task.running:
             self._tracking_task.stop()
             self.log.info(f"STOPPED WORK TRACKING")
@@ -728,6 +734,36 @@ class WorkTracker:
         self.__pending.clear()  # Forget the past. This is a new beginning.
         self._consecutive_fails = 0
 
+    def __throttling_delay(self, error: Exception) -> float:
+        """Seconds until the RPC provider accepts requests again, if `error` is due to throttling (else 0)."""
+        if isinstance(error, RPCRateLimiter.Throttled):
+            return error.retry_after
+        return RPCRateLimiter.for_provider(self.client.w3.provider).paused_for
+
+    def _work_unless_throttled(self, retrying: bool = False) -> None:
+        """
+        Does the work, unless the RPC provider is throttling requests. The work runs on the reactor thread,
+        where throttled requests are neither retried nor paced (that would block the reactor), so it is
+        retried as soon as the provider accepts requests again, a few times, instead of at the next interval.
+        """
+        if not retrying:
+            self._throttled_retries = 0
+        try:
+            self._do_work()
+        except Exception as e:
+            delay = self.__throttling_delay(e)
+            if not delay or self._throttled_retries >= self.THROTTLED_RETRIES:
+                raise
+            self._throttled_retries += 1
+            self.log.warn(f"RPC requests are throttled ({e!r}); retrying work in {delay:.1f} seconds "
+                          f"({self._throttled_retries}/{self.THROTTLED_RETRIES})")
+            if self._throttled_retry is None or not self._throttled_retry.active():
+                self._throttled_retry = self.CLOCK.callLater(delay, self.__retry_throttled_work)
+
+    def __retry_throttled_work(self) -> None:
+        d = defer.maybeDeferred(self._work_unless_throttled, retrying=True)
+        d.addErrback(self.handle_working_errors)
+
     def _do_work(self) -> None:
         """
         Async working task for Ursula  # TODO: Split into multiple async tasks
@@ -788,7 +824,7 @@ class WorkTracker:
     def __fire_commitment(self):
         """Makes an initial/replacement worker commitment transaction"""
         transacting_power = self.worker.transacting_power
-        with transacting_power:
+        with transacting_power, rpc_priority(HIGH_PRIORITY):
             txhash = self.worker.commit_to_next_period(fire_and_forget=True)  # < --- blockchain WRITE
         self.log.info(f"Making a commitment to period {self.current_period} - TxHash: {txhash.hex()}")
         return txhash
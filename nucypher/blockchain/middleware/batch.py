@@ -0,0 +1,68 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import itertools
+import json
+from typing import Any, Iterable, List, Tuple
+
+from web3 import HTTPProvider, Web3
+from web3._utils.request import make_post_request
+from web3.middleware import combine_middlewares
+from web3.types import RPCEndpoint, RPCResponse
+
+# Not an actual RPC method: it's how batches are told apart from single requests on their way through the middleware.
+BATCH_ENDPOINT = RPCEndpoint('nucypher_batch')
+
+__request_ids = itertools.count()
+
+
+def make_batch_request(w3: Web3, requests: Iterable[Tuple[RPCEndpoint, Any]]) -> List[RPCResponse]:
+    """
+    Sends the `requests` (method and params) to the `HTTPProvider` of `w3` as a single JSON-RPC batch request,
+    returning their responses in the same order. The responses may contain errors, just as single responses.
+
+    The batch goes through the middleware of `w3` as any other request would, so that it is paced by the rate limiter,
+    retried when throttled, etc. Middleware that only applies to specific methods leaves batches alone.
+    If the provider rejects the batch as a whole, `ValueError` is raised, as web3 does for a single request.
+    """
+    provider = w3.provider
+    if not isinstance(provider, HTTPProvider):
+        raise ValueError(f"Batch requests are only supported over HTTP, not by {provider.__class__.__name__}")
+
+    batch = [{'jsonrpc': '2.0', 'method': method, 'params': params, 'id': next(__request_ids)}
+             for method, params in requests]
+    if not batch:
+        return []
+
+    def send_batch(method: RPCEndpoint, params: Any) -> RPCResponse:
+        raw_response = make_post_request(provider.endpoint_uri, json.dumps(params).encode(), **provider.get_request_kwargs())
+        responses = json.loads(raw_response)
+        if not isinstance(responses, list):
+            # Rejected as a whole, eg. because batches aren't supported, or the provider is throttling requests.
+            return responses
+        return {'jsonrpc': '2.0', 'id': None, 'result': responses}
+
+    middlewares = tuple(w3.middleware_onion) + tuple(provider.middlewares)
+    response = combine_middlewares(middlewares, w3, send_batch)(BATCH_ENDPOINT, batch)
+    if 'error' in response or not isinstance(response.get('result'), list):
+        raise ValueError(response.get('error', response))
+
+    responses = {response.get('id'): response for response in response['result']}
+    try:
+        return [responses[request['id']] for request in batch]
+    except KeyError as e:
+        raise ValueError(f"No response to request {e} of a batch of {len(batch)}")
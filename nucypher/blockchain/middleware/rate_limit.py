@@ -0,0 +1,219 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import contextmanager
+from threading import Condition, Lock, local
+from typing import Callable, Iterator, Optional
+
+from twisted.python.threadable import isInIOThread
+from web3.providers import BaseProvider
+
+# Requests are served in order of priority (lowest first), then of arrival.
+HIGH_PRIORITY = 0  # eg. commitments
+NORMAL_PRIORITY = 1
+LOW_PRIORITY = 2  # eg. metrics
+
+__priority = local()
+
+
+def current_rpc_priority() -> int:
+    return getattr(__priority, 'value', NORMAL_PRIORITY)
+
+
+@contextmanager
+def rpc_priority(priority: int) -> Iterator[None]:
+    """Sets the priority of the RPC requests made by the current thread within the context."""
+    previous = current_rpc_priority()
+    __priority.value = priority
+    try:
+        yield
+    finally:
+        __priority.value = previous
+
+
+class RPCRateLimiter:
+    """
+    Token bucket shared by all the requests to an RPC provider, pacing them so that they are not rejected
+    for exceeding its rate limit.
+
+    The allowed rate is unknown (and requests are not paced) until the provider throttles a request.
+    It is then learned from the provider's hints (`allowed_rps`, `backoff_seconds`) if there are any,
+    or else halved from the observed rate, and slowly raised again while no request is throttled.
+
+    Waiting requests are served by priority (see `rpc_priority`). Requests made from the reactor thread
+    never wait, so that the reactor is never blocked: whatever their priority, they are refused
+    (see `Throttled`) instead of being sent if there is no token left for them, or if a more important
+    request is already waiting for one.
+    """
+
+    class Throttled(ConnectionError):
+        """Raised instead of sending a request from the reactor thread, which can't wait for its turn."""
+
+        def __init__(self, retry_after: float, *args, **kwargs):
+            self.retry_after = retry_after  # seconds
+            super().__init__(*args, **kwargs)
+
+    SAFETY_MARGIN = 0.9  # of the rate allowed by the provider
+    DECREASE_FACTOR = 0.5
+    INCREASE_FACTOR = 1.2
+    RECOVERY_INTERVAL = 10  # seconds without throttled requests before the rate is raised
+    OBSERVATION_WINDOW = 10  # seconds
+    MIN_RATE = 1  # requests per second
+    MAX_BACKOFF = 60  # seconds
+
+    __limiters = dict()  # By provider endpoint
+    __limiters_lock = Lock()
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.rate = None  # type: Optional[float]  # requests per second
+
+        # Stats
+        self.requests = 0
+        self.delayed_requests = 0
+        self.refused_requests = 0
+        self.throttled_requests = 0
+        self.wait_time = 0.0  # seconds
+
+        self.__clock = clock
+        self.__condition = Condition()
+        self.__tokens = 0.0
+        self.__last_refill = clock()
+        self.__last_rate_change = clock()
+        self.__paused_until = 0.0
+        self.__consecutive_throttles = 0
+        self.__recent_requests = deque()  # Times of the requests in the observation window
+        self.__queue = []  # Heap of (priority, arrival) of the waiting requests
+        self.__arrivals = itertools.count()
+
+    @classmethod
+    def for_provider(cls, provider: BaseProvider) -> 'RPCRateLimiter':
+        """Returns the rate limiter shared by all the requests to the endpoint of `provider`."""
+        key = getattr(provider, 'endpoint_uri', None) or getattr(provider, 'ipc_path', None) or provider
+        with cls.__limiters_lock:
+            try:
+                return cls.__limiters[key]
+            except KeyError:
+                limiter = cls.__limiters[key] = cls()
+                return limiter
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self.__queue)
+
+    @property
+    def paused_for(self) -> float:
+        """Seconds until the requests are resumed, after the provider throttled one of them (0 if not paused)."""
+        with self.__condition:
+            return max(0.0, self.__paused_until - self.__clock())
+
+    def __refill(self, now: float) -> None:
+        if self.rate is not None:
+            capacity = max(1.0, self.rate)  # One second worth of requests
+            self.__tokens = min(capacity, self.__tokens + (now - self.__last_refill) * self.rate)
+        self.__last_refill = now
+
+    def __delay(self, now: float) -> float:
+        if now < self.__paused_until:
+            return self.__paused_until - now
+        self.__refill(now)
+        if self.rate is None or self.__tokens >= 1:
+            return 0
+        return (1 - self.__tokens) / self.rate
+
+    def __take_token(self, now: float) -> None:
+        self.__refill(now)
+        if self.rate is not None:
+            self.__tokens -= 1
+        self.__recent_requests.append(now)
+        while self.__recent_requests[0] < now - self.OBSERVATION_WINDOW:
+            self.__recent_requests.popleft()
+
+    def acquire(self, priority: Optional[int] = None) -> float:
+        """Waits for the turn of a request, returning the time waited (in seconds)."""
+        if priority is None:
+            priority = current_rpc_priority()
+        start = self.__clock()
+        with self.__condition:
+            self.requests += 1
+            if isInIOThread():
+                delay = self.__delay(start)
+                if start < self.__paused_until:
+                    self.refused_requests += 1
+                    raise self.Throttled(delay, f"RPC requests are paused for {delay:.1f} seconds")
+                if delay > 0:
+                    self.refused_requests += 1
+                    raise self.Throttled(delay, f"No RPC request can be sent for {delay:.1f} seconds")
+                if self.__queue and self.__queue[0][0] < priority:
+                    self.refused_requests += 1
+                    raise self.Throttled(1 / self.rate, "A more important RPC request is waiting for its turn")
+                self.__take_token(start)
+                return 0
+
+            ticket = (priority, next(self.__arrivals))
+            heapq.heappush(self.__queue, ticket)
+            try:
+                while True:
+                    now = self.__clock()
+                    delay = self.__delay(now) if self.__queue[0] == ticket else None
+                    if delay == 0:
+                        break
+                    self.__condition.wait(timeout=delay)  # Until it's our turn, or until the next token
+            finally:
+                self.__queue.remove(ticket)
+                heapq.heapify(self.__queue)
+
+            self.__take_token(now)
+            self.__condition.notify_all()  # The next in line may go as well
+            waited = now - start
+            if waited > 0:
+                self.delayed_requests += 1
+                self.wait_time += waited
+        return waited
+
+    def throttled(self, allowed_rps: Optional[float] = None, backoff_seconds: Optional[float] = None) -> None:
+        """Lowers the rate after a request was throttled by the provider, and pauses all the requests for a while."""
+        with self.__condition:
+            now = self.__clock()
+            self.throttled_requests += 1
+            self.__consecutive_throttles += 1
+            if allowed_rps:
+                rate = allowed_rps * self.SAFETY_MARGIN
+            else:
+                observed_rate = len(self.__recent_requests) / self.OBSERVATION_WINDOW
+                rate = (self.rate or observed_rate) * self.DECREASE_FACTOR
+            self.rate = max(self.MIN_RATE, rate)
+            self.__tokens = min(self.__tokens, 0)
+            self.__last_rate_change = now
+
+            if backoff_seconds is None:
+                backoff_seconds = 2 ** self.__consecutive_throttles  # Exponential back-off
+            self.__paused_until = max(self.__paused_until, now + min(backoff_seconds, self.MAX_BACKOFF))
+            self.__condition.notify_all()
+
+    def succeeded(self) -> None:
+        """Slowly raises the rate again while no request is throttled."""
+        with self.__condition:
+            now = self.__clock()
+            self.__consecutive_throttles = 0
+            if self.rate is not None and now - self.__last_rate_change >= self.RECOVERY_INTERVAL:
+                self.rate *= self.INCREASE_FACTOR
+                self.__last_rate_change = now
+                self.__condition.notify_all()
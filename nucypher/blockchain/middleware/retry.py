@@ -15,29 +15,37 @@
  along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-import time
-from typing import Callable, Any, Union
+from typing import Callable, Any, Dict, Optional, Union
 
 from requests import HTTPError
+from twisted.python.threadable import isInIOThread
 from web3 import Web3
 from web3.types import RPCEndpoint, RPCResponse
 
+from nucypher.blockchain.middleware.rate_limit import RPCRateLimiter
 from nucypher.utilities.logging import Logger
 
 
 class RetryRequestMiddleware:
     """
     Automatically retries rpc requests whenever a 429 status code is returned.
+
+    Requests are paced by the `RPCRateLimiter` shared by all the requests to the same provider,
+    which learns the allowed rate from throttled requests, and makes retries back off
+    (unless `exponential_backoff` is disabled).
+    Throttled requests made from the reactor thread are not retried, so as not to block it.
     """
     def __init__(self,
                  make_request: Callable[[RPCEndpoint, Any], RPCResponse],
                  w3: Web3,
                  retries: int = 3,
-                 exponential_backoff: bool = True):
+                 exponential_backoff: bool = True,
+                 rate_limiter: Optional[RPCRateLimiter] = None):
         self.w3 = w3
         self.make_request = make_request
         self.retries = retries
         self.exponential_backoff = exponential_backoff
+        self.rate_limiter = rate_limiter or RPCRateLimiter.for_provider(w3.provider)
         self.logger = Logger(self.__class__.__name__)
 
     def is_request_result_retry(self, result: Union[RPCResponse, Exception]) -> bool:
@@ -59,10 +67,18 @@ class RetryRequestMiddleware:
         # not retry result
         return False
 
+    def throttling_hints(self, result: Union[RPCResponse, Exception]) -> Dict[str, float]:
+        """
+        Returns the hints of the provider about its rate limit found in a retry result,
+        as keyword arguments of `RPCRateLimiter.throttled`. Override for provider-specific hints.
+        """
+        return dict()
+
     def __call__(self, method, params):
         result = None
         num_iterations = 1 + self.retries  # initial call and subsequent retries
         for i in range(num_iterations):
+            self.rate_limiter.acquire()
             try:
                 response = self.make_request(method, params)
             except Exception as e:  # type: ignore
@@ -72,19 +88,27 @@ class RetryRequestMiddleware:
 
             # completed request
             if not self.is_request_result_retry(result):
+                self.rate_limiter.succeeded()
                 if i > 0:
                     # not initial call and retry was actually performed
                     self.logger.debug(f'Retried rpc request completed after {i} retries')
                 break
 
+            # slow down subsequent calls, and back off before the next one (if backing off at all)
+            hints = self.throttling_hints(result)
+            if not self.exponential_backoff:
+                hints['backoff_seconds'] = 0
+            self.rate_limiter.throttled(**hints)
+
             # max retries with no completion
             if i == self.retries:
                 self.logger.warn(f'RPC request retried {self.retries} times but was not completed')
                 break
 
-            # backoff before next call
-            if self.exponential_backoff:
-                time.sleep(2 ** (i + 1))  # exponential back-off - 2^(retry number)
+            # don't block the reactor while backing off
+            if self.exponential_backoff and isInIOThread():
+                self.logger.debug('RPC request throttled in the reactor thread; not retrying')
+                break
 
         if isinstance(result, Exception):
             raise result
@@ -164,10 +188,21 @@ class InfuraRetryRequestMiddleware(RetryRequestMiddleware):
                 error = result['error']
                 if not isinstance(error, str):
                     # RPCError TypeDict
-                    # TODO should we utilize infura's backoff_seconds value in response?
                     return error.get('code') == -32005 and 'rate exceeded' in error.get('message')
         # else
         #     exceptions already checked by superclass - no need to check here
 
         # not a retry result
         return False
+
+    def throttling_hints(self, result: Union[RPCResponse, Exception]) -> Dict[str, float]:
+        """
+        Infura tells the allowed rate, and how long to back off for, in the data of the error (see above).
+        """
+        hints = dict()
+        if not isinstance(result, Exception) and isinstance(result.get('error'), dict):
+            data = result['error'].get('data') or dict()
+            for hint in ('allowed_rps', 'backoff_seconds'):
+                if data.get(hint) is not None:
+                    hints[hint] = float(data[hint])
+        return hints
@@ -312,9 +312,13 @@ class WebController(CharacterControlServer):
                            self.emitter.MethodNotFound)
 
         try:
-            request_body = control_request.data or dict()
-            if request_body:
-                request_body = json.loads(request_body)
+            if control_request.mimetype == 'text/plain':
+                # Plain text goes to the specifications that take it as their `text` (eg. newline-delimited messages)
+                request_body = {'text': control_request.get_data(as_text=True)}
+            else:
+                request_body = control_request.data or dict()
+                if request_body:
+                    request_body = json.loads(request_body)
             request_body.update(kwargs)
 
             if method_name not in self._get_interfaces():
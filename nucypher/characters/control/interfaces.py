@@ -17,7 +17,8 @@
 
 import functools
 import maya
-from typing import Union
+import time
+from typing import List, Union
 from umbral.keys import UmbralPublicKey
 
 from nucypher.characters.control.specifications import alice, bob, enrico
@@ -251,3 +252,17 @@ class EnricoInterface(CharacterPublicInterface):
         message_kit, signature = self.character.encrypt_message(plaintext=plaintext)
         response_data = {'message_kit': message_kit, 'signature': signature}
         return response_data
+
+    @attach_schema(enrico.EncryptMessages)
+    def encrypt_messages(self, plaintexts: List[bytes]):
+        """
+        Character control endpoint for encrypting many messages for a policy at once, and
+        receiving the messagekits (and signatures), in the same order, to give to Bob.
+        """
+        start = time.perf_counter()
+        results = self.character.encrypt_messages(plaintexts=plaintexts)
+        elapsed = time.perf_counter() - start
+        response_data = {'message_kits': [message_kit for message_kit, _signature in results],
+                         'signatures': [signature for _message_kit, signature in results],
+                         'records_per_second': len(results) / elapsed if elapsed else None}
+        return response_data
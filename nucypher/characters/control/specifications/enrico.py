@@ -65,3 +65,62 @@ class EncryptMessage(BaseSchema):
     # output
     message_kit = fields.UmbralMessageKit(dump_only=True)
     signature = fields.UmbralSignature(dump_only=True)
+
+
+class EncryptMessages(BaseSchema):
+
+    # input
+    messages = fields.List(
+        fields.Cleartext(),
+        load_only=True,
+        allow_none=True,
+        click=click.option('--message', 'messages', multiple=True, help="A unicode message to encrypt for a policy")
+    )
+
+    file = fields.FileField(
+        load_only=True,
+        allow_none=True,
+        click=click.option('--file', help="Filepath to a plaintext file to encrypt, one message per line",
+                           type=EXISTING_READABLE_FILE)
+    )
+
+    # newline-delimited messages, as sent in a text/plain request body
+    text = fields.String(
+        load_only=True,
+        allow_none=True
+    )
+
+    policy_encrypting_key = fields.Key(
+        required=False,
+        load_only=True,
+        click=options.option_policy_encrypting_key()
+    )
+
+    @post_load()
+    def format_method_arguments(self, data, **kwargs):
+        """
+        input can be through either the file input, with one message per line, a list of
+        raw messages, or newline-delimited text; we output them as the "plaintexts" arg
+        to enrico.encrypt_messages
+        """
+
+        if sum(1 for source in ('messages', 'file', 'text') if data.get(source)) > 1:
+            raise exceptions.InvalidArgumentCombo("choose only one of messages, a filepath or text.")
+
+        if data.get('text'):
+            # Each line is taken like one of the messages
+            messages = [fields.Cleartext().deserialize(line) for line in data['text'].splitlines()]
+            plaintexts = [bytes(message, encoding='utf-8') for message in messages]
+        elif data.get('messages'):
+            plaintexts = [bytes(message, encoding='utf-8') for message in data['messages']]
+        elif data.get('file'):
+            plaintexts = data['file'].splitlines()
+        else:
+            raise exceptions.InvalidInputData("either messages, a filepath or text is required.")
+
+        return {"plaintexts": plaintexts}
+
+    # output
+    message_kits = fields.List(fields.UmbralMessageKit(), dump_only=True)
+    signatures = fields.List(fields.UmbralSignature(), dump_only=True)
+    records_per_second = fields.Float(dump_only=True)
@@ -35,6 +35,10 @@ class Integer(BaseField, fields.Integer):
     click_type = click.INT
 
 
+class Float(BaseField, fields.Float):
+    click_type = click.FLOAT
+
+
 class PositiveInteger(Integer):
 
     def _validate(self, value):
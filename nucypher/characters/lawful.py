@@ -18,9 +18,12 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 import json
 from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 import contextlib
 import maya
+import multiprocessing
+import os
 import random
 import time
 from base64 import b64decode, b64encode
@@ -51,14 +54,18 @@ from functools import partial
 from json.decoder import JSONDecodeError
 from queue import Queue
 from random import shuffle
+from threading import Event, Lock
 from twisted.internet import reactor, stdio, threads
 from twisted.internet.defer import Deferred
 from twisted.internet.task import LoopingCall
 from twisted.logger import Logger
-from typing import Dict, Iterable, List, NamedTuple, Tuple, Union, Optional, Sequence, Set, Any
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union, Optional, Sequence, Set, Any
 from umbral import pre
+from umbral.cfrags import CapsuleFrag
+from umbral.config import default_params
 from umbral.keys import UmbralPublicKey
 from umbral.kfrags import KFrag
+from umbral.pre import Capsule
 from umbral.signing import Signature
 
 import nucypher
@@ -76,9 +83,9 @@ from nucypher.characters.control.controllers import WebController
 from nucypher.characters.control.emitters import StdoutEmitter
 from nucypher.characters.control.interfaces import AliceInterface, BobInterface, EnricoInterface
 from nucypher.cli.processes import UrsulaCommandProtocol
-from nucypher.config.constants import END_OF_POLICIES_PROBATIONARY_PERIOD
+from nucypher.config.constants import AUTO_REENCRYPTION_WORKERS, END_OF_POLICIES_PROBATIONARY_PERIOD
 from nucypher.config.storages import ForgetfulNodeStorage, NodeStorage
-from nucypher.crypto.api import encrypt_and_sign, keccak_digest
+from nucypher.crypto.api import encrypt_and_sign, encrypt_signed_serialized, keccak_digest, reencrypt_serialized
 from nucypher.crypto.constants import HRAC_LENGTH, PUBLIC_KEY_LENGTH
 from nucypher.crypto.keypairs import HostingKeypair
 from nucypher.crypto.kits import UmbralMessageKit
@@ -90,6 +97,20 @@ from nucypher.crypto.powers import (
     TransactingPower
 )
 from nucypher.crypto.signing import InvalidSignature
+from nucypher.crypto.streaming import (
+    DEFAULT_CHUNK_SIZE,
+    MAX_HEADER_RECORD_LENGTH,
+    StreamDecryptionError,
+    StreamHeader,
+    decrypt_chunks,
+    encrypt_chunks,
+    max_chunk_record_length,
+    read_file_chunks,
+    read_file_records,
+    rechunk,
+    records,
+    split_records
+)
 from nucypher.datastore.datastore import DatastoreTransactionError, RecordNotFound
 from nucypher.datastore.queries import find_expired_policies, find_expired_treasure_maps
 from nucypher.network.exceptions import NodeSeemsToBeDown
@@ -98,6 +119,7 @@ from nucypher.network.nodes import NodeSprout, TEACHER_NODES, Teacher
 from nucypher.network.protocols import InterfaceInfo, parse_node_uri
 from nucypher.network.server import ProxyRESTServer, TLSHostingPower, make_rest_app
 from nucypher.network.trackers import AvailabilityTracker
+from nucypher.utilities.concurrency import AllAtOnceFactory, WorkerPool
 from nucypher.utilities.logging import Logger
 from nucypher.utilities.networking import validate_worker_ip
 
@@ -493,6 +515,12 @@ class Bob(Character):
 
     _default_crypto_powerups = [SigningPower, DecryptingPower]
 
+    _retrieval_timeout = 20  # seconds
+
+    MAX_TREASURE_MAP_LOOKUP_THREADS = 20  # nodes asked for a treasure map in parallel
+    TREASURE_MAP_RETRY_INTERVAL = 0.5  # seconds between asking the same nodes for a treasure map again
+    MAX_REENCRYPTION_REQUEST_THREADS = 20  # WorkOrders sent to Ursulas in parallel
+
     class IncorrectCFragsReceived(Exception):
         """
         Raised when Bob detects incorrect CFrags returned by some Ursulas
@@ -643,45 +671,81 @@ class Bob(Character):
 
     def get_treasure_map_from_known_ursulas(self, network_middleware, map_identifier, timeout=3):
         """
-        Iterate through the nodes we know, asking for the TreasureMap.
-        Return the first one who has it.
+        Ask the nodes we know that may have the TreasureMap for it, all at once.
+        Return the first valid one, or give up once `timeout` seconds have passed.
+        Until then, nodes that didn't have it are asked again, since the map may still be on its way to them.
         """
         if self.federated_only:
             from nucypher.policy.collections import TreasureMap as _MapClass
         else:
             from nucypher.policy.collections import SignedTreasureMap as _MapClass
 
-        start = maya.now()
+        start = time.monotonic()
+        deadline = start + timeout
 
         # Spend no more than half the timeout finding the nodes.  8 nodes is arbitrary.  Come at me.
         self.block_until_number_of_known_nodes_is(8, timeout=timeout/2, learn_on_this_thread=True)
-        while True:
-            nodes_with_map = self.matching_nodes_among(self.known_nodes)
-            random.shuffle(nodes_with_map)
 
-            for node in nodes_with_map:
-                try:
-                    response = network_middleware.get_treasure_map_from_node(node, map_identifier)
-                except (*NodeSeemsToBeDown, self.NotEnoughNodes):
-                    continue
-                except network_middleware.NotFound:
-                    self.log.info(f"Node {node} claimed not to have TreasureMap {map_identifier}")
-                    continue
+        def worker(checksum_address):
+            node = nodes_to_ask[checksum_address]
+            response = network_middleware.get_treasure_map_from_node(node, map_identifier)
+            if response.status_code != 200 or not response.content:
+                raise network_middleware.UnexpectedResponse(f"Got {response.status_code} from {node}",
+                                                            status=response.status_code)
+            return _MapClass.from_bytes(response.content)  # Raises if Alice's signature doesn't check out.
 
-                if response.status_code == 200 and response.content:
-                    try:
-                        treasure_map = _MapClass.from_bytes(response.content)
-                        return treasure_map
-                    except InvalidSignature:
-                        # TODO: What if a node gives a bunk TreasureMap?  NRN
-                        raise
-                else:
-                    continue  # TODO: Actually, handle error case here.  NRN
-            else:
+        asked = set()
+
+        def candidate_nodes():
+            return {node.checksum_address: node for node in self.matching_nodes_among(self.known_nodes)}
+
+        while True:
+            nodes_to_ask = {address: node for address, node in candidate_nodes().items() if address not in asked}
+            if not nodes_to_ask:
+                # We may learn about more of them...
                 self.learn_from_teacher_node()
+                nodes_to_ask = {address: node for address, node in candidate_nodes().items() if address not in asked}
+            if not nodes_to_ask:
+                # ...otherwise, we've asked everyone that could have it so far: ask them all again in a while.
+                time.sleep(max(0, min(self.TREASURE_MAP_RETRY_INTERVAL, deadline - time.monotonic())))
+                nodes_to_ask = candidate_nodes()
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0:
+                raise _MapClass.NowhereToBeFound(f"Asked {len(asked)} nodes for {timeout}s, "
+                                                 f"but none had map {map_identifier}")
+            if not nodes_to_ask:
+                continue
 
-            if (start - maya.now()).seconds > timeout:
-                raise _MapClass.NowhereToBeFound(f"Asked {len(self.known_nodes)} nodes, but none had map {map_identifier} ")
+            addresses_to_ask = list(nodes_to_ask)
+            random.shuffle(addresses_to_ask)
+            asked.update(addresses_to_ask)
+            worker_pool = WorkerPool(worker=worker,
+                                     value_factory=AllAtOnceFactory(addresses_to_ask),
+                                     target_successes=1,
+                                     timeout=remaining_time,
+                                     threadpool_size=min(len(nodes_to_ask), self.MAX_TREASURE_MAP_LOOKUP_THREADS))
+            worker_pool.start()
+            try:
+                successes = worker_pool.block_until_target_successes()
+            except (WorkerPool.OutOfValues, WorkerPool.TimedOut):
+                successes = {}
+            finally:
+                # The other nodes are of no use anymore.
+                worker_pool.cancel()
+
+            for checksum_address, (exc_type, exc_value, _traceback) in worker_pool.get_failures().items():
+                if issubclass(exc_type, network_middleware.NotFound):
+                    self.log.info(f"Node {checksum_address} claimed not to have TreasureMap {map_identifier}")
+                elif issubclass(exc_type, InvalidSignature):
+                    self.log.warn(f"Node {checksum_address} sent an invalid TreasureMap {map_identifier}")
+                else:
+                    self.log.debug(f"Couldn't get TreasureMap {map_identifier} from {checksum_address}: {exc_value}")
+
+            if successes:
+                checksum_address, treasure_map = successes.popitem()
+                self.log.info(f"Got TreasureMap {map_identifier} from {checksum_address} "
+                              f"in {time.monotonic() - start:.3f}s, asking {len(asked)} nodes")
+                return treasure_map
 
     def work_orders_for_capsules(self,
                                  *capsules,
@@ -788,38 +852,77 @@ class Bob(Character):
 
         # We don't have enough CFrags yet.  Let's get another one from a WorkOrder.
         try:
-            cfrags_and_signatures = self.network_middleware.reencrypt(work_order)
+            cfrags_and_signatures = self._request_reencryption(work_order)
+        except (NodeSeemsToBeDown, self.network_middleware.NotFound):
+            return False, []  # TODO: return a grievance?
+
+        return self._complete_work_order(work_order, cfrags_and_signatures, retain_cfrags=retain_cfrags)
+
+    def _request_reencryption(self, work_order: 'WorkOrder') -> List[Tuple['CapsuleFrag', Signature]]:
+        """
+        Sends `work_order` to its Ursula, and returns her cfrags and signatures, still unchecked.
+        Raises (after logging it) `NodeSeemsToBeDown` if she can't be reached,
+        or `NotFound` if she doesn't have the KFrag.
+        """
+        try:
+            return self.network_middleware.reencrypt(work_order)
         except NodeSeemsToBeDown as e:
             # TODO: What to do here?  Ursula isn't supposed to be down.  NRN
             self.log.info(f"Ursula ({work_order.ursula}) seems to be down while trying to complete WorkOrder: {work_order}")
-            return False, [] # TODO: return a grievance?
+            raise
         except self.network_middleware.NotFound:
             # This Ursula claims not to have a matching KFrag.  Maybe this has been revoked?
             # TODO: What's the thing to do here?  Do we want to track these Ursulas in some way in case they're lying?  567
             self.log.warn(f"Ursula ({work_order.ursula}) claims not to have the KFrag to complete WorkOrder: {work_order}.  Has accessed been revoked?")
-            return False, [] # TODO: return a grievance?
+            raise
         except self.network_middleware.UnexpectedResponse:
             raise # TODO: Handle this
 
-        cfrags = work_order.complete(cfrags_and_signatures)
-
-        # TODO: hopefully GIL will allow this to execute concurrently...
-        # or we'll have to modify tests that rely on it
+    def _complete_work_order(self,
+                             work_order: 'WorkOrder',
+                             cfrags_and_signatures: List[Tuple['CapsuleFrag', Signature]],
+                             retain_cfrags: bool = False
+                             ) -> Tuple[bool, Union[List['IndisputableEvidence'], List['CapsuleFrag']]]:
+        incorrect_capsules = self._verify_work_order_results(work_order, cfrags_and_signatures)
+        return self._record_work_order_results(work_order,
+                                               cfrags_and_signatures,
+                                               incorrect_capsules=incorrect_capsules,
+                                               retain_cfrags=retain_cfrags)
+
+    @staticmethod
+    def _verify_work_order_results(work_order: 'WorkOrder',
+                                   cfrags_and_signatures: List[Tuple['CapsuleFrag', Signature]]
+                                   ) -> List['Capsule']:
+        """
+        Checks the cfrags returned for `work_order` - the costly part of completing it - without completing it.
+        Raises `InvalidSignature` if Ursula didn't sign them, and returns the Capsules whose cfrag is incorrect.
+        """
+        work_order.verify_work_results(cfrags_and_signatures)
+        return [capsule for capsule, (cfrag, _signature) in zip(work_order.tasks, cfrags_and_signatures)
+                if not cfrag.verify_correctness(capsule)]
+
+    def _record_work_order_results(self,
+                                   work_order: 'WorkOrder',
+                                   cfrags_and_signatures: List[Tuple['CapsuleFrag', Signature]],
+                                   incorrect_capsules: List['Capsule'],
+                                   retain_cfrags: bool = False
+                                   ) -> Tuple[bool, Union[List['IndisputableEvidence'], List['CapsuleFrag']]]:
+        """Completes `work_order` with results already checked by `_verify_work_order_results`."""
+        work_order.attach_work_results(cfrags_and_signatures)
         self._completed_work_orders.save_work_order(work_order, as_replete=retain_cfrags)
 
         the_airing_of_grievances = []
-        for capsule, pre_task in work_order.tasks.items():
-            if not pre_task.cfrag.verify_correctness(capsule):
-                # TODO: WARNING - This block is untested.
-                from nucypher.policy.collections import IndisputableEvidence
-                evidence = IndisputableEvidence(task=pre_task, work_order=work_order)
-                # I got a lot of problems with you people ...
-                the_airing_of_grievances.append(evidence)
+        for capsule in incorrect_capsules:
+            # TODO: WARNING - This block is untested.
+            from nucypher.policy.collections import IndisputableEvidence
+            evidence = IndisputableEvidence(task=work_order.tasks[capsule], work_order=work_order)
+            # I got a lot of problems with you people ...
+            the_airing_of_grievances.append(evidence)
 
         if the_airing_of_grievances:
             return False, the_airing_of_grievances
         else:
-            return True, cfrags
+            return True, [cfrag for cfrag, _signature in cfrags_and_signatures]
 
     def retrieve(self,
 
@@ -923,6 +1026,11 @@ class Bob(Character):
             remaining_work_orders, capsules_to_activate = self._filter_work_orders_and_capsules(
                 new_work_orders, capsules_to_activate, m)
 
+            # Every Ursula in the map may have already been asked (eg. by a previous retrieval), and still not enough.
+            if capsules_to_activate and not remaining_work_orders:
+                raise Ursula.NotEnoughUrsulas(
+                    "Unable to reach m Ursulas.  See the logs for which Ursulas are down or noncompliant.")
+
             # If all the capsules are now activated, we can stop here.
             if capsules_to_activate and remaining_work_orders:
 
@@ -930,22 +1038,83 @@ class Bob(Character):
                 if not self.done_seeding:
                     self.learn_from_teacher_node()
 
-                for work_order in remaining_work_orders:
-                    success, result = self._reencrypt(work_order, retain_cfrags)
-
+                # WorkOrders aren't hashable, so the pool works with the addresses of their Ursulas.
+                work_orders_by_ursula = {work_order.ursula.checksum_address: work_order
+                                         for work_order in remaining_work_orders}
+
+                # Once this retrieval moves on, the WorkOrders still in flight must leave no trace:
+                # their results are dropped instead of completing the WorkOrders.
+                completion_lock = Lock()
+                retrieval_over = Event()
+
+                def worker(ursula_address):
+                    work_order = work_orders_by_ursula[ursula_address]
+                    cfrags_and_signatures = self._request_reencryption(work_order)
+                    # The cfrags are checked concurrently; the lock is only held to complete the WorkOrder.
+                    incorrect_capsules = self._verify_work_order_results(work_order, cfrags_and_signatures)
+                    with completion_lock:
+                        if retrieval_over.is_set():
+                            return None
+                        success, result = self._record_work_order_results(work_order,
+                                                                          cfrags_and_signatures,
+                                                                          incorrect_capsules=incorrect_capsules,
+                                                                          retain_cfrags=retain_cfrags)
                     if not success:
-                        the_airing_of_grievances.extend(result)
-                        continue
-
-                    for capsule, pre_task in work_order.tasks.items():
-                        capsule.attach_cfrag(pre_task.cfrag) # already verified, will not fail
-                        if len(capsule) >= m:
-                            capsules_to_activate.discard(capsule)
+                        raise self.IncorrectCFragsReceived(result)
+                    return result
+
+                # Usually every WorkOrder covers every Capsule, so we're done after the neediest one gets m cfrags.
+                target_successes = m - min(len(capsule) for capsule in capsules_to_activate)
+                worker_pool = WorkerPool(worker=worker,
+                                         value_factory=AllAtOnceFactory(list(work_orders_by_ursula)),
+                                         target_successes=target_successes,
+                                         timeout=self._retrieval_timeout,
+                                         threadpool_size=min(len(remaining_work_orders),
+                                                             self.MAX_REENCRYPTION_REQUEST_THREADS))
+                worker_pool.start()
+
+                activated_ursulas = set()
+
+                def activate_capsules():
+                    for ursula_address in worker_pool.get_successes():
+                        if ursula_address in activated_ursulas:
+                            continue
+                        activated_ursulas.add(ursula_address)
+                        for capsule, pre_task in work_orders_by_ursula[ursula_address].tasks.items():
+                            if capsule in capsules_to_activate:
+                                capsule.attach_cfrag(pre_task.cfrag)  # already verified, will not fail
+                                if len(capsule) >= m:
+                                    capsules_to_activate.discard(capsule)
 
-                    # If all the capsules are now activated, we can stop here.
-                    if not capsules_to_activate:
-                        break
-                else:
+                try:
+                    timed_out = False
+                    try:
+                        worker_pool.block_until_target_successes()
+                    except WorkerPool.TimedOut:
+                        timed_out = True
+                    except WorkerPool.OutOfValues:
+                        # We'll find out below whether what we got is enough.
+                        pass
+                    activate_capsules()
+
+                    if capsules_to_activate and not timed_out:
+                        # Some WorkOrders didn't cover all the Capsules; wait for the rest of them.
+                        worker_pool.join()
+                        activate_capsules()
+                finally:
+                    # Whatever is still in flight won't be needed.
+                    with completion_lock:
+                        retrieval_over.set()
+                    worker_pool.cancel()
+
+                for ursula_address, (exc_type, exc_value, _traceback) in worker_pool.get_failures().items():
+                    if exc_type is self.IncorrectCFragsReceived:
+                        the_airing_of_grievances.extend(exc_value.evidence)
+                    elif not issubclass(exc_type, (NodeSeemsToBeDown, self.network_middleware.NotFound)):
+                        # (Unreachable Ursulas and missing KFrags have been logged already.)
+                        self.log.warn(f"Failed to complete WorkOrder {work_orders_by_ursula[ursula_address]}: {exc_value!r}")
+
+                if capsules_to_activate:
                     raise Ursula.NotEnoughUrsulas(
                         "Unable to reach m Ursulas.  See the logs for which Ursulas are down or noncompliant.")
 
@@ -968,6 +1137,46 @@ class Bob(Character):
 
         return cleartexts
 
+    def retrieve_stream(self, stream: Iterable[bytes], **retrieve_kwargs) -> Iterator[bytes]:
+        """
+        Decrypts a stream encrypted by `Enrico.encrypt_stream`, given as pieces of any size.
+        The header of the stream is retrieved like any other message (see `retrieve` for the
+        keyword arguments), and then the plaintext is yielded chunk by chunk.
+
+        Raises `StreamDecryptionError` if a chunk has been tampered with or the stream was truncated;
+        note that the chunks before it have been yielded by then.
+        """
+        yield from self._decrypt_stream(lambda max_record_length: split_records(stream, max_record_length),
+                                        **retrieve_kwargs)
+
+    def retrieve_file(self, ciphertext_filepath: str, plaintext_filepath: str, **retrieve_kwargs) -> None:
+        """
+        Like `retrieve_stream`, from and to files.
+        """
+        with open(ciphertext_filepath, 'rb') as ciphertext_file, open(plaintext_filepath, 'wb') as plaintext_file:
+            split = lambda max_record_length: read_file_records(ciphertext_file, max_record_length)
+            for chunk in self._decrypt_stream(split, **retrieve_kwargs):
+                plaintext_file.write(chunk)
+
+    def _decrypt_stream(self,
+                        split: Callable[[Callable[[int], int]], Iterator[bytes]],
+                        **retrieve_kwargs
+                        ) -> Iterator[bytes]:
+        header = None
+
+        def max_record_length(index: int) -> int:
+            # Records are only split as they are consumed, so the header is known by the time a chunk is read.
+            return MAX_HEADER_RECORD_LENGTH if index == 0 else max_chunk_record_length(header)
+
+        stream_records = split(max_record_length)
+        try:
+            header_message_kit = UmbralMessageKit.from_bytes(next(stream_records))
+        except StopIteration:
+            raise StreamDecryptionError("The stream is empty.")
+        header_bytes, = self.retrieve(header_message_kit, **retrieve_kwargs)
+        header = StreamHeader.from_bytes(header_bytes)
+        yield from decrypt_chunks(header, stream_records)
+
     def matching_nodes_among(self,
                              nodes: FleetSensor,
                              no_less_than=7):  # Somewhat arbitrary floor here.
@@ -1084,6 +1293,7 @@ class Ursula(Teacher, Character, Worker):
                  interface_signature=None,
                  timestamp=None,
                  availability_check: bool = False,  # TODO: Remove from init
+                 reencryption_workers: Union[int, str] = 0,
 
                  # Blockchain
                  checksum_address: ChecksumAddress = None,
@@ -1101,6 +1311,9 @@ class Ursula(Teacher, Character, Worker):
                  **character_kwargs
                  ) -> None:
 
+        # Serialized metadata, and what it was computed from (see __bytes__)
+        self.__metadata_cache = (None, None)
+
         Character.__init__(self,
                            is_me=is_me,
                            checksum_address=checksum_address,
@@ -1127,6 +1340,13 @@ class Ursula(Teacher, Character, Worker):
             self.__pruning_task: Union[Deferred, None] = None
             self._datastore_pruning_task = LoopingCall(f=self.__prune_datastore)
 
+            # Re-Encryption (in the calling thread, unless the operator opts in to a process pool, created on demand)
+            if reencryption_workers == AUTO_REENCRYPTION_WORKERS:
+                reencryption_workers = os.cpu_count() or 1
+            self.reencryption_workers = reencryption_workers
+            self.__reencryption_executor: Optional[ProcessPoolExecutor] = None
+            self.__reencryption_executor_lock = Lock()
+
             # Decentralized Worker
             if not federated_only:
 
@@ -1273,7 +1493,8 @@ class Ursula(Teacher, Character, Worker):
             prometheus_config: 'PrometheusMetricsConfig' = None,
             preflight: bool = True,
             block_until_ready: bool = True,
-            eager: bool = False
+            eager: bool = False,
+            cache_contract_calls: bool = False
             ) -> None:
 
         """Schedule and start select ursula services, then optionally start the reactor."""
@@ -1282,6 +1503,9 @@ class Ursula(Teacher, Character, Worker):
         if not self.federated_only:
             if not BlockchainInterfaceFactory.is_interface_initialized(provider_uri=self.provider_uri):
                 BlockchainInterfaceFactory.initialize_interface(provider_uri=self.provider_uri)
+            if cache_contract_calls:
+                blockchain = BlockchainInterfaceFactory.get_interface(provider_uri=self.provider_uri)
+                blockchain.enable_call_cache(get_current_period=self.staking_agent.get_current_period)
 
         if preflight:
             self.__preflight()
@@ -1371,6 +1595,9 @@ class Ursula(Teacher, Character, Worker):
                 self.work_tracker.stop()
             if self._datastore_pruning_task.running:
                 self._datastore_pruning_task.stop()
+            if self.__reencryption_executor:
+                self.__reencryption_executor.shutdown()
+                self.__reencryption_executor = None
         if halt_reactor:
             reactor.stop()
 
@@ -1407,6 +1634,22 @@ class Ursula(Teacher, Character, Worker):
         return deployer
 
     def __bytes__(self):
+        """
+        The serialized metadata of this node is computed once, and only computed again if the node
+        re-signs its interface (ie. the timestamp or the interface change), or its version, certificate or
+        identity evidence change.  The rest of the metadata doesn't change during the life of a node.
+        """
+        interface_signature = self._interface_signature  # Dates and signs the interface, if it wasn't yet.
+        cache_key = (self.TEACHER_VERSION,
+                     self._timestamp,
+                     interface_signature,
+                     *self.rest_interface,
+                     self.decentralized_identity_evidence,
+                     self.certificate)
+        # Nothing is serialized to check the key: most of the time, the very same objects are there.
+        cached_key, cached_bytes = self.__metadata_cache
+        if cached_key and all(new is cached or new == cached for new, cached in zip(cache_key, cached_key)):
+            return cached_bytes
 
         version = self.TEACHER_VERSION.to_bytes(2, "big")
         interface_info = VariableLengthBytestring(bytes(self.rest_interface))
@@ -1415,13 +1658,14 @@ class Ursula(Teacher, Character, Worker):
                                  self.canonical_public_address,
                                  bytes(VariableLengthBytestring(self.domain.encode('utf-8'))),
                                  self.timestamp_bytes(),
-                                 bytes(self._interface_signature),
+                                 bytes(interface_signature),
                                  bytes(VariableLengthBytestring(self.decentralized_identity_evidence)),  # FIXME: Fixed length doesn't work with federated
                                  bytes(self.public_keys(SigningPower)),
                                  bytes(self.public_keys(DecryptingPower)),
                                  bytes(certificate_vbytes),  # TLSHostingPower
                                  bytes(interface_info))
                                 )
+        self.__metadata_cache = (cache_key, as_bytes)
         return as_bytes
 
     #
@@ -1723,21 +1967,53 @@ class Ursula(Teacher, Character, Worker):
     # Re-Encryption
     #
 
+    @property
+    def reencryption_executor(self) -> Optional[ProcessPoolExecutor]:
+        """
+        The process pool shared by all of this node's re-encryption requests, or None if
+        this node re-encrypts in the calling thread.
+        """
+        if not self.reencryption_workers:
+            return None
+        with self.__reencryption_executor_lock:
+            if not self.__reencryption_executor:
+                # Spawned (not forked) workers, since this process is running the reactor's threads.
+                context = multiprocessing.get_context('spawn')
+                self.__reencryption_executor = ProcessPoolExecutor(max_workers=self.reencryption_workers,
+                                                                   mp_context=context)
+            return self.__reencryption_executor
+
     def _reencrypt(self, kfrag: KFrag, work_order: 'WorkOrder', alice_verifying_key: UmbralPublicKey):
 
-        # Prepare a bytestring for concatenating re-encrypted
-        # capsule data for each work order task.
-        cfrag_byte_stream = bytes()
+        # Ursula signs on top of Bob's signature of each task.
+        # Now both are committed to the same task.  See #259.
+        tasks_metadata = list()
         for capsule, task in work_order.tasks.items():
-            # Ursula signs on top of Bob's signature of each task.
-            # Now both are committed to the same task.  See #259.
             reencryption_metadata = bytes(self.stamp(bytes(task.signature)))
 
             # Ursula sets Alice's verifying key for capsule correctness verification.
             capsule.set_correctness_keys(verifying=alice_verifying_key)
+            tasks_metadata.append((capsule, reencryption_metadata))
+
+        # Then re-encrypts the fragments, spread across the re-encryption workers if there are any.
+        executor = self.reencryption_executor
+        if executor:
+            kfrag_bytes, alice_verifying_key_bytes = kfrag.to_bytes(), bytes(alice_verifying_key)
+            futures = [executor.submit(reencrypt_serialized,
+                                       kfrag_bytes,
+                                       bytes(capsule),
+                                       alice_verifying_key_bytes,
+                                       reencryption_metadata)
+                       for capsule, reencryption_metadata in tasks_metadata]
+            cfrags = [CapsuleFrag.from_bytes(future.result()) for future in futures]
+        else:
+            cfrags = [pre.reencrypt(kfrag, capsule, metadata=reencryption_metadata)  # <--- pyUmbral
+                      for capsule, reencryption_metadata in tasks_metadata]
 
-            # Then re-encrypts the fragment.
-            cfrag = pre.reencrypt(kfrag, capsule, metadata=reencryption_metadata)  # <--- pyUmbral
+        # Prepare a bytestring for concatenating re-encrypted
+        # capsule data for each work order task.
+        cfrag_byte_stream = bytes()
+        for (capsule, _metadata), cfrag in zip(tasks_metadata, cfrags):
             self.log.info(f"Re-encrypted capsule {capsule} -> made {cfrag}.")
 
             # Next, Ursula signs to commit to her results.
@@ -1833,14 +2109,23 @@ class Enrico(Character):
     _interface_class = EnricoInterface
     _default_crypto_powerups = [SigningPower]
 
+    ENCRYPTION_CHUNK_SIZE = 100  # messages per task of the encryption workers
+
     def __init__(self,
                  is_me: bool = True,
                  policy_encrypting_key: Optional[UmbralPublicKey] = None,
                  controller: bool = True,
+                 encryption_workers: int = 0,
                  *args, **kwargs):
 
         self._policy_pubkey = policy_encrypting_key
 
+        # Batches of messages are encrypted in the calling thread, unless there are encryption workers:
+        # then by a process pool, created on demand.
+        self.encryption_workers = encryption_workers
+        self.__encryption_executor: Optional[ProcessPoolExecutor] = None
+        self.__encryption_executor_lock = Lock()
+
         # Enrico never uses the blockchain (hence federated_only)
         kwargs['federated_only'] = True
         kwargs['known_node_class'] = None
@@ -1861,6 +2146,84 @@ class Enrico(Character):
         message_kit.policy_pubkey = self.policy_pubkey  # TODO: We can probably do better here.  NRN
         return message_kit, signature
 
+    @property
+    def encryption_executor(self) -> Optional[ProcessPoolExecutor]:
+        """
+        The process pool encrypting the batches of messages of this Enrico, or None if
+        they are encrypted in the calling thread.
+        """
+        if not self.encryption_workers:
+            return None
+        with self.__encryption_executor_lock:
+            if not self.__encryption_executor:
+                # Spawned (not forked) workers, since this process may be running the reactor's threads.
+                context = multiprocessing.get_context('spawn')
+                self.__encryption_executor = ProcessPoolExecutor(max_workers=self.encryption_workers,
+                                                                 mp_context=context)
+            return self.__encryption_executor
+
+    def encrypt_messages(self, plaintexts: Iterable[bytes]) -> List[Tuple[UmbralMessageKit, Signature]]:
+        """
+        Encrypts many messages at once, returning the message kits and signatures
+        in the same order as the plaintexts.
+
+        Batches of more than one chunk (see `ENCRYPTION_CHUNK_SIZE`) are spread across
+        the encryption workers, if there are any, chunk by chunk.  The messages are signed here,
+        and only encrypted by the workers, so that the signing key never leaves this process.
+        """
+        plaintexts = list(plaintexts)
+        executor = self.encryption_executor if len(plaintexts) > self.ENCRYPTION_CHUNK_SIZE else None
+        if not executor:
+            return [self.encrypt_message(plaintext) for plaintext in plaintexts]
+
+        signatures = [self.stamp(plaintext) for plaintext in plaintexts]
+        signed_plaintexts = [(bytes(signature), plaintext) for signature, plaintext in zip(signatures, plaintexts)]
+        policy_pubkey_bytes = bytes(self.policy_pubkey)
+        chunk_starts = range(0, len(plaintexts), self.ENCRYPTION_CHUNK_SIZE)
+        futures = [executor.submit(encrypt_signed_serialized,
+                                   policy_pubkey_bytes,
+                                   signed_plaintexts[start:start + self.ENCRYPTION_CHUNK_SIZE])
+                   for start in chunk_starts]
+        sender_verifying_key = self.stamp.as_umbral_pubkey()
+        results = list()
+        for future, start in zip(futures, chunk_starts):
+            for signature, (ciphertext, capsule_bytes) in zip(signatures[start:], future.result()):
+                message_kit = UmbralMessageKit(capsule=Capsule.from_bytes(capsule_bytes, params=default_params()),
+                                               sender_verifying_key=sender_verifying_key,
+                                               ciphertext=ciphertext,
+                                               signature=signature)
+                message_kit.policy_pubkey = self.policy_pubkey
+                results.append((message_kit, signature))
+        return results
+
+    def disenchant(self):
+        super().disenchant()
+        with self.__encryption_executor_lock:
+            if self.__encryption_executor:
+                self.__encryption_executor.shutdown()
+                self.__encryption_executor = None
+
+    def encrypt_stream(self, plaintext: Iterable[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Encrypts a stream of plaintext, given as pieces of any size, chunk by chunk.
+        Yields the encrypted stream, also in pieces, for Bob to decrypt with `Bob.retrieve_stream`.
+
+        The whole stream is under a single Capsule, so Bob only needs one re-encryption to decrypt it.
+        """
+        header = StreamHeader.random(chunk_size=chunk_size)
+        header_message_kit, _signature = self.encrypt_message(plaintext=bytes(header))
+        yield from records([header_message_kit.to_bytes()])
+        yield from records(encrypt_chunks(header, rechunk(plaintext, chunk_size=chunk_size)))
+
+    def encrypt_file(self, plaintext_filepath: str, ciphertext_filepath: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Like `encrypt_stream`, from and to files. The plaintext file is memory-mapped.
+        """
+        with open(plaintext_filepath, 'rb') as plaintext_file, open(ciphertext_filepath, 'wb') as ciphertext_file:
+            for piece in self.encrypt_stream(read_file_chunks(plaintext_file, chunk_size=chunk_size),
+                                             chunk_size=chunk_size):
+                ciphertext_file.write(piece)
+
     @classmethod
     def from_alice(cls, alice: Alice, label: bytes):
         """
@@ -1924,4 +2287,13 @@ class Enrico(Character):
 
             return Response(json.dumps(response_data), status=200)
 
+        @enrico_control.route('/encrypt_messages', methods=['POST'])
+        def encrypt_messages():
+            """
+            Character control endpoint for encrypting many messages at once, given either as
+            a JSON list or as newline-delimited plain text, and receiving the messagekits
+            (and signatures) in the same order.
+            """
+            return controller(method_name='encrypt_messages', control_request=request)
+
         return controller
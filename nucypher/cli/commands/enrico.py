@@ -36,13 +36,14 @@ def enrico():
 @option_policy_encrypting_key(required=True)
 @option_dry_run
 @click.option('--http-port', help="The host port to run Enrico HTTP services on", type=NETWORK_PORT)
+@click.option('--encryption-workers', help="Number of processes used to encrypt batches of messages (by default, 0 encrypts them in the request thread)", type=click.IntRange(min=0), default=0)
 @group_general_config
-def run(general_config, policy_encrypting_key, dry_run, http_port):
+def run(general_config, policy_encrypting_key, dry_run, http_port, encryption_workers):
     """Start Enrico's controller."""
 
     # Setup
     emitter = setup_emitter(general_config, policy_encrypting_key)
-    ENRICO = _create_enrico(emitter, policy_encrypting_key)
+    ENRICO = _create_enrico(emitter, policy_encrypting_key, encryption_workers=encryption_workers)
 
     # RPC
     if general_config.json_ipc:
@@ -98,8 +99,8 @@ def encrypt(general_config, policy_encrypting_key, message, file, ipfs):
     return response
 
 
-def _create_enrico(emitter, policy_encrypting_key) -> Enrico:
+def _create_enrico(emitter, policy_encrypting_key, encryption_workers: int = 0) -> Enrico:
     policy_encrypting_key = UmbralPublicKey.from_bytes(bytes.fromhex(policy_encrypting_key))
-    ENRICO = Enrico(policy_encrypting_key=policy_encrypting_key)
+    ENRICO = Enrico(policy_encrypting_key=policy_encrypting_key, encryption_workers=encryption_workers)
     ENRICO.controller.emitter = emitter
     return ENRICO
@@ -98,6 +98,15 @@ option_from_block = click.option('--from-block',
 option_to_block = click.option('--to-block',
                                help="Collect events until this block number; defaults to 'latest' block number",
                                type=click.INT)
+option_concurrency = click.option('--concurrency',
+                                  help="Number of block ranges to collect events from at the same time",
+                                  type=click.IntRange(min=1),
+                                  default=4,
+                                  show_default=True)
+option_resume = click.option('--resume',
+                             help="Resume an interrupted collection of events to a CSV file",
+                             default=False,
+                             is_flag=True)
 
 
 @click.group()
@@ -157,8 +166,11 @@ def locked_tokens(general_config, registry_options, periods):
 @option_csv
 @option_csv_file
 @option_event_filters
+@option_concurrency
+@option_resume
 # TODO: Add options for number of periods in the past (default current period), or range of blocks
-def events(general_config, registry_options, contract_name, from_block, to_block, event_name, csv, csv_file, event_filters):
+def events(general_config, registry_options, contract_name, from_block, to_block, event_name, csv, csv_file, event_filters,
+           concurrency, resume):
     """Show events associated with NuCypher contracts."""
 
     if csv or csv_file:
@@ -234,7 +246,9 @@ def events(general_config, registry_options, contract_name, from_block, to_block
                             from_block=from_block,
                             to_block=to_block,
                             argument_filters=argument_filters,
-                            csv_output_file=csv_output_file)
+                            csv_output_file=csv_output_file,
+                            concurrency=concurrency,
+                            resume=resume)
 
 
 @status.command(name='fee-range')
@@ -17,6 +17,7 @@
 
 
 import click
+from typing import Union
 
 from nucypher.blockchain.eth.signers.software import ClefSigner
 from nucypher.cli.actions.auth import get_client_password, get_nucypher_password
@@ -56,7 +57,7 @@ from nucypher.cli.options import (
     option_max_gas_price
 )
 from nucypher.cli.painting.help import paint_new_installation_help
-from nucypher.cli.types import EIP55_CHECKSUM_ADDRESS, NETWORK_PORT, WORKER_IP
+from nucypher.cli.types import EIP55_CHECKSUM_ADDRESS, NETWORK_PORT, REENCRYPTION_WORKERS, WORKER_IP
 from nucypher.cli.utils import make_cli_character, setup_emitter
 from nucypher.config.characters import UrsulaConfiguration
 from nucypher.config.constants import (
@@ -64,6 +65,7 @@ from nucypher.config.constants import (
     TEMPORARY_DOMAIN
 )
 from nucypher.config.keyring import NucypherKeyring
+from nucypher.network.nodes import Learner
 
 
 class UrsulaConfigOptions:
@@ -86,7 +88,9 @@ class UrsulaConfigOptions:
                  max_gas_price: int,  # gwei
                  signer_uri: str,
                  availability_check: bool,
-                 lonely: bool
+                 lonely: bool,
+                 reencryption_workers: Union[int, str],
+                 max_concurrent_teachers: int
                  ):
 
         if federated_only:
@@ -110,6 +114,8 @@ class UrsulaConfigOptions:
         self.max_gas_price = max_gas_price
         self.availability_check = availability_check
         self.lonely = lonely
+        self.reencryption_workers = reencryption_workers
+        self.max_concurrent_teachers = max_concurrent_teachers
 
     def create_config(self, emitter, config_file):
         if self.dev:
@@ -129,7 +135,9 @@ class UrsulaConfigOptions:
                 rest_host=self.rest_host,
                 rest_port=self.rest_port,
                 db_filepath=self.db_filepath,
-                availability_check=self.availability_check
+                availability_check=self.availability_check,
+                reencryption_workers=self.reencryption_workers,
+                max_concurrent_teachers=self.max_concurrent_teachers
             )
         else:
             if not config_file:
@@ -152,7 +160,9 @@ class UrsulaConfigOptions:
                     poa=self.poa,
                     light=self.light,
                     federated_only=self.federated_only,
-                    availability_check=self.availability_check
+                    availability_check=self.availability_check,
+                    reencryption_workers=self.reencryption_workers,
+                    max_concurrent_teachers=self.max_concurrent_teachers
                 )
             except FileNotFoundError:
                 return handle_missing_configuration_file(character_config_class=UrsulaConfiguration, config_file=config_file)
@@ -194,7 +204,9 @@ class UrsulaConfigOptions:
                                             max_gas_price=self.max_gas_price,
                                             poa=self.poa,
                                             light=self.light,
-                                            availability_check=self.availability_check)
+                                            availability_check=self.availability_check,
+                                            reencryption_workers=self.reencryption_workers,
+                                            max_concurrent_teachers=self.max_concurrent_teachers)
 
     def get_updates(self) -> dict:
         payload = dict(rest_host=self.rest_host,
@@ -210,7 +222,9 @@ class UrsulaConfigOptions:
                        max_gas_price=self.max_gas_price,
                        poa=self.poa,
                        light=self.light,
-                       availability_check=self.availability_check)
+                       availability_check=self.availability_check,
+                       reencryption_workers=self.reencryption_workers,
+                       max_concurrent_teachers=self.max_concurrent_teachers)
         # Depends on defaults being set on Configuration classes, filtrates None values
         updates = {k: v for k, v in payload.items() if v is not None}
         return updates
@@ -234,6 +248,8 @@ group_config_options = group_options(
     dev=option_dev,
     availability_check=click.option('--availability-check/--disable-availability-check', help="Enable or disable self-health checks while running", is_flag=True, default=None),
     lonely=option_lonely,
+    reencryption_workers=click.option('--reencryption-workers', help="Number of processes used for re-encryption, or 'auto' for one per CPU (by default, 0 re-encrypts in the request thread)", type=REENCRYPTION_WORKERS, default=None),
+    max_concurrent_teachers=click.option('--max-concurrent-teachers', help="Maximum number of teachers to learn from concurrently in each learning round", type=click.IntRange(min=1, max=Learner.MAX_CONCURRENT_TEACHERS), default=None),
 )
 
 
@@ -346,8 +362,9 @@ def forget(general_config, config_options, config_file):
 @click.option("--metrics-prefix", help="Create metrics params with specified prefix", default="ursula")
 @click.option("--metrics-interval", help="The frequency of metrics collection", type=click.INT, default=90)
 @click.option("--ip-checkup/--no-ip-checkup", help="Verify external IP matches configuration", default=True)
+@click.option("--cache-contract-calls", help="Reuse the results of contract calls within a block", is_flag=True, default=False)
 def run(general_config, character_options, config_file, interactive, dry_run, prometheus, metrics_port,
-        metrics_listen_address, metrics_prefix, metrics_interval, force, ip_checkup):
+        metrics_listen_address, metrics_prefix, metrics_interval, force, ip_checkup, cache_contract_calls):
     """Run an "Ursula" node."""
 
     worker_address = character_options.config_options.worker_address
@@ -384,7 +401,8 @@ def run(general_config, character_options, config_file, interactive, dry_run, pr
                    start_reactor=not dry_run,
                    interactive=interactive,
                    prometheus_config=prometheus_config,
-                   preflight=not dev_mode)
+                   preflight=not dev_mode,
+                   cache_contract_calls=cache_contract_calls)
     finally:
         if dry_run:
             URSULA.stop()
@@ -26,6 +26,7 @@ from nucypher.blockchain.economics import StandardTokenEconomics
 from nucypher.blockchain.eth.interfaces import BlockchainInterface
 from nucypher.blockchain.eth.networks import NetworksInventory
 from nucypher.blockchain.eth.token import NU
+from nucypher.config.constants import AUTO_REENCRYPTION_WORKERS
 from nucypher.utilities.networking import validate_worker_ip, InvalidWorkerIP
 
 
@@ -118,6 +119,21 @@ class NuCypherNetworkName(click.ParamType):
             return value
 
 
+class ReencryptionWorkers(click.ParamType):
+    name = 'reencryption_workers'
+
+    def convert(self, value, param, ctx):
+        if str(value).lower() == AUTO_REENCRYPTION_WORKERS:
+            return AUTO_REENCRYPTION_WORKERS
+        try:
+            workers = int(value)
+        except ValueError:
+            self.fail(f"'{value}' is neither a number of workers nor '{AUTO_REENCRYPTION_WORKERS}'.")
+        if workers < 0:
+            self.fail(f"'{value}' is not a valid number of workers.")
+        return workers
+
+
 class UmbralPublicKeyHex(click.ParamType):
     name = 'nucypher_umbral_public_key'
 
@@ -153,3 +169,4 @@ WORKER_IP = WorkerIPAddress()
 
 GAS_STRATEGY_CHOICES = click.Choice(list(BlockchainInterface.GAS_STRATEGIES.keys()))
 UMBRAL_PUBLIC_KEY_HEX = UmbralPublicKeyHex()
+REENCRYPTION_WORKERS = ReencryptionWorkers()
@@ -27,7 +27,7 @@ from constant_sorrow.constants import NO_CONTROL_PROTOCOL
 from web3.types import BlockIdentifier
 
 from nucypher.blockchain.eth.agents import EthereumContractAgent
-from nucypher.blockchain.eth.events import EventRecord
+from nucypher.blockchain.eth.events import ContractEventsThrottler
 from nucypher.blockchain.eth.interfaces import (
     BlockchainDeployerInterface,
     BlockchainInterface,
@@ -267,16 +267,21 @@ def retrieve_events(emitter: StdoutEmitter,
                     from_block: BlockIdentifier,
                     to_block: BlockIdentifier,
                     argument_filters: Dict,
-                    csv_output_file: Optional[str] = None) -> None:
+                    csv_output_file: Optional[str] = None,
+                    concurrency: int = 1,
+                    resume: bool = False) -> None:
     if csv_output_file:
-        if Path(csv_output_file).exists():
+        resuming = resume and Path(f'{csv_output_file}.checkpoint').exists()
+        if Path(csv_output_file).exists() and not resuming:
             click.confirm(CONFIRM_OVERWRITE_EVENTS_CSV_FILE.format(csv_file=csv_output_file), abort=True)
         available_events = write_events_to_csv_file(csv_file=csv_output_file,
                                                     agent=agent,
                                                     event_name=event_name,
                                                     from_block=from_block,
                                                     to_block=to_block,
-                                                    argument_filters=argument_filters)
+                                                    argument_filters=argument_filters,
+                                                    concurrency=concurrency,
+                                                    resume=resume)
         if available_events:
             emitter.echo(f"{agent.contract_name}::{event_name} events written to {csv_output_file}",
                          bold=True,
@@ -284,8 +289,13 @@ def retrieve_events(emitter: StdoutEmitter,
         else:
             emitter.echo(f'No {agent.contract_name}::{event_name} events found', color='yellow')
     else:
-        event = agent.contract.events[event_name]
         emitter.echo(f"{event_name}:", bold=True, color='yellow')
-        entries = event.getLogs(fromBlock=from_block, toBlock=to_block, argument_filters=argument_filters)
-        for event_record in entries:
-            emitter.echo(f"  - {EventRecord(event_record)}")
+        events_throttler = ContractEventsThrottler(agent=agent,
+                                                   event_name=event_name,
+                                                   from_block=from_block,
+                                                   to_block=to_block if to_block != 'latest' else None,
+                                                   adaptive=True,
+                                                   concurrency=concurrency,
+                                                   **(argument_filters or dict()))
+        for event_record in events_throttler:
+            emitter.echo(f"  - {event_record}")
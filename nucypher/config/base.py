@@ -49,6 +49,7 @@ from nucypher.config import constants
 from nucypher.config.keyring import NucypherKeyring
 from nucypher.config.storages import (
     ForgetfulNodeStorage,
+    LMDBNodeStorage,
     LocalFileBasedNodeStorage,
     NodeStorage
 )
@@ -327,6 +328,9 @@ class CharacterConfiguration(BaseConfiguration):
     # Gas
     DEFAULT_GAS_STRATEGY = 'fast'
 
+    # Learner
+    DEFAULT_MAX_CONCURRENT_TEACHERS = 1
+
     # Fields specified here are *not* passed into the Character's constructor
     # and can be understood as configuration fields only.
     _CONFIG_FIELDS = ('config_root',
@@ -362,6 +366,7 @@ class CharacterConfiguration(BaseConfiguration):
                  learn_on_same_thread: bool = False,
                  abort_on_learning_error: bool = False,
                  start_learning_now: bool = True,
+                 max_concurrent_teachers: int = None,
 
                  # Network
                  controller_port: int = None,
@@ -429,6 +434,7 @@ class CharacterConfiguration(BaseConfiguration):
         self.learn_on_same_thread = learn_on_same_thread
         self.abort_on_learning_error = abort_on_learning_error
         self.start_learning_now = start_learning_now
+        self.max_concurrent_teachers = max_concurrent_teachers or self.DEFAULT_MAX_CONCURRENT_TEACHERS
         self.save_metadata = save_metadata
         self.reload_metadata = reload_metadata
         self.known_nodes = known_nodes or set()  # handpicked
@@ -575,9 +581,9 @@ class CharacterConfiguration(BaseConfiguration):
         if self.dev_mode:
             node_storage = ForgetfulNodeStorage(registry=self.registry, federated_only=self.federated_only)
         elif not node_storage:
-            node_storage = LocalFileBasedNodeStorage(registry=self.registry,
-                                                     config_root=self.config_root,
-                                                     federated_only=self.federated_only)
+            node_storage = LMDBNodeStorage(registry=self.registry,
+                                           config_root=self.config_root,
+                                           federated_only=self.federated_only)
         self.node_storage = node_storage
 
     def forget_nodes(self) -> None:
@@ -668,6 +674,7 @@ class CharacterConfiguration(BaseConfiguration):
             learn_on_same_thread=self.learn_on_same_thread,
             abort_on_learning_error=self.abort_on_learning_error,
             start_learning_now=self.start_learning_now,
+            max_concurrent_teachers=self.max_concurrent_teachers,
             save_metadata=self.save_metadata,
             node_storage=self.node_storage.payload(),
             lonely=self.lonely,
@@ -809,4 +816,11 @@ class CharacterConfiguration(BaseConfiguration):
         storage_type = storage_payload[NodeStorage._TYPE_LABEL]
         storage_class = node_storage_subclasses[storage_type]
         node_storage = storage_class.from_payload(payload=storage_payload, federated_only=federated_only)
+        if isinstance(node_storage, LocalFileBasedNodeStorage):
+            # Nodes stored one file per node are moved to a database next to them, which is used from now on.
+            legacy_storage = node_storage
+            node_storage = LMDBNodeStorage(storage_root=legacy_storage.root_dir,
+                                           certificates_dir=legacy_storage.certificates_dir,
+                                           federated_only=federated_only)
+            node_storage.migrate_from(legacy_storage)
         return node_storage
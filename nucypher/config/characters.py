@@ -18,6 +18,7 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 import os
 from tempfile import TemporaryDirectory
+from typing import Union
 
 from constant_sorrow.constants import UNINITIALIZED_CONFIGURATION
 from cryptography.hazmat.primitives.asymmetric import ec
@@ -48,6 +49,7 @@ class UrsulaConfiguration(CharacterConfiguration):
     DEFAULT_DEVELOPMENT_REST_PORT = 10151
     DEFAULT_DB_NAME = f'{NAME}.db'
     DEFAULT_AVAILABILITY_CHECKS = False
+    DEFAULT_REENCRYPTION_WORKERS = 0  # Re-encrypt in the request thread; AUTO_REENCRYPTION_WORKERS for one per CPU
     LOCAL_SIGNERS_ALLOWED = True
     SIGNER_ENVVAR = NUCYPHER_ENVVAR_WORKER_ETH_PASSWORD
 
@@ -59,6 +61,7 @@ class UrsulaConfiguration(CharacterConfiguration):
                  rest_port: int = None,
                  certificate: Certificate = None,
                  availability_check: bool = None,
+                 reencryption_workers: Union[int, str] = None,
                  *args, **kwargs) -> None:
 
         if dev_mode:
@@ -77,6 +80,7 @@ class UrsulaConfiguration(CharacterConfiguration):
         self.db_filepath = db_filepath or UNINITIALIZED_CONFIGURATION
         self.worker_address = worker_address
         self.availability_check = availability_check if availability_check is not None else self.DEFAULT_AVAILABILITY_CHECKS
+        self.reencryption_workers = reencryption_workers if reencryption_workers is not None else self.DEFAULT_REENCRYPTION_WORKERS
         super().__init__(dev_mode=dev_mode, *args, **kwargs)
 
     @classmethod
@@ -111,6 +115,7 @@ class UrsulaConfiguration(CharacterConfiguration):
             rest_port=self.rest_port,
             db_filepath=self.db_filepath,
             availability_check=self.availability_check,
+            reencryption_workers=self.reencryption_workers,
         )
         return {**super().static_payload(), **payload}
 
@@ -71,6 +71,10 @@ TEMPORARY_DOMAIN = ":temporary-domain:"  # for use with `--dev` node runtimes
 
 # Event Blocks Throttling
 NUCYPHER_EVENTS_THROTTLE_MAX_BLOCKS = 'NUCYPHER_EVENTS_THROTTLE_MAX_BLOCKS'
+NUCYPHER_EVENTS_CONFIRMATIONS = 'NUCYPHER_EVENTS_CONFIRMATIONS'
+
+# Re-encryption workers: as many as CPUs
+AUTO_REENCRYPTION_WORKERS = 'auto'
 
 # Probationary period (see #2353, #2584)
 END_OF_POLICIES_PROBATIONARY_PERIOD = MayaDT.from_iso8601('2021-05-31T23:59:59.0Z')
@@ -20,8 +20,12 @@ from pathlib import Path
 import OpenSSL
 import binascii
 import os
+import shutil
 import tempfile
 from abc import ABC, abstractmethod
+from threading import Lock
+
+import lmdb
 
 from bytestring_splitter import BytestringSplittingError
 from cryptography import x509
@@ -29,7 +33,7 @@ from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.serialization import Encoding
 from cryptography.x509 import Certificate, NameOID
 from eth_utils import is_checksum_address
-from typing import Any, Callable, Set, Tuple, Union
+from typing import Any, Callable, Dict, Set, Tuple, Union
 
 from nucypher.acumen.nicknames import Nickname
 from nucypher.blockchain.eth.decorators import validate_checksum_address
@@ -52,6 +56,9 @@ class NodeStorage(ABC):
     class UnknownNode(NodeStorageError):
         pass
 
+    class InvalidNodeMetadata(NodeStorageError):
+        """Node metadata is corrupt or not possible to parse"""
+
     def __init__(self,
                  federated_only: bool,  # TODO# 466
                  character_class=None,
@@ -189,6 +196,10 @@ class NodeStorage(ABC):
         """Remove all stored nodes"""
         raise NotImplementedError
 
+    def flush(self) -> None:
+        """Write any node metadata still waiting to be stored"""
+        return
+
 
 class ForgetfulNodeStorage(NodeStorage):
     _name = ':memory:'
@@ -297,9 +308,6 @@ class LocalFileBasedNodeStorage(NodeStorage):
     class NoNodeMetadataFileFound(FileNotFoundError, NodeStorage.UnknownNode):
         pass
 
-    class InvalidNodeMetadata(NodeStorage.NodeStorageError):
-        """Node metadata is corrupt or not possible to parse"""
-
     def __init__(self,
                  config_root: str = None,
                  storage_root: str = None,
@@ -567,3 +575,284 @@ class TemporaryFileBasedNodeStorage(LocalFileBasedNodeStorage):
         # Certificates
         self.__temp_certificates_dir = str(Path(self.__temp_root_dir) / "certs")
         self.certificates_dir = self.__temp_certificates_dir
+
+
+class LMDBNodeStorage(NodeStorage):
+    """
+    Keeps the metadata and certificates of all known nodes in a single LMDB database,
+    instead of a pair of files per node.
+
+    Metadata is written in batches, each one in a single transaction: when enough nodes are waiting
+    to be stored, or when `flush()` is called (eg. at the end of a learning round).
+    Certificates are also written to PEM files, since that's what TLS verification is done against.
+
+    Nodes stored one file per node (as `LocalFileBasedNodeStorage` does) under the same root
+    are brought over the first time the database is opened.
+    """
+
+    _name = 'lmdb'
+
+    # The database is tiny compared to this, but LMDB needs a cap on its size; see `Datastore`.
+    LMDB_MAP_SIZE = 10_000_000_000
+    METADATA_DB_NAME = b'metadata'
+    CERTIFICATES_DB_NAME = b'certificates'
+    MIGRATIONS_DB_NAME = b'migrations'  # The file-based storages already migrated
+
+    BATCH_SIZE = 100  # nodes
+
+    def __init__(self,
+                 config_root: str = None,
+                 storage_root: str = None,
+                 db_path: str = None,
+                 certificates_dir: str = None,
+                 *args, **kwargs
+                 ) -> None:
+
+        super().__init__(*args, **kwargs)
+        self.root_dir = storage_root or os.path.join(config_root or DEFAULT_CONFIG_ROOT, 'known_nodes')
+        self.db_path = db_path or os.path.join(self.root_dir, 'nodes.lmdb')
+        self.certificates_dir = certificates_dir or os.path.join(self.root_dir, 'certificates')
+
+        self.__db_env = None
+        self.__metadata_db = None
+        self.__certificates_db = None
+        self.__migrations_db = None
+        self.__open_lock = Lock()
+
+        self.__pending_lock = Lock()
+        self.__pending_metadata = dict()  # type: Dict[str, bytes]
+        self.__pending_certificates = dict()  # type: Dict[str, bytes]
+
+    @property
+    def source(self) -> str:
+        """Human readable source string"""
+        return self.db_path
+
+    def __open(self) -> lmdb.Environment:
+        with self.__open_lock:
+            if self.__db_env is None:
+                os.makedirs(self.db_path, exist_ok=True)
+                db_env = lmdb.open(self.db_path, map_size=self.LMDB_MAP_SIZE, max_dbs=3)
+                self.__metadata_db = db_env.open_db(self.METADATA_DB_NAME)
+                self.__certificates_db = db_env.open_db(self.CERTIFICATES_DB_NAME)
+                self.__migrations_db = db_env.open_db(self.MIGRATIONS_DB_NAME)
+                self.__migrate_legacy_nodes(db_env)
+                self.__db_env = db_env
+        return self.__db_env
+
+    def __begin(self, write: bool = False) -> lmdb.Transaction:
+        return self.__open().begin(write=write)
+
+    def __read_node(self, node_bytes: bytes):
+        try:
+            return self.character_class.from_bytes(node_bytes, fail_fast=True)
+        except (BytestringSplittingError, self.character_class.UnexpectedVersion):
+            raise self.InvalidNodeMetadata
+
+    @staticmethod
+    def __read_certificate(certificate_bytes: bytes) -> Certificate:
+        return x509.load_pem_x509_certificate(certificate_bytes, backend=default_backend())
+
+    #
+    # Writes
+    #
+
+    def flush(self) -> None:
+        """Write all the pending metadata and certificates in a single transaction"""
+        with self.__pending_lock:
+            if not (self.__pending_metadata or self.__pending_certificates):
+                return
+            with self.__begin(write=True) as transaction:
+                for checksum_address, node_bytes in self.__pending_metadata.items():
+                    transaction.put(checksum_address.encode(), node_bytes, db=self.__metadata_db)
+                for checksum_address, certificate_bytes in self.__pending_certificates.items():
+                    transaction.put(checksum_address.encode(), certificate_bytes, db=self.__certificates_db)
+            self.log.debug(f"Wrote metadata of {len(self.__pending_metadata)} nodes "
+                           f"and {len(self.__pending_certificates)} certificates to {self.db_path}")
+            self.__pending_metadata.clear()
+            self.__pending_certificates.clear()
+
+    def __add_pending(self, pending: dict, checksum_address: str, value: bytes) -> None:
+        with self.__pending_lock:
+            pending[checksum_address] = value
+            batch_is_full = len(self.__pending_metadata) + len(self.__pending_certificates) >= self.BATCH_SIZE
+        if batch_is_full:
+            self.flush()
+
+    def store_node_metadata(self, node, filepath: str = None) -> str:
+        self.__add_pending(self.__pending_metadata, node.checksum_address, bytes(node))
+        return self.db_path
+
+    def store_node_certificate(self, certificate: Certificate, force: bool = True) -> str:
+        certificate_filepath = self._write_tls_certificate(certificate=certificate, force=force)
+        checksum_address = read_certificate_pseudonym(certificate=certificate)
+        self.__add_pending(self.__pending_certificates,
+                           checksum_address,
+                           certificate.public_bytes(self.TLS_CERTIFICATE_ENCODING))
+        return certificate_filepath
+
+    @validate_checksum_address
+    def generate_certificate_filepath(self, checksum_address: str) -> str:
+        filename = f'{checksum_address}{self.TLS_CERTIFICATE_EXTENSION}'
+        return os.path.join(self.certificates_dir, filename)
+
+    #
+    # Reads
+    #
+
+    def all(self, federated_only: bool, certificates_only: bool = False) -> Set[Union[Any, Certificate]]:
+        self.flush()
+        with self.__begin() as transaction:
+            db = self.__certificates_db if certificates_only else self.__metadata_db
+            stored = list(transaction.cursor(db=db).iternext(keys=True, values=True))
+
+        if certificates_only:
+            return {self.__read_certificate(certificate_bytes) for _address, certificate_bytes in stored}
+
+        # Nodes are read as sprouts, which are only fully parsed when needed.
+        known_nodes = set()
+        invalid_metadata = []
+        for address, node_bytes in stored:
+            try:
+                known_nodes.add(self.__read_node(node_bytes))
+            except self.NodeStorageError:
+                invalid_metadata.append(address.decode())
+        self.log.info(f"Found {len(stored)} known nodes in {self.db_path}")
+        if invalid_metadata:
+            self.log.warn(f"Couldn't read metadata in {self.db_path} for the following nodes: {invalid_metadata}")
+        return known_nodes
+
+    @validate_checksum_address
+    def get(self, checksum_address: str, federated_only: bool, certificate_only: bool = False):
+        with self.__pending_lock:
+            pending = self.__pending_certificates if certificate_only else self.__pending_metadata
+            stored_bytes = pending.get(checksum_address)
+        if stored_bytes is None:
+            with self.__begin() as transaction:
+                db = self.__certificates_db if certificate_only else self.__metadata_db
+                stored_bytes = transaction.get(checksum_address.encode(), db=db)
+        if stored_bytes is None:
+            raise self.UnknownNode(f"{checksum_address} is not in {self.db_path}")
+
+        if certificate_only:
+            return self.__read_certificate(stored_bytes)
+        return self.__read_node(stored_bytes)
+
+    #
+    # Removal
+    #
+
+    @validate_checksum_address
+    def remove(self, checksum_address: str, metadata: bool = True, certificate: bool = True) -> None:
+        with self.__pending_lock:
+            with self.__begin(write=True) as transaction:
+                if metadata is True:
+                    self.__pending_metadata.pop(checksum_address, None)
+                    transaction.delete(checksum_address.encode(), db=self.__metadata_db)
+                if certificate is True:
+                    self.__pending_certificates.pop(checksum_address, None)
+                    transaction.delete(checksum_address.encode(), db=self.__certificates_db)
+        if certificate is True:
+            try:
+                os.remove(self.generate_certificate_filepath(checksum_address=checksum_address))
+            except FileNotFoundError:
+                pass
+        self.log.debug(f"Deleted {checksum_address} from {self.db_path}")
+
+    def clear(self, metadata: bool = True, certificates: bool = True) -> None:
+        """Forget all stored nodes and certificates"""
+        with self.__pending_lock:
+            with self.__begin(write=True) as transaction:
+                if metadata is True:
+                    self.__pending_metadata.clear()
+                    transaction.drop(self.__metadata_db, delete=False)
+                if certificates is True:
+                    self.__pending_certificates.clear()
+                    transaction.drop(self.__certificates_db, delete=False)
+        if certificates is True:
+            shutil.rmtree(self.certificates_dir, ignore_errors=True)
+
+    #
+    # Migration
+    #
+
+    def migrate_from(self, legacy_storage: LocalFileBasedNodeStorage) -> int:
+        """
+        Copies the nodes stored one file per node by `legacy_storage` into this database,
+        in a single transaction, and returns how many were copied.
+        Metadata that can't be read is left behind; the files themselves are not removed,
+        but they are only ever copied once, so that they don't overwrite newer metadata later on.
+        """
+        with self.__pending_lock, self.__begin(write=True) as transaction:
+            return self.__copy_legacy_nodes(legacy_storage, transaction)
+
+    def __migrate_legacy_nodes(self, db_env: lmdb.Environment) -> None:
+        legacy_storage = LocalFileBasedNodeStorage(storage_root=self.root_dir,
+                                                   federated_only=self.federated_only,
+                                                   character_class=self.character_class,
+                                                   registry=self.registry)
+        if os.path.isdir(legacy_storage.metadata_dir):
+            with db_env.begin(write=True) as transaction:
+                self.__copy_legacy_nodes(legacy_storage, transaction)
+
+    def __copy_legacy_nodes(self, legacy_storage: LocalFileBasedNodeStorage, transaction: lmdb.Transaction) -> int:
+        migration_key = os.path.abspath(legacy_storage.metadata_dir).encode()
+        if transaction.get(migration_key, db=self.__migrations_db) is not None:
+            return 0
+
+        migrated = 0
+        for directory, db, extension in ((legacy_storage.metadata_dir, self.__metadata_db, '.node'),
+                                         (legacy_storage.certificates_dir, self.__certificates_db,
+                                          self.TLS_CERTIFICATE_EXTENSION)):
+            try:
+                filenames = os.listdir(directory)
+            except FileNotFoundError:
+                continue
+            for filename in filenames:
+                checksum_address, file_extension = os.path.splitext(filename)
+                if file_extension != extension:
+                    continue
+                with open(os.path.join(directory, filename), 'rb') as file:
+                    stored_bytes = legacy_storage.decode_node_bytes(file.read())
+                if db is self.__metadata_db:
+                    try:
+                        self.__read_node(stored_bytes)
+                    except self.NodeStorageError:
+                        self.log.warn(f"Not migrating unreadable node metadata {filename} from {directory}")
+                        continue
+                    migrated += 1
+                transaction.put(checksum_address.encode(), stored_bytes, db=db)
+        transaction.put(migration_key, str(migrated).encode(), db=self.__migrations_db)
+
+        self.log.info(f"Migrated {migrated} nodes from {legacy_storage.source} to {self.db_path}")
+        return migrated
+
+    #
+    # Configuration
+    #
+
+    def payload(self) -> dict:
+        payload = {
+            self._TYPE_LABEL: self._name,
+            'storage_root': self.root_dir,
+            'db_path': self.db_path,
+            'certificates_dir': self.certificates_dir
+        }
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: dict, *args, **kwargs) -> 'LMDBNodeStorage':
+        storage_type = payload[cls._TYPE_LABEL]
+        if not storage_type == cls._name:
+            raise cls.NodeStorageError("Wrong storage type. got {}".format(storage_type))
+        del payload['storage_type']
+
+        return cls(*args, **payload, **kwargs)
+
+    def initialize(self):
+        try:
+            os.makedirs(self.root_dir, mode=0o755, exist_ok=True)
+        except FileNotFoundError:
+            raise self.NodeStorageError("There is no existing configuration at {}".format(self.root_dir))
+
+        self.__open()  # Bringing over the nodes stored one file per node, if any
@@ -17,6 +17,7 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 
 
 import datetime
+import functools
 import sha3
 from constant_sorrow import constants
 from cryptography import x509
@@ -34,9 +35,12 @@ from eth_account.messages import encode_defunct
 from eth_utils import is_checksum_address, to_checksum_address
 from ipaddress import IPv4Address
 from random import SystemRandom
-from typing import Tuple
+from typing import List, Tuple
 from umbral import pre
+from umbral.config import default_params
 from umbral.keys import UmbralPrivateKey, UmbralPublicKey
+from umbral.kfrags import KFrag
+from umbral.pre import Capsule
 from umbral.signing import Signature
 
 from nucypher.crypto.constants import SHA256
@@ -150,6 +154,20 @@ def verify_eip_191(address: str, message: bytes, signature: bytes) -> bool:
     return signature_is_valid
 
 
+# Verifications of the same signatures are repeated across requests (eg. of the stamps of known nodes)
+EIP_191_VERIFICATION_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=EIP_191_VERIFICATION_CACHE_SIZE)
+def memoized_verify_eip_191(address: str, message: bytes, signature: bytes) -> bool:
+    """
+    Like `verify_eip_191`, but the results are kept in a process-wide bounded cache,
+    so that verifying the same signature again doesn't recover the public key again.
+    Use `memoized_verify_eip_191.cache_info()` for the hits and misses of the cache.
+    """
+    return verify_eip_191(address=address, message=message, signature=signature)
+
+
 def verify_ecdsa(message: bytes,
                  signature: bytes,
                  public_key: UmbralPublicKey
@@ -261,3 +279,36 @@ def encrypt_and_sign(recipient_pubkey_enc: UmbralPublicKey,
         message_kit = UmbralMessageKit(ciphertext=ciphertext, capsule=capsule)
 
     return message_kit, signature
+
+
+def reencrypt_serialized(kfrag_bytes: bytes,
+                         capsule_bytes: bytes,
+                         verifying_key_bytes: bytes,
+                         metadata: bytes = None
+                         ) -> bytes:
+    """
+    Re-encrypts a serialized capsule with a serialized KFrag and returns the serialized CFrag.
+    Only bytes go in and out, so this can be dispatched to a process pool.
+    """
+    kfrag = KFrag.from_bytes(kfrag_bytes)
+    capsule = Capsule.from_bytes(capsule_bytes, params=default_params())
+    capsule.set_correctness_keys(verifying=UmbralPublicKey.from_bytes(verifying_key_bytes))
+    cfrag = pre.reencrypt(kfrag, capsule, metadata=metadata)
+    return cfrag.to_bytes()
+
+
+def encrypt_signed_serialized(recipient_pubkey_bytes: bytes,
+                              signed_plaintexts: List[Tuple[bytes, bytes]]
+                              ) -> List[Tuple[bytes, bytes]]:
+    """
+    Encrypts plaintexts that were already signed, given as serialized (signature, plaintext) pairs,
+    the way `encrypt_and_sign` does (sign first, encrypt second), for a serialized recipient key.
+    Returns the ciphertexts and serialized capsules, in the same order as the plaintexts.
+    Only bytes go in and out, and no private key, so this can be dispatched to a process pool.
+    """
+    recipient_pubkey = UmbralPublicKey.from_bytes(recipient_pubkey_bytes)
+    results = list()
+    for signature, plaintext in signed_plaintexts:
+        ciphertext, capsule = pre.encrypt(recipient_pubkey, constants.SIGNATURE_TO_FOLLOW + signature + plaintext)
+        results.append((ciphertext, capsule.to_bytes()))
+    return results
@@ -0,0 +1,225 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import itertools
+import mmap
+import os
+from typing import BinaryIO, Callable, Iterable, Iterator
+
+from bytestring_splitter import BytestringSplitter
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from umbral.dem import DEM_KEYSIZE, DEM_NONCE_SIZE
+
+"""
+Streams are encrypted in fixed-size chunks, so that neither Enrico nor Bob ever
+need to hold more than a couple of chunks in memory, and Bob can start decrypting
+as soon as the first chunk arrives.
+
+A stream is a sequence of records, each one prefixed with its length:
+
+    header || chunk_0 || chunk_1 || ... || chunk_n
+
+The header is a regular, signed MessageKit whose plaintext is the `StreamHeader`:
+the symmetric key of the stream and its chunk size. Bob retrieves it like any other
+message, so there is only one Capsule (and one round of re-encryption) per stream.
+
+Each chunk is sealed with ChaCha20-Poly1305 under the stream key. Nonces aren't random, but
+made of the index of the chunk and a flag for the last one, so that chunks can't be dropped,
+reordered or appended, and the stream can't be truncated, without Bob noticing.
+"""
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # bytes
+RECORD_LENGTH_SIZE = 4  # bytes
+AEAD_TAG_SIZE = 16  # bytes; the Poly1305 tag of each chunk
+MAX_HEADER_RECORD_LENGTH = 1024  # bytes; the MessageKit of a StreamHeader is a few hundred bytes long
+
+_NOT_LAST_CHUNK = b'\x00'
+_LAST_CHUNK = b'\x01'
+
+
+class StreamDecryptionError(Exception):
+    """
+    Raised when a stream chunk can't be decrypted: it was tampered with, is out of place,
+    or the stream was truncated.
+    """
+
+
+class StreamHeader:
+
+    splitter = BytestringSplitter(DEM_KEYSIZE, (int, 4, {'byteorder': 'big'}))
+
+    def __init__(self, key: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if len(key) != DEM_KEYSIZE:
+            raise ValueError(f"Stream keys must be {DEM_KEYSIZE} bytes long.")
+        if chunk_size < 1:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+        self.key = key
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def random(cls, chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'StreamHeader':
+        return cls(key=os.urandom(DEM_KEYSIZE), chunk_size=chunk_size)
+
+    def __bytes__(self):
+        return self.key + self.chunk_size.to_bytes(4, byteorder='big')
+
+    @classmethod
+    def from_bytes(cls, header_bytes: bytes) -> 'StreamHeader':
+        key, chunk_size = cls.splitter(header_bytes)
+        return cls(key=key, chunk_size=chunk_size)
+
+
+def _chunk_nonce(index: int, last: bool) -> bytes:
+    return index.to_bytes(DEM_NONCE_SIZE - 1, byteorder='big') + (_LAST_CHUNK if last else _NOT_LAST_CHUNK)
+
+
+def records(payloads: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Prefixes each one of `payloads` with its length, as records of a stream.
+    Prefixes and payloads are yielded separately, so that payloads aren't copied.
+    """
+    for payload in payloads:
+        yield len(payload).to_bytes(RECORD_LENGTH_SIZE, byteorder='big')
+        yield payload
+
+
+def rechunk(pieces: Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+    """
+    Turns pieces of arbitrary sizes into chunks of `chunk_size` bytes (except for the last one).
+    """
+    buffer = bytearray()
+    for piece in pieces:
+        if not buffer and len(piece) == chunk_size:
+            yield bytes(piece)
+            continue
+        buffer += piece
+        while len(buffer) >= chunk_size:
+            yield bytes(buffer[:chunk_size])
+            del buffer[:chunk_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def read_file_chunks(file: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """
+    Reads `file` in chunks of `chunk_size` bytes, memory-mapping it if possible.
+    """
+    try:
+        mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        # Not a real file, or an empty one (which can't be mapped).
+        yield from iter(lambda: file.read(chunk_size), b'')
+        return
+    with mapped_file:
+        for offset in range(0, len(mapped_file), chunk_size):
+            yield mapped_file[offset:offset + chunk_size]
+
+
+def max_chunk_record_length(header: StreamHeader) -> int:
+    """
+    The length of the longest record that can hold a chunk of a stream with this header.
+    """
+    return header.chunk_size + AEAD_TAG_SIZE
+
+
+def _check_record_length(index: int, record_length: int, max_record_length: Callable[[int], int]) -> None:
+    limit = max_record_length(index)
+    if record_length > limit:
+        raise StreamDecryptionError(f"Record {index} of the stream is {record_length} bytes long, "
+                                    f"but can't be longer than {limit} bytes.")
+
+
+def split_records(pieces: Iterable[bytes], max_record_length: Callable[[int], int]) -> Iterator[bytes]:
+    """
+    Inverse of `records`: turns the pieces of a stream (of arbitrary sizes) into its records.
+
+    `max_record_length` is called with the index of each record as soon as its length is known,
+    and the stream is rejected if the record is any longer, before buffering it.
+    Since records are yielded as they are completed, the limit can depend on the records before.
+    """
+    buffer = bytearray()
+    index = 0
+    for piece in pieces:
+        buffer += piece
+        while len(buffer) >= RECORD_LENGTH_SIZE:
+            record_length = int.from_bytes(buffer[:RECORD_LENGTH_SIZE], byteorder='big')
+            _check_record_length(index, record_length, max_record_length)
+            record_end = RECORD_LENGTH_SIZE + record_length
+            if len(buffer) < record_end:
+                break
+            yield bytes(buffer[RECORD_LENGTH_SIZE:record_end])
+            del buffer[:record_end]
+            index += 1
+    if buffer:
+        raise StreamDecryptionError(f"The stream ends with {len(buffer)} bytes of an incomplete record.")
+
+
+def read_file_records(file: BinaryIO, max_record_length: Callable[[int], int]) -> Iterator[bytes]:
+    """
+    Like `split_records`, but reading from `file`.
+    """
+    for index in itertools.count():
+        record_length = file.read(RECORD_LENGTH_SIZE)
+        if not record_length:
+            return
+        record_length = int.from_bytes(record_length, byteorder='big')
+        _check_record_length(index, record_length, max_record_length)
+        payload = file.read(record_length)
+        if len(payload) != record_length:
+            raise StreamDecryptionError("The stream ends with an incomplete record.")
+        yield payload
+
+
+def encrypt_chunks(header: StreamHeader, plaintext_chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Encrypts `plaintext_chunks` (each one of `header.chunk_size` bytes, except for the last one),
+    and yields the ciphertext of each one.
+    """
+    cipher = ChaCha20Poly1305(header.key)
+    chunks = iter(plaintext_chunks)
+    index, chunk = 0, next(chunks, b'')  # Even an empty stream has a last chunk.
+    for next_chunk in chunks:
+        yield cipher.encrypt(_chunk_nonce(index, last=False), chunk, None)
+        index, chunk = index + 1, next_chunk
+    yield cipher.encrypt(_chunk_nonce(index, last=True), chunk, None)
+
+
+def decrypt_chunks(header: StreamHeader, ciphertext_chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Inverse of `encrypt_chunks`.
+
+    Raises `StreamDecryptionError` as soon as a chunk fails to authenticate, or if the stream
+    doesn't end with the last chunk Enrico encrypted. Note that the chunks before it have been yielded by then.
+    """
+    cipher = ChaCha20Poly1305(header.key)
+    chunks = iter(ciphertext_chunks)
+    index, chunk = 0, next(chunks, None)
+    if chunk is None:
+        raise StreamDecryptionError("The stream has no chunks.")
+    for next_chunk in chunks:
+        yield _decrypt_chunk(cipher, index, chunk, last=False)
+        index, chunk = index + 1, next_chunk
+    yield _decrypt_chunk(cipher, index, chunk, last=True)
+
+
+def _decrypt_chunk(cipher: ChaCha20Poly1305, index: int, chunk: bytes, last: bool) -> bytes:
+    try:
+        return cipher.decrypt(_chunk_nonce(index, last=last), chunk, None)
+    except InvalidTag:
+        raise StreamDecryptionError(f"Chunk {index} of the stream can't be decrypted: "
+                                    f"it was tampered with, is out of order, or the stream was truncated.")
@@ -15,7 +15,7 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 import msgpack
-from typing import Any, Callable, Iterable, NamedTuple, Union
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Union
 
 
 class DBWriteError(Exception):
@@ -45,26 +45,59 @@ class RecordField(NamedTuple):
     The optional `decode` is any callable that takes the unpack'd encoded
     field value and returns the `field_type`. If you implement `encode`, you
     will probably always want to provide a `decode`.
+
+    The optional `index` declares a secondary index on the field. It is any
+    callable that takes the field value and returns a fixed-width `bytes`
+    sort key, such that the byte order of the keys matches the order of the
+    values. The datastore keeps the records sorted by this key, which allows
+    range queries on the field (see `Datastore.query_by_range`) to only touch
+    the matching records.
     """
     field_type: Any
     encode: Callable[[Any], bytes] = lambda field: field
     decode: Callable[[bytes], Any] = lambda field: field
+    index: Optional[Callable[[Any], bytes]] = None
 
 
 class DatastoreRecord:
+    """
+    Records are created per transaction, often by the thousand in queries and
+    batches, so they have no instance `__dict__`: record types (subclasses)
+    should declare `__slots__ = ()` as well.
+    """
+    __slots__ = ('_record_id', '__db_transaction', '__index_db', '__storage_key', '__encoded_fields',
+                 '__field_cache', '__writeable')
+
     def __new__(cls, *args, **kwargs):
         # Set default class attributes for the new instance
-        cls.__writeable = None
-        cls.__storagekey = f'{cls.__name__}:{{record_field}}:{{record_id}}'
+        cls.__storagekey = f'{cls.__name__}:{{record_id}}'
         return super().__new__(cls)
 
     def __init__(self,
                  db_transaction: 'lmdb.Transaction',
                  record_id: Union[int, str],
-                 writeable: bool = False) -> None:
-        self._record_id = record_id
-        self.__db_transaction = db_transaction
-        self.__writeable = writeable
+                 writeable: bool = False,
+                 index_db: Optional['lmdb._Database'] = None) -> None:
+        """
+        Records with indexed fields keep their secondary indexes up to date
+        in the given `index_db`. The `Datastore` always provides it; records
+        created without one don't maintain their indexes.
+
+        All the fields of a record are stored together under a single key,
+        as a msgpack map of the encoded field values, so the record is read
+        from the database at most once per transaction. Fields are decoded on
+        first access and cached. Both caches are dropped when the record is
+        closed at the end of the transaction (see `_close`).
+        """
+        # Straight to the slots, since records are created by the thousand.
+        set_slot = super().__setattr__
+        set_slot('_record_id', record_id)
+        set_slot('_DatastoreRecord__db_transaction', db_transaction)
+        set_slot('_DatastoreRecord__index_db', index_db)
+        set_slot('_DatastoreRecord__storage_key', self.__storagekey.format(record_id=record_id).encode())
+        set_slot('_DatastoreRecord__encoded_fields', None)
+        set_slot('_DatastoreRecord__field_cache', dict())
+        set_slot('_DatastoreRecord__writeable', writeable)
 
     def __setattr__(self, attr: str, value: Any) -> None:
         """
@@ -72,7 +105,7 @@ class DatastoreRecord:
         this method to serialize the value being set to the attribute, and then
         we _write_ it to the database.
 
-        When `__writeable` is `None`, we only set attributes on the instance.
+        Private attributes (starting with `_`) are only set on the instance.
         When `__writeable` is `False`, we raise a `TypeError`.
 
         Finally, when `__writeable` is `True`, we get the `RecordField` for
@@ -80,15 +113,13 @@ class DatastoreRecord:
         the correct type via its `RecordField.field_type`. If the type is not
         correct, we raise a `TypeError`.
 
-        If the type is correct, we then serialize it to bytes via its
-        `RecordField.encode` function and pack it with msgpack. Then the value
-        gets written to the database. If the value is unable to be written,
-        this will raise a `DBWriteError`.
+        If the type is correct, we then serialize it via its `RecordField.encode`
+        function and write the record, with the updated field, to the database.
+        If the record is unable to be written, this will raise a `DBWriteError`.
         """
-        # When writeable is None (meaning, it hasn't been __init__ yet), then
-        # we allow any attribute to be set on the instance.
+        # Private attributes are the state of the instance, not record fields.
         # HOT LAVA -- causes a recursion if this check isn't present.
-        if self.__writeable is None:
+        if attr.startswith('_'):
             super().__setattr__(attr, value)
 
         # Datastore records are not writeable/mutable by default, so we
@@ -106,8 +137,12 @@ class DatastoreRecord:
 
             if not type(value) == record_field.field_type:
                 raise TypeError(f'Given record is type {type(value)}; expected {record_field.field_type}')
-            field_value = msgpack.packb(record_field.encode(value))
-            self.__write_raw_record(attr, field_value)
+            encoded_value = record_field.encode(value)
+            self.__update_index(attr, record_field, value)
+            encoded_fields = dict(self.__read_encoded_fields())
+            encoded_fields[attr] = encoded_value
+            self.__write_encoded_fields(encoded_fields)
+            self.__field_cache[attr] = value
 
     def __getattr__(self, attr: str) -> Any:
         """
@@ -118,49 +153,118 @@ class DatastoreRecord:
         We deserialize records by calling the record's respective `RecordField.decode`
         function. If the deserialized type doesn't match the type defined by
         its `RecordField.field_type`, then this method will raise a `TypeError`.
+
+        Deserialized fields are cached, so repeated accesses within the same
+        transaction don't decode them again.
         """
         # Handle __getattr__ look ups for private fields
         # HOT LAVA -- causes a recursion if this check isn't present.
         if attr.startswith('_'):
             return super().__getattr__(attr)
 
-        # Get the corresponding RecordField and retrieve the raw value from
-        # the db, unpack it, then use the `RecordField` to deserialize it.
+        try:
+            return self.__field_cache[attr]
+        except KeyError:
+            pass
+
+        # Get the corresponding RecordField and retrieve the encoded value from
+        # the record, then use the `RecordField` to deserialize it.
         record_field = self.__get_record_field(attr)
-        field_value = record_field.decode(msgpack.unpackb(self.__retrieve_raw_record(attr)))
+        try:
+            encoded_value = self.__read_encoded_fields()[attr]
+        except KeyError:
+            raise AttributeError(f"No {attr} record found for ID: {self._record_id}.")
+        field_value = record_field.decode(encoded_value)
         if not type(field_value) == record_field.field_type:
             raise TypeError(f"Decoded record was type {type(field_value)}; expected {record_field.field_type}")
+        self.__field_cache[attr] = field_value
         return field_value
 
-    def __retrieve_raw_record(self, record_field: str) -> bytes:
+    def _close(self) -> None:
         """
-        Retrieves a raw record, as bytes, from the database given a `record_field`.
-        If the record doesn't exist, this method raises an `AttributeError`.
+        Called by the `Datastore` when the transaction of this record ends.
+        Makes the record read-only and drops its cached fields, so that any
+        later access goes to the (now closed) transaction and errors.
         """
-        key = self.__storagekey.format(record_field=record_field, record_id=self._record_id).encode()
-        field_value = self.__db_transaction.get(key, default=None)
-        if field_value is None:
-            raise AttributeError(f"No {record_field} record found for ID: {self._record_id}.")
-        return field_value
+        set_slot = super().__setattr__
+        set_slot('_DatastoreRecord__writeable', False)
+        set_slot('_DatastoreRecord__encoded_fields', None)
+        self.__field_cache.clear()
 
-    def __write_raw_record(self, record_field: str, value: bytes) -> None:
+    def _has_field(self, record_field: str) -> bool:
         """
-        Writes a raw record, as bytes, to the database given a `record_field`
-        and a `value`.
-        If the record is unable to be written, this method raises a `DBWriteError`.
+        Returns whether the record has a value for `record_field`, without decoding it.
         """
-        key = self.__storagekey.format(record_field=record_field, record_id=self._record_id).encode()
-        if not self.__db_transaction.put(key, value, overwrite=True):
-            raise DBWriteError(f"Couldn't write the record (key: {key}) to the database.")
+        return record_field in self.__read_encoded_fields()
 
-    def __delete_record(self, record_field: str) -> None:
+    def __read_encoded_fields(self) -> dict:
+        """
+        Reads the record from the database, once per transaction, and returns
+        its fields (by name) as they were encoded by their `RecordField`.
+        A record that doesn't exist has no fields.
         """
-        Deletes the record from the datastore.
+        if self.__encoded_fields is None:
+            packed_fields = self.__db_transaction.get(self.__storage_key, default=None)
+            self.__encoded_fields = msgpack.unpackb(packed_fields) if packed_fields is not None else dict()
+        return self.__encoded_fields
+
+    def __write_encoded_fields(self, encoded_fields: dict) -> None:
+        """
+        Writes the record, given the encoded values of all its fields, to the database.
+        A record without fields is deleted altogether.
+        If the record is unable to be written, this method raises a `DBWriteError`.
         """
-        key = self.__storagekey.format(record_field=record_field, record_id=self._record_id).encode()
-        if not self.__db_transaction.delete(key) and self.__db_transaction.get(key) is not None:
+        key = self.__storage_key
+        if encoded_fields:
+            if not self.__db_transaction.put(key, msgpack.packb(encoded_fields), overwrite=True):
+                raise DBWriteError(f"Couldn't write the record (key: {key}) to the database.")
+        elif not self.__db_transaction.delete(key) and self.__db_transaction.get(key) is not None:
             # We do this check to ensure that the key was actually deleted.
             raise DBWriteError(f"Couldn't delete the record (key: {key}) from the database.")
+        self.__encoded_fields = encoded_fields
+
+    def __delete_record(self, record_field: str) -> None:
+        """
+        Deletes the field from the record in the datastore.
+        """
+        self.__update_index(record_field, self.__get_record_field(record_field), None)
+        self.__field_cache.pop(record_field, None)
+        encoded_fields = dict(self.__read_encoded_fields())
+        if encoded_fields.pop(record_field, None) is not None:
+            self.__write_encoded_fields(encoded_fields)
+
+    @classmethod
+    def _index_prefix(cls, record_field: str) -> bytes:
+        """
+        Returns the common prefix of the secondary index keys for `record_field`.
+        """
+        return f'{cls.__name__}:{record_field}:'.encode()
+
+    def _index_key(self, record_field: str, sort_key: bytes) -> bytes:
+        """
+        Returns the key of this record in the secondary index of `record_field`.
+        The value stored under it is the record ID.
+        """
+        return self._index_prefix(record_field) + sort_key + b':' + str(self._record_id).encode()
+
+    def __update_index(self, record_field: str, field: 'RecordField', new_value: Any) -> None:
+        """
+        Moves the entry of this record in the secondary index of `record_field`
+        (if it has one) from the current value of the field to `new_value`.
+        A `new_value` of `None` removes the entry.
+        """
+        if field.index is None or self.__index_db is None:
+            return
+
+        encoded_fields = self.__read_encoded_fields()
+        if record_field in encoded_fields:
+            old_value = field.decode(encoded_fields[record_field])
+            self.__db_transaction.delete(self._index_key(record_field, field.index(old_value)), db=self.__index_db)
+
+        if new_value is not None:
+            index_key = self._index_key(record_field, field.index(new_value))
+            if not self.__db_transaction.put(index_key, str(self._record_id).encode(), db=self.__index_db):
+                raise DBWriteError(f"Couldn't write the index entry (key: {index_key}) to the database.")
 
     def __get_record_field(self, attr: str) -> 'RecordField':
         """
@@ -15,11 +15,13 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 import lmdb
+import msgpack
+from collections import defaultdict
 from contextlib import contextmanager, suppress
 from functools import partial
-from typing import Any, Callable, Generator, List, NamedTuple, Optional, Type, Union
+from typing import Any, Callable, Generator, Iterable, List, NamedTuple, Optional, Type, Union
 
-from nucypher.datastore.base import DatastoreRecord, DBWriteError
+from nucypher.datastore.base import DatastoreRecord, DBWriteError, RecordField
 
 DatastoreQueryResult = Generator[List[Type['DatastoreRecord']], None, None]
 
@@ -42,7 +44,6 @@ class DatastoreKey(NamedTuple):
     Used for managing keys when querying the datastore.
     """
     record_type: Optional[str] = None
-    record_field: Optional[str] = None
     record_id: Optional[Union[bytes, int]] = None
 
     @classmethod
@@ -70,7 +71,6 @@ class DatastoreKey(NamedTuple):
         """
         other_key = DatastoreKey.from_bytestring(key_bytestring)
         return self.record_type == (other_key.record_type or self.record_type) and \
-               self.record_field == (other_key.record_field or self.record_field) and \
                self.record_id == (other_key.record_id or self.record_id)
 
 
@@ -83,6 +83,16 @@ class Datastore:
     # We can set this arbitrarily high (1TB) to prevent any run-time crashes.
     LMDB_MAP_SIZE = 1_000_000_000_000
 
+    # Secondary indexes of all record types are kept in this named sub-database.
+    INDEX_DB_NAME = b'indexes'
+
+    # Index sub-database keys that mark an index as backfilled; they sort before any index entry.
+    BUILT_INDEX_MARKER = b'\x00built:'
+
+    # Marks (in the index sub-database) that the records are stored one per key.
+    # Older versions stored each field of a record under its own `Type:field:id` key.
+    RECORD_LAYOUT_MARKER = b'\x00layout:record-per-key'
+
     def __init__(self, db_path: str) -> None:
         """
         Initializes a Datastore object by path.
@@ -90,7 +100,44 @@ class Datastore:
         :param db_path: Filepath to a lmdb database.
         """
         self.db_path = db_path
-        self.__db_env = lmdb.open(db_path, map_size=self.LMDB_MAP_SIZE)
+        self.__db_env = lmdb.open(db_path, map_size=self.LMDB_MAP_SIZE, max_dbs=1)
+        self.__index_db = self.__db_env.open_db(self.INDEX_DB_NAME)
+        self.__migrate_field_keys()
+
+        # Read the backfill markers once, so range queries don't have to check them.
+        self.__built_indexes = set()
+        with self.__db_env.begin() as datastore_tx:
+            db_cursor = datastore_tx.cursor(db=self.__index_db)
+            if db_cursor.set_range(self.BUILT_INDEX_MARKER):
+                for marker in db_cursor.iternext(keys=True, values=False):
+                    if not marker.startswith(self.BUILT_INDEX_MARKER):
+                        break
+                    self.__built_indexes.add(marker[len(self.BUILT_INDEX_MARKER):])
+
+    def __migrate_field_keys(self) -> None:
+        """
+        Moves the records written by older versions, with a key per field,
+        to a single key per record. This happens once per datastore.
+        """
+        with self.__db_env.begin(write=True) as datastore_tx:
+            if datastore_tx.get(self.RECORD_LAYOUT_MARKER, db=self.__index_db) is not None:
+                return
+
+            records, field_keys = defaultdict(dict), list()
+            db_cursor = datastore_tx.cursor()
+            for db_key, packed_value in db_cursor.iternext(keys=True, values=True):
+                key_parts = db_key.split(b':')
+                if len(key_parts) != 3:
+                    continue
+                record_type, record_field, record_id = key_parts
+                records[record_type + b':' + record_id][record_field.decode()] = msgpack.unpackb(packed_value)
+                field_keys.append(db_key)
+
+            for field_key in field_keys:
+                datastore_tx.delete(field_key)
+            for record_key, encoded_fields in records.items():
+                datastore_tx.put(record_key, msgpack.packb(encoded_fields))
+            datastore_tx.put(self.RECORD_LAYOUT_MARKER, b'', db=self.__index_db)
 
     @contextmanager
     def describe(self,
@@ -112,6 +159,9 @@ class Datastore:
         transaction will be aborted and no data will be written, and a
         `DatastoreTransactionError` will be raised.
 
+        All the fields of the record are read from the database at once, on
+        the first access to any of them.
+
         If the record is used outside the scope of the context manager, any
         writes or reads will error.
         """
@@ -120,7 +170,7 @@ class Datastore:
             record_id = int(record_id)
 
         with self.__db_env.begin(write=writeable) as datastore_tx:
-            record = record_type(datastore_tx, record_id, writeable=writeable)
+            record = record_type(datastore_tx, record_id, writeable=writeable, index_db=self.__index_db)
             try:
                 yield record
             except (AttributeError, TypeError, DBWriteError) as tx_err:
@@ -129,8 +179,52 @@ class Datastore:
                     raise RecordNotFound(tx_err)
                 raise DatastoreTransactionError(f'An error was encountered during the transaction (no data was written): {tx_err}')
             finally:
-                # Now we ensure that the record is not writeable
-                record.__dict__['_DatastoreRecord__writeable'] = False
+                # Now we ensure that the record is not usable outside the transaction
+                record._close()
+
+    @contextmanager
+    def describe_many(self,
+                      record_type: Type['DatastoreRecord'],
+                      record_ids: Iterable[Union[int, str]],
+                      writeable: bool = False) -> List[Type['DatastoreRecord']]:
+        """
+        Like `describe`, but returns a list of `record_type` instances, one per
+        ID in `record_ids` (in the same order), all bound to a _single_
+        datastore transaction. Repeated IDs get the same record instance, so
+        that writes through any of them are seen by all.
+
+        This is useful for batch operations, where opening a transaction per
+        record would dominate the cost of the operation.
+
+        The error handling semantics are the same as `describe`, but apply to
+        the transaction as a whole: an unhandled error raised for any of the
+        records aborts the writes for all of them. Reading a non-existent
+        field of a record raises an `AttributeError` that can be handled
+        within the context manager on a per-record basis.
+        """
+        normalized_record_ids = list()
+        for record_id in record_ids:
+            with suppress(ValueError):
+                # If the ID can be converted to an int, we do it.
+                record_id = int(record_id)
+            normalized_record_ids.append(record_id)
+
+        with self.__db_env.begin(write=writeable) as datastore_tx:
+            records = dict()
+            for record_id in normalized_record_ids:
+                if record_id not in records:
+                    records[record_id] = record_type(datastore_tx, record_id, writeable=writeable, index_db=self.__index_db)
+            try:
+                yield [records[record_id] for record_id in normalized_record_ids]
+            except (AttributeError, TypeError, DBWriteError) as tx_err:
+                # Handle `RecordNotFound` cases when `writeable` is `False`.
+                if not writeable and isinstance(tx_err, AttributeError):
+                    raise RecordNotFound(tx_err)
+                raise DatastoreTransactionError(f'An error was encountered during the transaction (no data was written): {tx_err}')
+            finally:
+                # Now we ensure that the records are not usable outside the transaction
+                for record in records.values():
+                    record._close()
 
     @contextmanager
     def query_by(self,
@@ -151,8 +245,8 @@ class Datastore:
         An optional `filter_field` can be provided as a `str` to perform a
         query on a specific field for a `record_type`. This will cause the
         `filter_func` to receive the decoded `filter_field` per the `record_type`.
-        Additionally, providing a `filter_field` will limit the query to
-        iterating over only the subset of records specific to that field.
+        Additionally, providing a `filter_field` will limit the query results
+        to the records that have that field.
 
         If records can't be found, this method will raise `RecordNotFound`.
         """
@@ -161,10 +255,7 @@ class Datastore:
             db_cursor = datastore_tx.cursor()
 
             # Set the cursor to the closest key (if it exists) by the query params.
-            #
-            # By providing a `filter_field`, the query will immediately be
-            # limited to the subset of keys for the `filter_field`.
-            query_key = f'{record_type.__name__}:{filter_field}'.encode()
+            query_key = f'{record_type.__name__}:'.encode()
             if not db_cursor.set_range(query_key):
                 # The cursor couldn't identify any records by the key
                 raise RecordNotFound(f"No records exist for the key from the specified query parameters: '{query_key}'")
@@ -180,16 +271,14 @@ class Datastore:
             # no records for the query because lmdb orders the keys lexicographically.
             # Ergo, if the current key doesn't match the query key, we know
             # we have gone beyond the relevant keys and can `break` the loop.
-            # Additionally, if the record is already in the `valid_records`
-            # set (identified by the `record_id`, we call `continue`.
             for db_key in db_cursor.iternext(keys=True, values=False):
                 curr_key = DatastoreKey.from_bytestring(db_key)
                 if not curr_key.compare_key(query_key):
                     break
-                elif curr_key.record_id in valid_records:
-                    continue
 
-                record = partial(record_type, datastore_tx, curr_key.record_id)
+                record = partial(record_type, datastore_tx, curr_key.record_id, index_db=self.__index_db)
+                # Read-only queries hand out the same record the filter has seen, along with the fields it read.
+                readonly_record = record(writeable=False)
 
                 # We pass the field to the filter_func if `filter_field` and
                 # `filter_func` are both provided. In the event that the
@@ -197,23 +286,28 @@ class Datastore:
                 # `filter_func` returns `False`, we call `continue`.
                 if filter_field and filter_func:
                     try:
-                        field = getattr(record(writeable=False), filter_field)
+                        field = getattr(readonly_record, filter_field)
                     except (TypeError, AttributeError):
                         continue
                     else:
                         if not filter_func(field):
                             continue
 
+                # Without a `filter_func`, the `filter_field` only has to be there.
+                elif filter_field:
+                    if not readonly_record._has_field(filter_field):
+                        continue
+
                 # If only a filter_func is given, we pass a readonly record to it.
                 # Likewise to the above, if `filter_func` returns `False`, we
                 # call `continue`.
                 elif filter_func:
-                    if not filter_func(record(writeable=False)):
+                    if not filter_func(readonly_record):
                         continue
 
                 # Finally, having a record that satisfies the above conditional
                 # constraints, we can add the record to the set
-                valid_records.add(record(writeable=writeable))
+                valid_records.add(record(writeable=True) if writeable else readonly_record)
 
             # If after the iteration we have no records, we raise `RecordNotFound`
             if len(valid_records) == 0:
@@ -229,4 +323,93 @@ class Datastore:
                 raise DatastoreTransactionError(f'An error was encountered during the transaction (no data was written): {tx_err}')
             finally:
                 for record in valid_records:
-                    record.__dict__['_DatastoreRecord__writeable'] = False
+                    record._close()
+
+    def __build_index(self, record_type: Type['DatastoreRecord'], record_field: str) -> None:
+        """
+        Indexes the records of `record_type` written before the index on
+        `record_field` existed (eg. by an older version).
+        This happens once per index; a marker in the index sub-database records that it's done.
+        """
+        index_prefix = record_type._index_prefix(record_field)
+        if index_prefix in self.__built_indexes:
+            return
+
+        field = getattr(record_type, f'_{record_field}')
+        with self.__db_env.begin(write=True) as datastore_tx:
+            db_cursor = datastore_tx.cursor()
+            record_prefix = f'{record_type.__name__}:'.encode()
+            if db_cursor.set_range(record_prefix):
+                for db_key, packed_fields in db_cursor.iternext(keys=True, values=True):
+                    if not db_key.startswith(record_prefix):
+                        break
+                    encoded_fields = msgpack.unpackb(packed_fields)
+                    if record_field not in encoded_fields:
+                        continue
+                    record_id = DatastoreKey.from_bytestring(db_key).record_id
+                    record = record_type(datastore_tx, record_id, index_db=self.__index_db)
+                    value = field.decode(encoded_fields[record_field])
+                    datastore_tx.put(record._index_key(record_field, field.index(value)),
+                                     str(record_id).encode(),
+                                     db=self.__index_db)
+            datastore_tx.put(self.BUILT_INDEX_MARKER + index_prefix, b'', db=self.__index_db)
+        self.__built_indexes.add(index_prefix)
+
+    @contextmanager
+    def query_by_range(self,
+                       record_type: Type['DatastoreRecord'],
+                       record_field: str,
+                       lower: Any = None,
+                       upper: Any = None,
+                       writeable: bool = False,
+                       ) -> DatastoreQueryResult:
+        """
+        Performs a query on the datastore for the records of `record_type`
+        whose `record_field` is within the range from `lower` to `upper`
+        (both inclusive, and both optional).
+
+        The `record_field` must be declared with an `index` (see `RecordField`);
+        the query walks the index instead of the whole keyspace, so it only
+        touches the matching records.
+
+        Like `query_by`, if no records match, this method raises `RecordNotFound`.
+        """
+        field = getattr(record_type, f'_{record_field}', None)
+        if not isinstance(field, RecordField) or field.index is None:
+            raise TypeError(f'{record_type.__name__}.{record_field} is not an indexed RecordField.')
+
+        self.__build_index(record_type, record_field)
+
+        index_prefix = record_type._index_prefix(record_field)
+        lower_key = index_prefix + (field.index(lower) if lower is not None else b'')
+        upper_sort_key = field.index(upper) if upper is not None else None
+
+        with self.__db_env.begin(write=writeable) as datastore_tx:
+            records = list()
+            db_cursor = datastore_tx.cursor(db=self.__index_db)
+            if db_cursor.set_range(lower_key):
+                for index_key, record_id in db_cursor.iternext(keys=True, values=True):
+                    if not index_key.startswith(index_prefix):
+                        break
+                    sort_key = index_key[len(index_prefix):-len(record_id) - 1]
+                    if upper_sort_key is not None and sort_key > upper_sort_key:
+                        break
+                    record_id = record_id.decode()
+                    with suppress(ValueError):
+                        # If the ID can be an int, we convert it
+                        record_id = int(record_id)
+                    records.append(record_type(datastore_tx, record_id, writeable=writeable, index_db=self.__index_db))
+
+            if not records:
+                raise RecordNotFound(f"No {record_type.__name__} records with {record_field} "
+                                     f"between {lower} and {upper}")
+            try:
+                yield records
+            except (AttributeError, TypeError, DBWriteError) as tx_err:
+                # Handle `RecordNotFound` cases when `writeable` is `False`.
+                if not writeable and isinstance(tx_err, AttributeError):
+                    raise RecordNotFound(tx_err)
+                raise DatastoreTransactionError(f'An error was encountered during the transaction (no data was written): {tx_err}')
+            finally:
+                for record in records:
+                    record._close()
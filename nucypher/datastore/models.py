@@ -22,12 +22,27 @@ from nucypher.crypto.signing import Signature
 from nucypher.datastore.base import DatastoreRecord, RecordField
 
 
+def expiration_index(maya_date: MayaDT) -> bytes:
+    """
+    Sort key of an expiration: microseconds since the Unix epoch, as 8 big-endian bytes,
+    so that byte order is chronological order.
+    """
+    microseconds = int(maya_date.epoch * 1_000_000)
+    if not 0 <= microseconds < 2 ** 64:
+        raise ValueError(f"Can't index expiration {maya_date.iso8601()}: "
+                         f"only dates from 1970-01-01 onward can be indexed.")
+    return microseconds.to_bytes(8, byteorder='big')
+
+
 class PolicyArrangement(DatastoreRecord):
+    __slots__ = ()
+
     _arrangement_id = RecordField(bytes)
     _expiration = RecordField(
             MayaDT,
             encode=lambda maya_date: maya_date.iso8601().encode(),
-            decode=lambda maya_bytes: MayaDT.from_iso8601(maya_bytes.decode()))
+            decode=lambda maya_bytes: MayaDT.from_iso8601(maya_bytes.decode()),
+            index=expiration_index)
     _kfrag = RecordField(
             KFrag,
             encode=lambda kfrag: kfrag.to_bytes(),
@@ -39,6 +54,8 @@ class PolicyArrangement(DatastoreRecord):
 
 
 class Workorder(DatastoreRecord):
+    __slots__ = ()
+
     _arrangement_id = RecordField(bytes)
     _bob_verifying_key = RecordField(
             UmbralPublicKey,
@@ -51,6 +68,8 @@ class Workorder(DatastoreRecord):
 
 
 class TreasureMap(DatastoreRecord):
+    __slots__ = ()
+
     # Ideally this is a `policy.collections.TreasureMap`, but it causes a huge
     # circular import due to `Bob` and `Character` in `policy.collections`.
     # TODO #2126
@@ -58,4 +77,5 @@ class TreasureMap(DatastoreRecord):
     _expiration = RecordField(
             MayaDT,
             encode=lambda maya_date: maya_date.iso8601().encode(),
-            decode=lambda maya_bytes: MayaDT.from_iso8601(maya_bytes.decode()))
+            decode=lambda maya_bytes: MayaDT.from_iso8601(maya_bytes.decode()),
+            index=expiration_index)
@@ -47,17 +47,11 @@ def unwrap_records(func: Callable[..., DatastoreQueryResult]) -> Callable[..., L
 
 
 def find_expired_policies(ds: Datastore, cutoff: maya.MayaDT) -> DatastoreQueryResult:
-    return ds.query_by(PolicyArrangement,
-                       filter_field='expiration',
-                       filter_func=lambda expiration: expiration <= cutoff,
-                       writeable=True)
+    return ds.query_by_range(PolicyArrangement, 'expiration', upper=cutoff, writeable=True)
 
 
 def find_expired_treasure_maps(ds: Datastore, cutoff: maya.MayaDT) -> DatastoreQueryResult:
-    return ds.query_by(TreasureMap,
-                       filter_field='expiration',
-                       filter_func=lambda expiration: expiration <= cutoff,
-                       writeable=True)
+    return ds.query_by_range(TreasureMap, 'expiration', upper=cutoff, writeable=True)
 
 
 @unwrap_records
@@ -14,4 +14,6 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
+# Fleet state checksums (the root of a Merkle trie of the known nodes) don't match those of older nodes
+# for the same fleet, but they are only compared to skip an exchange: a mismatch just means a full one.
 LEARNING_LOOP_VERSION = 2  # TODO: Rename to DISCOVERY_LOOP_VERSION
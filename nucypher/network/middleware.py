@@ -20,10 +20,13 @@ import requests
 import socket
 import ssl
 import time
-from bytestring_splitter import VariableLengthBytestring
+from bytestring_splitter import BytestringSplitter, VariableLengthBytestring
+from collections import OrderedDict
 from constant_sorrow.constants import CERTIFICATE_NOT_SAVED, EXEMPT_FROM_VERIFICATION
 from cryptography import x509
 from cryptography.hazmat.backends import default_backend
+from requests.adapters import HTTPAdapter
+from threading import Lock
 
 from nucypher.blockchain.eth.networks import NetworksInventory
 from nucypher.crypto.signing import signature_splitter
@@ -33,12 +36,130 @@ from nucypher.utilities.logging import Logger
 EXEMPT_FROM_VERIFICATION.bool_value(False)
 
 
+class _ResumableSSLSocket(ssl.SSLSocket):
+
+    def close(self):
+        # With TLS 1.3, session tickets arrive after the handshake, so the session
+        # of a connection is only worth keeping once it has been used.
+        self.context.remember_session(self)
+        super().close()
+
+
+class _ResumableSSLContext(ssl.SSLContext):
+    """
+    An SSLContext for the connections to a single node, which offers the TLS session of its
+    last connection when opening a new one, so that the node can resume it instead of doing a full handshake.
+    """
+
+    sslsocket_class = _ResumableSSLSocket
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.__session = None
+
+    def remember_session(self, tls_socket: ssl.SSLSocket) -> None:
+        try:
+            session = tls_socket.session
+        except (OSError, ValueError):
+            return
+        if session is not None:
+            self.__session = session
+
+    def wrap_socket(self, *args, **kwargs):
+        if not kwargs.get('server_side'):
+            kwargs.setdefault('session', self.__session)
+        tls_socket = super().wrap_socket(*args, **kwargs)
+        self.remember_session(tls_socket)
+        return tls_socket
+
+
+class _NodeAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter whose connections (to a single node) share a `_ResumableSSLContext`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.ssl_context = _ResumableSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        self.ssl_context.check_hostname = False  # The hostname is matched by urllib3 itself.
+        self.ssl_context.options |= ssl.OP_NO_COMPRESSION
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+
+class NodeSessionPool:
+    """
+    Keeps an HTTP session (with its pool of keep-alive connections) per node, keyed by its host
+    (and port) and certificate, so that requests to the same node reuse connections and TLS sessions.
+
+    At most `max_sessions` are kept, and sessions unused for `idle_timeout` seconds are closed.
+    """
+
+    DEFAULT_MAX_SESSIONS = 256
+    DEFAULT_CONNECTIONS_PER_NODE = 10
+    DEFAULT_IDLE_TIMEOUT = 300  # seconds
+
+    def __init__(self,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 connections_per_node: int = DEFAULT_CONNECTIONS_PER_NODE,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.max_sessions = max_sessions
+        self.connections_per_node = connections_per_node
+        self.idle_timeout = idle_timeout
+        self.__sessions = OrderedDict()  # (host, certificate_filepath) -> (session, last used time)
+        self.__lock = Lock()
+
+    def __len__(self):
+        return len(self.__sessions)
+
+    def __contains__(self, key):
+        return key in self.__sessions
+
+    def session(self, host: str, certificate_filepath) -> requests.Session:
+        key = (host, certificate_filepath)
+        now = time.monotonic()
+        with self.__lock:
+            self.__evict_idle_sessions(now)
+            try:
+                session, _last_used = self.__sessions.pop(key)
+            except KeyError:
+                session = self.__new_session()
+            self.__sessions[key] = (session, now)
+            while len(self.__sessions) > self.max_sessions:
+                _key, (evicted_session, _last_used) = self.__sessions.popitem(last=False)
+                evicted_session.close()
+            return session
+
+    def close(self) -> None:
+        with self.__lock:
+            for session, _last_used in self.__sessions.values():
+                session.close()
+            self.__sessions.clear()
+
+    def __new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.mount("https://", _NodeAdapter(pool_connections=1, pool_maxsize=self.connections_per_node))
+        return session
+
+    def __evict_idle_sessions(self, now: float) -> None:
+        # Sessions are ordered from the least to the most recently used.
+        while self.__sessions:
+            key, (session, last_used) = next(iter(self.__sessions.items()))
+            if now - last_used < self.idle_timeout:
+                break
+            del self.__sessions[key]
+            session.close()
+
+
 class NucypherMiddlewareClient:
     library = requests
     timeout = 1.2
 
     def __init__(self, registry=None, *args, **kwargs):
         self.registry = registry
+        self.sessions = NodeSessionPool()
 
     @staticmethod
     def response_cleaner(response):
@@ -115,6 +236,9 @@ class NucypherMiddlewareClient:
             else:
                 certificate_filepath = node_certificate_filepath
 
+            if http_client is self.library:
+                # Requests to the same node (with the same certificate) share keep-alive connections and TLS sessions.
+                http_client = self.sessions.session(host, certificate_filepath)
             method = getattr(http_client, method_name)
 
             url = f"https://{host}/{path}"
@@ -208,6 +332,42 @@ class RestMiddleware:
         cfrags_and_signatures = splitter.repeat(ursula_rest_response.content)
         return cfrags_and_signatures
 
+    def reencrypt_batch(self, work_orders):
+        """
+        Sends many WorkOrders, all to be completed by the same Ursula, in a single request.
+
+        Returns a list with one item per WorkOrder, in the same order: either the list of
+        (cfrag, signature) pairs for it, or the `UnexpectedResponse` for that WorkOrder alone.
+        """
+        if not work_orders:
+            return []
+        ursula = work_orders[0].ursula
+        if any(work_order.ursula.checksum_address != ursula.checksum_address for work_order in work_orders):
+            raise ValueError("All the WorkOrders in a batch must be for the same Ursula.")
+
+        payload = bytes().join(work_order.arrangement_id + VariableLengthBytestring(work_order.payload())
+                               for work_order in work_orders)
+        response = self.client.post(node_or_sprout=ursula,
+                                    path="kFrag/reencrypt_batch",
+                                    data=payload,
+                                    timeout=2 * len(work_orders))
+
+        splitter = cfrag_splitter + signature_splitter
+        batch_splitter = BytestringSplitter((int, 2, {"byteorder": "big"}), VariableLengthBytestring)
+        results = list()
+        for status, content in batch_splitter.repeat(response.content):
+            if status == 200:
+                results.append(splitter.repeat(content))
+            elif status == 404:
+                results.append(self.NotFound(f"Ursula has no KFrag for arrangement {content.hex()}"))
+            else:
+                results.append(self.UnexpectedResponse(content, status=status))
+
+        if len(results) != len(work_orders):
+            raise self.UnexpectedResponse(f"Expected {len(work_orders)} results but got {len(results)}",
+                                          status=response.status_code)
+        return results
+
     def revoke_arrangement(self, ursula, revocation):
         # TODO: Implement revocation confirmations
         response = self.client.delete(
@@ -256,17 +416,20 @@ class RestMiddleware:
                            node,
                            announce_nodes=None,
                            nodes_i_need=None,
-                           fleet_checksum=None):
+                           fleet_checksum=None,
+                           teacher_fleet_checksum=None):
         if nodes_i_need:
             # TODO: This needs to actually do something.  NRN
             # Include node_ids in the request; if the teacher node doesn't know about the
             # nodes matching these ids, then it will ask other nodes.
             pass
 
+        params = {}
         if fleet_checksum:
-            params = {'fleet': fleet_checksum}
-        else:
-            params = {}
+            params['fleet'] = fleet_checksum
+        if teacher_fleet_checksum:
+            # The teacher's fleet state we already know all the nodes of; it only needs to send what changed since.
+            params['since'] = teacher_fleet_checksum
 
         if announce_nodes:
             payload = bytes().join(bytes(VariableLengthBytestring(n)) for n in announce_nodes)
@@ -18,9 +18,11 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 import contextlib
 import time
 from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 from contextlib import suppress
 from queue import Queue
-from typing import Iterable, List, Set, Tuple, Union
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import maya
 import requests
@@ -47,15 +49,16 @@ from twisted.internet.defer import Deferred
 from umbral.signing import Signature
 
 from nucypher.acumen.nicknames import Nickname
-from nucypher.acumen.perception import FleetSensor
+from nucypher.acumen.perception import FleetSensor, FleetState
 from nucypher.blockchain.economics import EconomicsFactory
 from nucypher.blockchain.eth.agents import ContractAgency, StakingEscrowAgent
 from nucypher.blockchain.eth.constants import NULL_ADDRESS
 from nucypher.blockchain.eth.networks import NetworksInventory
 from nucypher.blockchain.eth.registry import BaseContractRegistry
+from nucypher.blockchain.eth.utils import period_to_epoch
 from nucypher.config.constants import SeednodeMetadata
 from nucypher.config.storages import ForgetfulNodeStorage
-from nucypher.crypto.api import InvalidNodeCertificate, recover_address_eip_191, verify_eip_191
+from nucypher.crypto.api import InvalidNodeCertificate, memoized_verify_eip_191, recover_address_eip_191
 from nucypher.crypto.kits import UmbralMessageKit
 from nucypher.crypto.powers import DecryptingPower, NoSigningPower, SigningPower
 from nucypher.crypto.signing import signature_splitter
@@ -63,6 +66,7 @@ from nucypher.network import LEARNING_LOOP_VERSION
 from nucypher.network.exceptions import NodeSeemsToBeDown
 from nucypher.network.middleware import RestMiddleware
 from nucypher.network.protocols import SuspiciousActivity
+from nucypher.types import Period
 from nucypher.utilities.logging import Logger
 
 TEACHER_NODES = {
@@ -152,6 +156,140 @@ class NodeSprout(PartiallyKwargifiedBytes):
         return self  # To reduce the awkwardity of renaming; this is always the weird part of polymorphism for me.
 
 
+class StakingStatusCache:
+    """
+    What is known about workers and stakers in the current period, so that verifying many nodes
+    doesn't take several contract calls for each one of them: the current period is read once, and kept
+    until the time it ends, and, once enough stakers have been checked in a period, the active stakers
+    are read in bulk.
+
+    Only positive answers are kept (workers bonded to a staker, and stakers that are staking),
+    since those hold for the rest of the period, but negative ones don't (eg. a worker may be bonded later on).
+    Workers can be unbonded at any time though, so the WorkerBonded events are followed to forget about
+    the bonds that changed since they were read.  The current period is read again along with them,
+    in case the chain's clock is not the same as ours.
+
+    Each learner keeps its own, and hands it to the nodes it verifies.
+    """
+
+    BULK_READ_THRESHOLD = 10  # Stakers checked one by one in a period before reading all the active ones at once
+    WORKER_BONDS_CHECK_INTERVAL = 15  # seconds, about a block
+
+    class _PeriodStatus:
+
+        def __init__(self, period: Period, ends_at: float):
+            self.period = period
+            self.ends_at = ends_at  # epoch
+            self.stakers_from_workers = dict()  # type: Dict[str, str]
+            self.staking_stakers = set()  # type: Set[str]
+            self.stakers_checked = 0
+            self.active_stakers_loaded = False
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.__statuses = dict()  # registry ID -> status for its current period
+        self.__bonds_checked = dict()  # registry ID -> (last block scanned for WorkerBonded events, when)
+        self.__lock = Lock()
+        self.__clock = clock
+
+    def __current_status(self, registry: BaseContractRegistry, staking_agent: StakingEscrowAgent) -> _PeriodStatus:
+        now = self.__clock()
+        with self.__lock:
+            status = self.__statuses.get(registry.id)
+            bonds_checked = self.__bonds_checked.get(registry.id)
+        period_ended = status is None or now >= status.ends_at
+        bonds_check_due = bonds_checked is None or now - bonds_checked[1] >= self.WORKER_BONDS_CHECK_INTERVAL
+        if not (period_ended or bonds_check_due):
+            return status
+
+        # The contract calls are made without holding the lock; it's only taken to apply their results.
+        current_period = staking_agent.get_current_period()
+        seconds_per_period = EconomicsFactory.get_economics(registry=registry).seconds_per_period
+        if bonds_check_due:
+            latest_block, changed_bonds = self.__read_changed_bonds(staking_agent=staking_agent,
+                                                                    status=status,
+                                                                    bonds_checked=bonds_checked)
+
+        with self.__lock:
+            status = self.__statuses.get(registry.id)
+            if status is None or status.period != current_period:
+                status = self._PeriodStatus(period=current_period,
+                                            ends_at=period_to_epoch(current_period + 1, seconds_per_period))
+                self.__statuses[registry.id] = status
+            # Unless another thread applied a newer check in the meantime.
+            if bonds_check_due and self.__bonds_checked.get(registry.id) == bonds_checked:
+                for staker_address, worker_address in changed_bonds:
+                    status.stakers_from_workers.pop(worker_address, None)
+                    for worker, staker in list(status.stakers_from_workers.items()):
+                        if staker == staker_address:
+                            del status.stakers_from_workers[worker]
+                self.__bonds_checked[registry.id] = (latest_block, now)
+            return status
+
+    @staticmethod
+    def __read_changed_bonds(staking_agent: StakingEscrowAgent,
+                             status: Optional[_PeriodStatus],
+                             bonds_checked: Optional[Tuple[int, float]]
+                             ) -> Tuple[int, List[Tuple[str, str]]]:
+        """Returns the latest block, and the (staker, worker) bonds made since the last block scanned."""
+        latest_block = staking_agent.blockchain.client.block_number
+        changed_bonds = list()
+        if bonds_checked is not None and status is not None and status.stakers_from_workers:
+            last_scanned_block, _checked_at = bonds_checked
+            if latest_block > last_scanned_block:
+                bonds = staking_agent.events.WorkerBonded(from_block=last_scanned_block + 1, to_block=latest_block)
+                changed_bonds = [(bond.args['staker'], bond.args['worker']) for bond in bonds]
+        return latest_block, changed_bonds
+
+    def staker_from_worker(self, registry: BaseContractRegistry, worker_address: str) -> str:
+        staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=registry)
+        status = self.__current_status(registry=registry, staking_agent=staking_agent)
+        try:
+            return status.stakers_from_workers[worker_address]
+        except KeyError:
+            bonds_checked = self.__bonds_checked.get(registry.id)
+            staker_address = staking_agent.get_staker_from_worker(worker_address=worker_address)
+            with self.__lock:
+                # Unless the bonds were checked in the meantime, and this answer may predate a change.
+                if staker_address != NULL_ADDRESS and self.__bonds_checked.get(registry.id) == bonds_checked:
+                    status.stakers_from_workers[worker_address] = staker_address
+            return staker_address
+
+    def is_staking(self, registry: BaseContractRegistry, staker_address: str) -> bool:
+        staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=registry)
+        status = self.__current_status(registry=registry, staking_agent=staking_agent)
+        if staker_address in status.staking_stakers:
+            return True
+
+        try:
+            economics = EconomicsFactory.get_economics(registry=registry)
+        except Exception:
+            raise  # TODO: Get StandardEconomics  NRN
+        min_stake = economics.minimum_allowed_locked
+
+        with self.__lock:
+            status.stakers_checked += 1
+            read_in_bulk = not status.active_stakers_loaded and status.stakers_checked > self.BULK_READ_THRESHOLD
+            if read_in_bulk:
+                status.active_stakers_loaded = True
+        if read_in_bulk and staking_agent.get_staker_population():
+            # The tokens that active stakers have locked for the next period.
+            _all_locked_tokens, active_stakers = staking_agent.get_all_active_stakers(periods=1)
+            staking_stakers = {staker for staker, locked_tokens in active_stakers.items() if locked_tokens >= min_stake}
+            with self.__lock:
+                status.staking_stakers.update(staking_stakers)
+            if staker_address in staking_stakers:
+                return True
+
+        # Not an active staker with enough tokens locked for the next period; it may still be staking this period.
+        stake_current_period = staking_agent.get_locked_tokens(staker_address=staker_address, periods=0)
+        stake_next_period = staking_agent.get_locked_tokens(staker_address=staker_address, periods=1)
+        is_staking = max(stake_current_period, stake_next_period) >= min_stake
+        if is_staking:
+            with self.__lock:
+                status.staking_stakers.add(staker_address)
+        return is_staking
+
+
 class DiscoveryCanceller:
 
     def __init__(self):
@@ -176,6 +314,8 @@ class Learner:
     _LONG_LEARNING_DELAY = 90
     LEARNING_TIMEOUT = 10
     _ROUNDS_WITHOUT_NODES_AFTER_WHICH_TO_SLOW_DOWN = 10
+    MAX_CONCURRENT_TEACHERS = 32
+    TEACHER_RESPONSE_TIMEOUT = LEARNING_TIMEOUT  # Longer than the middleware's own timeout for the nodes request
 
     # For Keeps
     __DEFAULT_NODE_STORAGE = ForgetfulNodeStorage
@@ -224,10 +364,20 @@ class Learner:
                  lonely: bool = False,
                  verify_node_bonding: bool = True,
                  include_self_in_the_state: bool = False,
+                 max_concurrent_teachers: int = 1,
                  ) -> None:
 
         self.log = Logger("learning-loop")  # type: Logger
 
+        # Teachers queried concurrently in each learning round.  With more than one, the number
+        # of teachers per round adapts (up to this maximum) to how fast the fleet state is converging.
+        if not 1 <= max_concurrent_teachers <= self.MAX_CONCURRENT_TEACHERS:
+            raise ValueError(f"The number of concurrent teachers must be between 1 and {self.MAX_CONCURRENT_TEACHERS}, "
+                             f"got {max_concurrent_teachers}")
+        self.max_concurrent_teachers = max_concurrent_teachers
+        self.teachers_per_round = max_concurrent_teachers
+        self.__teaching_executor = None
+
         self.suspicious_activities_witnessed = defaultdict(list)  # TODO: Combine with buckets / node labeling
 
         self.learning_deferred = Deferred()
@@ -245,8 +395,13 @@ class Learner:
         self._learning_listeners = defaultdict(list)
         self._node_ids_to_learn_about_immediately = set()
 
+        # The fleet state checksum of each teacher whose nodes we have fully taken in (and how many nodes
+        # we had forgotten by then), so that next time it only has to send us what changed since then.
+        self._teacher_states_learned = dict()
+
         self.__known_nodes = self.tracker_class(domain=domain, this_node=self if include_self_in_the_state else None)
         self._verify_node_bonding = verify_node_bonding
+        self.staking_status = StakingStatusCache()  # For the nodes this learner verifies
 
         self.lonely = lonely
         self.done_seeding = False
@@ -434,7 +589,8 @@ class Learner:
             try:
                 node.verify_node(force=force_verification_recheck,
                                  network_middleware_client=self.network_middleware.client,
-                                 registry=registry)
+                                 registry=registry,
+                                 staking_status=self.staking_status)
             except SSLError:
                 # TODO: Bucket this node as having bad TLS info - maybe it's an update that hasn't fully propagated?  567
                 return False
@@ -494,6 +650,13 @@ class Learner:
             # self._learning_deferred.cancel()  # TODO: The problem here is that this might already be called.
             self._discovery_canceller(self._learning_deferred)
 
+        if self.__teaching_executor is not None:
+            self.__teaching_executor.shutdown(wait=False)
+            self.__teaching_executor = None
+
+        if self.save_metadata:
+            self.node_storage.flush()
+
         # self.learning_deferred.cancel()  # TODO: The problem here is that there's no way to get a canceller into the LoopingCall.
 
     def handle_learning_errors(self, failure, *args, **kwargs):
@@ -553,6 +716,29 @@ class Learner:
 
         return teacher
 
+    def teachers_for_this_round(self) -> List['Teacher']:
+        """
+        The current teacher, and the ones after it, up to `teachers_per_round` different teachers.
+        """
+        teachers = {}
+        teacher = self.current_teacher_node()  # Will raise if there's no available teacher.
+        while teacher.checksum_address not in teachers:
+            teachers[teacher.checksum_address] = teacher
+            if len(teachers) == self.teachers_per_round:
+                break
+            teacher = self.current_teacher_node(cycle=True)
+        return list(teachers.values())
+
+    def _adapt_teachers_per_round(self, new_nodes: int) -> None:
+        """
+        While there are new nodes to learn about, the fleet state is still converging, so ask more
+        teachers at once; once they have nothing new to teach, ask fewer.
+        """
+        if new_nodes:
+            self.teachers_per_round = min(self.teachers_per_round * 2, self.max_concurrent_teachers)
+        else:
+            self.teachers_per_round = max(self.teachers_per_round // 2, 1)
+
     def learn_about_nodes_now(self, force=False):
         if self._learning_task.running:
             self._learning_task.reset()
@@ -779,26 +965,137 @@ class Learner:
 
         self._learning_round += 1
 
-        current_teacher = self.current_teacher_node()  # Will raise if there's no available teacher.
+        teachers = self.teachers_for_this_round()
 
         if isinstance(self, Teacher):
             announce_nodes = [self]
         else:
             announce_nodes = None
 
-        unresponsive_nodes = set()
-
         #
         # Request
         #
         if canceller and canceller.stop_now:
             return RELAX
 
+        teacher_states_learned = {teacher.checksum_address: self.__pop_teacher_state_learned(teacher)
+                                  for teacher in teachers}
+        try:
+            responses = self.__request_nodes_from(teachers, announce_nodes, teacher_states_learned)
+        finally:
+            # Is cycling happening in the right order?
+            self.cycle_teacher_node()
+
+        # The same node is usually known by several of the teachers: only take it in once per round.
+        sprouts_seen, sprouts_failed = dict(), set()
+        results, errors = list(), list()
+        pending = dict(responses)
+        try:
+            for response in as_completed(responses, timeout=self.TEACHER_RESPONSE_TIMEOUT):
+                current_teacher = pending.pop(response)
+                try:
+                    result = self.__learn_from_response(current_teacher,
+                                                        response,
+                                                        teacher_state_learned=teacher_states_learned[current_teacher.checksum_address],
+                                                        sprouts_seen=sprouts_seen,
+                                                        sprouts_failed=sprouts_failed,
+                                                        remembered=remembered,
+                                                        eager=eager,
+                                                        canceller=canceller)
+                except Exception as e:
+                    # One teacher going wrong doesn't spoil what the others taught us this round.
+                    errors.append(e)
+                else:
+                    results.append(result)
+        except FutureTimeoutError:
+            late_teachers = ", ".join(str(teacher) for teacher in pending.values())
+            self.log.info(f"Teachers {late_teachers} didn't answer within {self.TEACHER_RESPONSE_TIMEOUT} seconds; "
+                          f"ignoring them this round.")
+
+        if self.max_concurrent_teachers > 1:
+            self._adapt_teachers_per_round(new_nodes=len(remembered))
+
+        if remembered:
+            self.known_nodes.record_fleet_state()
+            if self.save_metadata:
+                self.node_storage.flush()  # The metadata of everyone we met in this round, at once.
+
+        if errors:
+            raise errors[0]
+
+        if len(results) == 1:
+            return results[0]
+        learned_sprouts = [result for result in results if isinstance(result, list)]
+        if learned_sprouts:
+            return list(sprouts_seen.values())
+        for result in results:
+            if result in (FLEET_STATES_MATCH, NO_KNOWN_NODES):
+                return result
+
+    def __pop_teacher_state_learned(self, teacher) -> Optional[str]:
+        try:
+            fleet_state_checksum, nodes_forgotten = self._teacher_states_learned.pop(teacher.checksum_address)
+        except KeyError:
+            return None
+        if nodes_forgotten != self.known_nodes.nodes_forgotten:
+            # We forgot somebody since then; the teacher wouldn't tell us about them again in an update.
+            return None
+        return fleet_state_checksum
+
+    def __record_teacher_state_learned(self, teacher, fleet_state_checksum: str) -> None:
+        self._teacher_states_learned[teacher.checksum_address] = (fleet_state_checksum,
+                                                                  self.known_nodes.nodes_forgotten)
+
+    def __request_nodes_from(self, teachers, announce_nodes, teacher_states_learned) -> dict:
+        """
+        Requests the nodes of each one of `teachers`: concurrently, if there are many.
+        Returns the future response of each teacher.
+        """
+        def request(teacher):
+            return self.network_middleware.get_nodes_via_rest(node=teacher,
+                                                              nodes_i_need=self._node_ids_to_learn_about_immediately,
+                                                              announce_nodes=announce_nodes,
+                                                              fleet_checksum=self.known_nodes.checksum,
+                                                              teacher_fleet_checksum=teacher_states_learned[teacher.checksum_address])
+
+        if len(teachers) == 1:
+            teacher = teachers[0]
+            response = Future()
+            try:
+                response.set_result(request(teacher))
+            except Exception as e:
+                response.set_exception(e)
+            return {response: teacher}
+
+        if self.__teaching_executor is None:
+            self.__teaching_executor = ThreadPoolExecutor(max_workers=self.max_concurrent_teachers,
+                                                          thread_name_prefix="learning")
+        return {self.__teaching_executor.submit(request, teacher): teacher for teacher in teachers}
+
+    def __knows_about(self, sprout) -> bool:
+        """
+        Whether we know this node already, with metadata at least as recent as the sprout's.
+        """
+        if sprout == self:
+            return True
         try:
-            response = self.network_middleware.get_nodes_via_rest(node=current_teacher,
-                                                                  nodes_i_need=self._node_ids_to_learn_about_immediately,
-                                                                  announce_nodes=announce_nodes,
-                                                                  fleet_checksum=self.known_nodes.checksum)
+            return self.known_nodes[sprout.checksum_address].timestamp >= sprout.timestamp
+        except KeyError:
+            return False
+
+    def __learn_from_response(self,
+                              current_teacher: 'Teacher',
+                              response: Future,
+                              teacher_state_learned: Optional[str],
+                              sprouts_seen: dict,
+                              sprouts_failed: set,
+                              remembered: list,
+                              eager: bool,
+                              canceller):
+        unresponsive_nodes = set()
+
+        try:
+            response = response.result()
         # These except clauses apply to the current_teacher itself, not the learned-about nodes.
         except NodeSeemsToBeDown as e:
             unresponsive_nodes.add(current_teacher)
@@ -823,9 +1120,6 @@ class Learner:
         except Exception as e:
             self.log.warn(f"Unhandled error while learning from {str(current_teacher)}: {bytes(current_teacher)}:{e}.")  # To track down 2345 / 1698
             raise
-        finally:
-            # Is cycling happening in the right order?
-            self.cycle_teacher_node()
 
         # Before we parse the response, let's handle some edge cases.
         if response.status_code == 204:
@@ -871,6 +1165,7 @@ class Learner:
                 fleet_state_checksum,
                 fleet_state_updated,
                 self.known_nodes.population)
+            self.__record_teacher_state_learned(current_teacher, fleet_state_checksum)
 
             return FLEET_STATES_MATCH
 
@@ -880,15 +1175,24 @@ class Learner:
 
         sprouts = self.node_class.batch_from_bytes(node_payload)
 
+        remembered_before = len(remembered)
         for sprout in sprouts:
             fail_fast = True  # TODO  NRN
+            seen_sprout = sprouts_seen.get(sprout.checksum_address)
+            if seen_sprout is not None and seen_sprout.timestamp >= sprout.timestamp:
+                continue  # Another teacher already taught us about this node this round.
+            sprouts_seen[sprout.checksum_address] = sprout
+            taken_in = False
             try:
+                already_known = self.__knows_about(sprout)
                 node_or_false = self.remember_node(sprout,
                                                    record_fleet_state=False,
                                                    # Do we want both of these to be decided by `eager`?
                                                    eager=eager)
                 if node_or_false is not False:
                     remembered.append(node_or_false)
+                # Otherwise, we either knew this node already, or it failed verification.
+                taken_in = node_or_false is not False or already_known
 
                 #
                 # Report Failure
@@ -925,12 +1229,28 @@ class Learner:
                           f"Propagated by: {current_teacher}"
                 self.log.warn(message)
 
+            if taken_in:
+                sprouts_failed.discard(sprout.checksum_address)
+            else:
+                sprouts_failed.add(sprout.checksum_address)
+
+        if teacher_state_learned is None:
+            population = len(sprouts)
+        else:
+            # The teacher may have only sent us the nodes updated since the state we learned last time.
+            previous_state = self.known_nodes.remote_fleet_state(current_teacher.checksum_address)
+            population = max(len(sprouts), previous_state.population if previous_state else 0)
+
         # Is cycling happening in the right order?
         self.known_nodes.record_remote_fleet_state(
             current_teacher.checksum_address,
             fleet_state_checksum,
             fleet_state_updated,
-            len(sprouts))
+            population)
+
+        # If some of the nodes didn't check out, we'll want to hear about them again.
+        if not any(sprout.checksum_address in sprouts_failed for sprout in sprouts):
+            self.__record_teacher_state_learned(current_teacher, fleet_state_checksum)
 
         ###################
 
@@ -938,9 +1258,7 @@ class Learner:
         self.log.info(learning_round_log_message.format(self._learning_round,
                                                         current_teacher,
                                                         len(sprouts),
-                                                        len(remembered)))
-        if remembered:
-            self.known_nodes.record_fleet_state()
+                                                        len(remembered) - remembered_before))
         return sprouts
 
 
@@ -1043,9 +1361,17 @@ class Teacher:
         nodes_to_consider = list(self.known_nodes.values()) + [self]
         return sorted(nodes_to_consider, key=lambda n: n.checksum_address)
 
-    def bytestring_of_known_nodes(self):
+    def bytestring_of_known_nodes(self, since_fleet_state: Optional[FleetState] = None):
+        """
+        Serializes the current fleet state snapshot, the known nodes and this node itself.
+        If ``since_fleet_state`` is given, only the nodes which are new or updated since that state are included.
+        """
         payload = self.known_nodes.snapshot()
-        ursulas_as_vbytes = (VariableLengthBytestring(n) for n in self.known_nodes)
+        if since_fleet_state is None:
+            nodes = self.known_nodes
+        else:
+            nodes = self.known_nodes.current_state.nodes_updated_since(since_fleet_state)
+        ursulas_as_vbytes = (VariableLengthBytestring(n) for n in nodes)
         ursulas_as_bytes = bytes().join(bytes(u) for u in ursulas_as_vbytes)
         ursulas_as_bytes += VariableLengthBytestring(bytes(self))
 
@@ -1065,30 +1391,45 @@ class Teacher:
         """
         if self.__decentralized_identity_evidence is NOT_SIGNED:
             return False
-        signature_is_valid = verify_eip_191(message=bytes(self.stamp),
-                                            signature=self.__decentralized_identity_evidence,
-                                            address=self.worker_address)
+        # This is checked on every validation of the node and on every WorkOrder for it;
+        # the result for a given stamp, evidence and worker is always the same.
+        signature_is_valid = memoized_verify_eip_191(address=self.worker_address,
+                                                     message=bytes(self.stamp),
+                                                     signature=self.__decentralized_identity_evidence)
         return signature_is_valid
 
-    def _worker_is_bonded_to_staker(self, registry: BaseContractRegistry) -> bool:
+    def _worker_is_bonded_to_staker(self,
+                                    registry: BaseContractRegistry,
+                                    staking_status: Optional[StakingStatusCache] = None
+                                    ) -> bool:
         """
         This method assumes the stamp's signature is valid and accurate.
         As a follow-up, this checks that the worker is bonded to a staker, but it may be
         the case that the "staker" isn't "staking" (e.g., all her tokens have been slashed).
+        The `staking_status` of the verifying learner, if given, saves contract calls.
         """
-        # Lazy agent get or create
-        staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=registry)
-
-        staker_address = staking_agent.get_staker_from_worker(worker_address=self.worker_address)
+        if staking_status is not None:
+            staker_address = staking_status.staker_from_worker(registry=registry, worker_address=self.worker_address)
+        else:
+            # Lazy agent get or create
+            staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=registry)
+            staker_address = staking_agent.get_staker_from_worker(worker_address=self.worker_address)
         if staker_address == NULL_ADDRESS:
             raise self.UnbondedWorker(f"Worker {self.worker_address} is not bonded")
         return staker_address == self.checksum_address
 
-    def _staker_is_really_staking(self, registry: BaseContractRegistry) -> bool:
+    def _staker_is_really_staking(self,
+                                  registry: BaseContractRegistry,
+                                  staking_status: Optional[StakingStatusCache] = None
+                                  ) -> bool:
         """
         This method assumes the stamp's signature is valid and accurate.
         As a follow-up, this checks that the staker is, indeed, staking.
+        The `staking_status` of the verifying learner, if given, saves contract calls.
         """
+        if staking_status is not None:
+            return staking_status.is_staking(registry=registry, staker_address=self.checksum_address)
+
         # Lazy agent get or create
         staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=registry)  # type: StakingEscrowAgent
 
@@ -1104,7 +1445,10 @@ class Teacher:
         is_staking = max(stake_current_period, stake_next_period) >= min_stake
         return is_staking
 
-    def validate_worker(self, registry: BaseContractRegistry = None) -> None:
+    def validate_worker(self,
+                        registry: BaseContractRegistry = None,
+                        staking_status: Optional[StakingStatusCache] = None
+                        ) -> None:
 
         # Federated
         if self.federated_only:
@@ -1126,19 +1470,23 @@ class Teacher:
 
             # On-chain staking check, if registry is present
             if registry:
-                if not self._worker_is_bonded_to_staker(registry=registry):  # <-- Blockchain CALL
+                if not self._worker_is_bonded_to_staker(registry=registry,  # <-- Blockchain CALL
+                                                        staking_status=staking_status):
                     message = f"Worker {self.worker_address} is not bonded to staker {self.checksum_address}"
                     self.log.debug(message)
                     raise self.UnbondedWorker(message)
 
-                if self._staker_is_really_staking(registry=registry):  # <-- Blockchain CALL
+                if self._staker_is_really_staking(registry=registry,  # <-- Blockchain CALL
+                                                  staking_status=staking_status):
                     self.verified_worker = True
                 else:
                     raise self.NotStaking(f"Staker {self.checksum_address} is not staking")
 
             self.verified_stamp = True
 
-    def validate_metadata(self, registry: BaseContractRegistry = None):
+    def validate_metadata(self,
+                          registry: BaseContractRegistry = None,
+                          staking_status: Optional[StakingStatusCache] = None):
 
         # Verify the interface signature
         if not self.verified_interface:
@@ -1150,7 +1498,7 @@ class Teacher:
 
         # Offline check of valid stamp signature by worker
         try:
-            self.validate_worker(registry=registry)
+            self.validate_worker(registry=registry, staking_status=staking_status)
         except self.WrongMode:
             if bool(registry):
                 raise
@@ -1159,7 +1507,8 @@ class Teacher:
                     network_middleware_client,
                     registry: BaseContractRegistry = None,
                     certificate_filepath: str = None,
-                    force: bool = False
+                    force: bool = False,
+                    staking_status: Optional[StakingStatusCache] = None
                     ) -> bool:
         """
         Three things happening here:
@@ -1173,6 +1522,7 @@ class Teacher:
           checked are the same ones this node is using now. (raises InvalidNode if not valid;
           also emits a specific warning depending on which check failed).
 
+        The `staking_status` of the verifying learner, if given, saves contract calls on the staking checks.
         """
 
         if force:
@@ -1190,7 +1540,7 @@ class Teacher:
 
         # This is both the stamp's client signature and interface metadata check; May raise InvalidNode
         try:
-            self.validate_metadata(registry=registry)
+            self.validate_metadata(registry=registry, staking_status=staking_status)
         except self.UnbondedWorker:  # TODO: Why are we specifically catching this and not other reasons for invalidity, eg StampNotSigned?
             self.verified_node = False
             return False
@@ -1269,7 +1619,8 @@ class Teacher:
 
     @property
     def _interface_signature(self):
-        if not self.__interface_signature:
+        # Not by truthiness: the length of a signature is that of its serialization.
+        if self.__interface_signature is None or self.__interface_signature is NOT_SIGNED:
             try:
                 self._sign_and_date_interface_info()
             except NoSigningPower:
@@ -20,7 +20,7 @@ import binascii
 import os
 import uuid
 import weakref
-from bytestring_splitter import BytestringSplitter
+from bytestring_splitter import BytestringSplitter, BytestringSplittingError, VariableLengthBytestring
 from constant_sorrow import constants
 from constant_sorrow.constants import (
     FLEET_STATES_MATCH,
@@ -35,6 +35,7 @@ from mako.template import Template
 from maya import MayaDT
 from typing import Tuple
 from umbral.kfrags import KFrag
+from umbral.pre import Capsule
 from web3.exceptions import TimeExhausted
 
 import nucypher
@@ -182,9 +183,20 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
         if not this_node.known_nodes:
             return Response(b"", headers=headers, status=204)
 
-        known_nodes_bytestring = this_node.bytestring_of_known_nodes()
-        signature = this_node.stamp(known_nodes_bytestring)
-        return Response(bytes(signature) + known_nodes_bytestring, headers=headers)
+        # If the learner knows all about one of our recent fleet states, it only needs what changed since.
+        # Otherwise (or for older learners, which don't send this), we send everything.
+        learner_knows_state = request.args.get('since')
+        since_fleet_state = this_node.known_nodes.recent_state(learner_knows_state) if learner_knows_state else None
+
+        def signed_known_nodes():
+            known_nodes_bytestring = this_node.bytestring_of_known_nodes(since_fleet_state=since_fleet_state)
+            signature = this_node.stamp(known_nodes_bytestring)
+            return bytes(signature) + known_nodes_bytestring
+
+        # Every learner asking about the same fleet state gets the same bytes, so we only serialize and sign them once.
+        cache_key = ('known_nodes', since_fleet_state.checksum if since_fleet_state else None)
+        payload = this_node.known_nodes.cached_payload(cache_key, signed_known_nodes)
+        return Response(payload, headers=headers)
 
     @rest_app.route('/node_metadata', methods=["POST"])
     def node_metadata_exchange():
@@ -194,14 +206,21 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
         if learner_fleet_state == this_node.known_nodes.checksum:
             # log.debug("Learner already knew fleet state {}; doing nothing.".format(learner_fleet_state))  # 1712
             headers = {'Content-Type': 'application/octet-stream'}
-            payload = this_node.known_nodes.snapshot() + bytes(FLEET_STATES_MATCH)
-            signature = this_node.stamp(payload)
-            return Response(bytes(signature) + payload, headers=headers)
+
+            def signed_fleet_states_match():
+                payload = this_node.known_nodes.snapshot() + bytes(FLEET_STATES_MATCH)
+                signature = this_node.stamp(payload)
+                return bytes(signature) + payload
+
+            payload = this_node.known_nodes.cached_payload('fleet_states_match', signed_fleet_states_match)
+            return Response(payload, headers=headers)
 
         sprouts = _node_class.batch_from_bytes(request.data)
 
         for node in sprouts:
             this_node.remember_node(node)
+        if this_node.save_metadata:
+            this_node.node_storage.flush()  # Rather than waiting for a batch to fill up, or the next learning round.
 
         # TODO: What's the right status code here?  202?  Different if we already knew about the node(s)?
         return all_known_nodes()
@@ -342,6 +361,85 @@ def _make_rest_app(datastore: Datastore, this_node, domain: str, log: Logger) ->
         headers = {'Content-Type': 'application/octet-stream'}
         return Response(headers=headers, response=response)
 
+    @rest_app.route('/kFrag/reencrypt_batch', methods=["POST"])
+    def reencrypt_batch_via_rest():
+        """
+        REST endpoint for re-encrypting many WorkOrders, possibly for different arrangements, in a single request.
+
+        The request body is a sequence of (arrangement ID, VariableLengthBytestring(work order payload)) pairs.
+        The response body holds one (status, VariableLengthBytestring(content)) pair per requested WorkOrder,
+        in the same order, where the content is what `reencrypt_via_rest` would have responded with.
+        A WorkOrder that is invalid, or can't be re-encrypted, only gets an error status for itself;
+        any other error fails the whole request.
+        """
+        from nucypher.policy.collections import WorkOrder  # Avoid circular import
+        from nucypher.policy.policies import Arrangement
+
+        batch_splitter = BytestringSplitter((bytes, Arrangement.ID_LENGTH), VariableLengthBytestring)
+        try:
+            batch = batch_splitter.repeat(request.data)
+        except BytestringSplittingError:
+            return Response(response=b'Invalid WorkOrder batch', status=400)
+
+        # Get all the KFrags in a single read transaction
+        # TODO: Yeah, well, what if these arrangements haven't been enacted?  1702
+        arrangements = dict()
+        ids_as_hex = [arrangement_id.hex() for arrangement_id, _payload in batch]
+        with datastore.describe_many(PolicyArrangement, ids_as_hex) as policy_arrangements:
+            for id_as_hex, policy_arrangement in zip(ids_as_hex, policy_arrangements):
+                try:
+                    arrangements[id_as_hex] = policy_arrangement.kfrag, policy_arrangement.alice_verifying_key
+                except AttributeError:
+                    continue  # Not found; reported below, per WorkOrder.
+
+        results, completed_work_orders = list(), list()
+        for arrangement_id, work_order_payload in batch:
+            try:
+                kfrag, alice_verifying_key = arrangements[arrangement_id.hex()]
+            except KeyError:
+                results.append((404, arrangement_id))
+                continue
+
+            alice_address = canonical_address_from_umbral_key(alice_verifying_key)
+            try:
+                work_order = WorkOrder.from_rest_payload(arrangement_id=arrangement_id,
+                                                         rest_payload=work_order_payload,
+                                                         ursula=this_node,
+                                                         alice_address=alice_address)
+            except (BytestringSplittingError, InvalidSignature) as e:
+                # A malformed or forged WorkOrder is only reported for this item, not for the rest of the batch.
+                log.debug(f"Invalid WorkOrder for arrangement {arrangement_id.hex()} in batch: {e!r}")
+                results.append((400, b'Invalid WorkOrder'))
+                continue
+            log.info(f"Work Order from {work_order.bob}, signed {work_order.receipt_signature}")
+
+            # Re-encrypt
+            try:
+                response = this_node._reencrypt(kfrag=kfrag,
+                                                work_order=work_order,
+                                                alice_verifying_key=alice_verifying_key)
+            except (Capsule.NotValid, KFrag.NotValid) as e:
+                # The Capsule is not valid, or not for the KFrag of this arrangement: that's on the client.
+                log.warn(f"Failed to re-encrypt Work Order from {work_order.bob} in batch: {e!r}")
+                results.append((400, b'Invalid Capsule or KFrag'))
+                continue
+            results.append((200, response))
+            completed_work_orders.append(work_order)
+
+        # Now, Ursula saves all the workorders to her database in a single write transaction.
+        # Note: we give each work order a random ID to store it under.
+        workorder_ids = [str(uuid.uuid4()) for _ in completed_work_orders]
+        with datastore.describe_many(Workorder, workorder_ids, writeable=True) as new_workorders:
+            for new_workorder, work_order in zip(new_workorders, completed_work_orders):
+                new_workorder.arrangement_id = work_order.arrangement_id
+                new_workorder.bob_verifying_key = work_order.bob.stamp.as_umbral_pubkey()
+                new_workorder.bob_signature = work_order.receipt_signature
+
+        batch_response = bytes().join(status.to_bytes(2, "big") + VariableLengthBytestring(content)
+                                      for status, content in results)
+        headers = {'Content-Type': 'application/octet-stream'}
+        return Response(headers=headers, response=batch_response)
+
     @rest_app.route('/treasure_map/<identifier>')
     def provide_treasure_map(identifier):
         headers = {'Content-Type': 'application/octet-stream'}
@@ -440,6 +440,15 @@ class WorkOrder:
         return bytes(self.receipt_signature) + self.bob.stamp + self.blockhash + tasks_bytes
 
     def complete(self, cfrags_and_signatures):
+        good_cfrags = self.verify_work_results(cfrags_and_signatures)
+        self.attach_work_results(cfrags_and_signatures)
+        return good_cfrags
+
+    def verify_work_results(self, cfrags_and_signatures):
+        """
+        Checks that the cfrags were signed by Ursula, for the tasks of this WorkOrder,
+        without completing it (see `attach_work_results`).  Returns the cfrags.
+        """
         good_cfrags = []
         if not len(self) == len(cfrags_and_signatures):
             raise ValueError("Ursula gave back the wrong number of cfrags. She's up to something.")
@@ -461,11 +470,14 @@ class WorkOrder:
                 raise InvalidSignature(f"{cfrag} is not properly signed by Ursula.")
                 # TODO: Instead of raising, we should do something (#957)
 
+        return good_cfrags
+
+    def attach_work_results(self, cfrags_and_signatures):
+        """Completes this WorkOrder with cfrags already checked by `verify_work_results`."""
         for task, (cfrag, cfrag_signature) in zip(self.tasks.values(), cfrags_and_signatures):
             task.attach_work_result(cfrag, cfrag_signature)
 
         self.completed = maya.now()
-        return good_cfrags
 
     def sanitize(self):
         for task in self.tasks.values():
@@ -15,14 +15,16 @@ You should have received a copy of the GNU Affero General Public License
 along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 import csv
+import os
 from collections import OrderedDict
+from contextlib import suppress
 from typing import Dict, Optional
 
 import maya
 from web3.types import BlockIdentifier
 
 from nucypher.blockchain.eth.agents import EthereumContractAgent
-from nucypher.blockchain.eth.events import EventRecord
+from nucypher.blockchain.eth.events import ContractEventsThrottler
 
 
 def generate_events_csv_file(contract_name: str, event_name: str) -> str:
@@ -35,26 +37,62 @@ def write_events_to_csv_file(csv_file: str,
                              event_name: str,
                              argument_filters: Dict = None,
                              from_block: Optional[BlockIdentifier] = 0,
-                             to_block: Optional[BlockIdentifier] = 'latest') -> bool:
+                             to_block: Optional[BlockIdentifier] = 'latest',
+                             concurrency: int = 1,
+                             resume: bool = False) -> bool:
     """
     Write events to csv file.
+
+    Events are scanned in adaptive block ranges, `concurrency` of them at a time (see `ContractEventsThrottler`).
+    The progress of the scan is saved in a checkpoint file next to the csv file while it runs; if `resume`,
+    an interrupted scan picks up from there, appending to the csv file.
     :return: True if data written to file, False if there was no event data to write
     """
-    event_type = agent.contract.events[event_name]
-    entries = event_type.getLogs(fromBlock=from_block, toBlock=to_block, argument_filters=argument_filters)
-    if not entries:
-        return False
-
-    with open(csv_file, mode='w') as events_file:
-        events_writer = None
-        for event_record in entries:
-            event_record = EventRecord(event_record)
+    checkpoint_file = f'{csv_file}.checkpoint'
+    if not resume:
+        with suppress(FileNotFoundError):
+            os.remove(checkpoint_file)
+
+    events_file, events_writer = None, None
+
+    def flush_events_file(_last_scanned_block: int) -> None:
+        # Once per block range, so that the checkpoint, saved right after, never gets ahead of the file.
+        if events_file:
+            events_file.flush()
+
+    events_throttler = ContractEventsThrottler(agent=agent,
+                                               event_name=event_name,
+                                               from_block=from_block,
+                                               to_block=to_block if to_block != 'latest' else None,
+                                               adaptive=True,
+                                               concurrency=concurrency,
+                                               checkpoint_file=checkpoint_file,
+                                               on_range_scanned=flush_events_file,
+                                               **(argument_filters or dict()))
+    resuming = events_throttler.last_scanned_block >= events_throttler.from_block and os.path.exists(csv_file)
+    if resuming:
+        # Drop the events of the block range that was interrupted; they'll be written again.
+        with open(csv_file) as events_file:
+            rows = list(csv.reader(events_file))
+        with open(csv_file, mode='w') as events_file:
+            csv.writer(events_file).writerows(row for index, row in enumerate(rows)
+                                              if index == 0 or int(row[1]) <= events_throttler.last_scanned_block)
+
+    try:
+        for event_record in events_throttler:
             event_row = OrderedDict()
             event_row['event_name'] = event_name
             event_row['block_number'] = event_record.block_number
             event_row.update(dict(event_record.args.items()))
             if events_writer is None:
+                events_file = open(csv_file, mode='a' if resuming else 'w')
                 events_writer = csv.DictWriter(events_file, fieldnames=event_row.keys())
-                events_writer.writeheader()
+                if not resuming:
+                    events_writer.writeheader()
             events_writer.writerow(event_row)
-    return True
+    finally:
+        if events_file:
+            events_file.close()
+
+    os.remove(checkpoint_file)
+    return resuming or events_writer is not None
@@ -24,7 +24,7 @@ from typing import Union, Optional
 
 from nucypher.acumen.perception import FleetSensor
 from nucypher.blockchain.eth.registry import BaseContractRegistry
-from nucypher.config.storages import LocalFileBasedNodeStorage
+from nucypher.config.storages import LMDBNodeStorage
 from nucypher.network.exceptions import NodeSeemsToBeDown
 from nucypher.network.middleware import RestMiddleware, NucypherMiddlewareClient
 from nucypher.utilities.logging import Logger
@@ -129,7 +129,9 @@ def get_external_ip_from_default_teacher(network: str,
 
     ####
     # TODO: Clean this mess #1481 (Federated Mode)
-    node_storage = LocalFileBasedNodeStorage(federated_only=federated_only)
+    # Only the teacher's certificate file is needed here; it's never flushed to the database,
+    # which may well be open already by the node this IP address is for.
+    node_storage = LMDBNodeStorage(federated_only=federated_only)
     Ursula.set_cert_storage_function(node_storage.store_node_certificate)
     Ursula.set_federated_mode(federated_only)
     #####
@@ -14,7 +14,7 @@
  You should have received a copy of the GNU Affero General Public License
  along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
-from nucypher.blockchain.eth.events import ContractEventsThrottler
+from nucypher.blockchain.eth.events import BlockWatcher, ContractEventsThrottler
 from nucypher.blockchain.eth.utils import estimate_block_number_for_period
 
 try:
@@ -30,6 +30,8 @@ from nucypher.blockchain.eth.actors import NucypherTokenActor
 from nucypher.blockchain.eth.agents import ContractAgency, PolicyManagerAgent, StakingEscrowAgent, WorkLockAgent
 from nucypher.blockchain.eth.interfaces import BlockchainInterfaceFactory
 from nucypher.blockchain.eth.registry import BaseContractRegistry
+from nucypher.blockchain.middleware.rate_limit import RPCRateLimiter
+from nucypher.crypto.api import memoized_verify_eip_191
 from nucypher.datastore.queries import get_policy_arrangements, get_work_orders
 
 from prometheus_client.registry import CollectorRegistry
@@ -108,6 +110,12 @@ class UrsulaInfoMetricsCollector(BaseMetricsCollector):
             "availability_score_gauge": Gauge(f'{metrics_prefix}_availability_score',
                                               'Availability score',
                                               registry=registry),
+            "identity_verification_cache_hits_gauge": Gauge(f'{metrics_prefix}_identity_verification_cache_hits',
+                                                            'Node identity verifications answered from the cache',
+                                                            registry=registry),
+            "identity_verification_cache_misses_gauge": Gauge(f'{metrics_prefix}_identity_verification_cache_misses',
+                                                              'Node identity verifications that recovered a key',
+                                                              registry=registry),
         }
 
     def _collect_internal(self) -> None:
@@ -129,6 +137,10 @@ class UrsulaInfoMetricsCollector(BaseMetricsCollector):
         else:
             self.metrics["availability_score_gauge"].set(-1)
 
+        verification_cache_info = memoized_verify_eip_191.cache_info()
+        self.metrics["identity_verification_cache_hits_gauge"].set(verification_cache_info.hits)
+        self.metrics["identity_verification_cache_misses_gauge"].set(verification_cache_info.misses)
+
         work_orders = get_work_orders(self.ursula.datastore)
         self.metrics["work_orders_gauge"].set(len(work_orders))
 
@@ -159,11 +171,47 @@ class BlockchainMetricsCollector(BaseMetricsCollector):
             "current_eth_block_number": Gauge(f'{metrics_prefix}_current_eth_block_number',
                                               'Current Ethereum block',
                                               registry=registry),
+            "contract_call_cache_hits_gauge": Gauge(f'{metrics_prefix}_contract_call_cache_hits',
+                                                    'Contract calls answered from the cache',
+                                                    registry=registry),
+            "contract_call_cache_misses_gauge": Gauge(f'{metrics_prefix}_contract_call_cache_misses',
+                                                      'Contract calls sent to the provider by the cache',
+                                                      registry=registry),
+            "rpc_queue_depth_gauge": Gauge(f'{metrics_prefix}_rpc_queue_depth',
+                                           'RPC requests waiting for their turn',
+                                           registry=registry),
+            "rpc_rate_limit_gauge": Gauge(f'{metrics_prefix}_rpc_rate_limit',
+                                          'Learned RPC rate limit (requests per second, -1 if unknown)',
+                                          registry=registry),
+            "rpc_throttled_requests_gauge": Gauge(f'{metrics_prefix}_rpc_throttled_requests',
+                                                  'RPC requests throttled by the provider',
+                                                  registry=registry),
+            "rpc_delayed_requests_gauge": Gauge(f'{metrics_prefix}_rpc_delayed_requests',
+                                                'RPC requests delayed by the rate limiter',
+                                                registry=registry),
+            "rpc_refused_requests_gauge": Gauge(f'{metrics_prefix}_rpc_refused_requests',
+                                                'RPC requests from the reactor refused by the rate limiter',
+                                                registry=registry),
+            "rpc_wait_time_gauge": Gauge(f'{metrics_prefix}_rpc_wait_seconds',
+                                         'Total time RPC requests waited for their turn',
+                                         registry=registry),
         }
 
     def _collect_internal(self) -> None:
         blockchain = BlockchainInterfaceFactory.get_or_create_interface(provider_uri=self.provider_uri)
-        self.metrics["current_eth_block_number"].set(blockchain.client.block_number)
+        # Polling the shared watcher also serves the event collectors
+        self.metrics["current_eth_block_number"].set(BlockWatcher.for_blockchain(blockchain).poll())
+        if blockchain.call_cache is not None:
+            self.metrics["contract_call_cache_hits_gauge"].set(blockchain.call_cache.hits)
+            self.metrics["contract_call_cache_misses_gauge"].set(blockchain.call_cache.misses)
+
+        rate_limiter = RPCRateLimiter.for_provider(blockchain.w3.provider)
+        self.metrics["rpc_queue_depth_gauge"].set(rate_limiter.queue_depth)
+        self.metrics["rpc_rate_limit_gauge"].set(rate_limiter.rate if rate_limiter.rate is not None else -1)
+        self.metrics["rpc_throttled_requests_gauge"].set(rate_limiter.throttled_requests)
+        self.metrics["rpc_delayed_requests_gauge"].set(rate_limiter.delayed_requests)
+        self.metrics["rpc_refused_requests_gauge"].set(rate_limiter.refused_requests)
+        self.metrics["rpc_wait_time_gauge"].set(rate_limiter.wait_time)
 
 
 class StakerMetricsCollector(BaseMetricsCollector):
@@ -302,6 +350,10 @@ class EventMetricsCollector(BaseMetricsCollector):
         self.filter_arguments = argument_filters
         self.event_args_config = event_args_config
 
+        # events of all the collectors are fetched together
+        self.block_watcher = BlockWatcher.for_blockchain(self.contract_agent.blockchain)
+        self.subscription = None
+
     def initialize(self, metrics_prefix: str, registry: CollectorRegistry) -> None:
         self.metrics = dict()
         for arg_name in self.event_args_config:
@@ -310,23 +362,19 @@ class EventMetricsCollector(BaseMetricsCollector):
             self.metrics[metric_key] = metric_class(metric_name, metric_doc, registry=registry)
 
     def _collect_internal(self) -> None:
-        from_block = self.filter_current_from_block
-        to_block = self.contract_agent.blockchain.client.block_number
-        if from_block >= to_block:
-            # we've already checked the latest block and waiting for a new block
-            # nothing to see here
-            return
-
-        events_throttler = ContractEventsThrottler(agent=self.contract_agent,
-                                                   event_name=self.event_name,
-                                                   from_block=from_block,
-                                                   to_block=to_block,
-                                                   **self.filter_arguments)
-        for event_record in events_throttler:
-            self._event_occurred(event_record.raw_event)
-
-        # update last block checked for the next round - from/to block range is inclusive
-        self.filter_current_from_block = to_block + 1
+        if self.subscription is None:
+            # subscribe on first collection, once the initial data was collected
+            self.subscription = self.block_watcher.subscribe(
+                agent=self.contract_agent,
+                event_name=self.event_name,
+                callback=lambda event_record: self._event_occurred(event_record.raw_event),
+                from_block=self.filter_current_from_block,
+                **self.filter_arguments)
+
+        self.block_watcher.poll()
+
+        # the next block to check - from/to block range is inclusive
+        self.filter_current_from_block = self.subscription.next_block
 
     def _event_occurred(self, event) -> None:
         for arg_name in self.event_args_config:
@@ -47,10 +47,11 @@ from nucypher.utilities.prometheus.collector import (
 
 from typing import List
 
-from twisted.internet import reactor, task
+from twisted.internet import reactor, task, threads
 from twisted.web.resource import Resource
 
 from nucypher.blockchain.eth.agents import ContractAgency, StakingEscrowAgent, PolicyManagerAgent, WorkLockAgent
+from nucypher.blockchain.middleware.rate_limit import LOW_PRIORITY, rpc_priority
 
 
 class PrometheusMetricsConfig:
@@ -144,8 +145,10 @@ class JSONMetricsResource(Resource):
 
 
 def collect_prometheus_metrics(metrics_collectors: List[MetricsCollector]) -> None:
-    for collector in metrics_collectors:
-        collector.collect()
+    # Metrics can wait for more important RPC requests
+    with rpc_priority(LOW_PRIORITY):
+        for collector in metrics_collectors:
+            collector.collect()
 
 
 def start_prometheus_exporter(ursula: 'Ursula',
@@ -164,8 +167,9 @@ def start_prometheus_exporter(ursula: 'Ursula',
     # TODO: was never used
     # "requests_counter": Counter(f'{metrics_prefix}_http_failures', 'HTTP Failures', ['method', 'endpoint']),
 
-    # Scheduling
-    metrics_task = task.LoopingCall(collect_prometheus_metrics,
+    # Scheduling (off the reactor thread, since RPC requests may have to wait for their turn)
+    metrics_task = task.LoopingCall(threads.deferToThread,
+                                    collect_prometheus_metrics,
                                     metrics_collectors=metrics_collectors)
     metrics_task.start(interval=prometheus_config.collection_interval,
                        now=prometheus_config.start_now)
@@ -165,6 +165,20 @@ def test_sample_stakers(agency, test_registry):
     staking_agent.blockchain.is_light = light
 
 
+@pytest.mark.usefixtures("blockchain_ursulas")
+def test_get_locked_tokens_projection(agency, test_registry):
+    staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=test_registry)
+
+    periods = 5
+    projection = staking_agent.get_locked_tokens_projection(periods=periods)
+    assert list(projection) == list(range(1, periods + 1))
+    for offset, locked_tokens in projection.items():
+        assert locked_tokens == staking_agent.get_all_locked_tokens(periods=offset)
+
+    with pytest.raises(ValueError):
+        staking_agent.get_locked_tokens_projection(periods=0)
+
+
 def test_get_current_period(agency, testerchain, test_registry):
     staking_agent = ContractAgency.get_agent(StakingEscrowAgent, registry=test_registry)
     start_period = staking_agent.get_current_period()
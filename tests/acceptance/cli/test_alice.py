@@ -23,7 +23,7 @@ from nucypher.cli.literature import SUCCESSFUL_DESTRUCTION, COLLECT_NUCYPHER_PAS
 from nucypher.cli.main import nucypher_cli
 from nucypher.config.characters import AliceConfiguration
 from nucypher.config.constants import NUCYPHER_ENVVAR_KEYRING_PASSWORD, TEMPORARY_DOMAIN
-from nucypher.config.storages import LocalFileBasedNodeStorage
+from nucypher.config.storages import LMDBNodeStorage
 from nucypher.policy.identity import Card
 from tests.constants import (
     FAKE_PASSWORD_CONFIRMED,
@@ -47,7 +47,7 @@ def test_initialize_alice_defaults(click_runner, mocker, custom_filepath, monkey
     # Mock out filesystem writes
     mocker.patch.object(AliceConfiguration, 'initialize', autospec=True)
     mocker.patch.object(AliceConfiguration, 'to_configuration_file', autospec=True)
-    mocker.patch.object(LocalFileBasedNodeStorage, 'all', return_value=blockchain_ursulas)
+    mocker.patch.object(LMDBNodeStorage, 'all', return_value=blockchain_ursulas)
 
 
     # Use default alice init args
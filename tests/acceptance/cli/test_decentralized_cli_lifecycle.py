@@ -18,7 +18,7 @@
 
 import pytest_twisted as pt
 
-from nucypher.config.storages import LocalFileBasedNodeStorage
+from nucypher.config.storages import LMDBNodeStorage
 from tests.acceptance.cli.lifecycle import run_entire_cli_lifecycle
 
 
@@ -33,7 +33,7 @@ def test_decentralized_cli_lifecycle(click_runner,
                                      mocker):
 
     # For the purposes of this test, assume that all peers are already known and stored.
-    mocker.patch.object(LocalFileBasedNodeStorage, 'all', return_value=blockchain_ursulas)
+    mocker.patch.object(LMDBNodeStorage, 'all', return_value=blockchain_ursulas)
 
     yield run_entire_cli_lifecycle(click_runner,
                                    random_policy_label,
@@ -17,6 +17,7 @@
 
 from umbral.keys import UmbralPrivateKey
 
+from nucypher.characters.lawful import Enrico
 from nucypher.cli.main import nucypher_cli
 
 
@@ -42,3 +43,16 @@ def test_enrico_control_starts(click_runner):
     result = click_runner.invoke(nucypher_cli, run_args, catch_exceptions=False)
     assert result.exit_code == 0
     assert policy_encrypting_key in result.output
+
+
+def test_enrico_control_starts_with_encryption_workers(click_runner, mocker):
+    enrico_init = mocker.spy(Enrico, '__init__')
+    policy_encrypting_key = UmbralPrivateKey.gen_key().get_pubkey().to_bytes().hex()
+    run_args = ('enrico', 'run',
+                '--policy-encrypting-key', policy_encrypting_key,
+                '--encryption-workers', '2',
+                '--dry-run')
+
+    result = click_runner.invoke(nucypher_cli, run_args, catch_exceptions=False)
+    assert result.exit_code == 0
+    assert enrico_init.call_args.kwargs['encryption_workers'] == 2
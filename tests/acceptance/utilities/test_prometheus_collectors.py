@@ -21,6 +21,7 @@ from unittest.mock import patch
 
 from prometheus_client import CollectorRegistry
 
+from nucypher.blockchain.eth.events import BlockWatcher
 from nucypher.blockchain.eth.signers.software import Web3Signer
 from nucypher.crypto.powers import TransactingPower
 from nucypher.utilities.prometheus.collector import (
@@ -134,6 +135,7 @@ def test_worker_metrics_collector(test_registry, blockchain_ursulas):
     assert worker_nunits == float(int(ursula.token_balance))
 
 
+@patch.object(BlockWatcher, 'DEFAULT_CONFIRMATIONS', 0)  # The events are checked right away
 def test_staking_events_metric_collectors(testerchain, blockchain_ursulas):
     ursula = random.choice(blockchain_ursulas)
 
@@ -96,6 +96,14 @@ def test_enrico_rpc_character_control_encrypt_message(enrico_rpc_controller_test
     assert 'jsonrpc' in response.data
 
 
+def test_enrico_rpc_character_control_encrypt_messages(enrico_rpc_controller_test_client, encrypt_control_request):
+    _method_name, params = encrypt_control_request
+    request_data = {'method': 'encrypt_messages', 'params': {'messages': [params['message']] * 3}}
+    response = enrico_rpc_controller_test_client.send(request_data)
+    assert 'jsonrpc' in response.data
+    assert len(response.content['message_kits']) == 3
+
+
 def test_bob_rpc_character_control_retrieve(bob_rpc_controller, retrieve_control_request):
     method_name, params = retrieve_control_request
     request_data = {'method': method_name, 'params': params}
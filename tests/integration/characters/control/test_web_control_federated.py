@@ -255,6 +255,32 @@ def test_enrico_web_character_control_encrypt_message(enrico_web_controller_test
     assert response.status_code == 400
 
 
+def test_enrico_web_character_control_encrypt_messages(enrico_web_controller_test_client):
+    messages = [b64encode(f"Message number {i}".encode()).decode() for i in range(10)]
+
+    # As a JSON list...
+    response = enrico_web_controller_test_client.post('/encrypt_messages', data=json.dumps({'messages': messages}))
+    assert response.status_code == 200
+    response_data = json.loads(response.data)
+    assert len(response_data['result']['message_kits']) == len(messages)
+    assert len(response_data['result']['signatures']) == len(messages)
+    assert response_data['result']['records_per_second'] > 0
+    for message_kit in response_data['result']['message_kits']:
+        assert UmbralMessageKit.from_bytes(b64decode(message_kit))
+
+    # ... or as newline-delimited text
+    response = enrico_web_controller_test_client.post('/encrypt_messages',
+                                                      data='\n'.join(messages),
+                                                      content_type='text/plain')
+    assert response.status_code == 200
+    response_data = json.loads(response.data)
+    assert len(response_data['result']['message_kits']) == len(messages)
+
+    # Send bad data to assert error return
+    response = enrico_web_controller_test_client.post('/encrypt_messages', data=json.dumps({'bad': 'input'}))
+    assert response.status_code == 400
+
+
 def test_web_character_control_lifecycle(alice_web_controller_test_client,
                                          bob_web_controller_test_client,
                                          enrico_web_controller_from_alice,
@@ -19,11 +19,13 @@ import datetime
 import maya
 import os
 import pytest
+import threading
 import time
 from constant_sorrow.constants import NO_DECRYPTION_PERFORMED
 from twisted.internet.task import Clock
 
 from nucypher.characters.lawful import Bob, Enrico, Ursula
+from nucypher.crypto.streaming import StreamDecryptionError
 from nucypher.policy.collections import TreasureMap
 from tests.constants import (MOCK_POLICY_DEFAULT_M, NUMBER_OF_URSULAS_IN_DEVELOPMENT_NETWORK)
 from nucypher.config.constants import TEMPORARY_DOMAIN
@@ -173,6 +175,120 @@ def test_bob_joins_policy_and_retrieves(federated_alice,
     bob.disenchant()
 
 
+def test_bob_gets_treasure_map_from_the_first_node_that_has_it(enacted_federated_policy,
+                                                               federated_alice,
+                                                               federated_bob,
+                                                               federated_ursulas):
+    for ursula in federated_ursulas:
+        federated_bob.remember_node(ursula)
+    map_id = federated_bob.construct_map_id(verifying_key=federated_alice.stamp,
+                                            label=enacted_federated_policy.label)
+
+    middleware = MockRestMiddleware()
+    nodes_with_map = [node for node in federated_bob.matching_nodes_among(federated_bob.known_nodes)
+                      if middleware.get_treasure_map_from_node(node, map_id).status_code == 200]
+    assert nodes_with_map
+    responsive_node = nodes_with_map[0]
+
+    class SlowMiddleware(MockRestMiddleware):
+        """Every node but one takes its time to answer."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.release = threading.Event()
+
+        def get_treasure_map_from_node(self, node, map_identifier):
+            if node.checksum_address != responsive_node.checksum_address:
+                self.release.wait(timeout=10)
+            return super().get_treasure_map_from_node(node, map_identifier)
+
+    slow_middleware = SlowMiddleware()
+    try:
+        start = time.monotonic()
+        treasure_map = federated_bob.get_treasure_map_from_known_ursulas(slow_middleware, map_id, timeout=5)
+        assert time.monotonic() - start < 5
+        assert treasure_map.public_id() == enacted_federated_policy.treasure_map.public_id()
+
+        # If none of them answers in time, Bob gives up when the time is up.
+        responsive_node = federated_alice  # Not one of the candidates
+        start = time.monotonic()
+        with pytest.raises(TreasureMap.NowhereToBeFound):
+            federated_bob.get_treasure_map_from_known_ursulas(slow_middleware, map_id, timeout=1)
+        assert time.monotonic() - start < 3
+    finally:
+        slow_middleware.release.set()
+
+
+def test_bob_asks_again_for_a_treasure_map_still_on_its_way(enacted_federated_policy,
+                                                            federated_alice,
+                                                            federated_bob,
+                                                            federated_ursulas,
+                                                            mocker):
+    for ursula in federated_ursulas:
+        federated_bob.remember_node(ursula)
+    map_id = federated_bob.construct_map_id(verifying_key=federated_alice.stamp,
+                                            label=enacted_federated_policy.label)
+    mocker.patch.object(federated_bob, 'TREASURE_MAP_RETRY_INTERVAL', 0.1)
+    mocker.patch.object(federated_bob, 'learn_from_teacher_node')  # No one new to learn about
+
+    class LateMiddleware(MockRestMiddleware):
+        """No node has the map the first time it's asked."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.lock = threading.Lock()
+            self.asked = set()
+
+        def get_treasure_map_from_node(self, node, map_identifier):
+            with self.lock:
+                first_time = node.checksum_address not in self.asked
+                self.asked.add(node.checksum_address)
+            if first_time:
+                raise self.NotFound("Not here yet")
+            return super().get_treasure_map_from_node(node, map_identifier)
+
+    late_middleware = LateMiddleware()
+    treasure_map = federated_bob.get_treasure_map_from_known_ursulas(late_middleware, map_id, timeout=5)
+    assert treasure_map.public_id() == enacted_federated_policy.treasure_map.public_id()
+
+
+def test_bob_asks_a_bounded_number_of_nodes_at_once(enacted_federated_policy,
+                                                    federated_alice,
+                                                    federated_bob,
+                                                    federated_ursulas,
+                                                    mocker):
+    for ursula in federated_ursulas:
+        federated_bob.remember_node(ursula)
+    map_id = federated_bob.construct_map_id(verifying_key=federated_alice.stamp,
+                                            label=enacted_federated_policy.label)
+    mocker.patch.object(federated_bob, 'MAX_TREASURE_MAP_LOOKUP_THREADS', 2)
+
+    class CountingMiddleware(MockRestMiddleware):
+        """Keeps track of how many nodes are asked at the same time.  None of them has the map."""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.lock = threading.Lock()
+            self.in_flight = 0
+            self.most_in_flight = 0
+
+        def get_treasure_map_from_node(self, node, map_identifier):
+            with self.lock:
+                self.in_flight += 1
+                self.most_in_flight = max(self.most_in_flight, self.in_flight)
+            try:
+                time.sleep(0.05)
+                raise self.UnexpectedResponse("No map here", status=404)
+            finally:
+                with self.lock:
+                    self.in_flight -= 1
+
+    counting_middleware = CountingMiddleware()
+    with pytest.raises(TreasureMap.NowhereToBeFound):
+        federated_bob.get_treasure_map_from_known_ursulas(counting_middleware, map_id, timeout=5)
+    assert counting_middleware.most_in_flight == 2
+
+
 def test_treasure_map_serialization(enacted_federated_policy, federated_alice, federated_bob):
     treasure_map = enacted_federated_policy.treasure_map
     assert treasure_map.m is not None
@@ -228,6 +344,51 @@ def test_bob_retrieves_with_treasure_map(
     assert text1[0] == text2[0] == b'Welcome to flippering number 2.'
 
 
+def test_bob_retrieves_a_stream(federated_bob, federated_ursulas, enacted_federated_policy, capsule_side_channel,
+                                tmpdir):
+    enrico = capsule_side_channel.enrico
+    treasure_map = enacted_federated_policy.treasure_map
+    retrieve_kwargs = dict(enrico=enrico,
+                           alice_verifying_key=enacted_federated_policy.alice_verifying_key,
+                           label=enacted_federated_policy.label,
+                           treasure_map=treasure_map)
+
+    federated_bob.remember_node(list(federated_ursulas)[0])
+    federated_bob.learn_from_teacher_node(eager=True)
+
+    # The plaintext is given in pieces of any size, and the stream can be split anyhow as well.
+    plaintext = os.urandom(10_000)
+    pieces = [plaintext[:1], plaintext[1:5000], plaintext[5000:]]
+    stream = b''.join(enrico.encrypt_stream(pieces, chunk_size=1024))
+    stream_pieces = [stream[i:i + 999] for i in range(0, len(stream), 999)]
+
+    chunks = list(federated_bob.retrieve_stream(stream_pieces, **retrieve_kwargs))
+    assert b''.join(chunks) == plaintext
+    assert all(len(chunk) == 1024 for chunk in chunks[:-1])
+
+    # Or from and to files
+    plaintext_filepath = os.path.join(tmpdir, 'plaintext')
+    ciphertext_filepath = os.path.join(tmpdir, 'ciphertext')
+    decrypted_filepath = os.path.join(tmpdir, 'decrypted')
+    with open(plaintext_filepath, 'wb') as plaintext_file:
+        plaintext_file.write(plaintext)
+    enrico.encrypt_file(plaintext_filepath, ciphertext_filepath, chunk_size=1024)
+    federated_bob.retrieve_file(ciphertext_filepath, decrypted_filepath, **retrieve_kwargs)
+    with open(decrypted_filepath, 'rb') as decrypted_file:
+        assert decrypted_file.read() == plaintext
+
+    # A truncated stream doesn't go unnoticed
+    truncated_stream = stream[:-(1024 + 16 + 4)]
+    with pytest.raises(StreamDecryptionError):
+        list(federated_bob.retrieve_stream([truncated_stream], **retrieve_kwargs))
+
+    # Nor is a record longer than a chunk can be, which is rejected before being buffered
+    header_record_end = 4 + int.from_bytes(stream[:4], byteorder='big')
+    oversized_record = (1024 + 16 + 1).to_bytes(4, byteorder='big')
+    with pytest.raises(StreamDecryptionError, match="can't be longer than 1040 bytes"):
+        list(federated_bob.retrieve_stream([stream[:header_record_end], oversized_record], **retrieve_kwargs))
+
+
 def test_bob_retrieves_too_late(federated_bob, federated_ursulas,
                                 enacted_federated_policy, capsule_side_channel):
 
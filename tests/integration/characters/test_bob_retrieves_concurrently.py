@@ -0,0 +1,178 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+from umbral import pre
+
+from nucypher.characters.lawful import Bob, Ursula
+from tests.constants import MOCK_POLICY_DEFAULT_M
+
+
+@pytest.fixture(scope='function')
+def retrieval(federated_bob, federated_ursulas, enacted_federated_policy, capsule_side_channel):
+    for ursula in federated_ursulas:
+        federated_bob.remember_node(ursula)
+    retrieve_kwargs = dict(enrico=capsule_side_channel.enrico,
+                           alice_verifying_key=enacted_federated_policy.alice_verifying_key,
+                           label=enacted_federated_policy.label,
+                           treasure_map=enacted_federated_policy.treasure_map)
+    ursula_addresses = sorted(node_id for node_id, _arrangement_id in enacted_federated_policy.treasure_map)
+    return retrieve_kwargs, ursula_addresses
+
+
+@pytest.fixture(scope='function')
+def work_orders_sent(federated_bob, mocker):
+    """
+    Lets each test decide how every Ursula responds to the WorkOrders sent to her,
+    and records the WorkOrders sent, and which of them were answered (or failed).
+    """
+    reencrypt = federated_bob.network_middleware.reencrypt
+    behaviours, sent, answered = dict(), list(), list()
+
+    def fake_reencrypt(work_order):
+        sent.append(work_order)
+        behaviour = behaviours.get(work_order.ursula.checksum_address, reencrypt)
+        try:
+            return behaviour(work_order)
+        finally:
+            answered.append(work_order)
+
+    mocker.patch.object(federated_bob.network_middleware, 'reencrypt', side_effect=fake_reencrypt)
+    return behaviours, sent, answered, reencrypt
+
+
+def wait_for(condition, timeout=10):
+    start = time.time()
+    while not condition():
+        assert time.time() - start < timeout, "Timed out waiting for the WorkOrders in flight"
+        time.sleep(0.05)
+
+
+def test_bob_retrieves_with_some_ursulas_down(federated_bob, capsule_side_channel, retrieval, work_orders_sent):
+    retrieve_kwargs, ursula_addresses = retrieval
+    behaviours, sent, _answered, _reencrypt = work_orders_sent
+
+    def down(work_order):
+        raise requests.exceptions.ConnectionError("She's not there")
+
+    # All the Ursulas but m are down, and the retrieval still succeeds.
+    down_addresses = ursula_addresses[MOCK_POLICY_DEFAULT_M:]
+    behaviours.update({address: down for address in down_addresses})
+    cleartexts = federated_bob.retrieve(capsule_side_channel(), **retrieve_kwargs)
+    assert len(cleartexts) == 1
+    for work_order in sent:
+        assert bool(work_order.completed) is (work_order.ursula.checksum_address not in down_addresses)
+
+    # One more, and there aren't enough of them; which isn't mistaken for incorrect cfrags.
+    behaviours[ursula_addresses[0]] = down
+    with pytest.raises(Ursula.NotEnoughUrsulas):
+        federated_bob.retrieve(capsule_side_channel(), **retrieve_kwargs)
+
+
+def test_bob_retrieval_times_out(federated_bob, capsule_side_channel, retrieval, work_orders_sent, monkeypatch):
+    retrieve_kwargs, ursula_addresses = retrieval
+    behaviours, sent, answered, reencrypt = work_orders_sent
+    monkeypatch.setattr(federated_bob, '_retrieval_timeout', 1)
+
+    # Only m - 1 Ursulas answer in time.
+    release = threading.Event()
+
+    def hanging(work_order):
+        release.wait()
+        return reencrypt(work_order)
+
+    hanging_addresses = ursula_addresses[MOCK_POLICY_DEFAULT_M - 1:]
+    behaviours.update({address: hanging for address in hanging_addresses})
+
+    start = time.time()
+    with pytest.raises(Ursula.NotEnoughUrsulas):
+        federated_bob.retrieve(capsule_side_channel(), **retrieve_kwargs)
+    assert time.time() - start < 5
+
+    # When they finally answer, nobody is listening anymore.
+    release.set()
+    wait_for(lambda: len(answered) == len(sent))
+    for work_order in sent:
+        assert bool(work_order.completed) is (work_order.ursula.checksum_address not in hanging_addresses)
+
+
+def test_bob_leaves_work_orders_in_flight_alone(federated_bob, capsule_side_channel, retrieval, work_orders_sent):
+    retrieve_kwargs, ursula_addresses = retrieval
+    behaviours, sent, answered, reencrypt = work_orders_sent
+
+    # m Ursulas answer right away, and the rest only after Bob is done.
+    release = threading.Event()
+
+    def slow(work_order):
+        release.wait()
+        return reencrypt(work_order)
+
+    slow_addresses = ursula_addresses[MOCK_POLICY_DEFAULT_M:]
+    behaviours.update({address: slow for address in slow_addresses})
+
+    cleartexts = federated_bob.retrieve(capsule_side_channel(), **retrieve_kwargs)
+    assert len(cleartexts) == 1
+    assert len(answered) == MOCK_POLICY_DEFAULT_M
+
+    # The late answers are dropped: their WorkOrders are neither completed nor saved.
+    release.set()
+    wait_for(lambda: len(answered) == len(sent))
+    late_work_orders = [work_order for work_order in sent if work_order.ursula.checksum_address in slow_addresses]
+    assert late_work_orders
+    for work_order in late_work_orders:
+        assert not work_order.completed
+        saved_work_orders = federated_bob._completed_work_orders.by_checksum_address(work_order.ursula.checksum_address)
+        assert work_order not in saved_work_orders.values()
+
+
+def test_bob_detects_incorrect_cfrags(federated_bob,
+                                      federated_alice,
+                                      federated_ursulas,
+                                      capsule_side_channel,
+                                      retrieval,
+                                      work_orders_sent):
+    retrieve_kwargs, ursula_addresses = retrieval
+    behaviours, _sent, _answered, reencrypt = work_orders_sent
+
+    # One Ursula re-encrypts (and duly signs) with a KFrag that isn't the one for this policy...
+    liar = next(ursula for ursula in federated_ursulas if ursula.checksum_address == ursula_addresses[0])
+    _policy_key, (wrong_kfrag, ) = federated_alice.generate_kfrags(bob=federated_bob, label=b'wrong', m=1, n=1)
+
+    def incorrect(work_order):
+        cfrags_and_signatures = []
+        for capsule, task in work_order.tasks.items():
+            metadata = bytes(liar.stamp(bytes(task.signature)))
+            cfrag = pre.reencrypt(wrong_kfrag, capsule, metadata=metadata, verify_kfrag=False)
+            cfrags_and_signatures.append((cfrag, liar.stamp(bytes(cfrag))))
+        return cfrags_and_signatures
+
+    # ... and the honest ones take a little longer, so that she's heard of before Bob is done.
+    def honest(work_order):
+        time.sleep(0.5)
+        return reencrypt(work_order)
+
+    behaviours.update({address: honest for address in ursula_addresses[1:]})
+    behaviours[liar.checksum_address] = incorrect
+
+    with pytest.raises(Bob.IncorrectCFragsReceived) as e:
+        federated_bob.retrieve(capsule_side_channel(), **retrieve_kwargs)
+    evidence, = e.value.evidence
+    assert evidence.ursula_pubkey == liar.stamp.as_umbral_pubkey()
@@ -0,0 +1,56 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+import os
+
+import pytest
+
+from nucypher.characters.lawful import Enrico
+
+
+@pytest.mark.parametrize('encryption_workers', (0, 2))
+def test_enrico_encrypts_a_batch_with_or_without_worker_processes(federated_alice, encryption_workers):
+    label = b'encryption workers'
+    policy_pubkey = federated_alice.get_policy_encrypting_key_from_label(label)
+    enrico = Enrico(policy_encrypting_key=policy_pubkey, encryption_workers=encryption_workers)
+    enrico.ENCRYPTION_CHUNK_SIZE = 2  # So that a small batch spans a few chunks
+    assert bool(enrico.encryption_executor) is bool(encryption_workers)
+
+    plaintexts = [os.urandom(32) for _ in range(5)]
+    try:
+        results = enrico.encrypt_messages(plaintexts)
+    finally:
+        enrico.disenchant()
+
+    assert len(results) == len(plaintexts)
+    for plaintext, (message_kit, signature) in zip(plaintexts, results):
+        assert message_kit.policy_pubkey == policy_pubkey
+        assert message_kit.sender_verifying_key == enrico.stamp.as_umbral_pubkey()
+        cleartext = federated_alice.verify_from(stranger=enrico,
+                                                message_kit=message_kit,
+                                                signature=signature,
+                                                decrypt=True,
+                                                label=label)
+        assert cleartext == plaintext
+
+
+def test_enrico_encrypts_inline_by_default(federated_alice):
+    policy_pubkey = federated_alice.get_policy_encrypting_key_from_label(b'no encryption workers')
+    enrico = Enrico(policy_encrypting_key=policy_pubkey)
+    assert enrico.encryption_workers == 0
+    assert enrico.encryption_executor is None
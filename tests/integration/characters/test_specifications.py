@@ -24,6 +24,7 @@ import pytest
 from nucypher.characters.control.specifications import fields
 from nucypher.characters.control.specifications.alice import GrantPolicy
 from nucypher.characters.control.specifications.base import BaseSchema
+from nucypher.characters.control.specifications.enrico import EncryptMessages
 from nucypher.characters.control.specifications.exceptions import (InvalidArgumentCombo, InvalidInputData,
                                                                    SpecificationError)
 from nucypher.crypto.powers import DecryptingPower
@@ -149,3 +150,26 @@ def test_key_validation(federated_bob):
 
     result = BobKeyInputRequirer().load(dict(bobkey=bytes(federated_bob.public_keys(DecryptingPower)).hex()))
     assert isinstance(result['bobkey'], bytes)
+
+
+def test_encrypt_messages_validation(tmpdir):
+    filepath = tmpdir / 'messages.txt'
+    filepath.write_binary(b'three\nfour\n')
+
+    # Either messages or a file is required, but not both
+    with pytest.raises(InvalidInputData):
+        EncryptMessages().load(dict())
+    with pytest.raises(InvalidArgumentCombo):
+        EncryptMessages().load({'messages': ['one'], 'file': str(filepath)})
+
+    # Messages are taken like the one of EncryptMessage
+    result = EncryptMessages().load({'messages': ['one', 'two']})
+    assert result['plaintexts'] == [b64encode(b'one'), b64encode(b'two')]
+    result = EncryptMessages().load({'file': str(filepath)})
+    assert result['plaintexts'] == [b'three', b'four']
+
+    # Newline-delimited text lines are taken like messages too
+    result = EncryptMessages().load({'text': 'one\ntwo\n'})
+    assert result['plaintexts'] == [b64encode(b'one'), b64encode(b'two')]
+    with pytest.raises(InvalidArgumentCombo):
+        EncryptMessages().load({'messages': ['one'], 'text': 'two'})
@@ -0,0 +1,213 @@
+"""
+This file is part of nucypher.
+
+nucypher is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+nucypher is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+
+import click
+import pytest
+from umbral.kfrags import KFrag
+
+from nucypher.characters.lawful import Enrico
+from nucypher.cli.types import REENCRYPTION_WORKERS
+from nucypher.config.constants import AUTO_REENCRYPTION_WORKERS
+from nucypher.crypto.powers import DecryptingPower
+from nucypher.crypto.signing import signature_splitter
+from nucypher.crypto.splitters import cfrag_splitter
+from nucypher.datastore.models import Workorder
+from nucypher.network.middleware import RestMiddleware
+from nucypher.policy.collections import WorkOrder
+from tests.utils.ursula import MOCK_KNOWN_URSULAS_CACHE, make_federated_ursulas
+
+
+def test_ursula_reencrypts_a_batch_of_work_orders(enacted_federated_policy,
+                                                  federated_bob,
+                                                  federated_alice,
+                                                  federated_ursulas,
+                                                  capsule_side_channel):
+    treasure_map = enacted_federated_policy.treasure_map
+    alice_verifying_key = federated_alice.stamp.as_umbral_pubkey()
+    for ursula in federated_ursulas:
+        federated_bob.remember_node(ursula)
+
+    # We'll send all of the WorkOrders to the first Ursula in the map.
+    node_id, arrangement_id = list(treasure_map)[0]
+    ursula = federated_bob.known_nodes[node_id]
+
+    capsule_side_channel.reset()
+    capsules = [capsule_side_channel().capsule for _ in range(3)]
+    for capsule in capsules:
+        capsule.set_correctness_keys(delegating=enacted_federated_policy.public_key,
+                                     receiving=federated_bob.public_keys(DecryptingPower),
+                                     verifying=alice_verifying_key)
+
+    work_orders = [WorkOrder.construct_by_bob(arrangement_id=arrangement_id,
+                                              alice_verifying=alice_verifying_key,
+                                              capsules=[capsule],
+                                              ursula=ursula,
+                                              bob=federated_bob)
+                   for capsule in capsules]
+
+    # A WorkOrder for an arrangement this Ursula doesn't know about doesn't spoil the rest of the batch.
+    unknown_work_order = WorkOrder.construct_by_bob(arrangement_id=os.urandom(32),
+                                                    alice_verifying=alice_verifying_key,
+                                                    capsules=[capsules[0]],
+                                                    ursula=ursula,
+                                                    bob=federated_bob)
+
+    results = federated_bob.network_middleware.reencrypt_batch([*work_orders, unknown_work_order])
+    assert len(results) == len(work_orders) + 1
+
+    # Each WorkOrder got its own results, in the same order.
+    for capsule, work_order, cfrags_and_signatures in zip(capsules, work_orders, results):
+        cfrags = work_order.complete(cfrags_and_signatures)
+        assert len(cfrags) == 1
+        assert cfrags[0].verify_correctness(capsule)
+
+    assert isinstance(results[-1], RestMiddleware.NotFound)
+
+    # Ursula saved all of the completed WorkOrders.
+    ursula = next(u for u in federated_ursulas if u.checksum_address == node_id)
+    with ursula.datastore.query_by(Workorder, filter_field='bob_verifying_key',
+            filter_func=lambda bob_key: bob_key == federated_bob.stamp.as_umbral_pubkey()) as work_orders_from_bob:
+        saved_signatures = [saved_work_order.bob_signature for saved_work_order in work_orders_from_bob]
+    for work_order in work_orders:
+        assert work_order.receipt_signature in saved_signatures
+
+
+def test_failed_work_orders_in_a_batch_only_fail_themselves(enacted_federated_policy,
+                                                            federated_bob,
+                                                            federated_alice,
+                                                            federated_ursulas,
+                                                            capsule_side_channel,
+                                                            mocker):
+    alice_verifying_key = federated_alice.stamp.as_umbral_pubkey()
+    for ursula in federated_ursulas:
+        federated_bob.remember_node(ursula)
+    node_id, arrangement_id = list(enacted_federated_policy.treasure_map)[0]
+    ursula = next(u for u in federated_ursulas if u.checksum_address == node_id)
+
+    capsule_side_channel.reset()
+    capsules = [capsule_side_channel().capsule for _ in range(3)]
+    for capsule in capsules:
+        capsule.set_correctness_keys(delegating=enacted_federated_policy.public_key,
+                                     receiving=federated_bob.public_keys(DecryptingPower),
+                                     verifying=alice_verifying_key)
+    good_work_order, invalid_work_order, failing_work_order = [
+        WorkOrder.construct_by_bob(arrangement_id=arrangement_id,
+                                   alice_verifying=alice_verifying_key,
+                                   capsules=[capsule],
+                                   ursula=federated_bob.known_nodes[node_id],
+                                   bob=federated_bob)
+        for capsule in capsules]
+
+    # One WorkOrder can't even be parsed, and another one can't be re-encrypted with Ursula's KFrag.
+    invalid_work_order.payload = lambda: b'This is not a WorkOrder'
+    failing_signature = failing_work_order.receipt_signature
+    reencrypt = ursula._reencrypt
+
+    def flaky_reencrypt(kfrag, work_order, alice_verifying_key):
+        if work_order.receipt_signature == failing_signature:
+            raise KFrag.NotValid("This Capsule is not for this KFrag")
+        return reencrypt(kfrag=kfrag, work_order=work_order, alice_verifying_key=alice_verifying_key)
+
+    mocker.patch.object(ursula, '_reencrypt', side_effect=flaky_reencrypt)
+
+    results = federated_bob.network_middleware.reencrypt_batch([invalid_work_order,
+                                                                failing_work_order,
+                                                                good_work_order])
+
+    # Each of them gets its own status, and the good one is still completed.
+    invalid_result, failing_result, good_result = results
+    assert isinstance(invalid_result, RestMiddleware.UnexpectedResponse) and invalid_result.status == 400
+    assert isinstance(failing_result, RestMiddleware.UnexpectedResponse) and failing_result.status == 400
+    cfrags = good_work_order.complete(good_result)
+    assert cfrags[0].verify_correctness(capsules[0])
+
+
+def test_work_orders_in_a_batch_must_be_for_the_same_ursula(enacted_federated_policy,
+                                                           federated_bob,
+                                                           federated_alice,
+                                                           capsule_side_channel):
+    alice_verifying_key = federated_alice.stamp.as_umbral_pubkey()
+    capsule = capsule_side_channel().capsule
+    (first_id, first_arrangement), (second_id, second_arrangement) = list(enacted_federated_policy.treasure_map)[:2]
+
+    work_orders = [WorkOrder.construct_by_bob(arrangement_id=arrangement_id,
+                                              alice_verifying=alice_verifying_key,
+                                              capsules=[capsule],
+                                              ursula=federated_bob.known_nodes[node_id],
+                                              bob=federated_bob)
+                   for node_id, arrangement_id in ((first_id, first_arrangement), (second_id, second_arrangement))]
+
+    with pytest.raises(ValueError):
+        federated_bob.network_middleware.reencrypt_batch(work_orders)
+
+
+@pytest.mark.parametrize('reencryption_workers', (0, 2))
+def test_ursula_reencrypts_with_or_without_worker_processes(ursula_federated_test_config,
+                                                            federated_bob,
+                                                            federated_alice,
+                                                            reencryption_workers):
+    # A dedicated Ursula, so that the shared ones keep re-encrypting the way they are configured to.
+    ursula = make_federated_ursulas(ursula_config=ursula_federated_test_config,
+                                    quantity=1,
+                                    know_each_other=False,
+                                    reencryption_workers=reencryption_workers).pop()
+    try:
+        assert ursula.reencryption_workers == reencryption_workers
+        assert bool(ursula.reencryption_executor) is bool(reencryption_workers)
+
+        label = b're-encryption workers'
+        alice_verifying_key = federated_alice.stamp.as_umbral_pubkey()
+        policy_public_key, (kfrag, ) = federated_alice.generate_kfrags(bob=federated_bob, label=label, m=1, n=1)
+        enrico = Enrico(policy_encrypting_key=policy_public_key)
+        capsules = [enrico.encrypt_message(os.urandom(32))[0].capsule for _ in range(3)]
+        for capsule in capsules:
+            capsule.set_correctness_keys(delegating=policy_public_key,
+                                         receiving=federated_bob.public_keys(DecryptingPower),
+                                         verifying=alice_verifying_key)
+        work_order = WorkOrder.construct_by_bob(arrangement_id=os.urandom(32),
+                                                alice_verifying=alice_verifying_key,
+                                                capsules=capsules,
+                                                ursula=ursula,
+                                                bob=federated_bob)
+
+        response = ursula._reencrypt(kfrag=kfrag, work_order=work_order, alice_verifying_key=alice_verifying_key)
+        cfrags = work_order.complete((cfrag_splitter + signature_splitter).repeat(response))
+        assert len(cfrags) == len(capsules)
+        for capsule, cfrag in zip(capsules, cfrags):
+            assert cfrag.verify_correctness(capsule)
+    finally:
+        ursula.stop()
+        MOCK_KNOWN_URSULAS_CACHE.pop(ursula.rest_interface.port, None)
+
+
+def test_ursula_reencryption_workers_can_match_the_cpus(ursula_federated_test_config):
+    assert REENCRYPTION_WORKERS.convert('auto', None, None) == AUTO_REENCRYPTION_WORKERS
+    assert REENCRYPTION_WORKERS.convert('3', None, None) == 3
+    with pytest.raises(click.BadParameter):
+        REENCRYPTION_WORKERS.convert('-1', None, None)
+
+    ursula = make_federated_ursulas(ursula_config=ursula_federated_test_config,
+                                    quantity=1,
+                                    know_each_other=False,
+                                    reencryption_workers=AUTO_REENCRYPTION_WORKERS).pop()
+    try:
+        assert ursula.reencryption_workers == os.cpu_count()
+    finally:
+        ursula.stop()
+        MOCK_KNOWN_URSULAS_CACHE.pop(ursula.rest_interface.port, None)
@@ -16,6 +16,9 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 import pytest
 
+from nucypher.characters.lawful import Ursula
+from nucypher.crypto.signing import Signature
+
 from tests.utils.middleware import MockRestMiddleware
 from tests.utils.ursula import make_federated_ursulas
 
@@ -45,3 +48,32 @@ def test_node_deployer(federated_ursulas):
         deployer = ursula.get_deployer()
         assert deployer.options['https_port'] == ursula.rest_information()[0].port
         assert deployer.application == ursula.rest_app
+
+
+def test_ursula_metadata_is_serialized_once_until_it_changes(lonely_ursula_maker, mocker):
+    ursula = lonely_ursula_maker(quantity=1).pop()
+
+    metadata = bytes(ursula)
+    signature_serializations = mocker.spy(Signature, '__bytes__')
+    assert bytes(ursula) is metadata
+    # Checking that the metadata didn't change doesn't serialize any of it.
+    assert signature_serializations.call_count == 0
+    assert Ursula.from_bytes(metadata) == ursula
+
+    # Signing the interface again gives a new timestamp and signature, and so new metadata.
+    ursula._sign_and_date_interface_info()
+    new_metadata = bytes(ursula)
+    assert new_metadata is not metadata
+    assert Ursula.from_bytes(new_metadata).timestamp == ursula.timestamp
+    assert bytes(ursula) is new_metadata
+
+    # So does a change of interface.
+    ursula.rest_interface.port += 1
+    assert bytes(ursula) != new_metadata
+    ursula.rest_interface.port -= 1
+    assert bytes(ursula) == new_metadata
+
+    # Strangers serialize to the same metadata they were made from, and cache it too.
+    stranger = Ursula.from_bytes(new_metadata).mature()
+    assert bytes(stranger) == new_metadata
+    assert bytes(stranger) is bytes(stranger)
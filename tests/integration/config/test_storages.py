@@ -20,8 +20,15 @@ import pytest
 import tempfile
 
 from nucypher.characters.lawful import Ursula
+from nucypher.config.base import CharacterConfiguration
 from nucypher.config.constants import TEMPORARY_DOMAIN
-from nucypher.config.storages import ForgetfulNodeStorage, NodeStorage, TemporaryFileBasedNodeStorage
+from nucypher.config.storages import (
+    ForgetfulNodeStorage,
+    LMDBNodeStorage,
+    LocalFileBasedNodeStorage,
+    NodeStorage,
+    TemporaryFileBasedNodeStorage
+)
 from nucypher.network.nodes import Learner
 from nucypher.utilities.networking import LOOPBACK_ADDRESS
 from tests.utils.ursula import MOCK_URSULA_STARTING_PORT
@@ -151,3 +158,127 @@ class TestTemporaryFileBasedNodeStorage(BaseTestNodeStorageBackends):
         restored_nodes = self.storage_backend.all(federated_only=True, certificates_only=False)
         total_nodes = 1 + ADDITIONAL_NODES_TO_LEARN_ABOUT
         assert total_nodes - 2 == len(restored_nodes)
+
+
+class TestLMDBNodeStorage(BaseTestNodeStorageBackends):
+    storage_backend = LMDBNodeStorage(character_class=BaseTestNodeStorageBackends.character_class,
+                                      federated_only=BaseTestNodeStorageBackends.federated_only,
+                                      storage_root=tempfile.mkdtemp())
+    storage_backend.initialize()
+
+    def test_metadata_is_written_in_batches(self, light_ursula, mocker):
+        pending_metadata = self.storage_backend._LMDBNodeStorage__pending_metadata
+
+        # Not written yet, but readable all the same.
+        self.storage_backend.store_node_metadata(node=light_ursula)
+        assert light_ursula.checksum_address in pending_metadata
+        assert self.storage_backend.get(checksum_address=light_ursula.checksum_address,
+                                        federated_only=True) == light_ursula
+
+        self.storage_backend.flush()
+        assert not pending_metadata
+        assert self.storage_backend.get(checksum_address=light_ursula.checksum_address,
+                                        federated_only=True) == light_ursula
+
+        # A full batch is written at once.
+        mocker.patch.object(self.storage_backend, 'BATCH_SIZE', 3)
+        other_nodes = [Ursula(rest_host=LOOPBACK_ADDRESS,
+                              db_filepath=MOCK_URSULA_DB_FILEPATH,
+                              rest_port=port,
+                              federated_only=True,
+                              domain=TEMPORARY_DOMAIN)
+                       for port in range(MOCK_URSULA_STARTING_PORT + 1, MOCK_URSULA_STARTING_PORT + 3)]
+        self.storage_backend.store_node_metadata(node=light_ursula)  # Only the latest metadata is written
+        for node in [light_ursula, *other_nodes]:
+            self.storage_backend.store_node_metadata(node=node)
+        assert not pending_metadata
+        assert len(self.storage_backend.all(federated_only=True)) == 3
+
+        self.storage_backend.clear()
+        assert self.storage_backend.all(federated_only=True) == set()
+
+    def test_invalid_metadata(self, light_ursula):
+        self._read_and_write_metadata(ursula=light_ursula, node_storage=self.storage_backend)
+        self.storage_backend.store_node_metadata(node=light_ursula)
+        self.storage_backend._LMDBNodeStorage__pending_metadata[light_ursula.checksum_address] = b'meh'
+
+        with pytest.raises(LMDBNodeStorage.InvalidNodeMetadata):
+            self.storage_backend.get(checksum_address=light_ursula.checksum_address, federated_only=True)
+
+        restored_nodes = self.storage_backend.all(federated_only=True)
+        assert ADDITIONAL_NODES_TO_LEARN_ABOUT == len(restored_nodes)
+        self.storage_backend.clear()
+
+
+def test_migrate_file_based_node_storage(light_ursula, tmpdir):
+    legacy_storage = TemporaryFileBasedNodeStorage(character_class=Ursula, federated_only=True)
+    legacy_storage.initialize()
+
+    nodes = [Ursula(rest_host=LOOPBACK_ADDRESS,
+                    db_filepath=MOCK_URSULA_DB_FILEPATH,
+                    rest_port=port,
+                    federated_only=True,
+                    domain=TEMPORARY_DOMAIN)
+             for port in range(MOCK_URSULA_STARTING_PORT, MOCK_URSULA_STARTING_PORT + 3)]
+    for node in nodes:
+        legacy_storage.store_node_metadata(node=node)
+        legacy_storage.store_node_certificate(certificate=node.certificate)
+    with open(os.path.join(legacy_storage.metadata_dir, f'{light_ursula.checksum_address}.node'), 'wb') as file:
+        file.write(b'meh')
+
+    storage = LMDBNodeStorage(character_class=Ursula, federated_only=True, storage_root=str(tmpdir))
+    assert storage.migrate_from(legacy_storage) == len(nodes)
+
+    stored_nodes = storage.all(federated_only=True)
+    assert sorted(node.checksum_address for node in stored_nodes) == sorted(node.checksum_address for node in nodes)
+    for node in nodes:
+        assert storage.get(checksum_address=node.checksum_address, federated_only=True) == node
+        certificate = storage.get(checksum_address=node.checksum_address, federated_only=True, certificate_only=True)
+        assert certificate == node.certificate
+
+
+def make_legacy_storage(storage_root: str, nodes) -> LocalFileBasedNodeStorage:
+    legacy_storage = LocalFileBasedNodeStorage(character_class=Ursula, federated_only=True, storage_root=storage_root)
+    legacy_storage.initialize()
+    for node in nodes:
+        legacy_storage.store_node_metadata(node=node)
+        legacy_storage.store_node_certificate(certificate=node.certificate)
+    return legacy_storage
+
+
+def test_file_based_nodes_are_migrated_when_the_database_is_opened(light_ursula, tmpdir):
+    make_legacy_storage(storage_root=str(tmpdir), nodes=[light_ursula])
+
+    # An existing storage is not necessarily initialized again; its first read brings the nodes over.
+    storage = LMDBNodeStorage(character_class=Ursula, federated_only=True, storage_root=str(tmpdir))
+    stored_nodes = storage.all(federated_only=True)
+    assert [node.checksum_address for node in stored_nodes] == [light_ursula.checksum_address]
+    storage.clear()
+    assert storage.all(federated_only=True) == set()
+
+    # The files are left in place, but they are only migrated once.
+    assert os.listdir(os.path.join(str(tmpdir), 'metadata'))
+    assert storage.migrate_from(LocalFileBasedNodeStorage(federated_only=True, storage_root=str(tmpdir))) == 0
+    assert storage.all(federated_only=True) == set()
+
+
+def test_file_based_node_storage_is_migrated_on_load(light_ursula, tmpdir):
+    legacy_storage = make_legacy_storage(storage_root=str(tmpdir), nodes=[light_ursula])
+
+    node_storage = CharacterConfiguration.load_node_storage(storage_payload=legacy_storage.payload(),
+                                                           federated_only=True)
+    assert isinstance(node_storage, LMDBNodeStorage)
+    assert node_storage.root_dir == legacy_storage.root_dir
+    assert node_storage.certificates_dir == legacy_storage.certificates_dir
+    assert node_storage.get(checksum_address=light_ursula.checksum_address, federated_only=True) == light_ursula
+    assert node_storage.payload()['storage_type'] == LMDBNodeStorage._name
+
+
+@pytest.fixture(scope='module')
+def light_ursula():
+    node = Ursula(rest_host=LOOPBACK_ADDRESS,
+                  rest_port=MOCK_URSULA_STARTING_PORT,
+                  db_filepath=MOCK_URSULA_DB_FILEPATH,
+                  federated_only=True,
+                  domain=TEMPORARY_DOMAIN)
+    yield node
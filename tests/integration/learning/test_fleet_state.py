@@ -15,12 +15,22 @@
  along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import threading
+
+import pytest
+import requests
+from bytestring_splitter import VariableLengthBytestring
 from constant_sorrow.constants import FLEET_STATES_MATCH, NO_KNOWN_NODES
 from functools import partial
 from hendrix.experience import crosstown_traffic
 from hendrix.utils.test_utils import crosstownTaskListDecoratorFactory
 
-from tests.utils.ursula import make_federated_ursulas
+from nucypher.characters.lawful import Ursula
+from nucypher.config.characters import UrsulaConfiguration
+from nucypher.crypto.signing import signature_splitter
+from nucypher.network.nodes import Learner
+from tests.utils.config import assemble, make_ursula_test_configuration
+from tests.utils.ursula import MOCK_URSULA_STARTING_PORT, make_federated_ursulas
 
 
 def test_all_nodes_have_same_fleet_state(federated_ursulas):
@@ -151,3 +161,261 @@ def test_teacher_records_new_fleet_state_upon_hearing_about_new_node(federated_u
 
     # ...is the same as the learner, because both have learned about everybody at this point.
     assert teacher_fleet_state_checksum == states[-1].checksum
+
+
+def test_teacher_only_sends_nodes_updated_since_the_state_the_learner_knows(federated_ursulas, lonely_ursula_maker):
+    teacher, learner, newcomer = list(lonely_ursula_maker(quantity=3))
+    for ursula in list(federated_ursulas)[:3]:
+        teacher.remember_node(ursula)
+
+    # The first time around, the learner gets the whole fleet.
+    learner.remember_node(teacher)
+    learner._current_teacher_node = teacher
+    sprouts = learner.learn_from_teacher_node()
+    assert len(sprouts) == len(teacher.known_nodes) + 1  # ...and the teacher itself.
+    assert learner._teacher_states_learned[teacher.checksum_address][0] == teacher.known_nodes.checksum
+
+    # The teacher learns about somebody new...
+    teacher.remember_node(newcomer)
+
+    # ...and that's all it has to tell the learner next time.
+    learner._current_teacher_node = teacher
+    sprouts = learner.learn_from_teacher_node()
+    assert set(sprout.checksum_address for sprout in sprouts) == {newcomer.checksum_address, teacher.checksum_address}
+    assert newcomer.checksum_address in learner.known_nodes
+
+    # A learner that doesn't know the teacher's state yet still gets everything.
+    known_nodes_bytestring = teacher.bytestring_of_known_nodes()
+    _checksum, _timestamp, nodes_bytestring = teacher.known_nodes.unpack_snapshot(known_nodes_bytestring)
+    assert len(teacher.batch_from_bytes(nodes_bytestring)) == len(teacher.known_nodes) + 1
+
+
+def test_learner_only_syncs_with_a_teacher_once_its_nodes_check_out(federated_ursulas, lonely_ursula_maker, mocker):
+    teacher, learner, newcomer = list(lonely_ursula_maker(quantity=3))
+    for ursula in list(federated_ursulas)[:3]:
+        teacher.remember_node(ursula)
+    teacher.remember_node(newcomer)
+
+    # One of the nodes can't be verified this time around...
+    unverifiable_address = newcomer.checksum_address
+    verify_node = Ursula.verify_node
+
+    def flaky_verify_node(node, *args, **kwargs):
+        if node.checksum_address == unverifiable_address:
+            raise requests.exceptions.ConnectionError("Nobody home")
+        return verify_node(node, *args, **kwargs)
+
+    mocker.patch.object(Ursula, 'verify_node', autospec=True, side_effect=flaky_verify_node)
+    learner.remember_node(teacher)
+    learner._current_teacher_node = teacher
+    learner.learn_from_teacher_node(eager=True)
+
+    # ...so the learner doesn't count the teacher's state as learned, and asks for everything next time.
+    assert teacher.checksum_address not in learner._teacher_states_learned
+
+    mocker.stopall()
+    learner._current_teacher_node = teacher
+    sprouts = learner.learn_from_teacher_node(eager=True)
+    assert unverifiable_address in {sprout.checksum_address for sprout in sprouts}
+    assert learner._teacher_states_learned[teacher.checksum_address][0] == teacher.known_nodes.checksum
+
+
+def test_learner_gets_everything_again_after_forgetting_a_node(federated_ursulas, lonely_ursula_maker):
+    teacher, learner = list(lonely_ursula_maker(quantity=2))
+    fleet = list(federated_ursulas)[:3]
+    for ursula in fleet:
+        teacher.remember_node(ursula)
+
+    learner.remember_node(teacher)
+    learner._current_teacher_node = teacher
+    learner.learn_from_teacher_node()
+    assert teacher.checksum_address in learner._teacher_states_learned
+
+    # The learner forgets one of the nodes; an update from the teacher wouldn't mention it again...
+    forgotten_node = learner.known_nodes[fleet[0].checksum_address]
+    learner.known_nodes.mark_as(forgotten_node.InvalidNode, forgotten_node)
+    learner.known_nodes.record_fleet_state()
+    assert forgotten_node.checksum_address not in learner.known_nodes
+
+    # ...so the learner asks for the whole fleet instead.
+    learner._current_teacher_node = teacher
+    sprouts = learner.learn_from_teacher_node()
+    assert len(sprouts) == len(teacher.known_nodes) + 1  # ...and the teacher itself.
+    assert forgotten_node.checksum_address in learner.known_nodes
+
+
+def test_teacher_serves_the_same_signed_payload_until_its_fleet_state_changes(federated_ursulas, lonely_ursula_maker):
+    teacher, newcomer = list(lonely_ursula_maker(quantity=2))
+    for ursula in list(federated_ursulas)[:3]:
+        teacher.remember_node(ursula)
+    client = teacher.rest_app.test_client()
+
+    first_response = client.get('/node_metadata')
+    assert first_response.status_code == 200
+
+    # Signatures are randomized, so getting the very same bytes means they were served from the cache.
+    assert client.get('/node_metadata').data == first_response.data
+
+    # Once the teacher records a new fleet state, it's a new payload.
+    teacher.remember_node(newcomer)
+    assert client.get('/node_metadata').data != first_response.data
+
+
+def test_teacher_sends_everything_for_a_fleet_state_it_cannot_tell(federated_ursulas, lonely_ursula_maker):
+    teacher = lonely_ursula_maker(quantity=1).pop()
+    for ursula in list(federated_ursulas)[:3]:
+        teacher.remember_node(ursula)
+    client = teacher.rest_app.test_client()
+
+    # eg. the checksum of a node that computes fleet states the old way: it gets the whole fleet, not a rejection.
+    unknown_checksum = 'ab' * 32
+    response = client.get(f'/node_metadata?since={unknown_checksum}')
+    assert response.status_code == 200
+
+    _signature, payload = signature_splitter(response.data, return_remainder=True)
+    _checksum, _timestamp, nodes_bytestring = teacher.known_nodes.unpack_snapshot(payload)
+    assert len(teacher.batch_from_bytes(nodes_bytestring)) == len(teacher.known_nodes) + 1
+
+
+def test_nodes_announced_to_a_teacher_are_stored_right_away(lonely_ursula_maker, monkeypatch, mocker):
+    teacher, newcomer = list(lonely_ursula_maker(quantity=2))
+    monkeypatch.setattr(teacher, 'save_metadata', True)
+    flush = mocker.spy(teacher.node_storage, 'flush')
+    client = teacher.rest_app.test_client()
+
+    response = client.post('/node_metadata', data=bytes(VariableLengthBytestring(bytes(newcomer))))
+    assert response.status_code == 200
+    assert newcomer in teacher.known_nodes
+    assert flush.call_count == 1
+
+
+def test_learning_from_several_teachers_at_once(lonely_ursula_maker):
+    teachers = list(lonely_ursula_maker(quantity=3))
+    shared_node = lonely_ursula_maker(quantity=1).pop()
+    for teacher in teachers:
+        teacher.remember_node(shared_node)
+        for node in lonely_ursula_maker(quantity=3):
+            teacher.remember_node(node)
+
+    learner = lonely_ursula_maker(quantity=1, max_concurrent_teachers=3).pop()
+    learner.done_seeding = True  # Only learn from the teachers.
+    for teacher in teachers:
+        learner.remember_node(teacher)
+    assert learner.teachers_per_round == 3
+
+    # A single round is enough to learn from all the teachers.
+    sprouts = learner.learn_from_teacher_node()
+    assert len(learner.known_nodes) == 3 + 1 + 3 * 3
+    assert shared_node in learner.known_nodes
+
+    # Each node was taken in only once, even if several teachers know about it.
+    learned_addresses = [sprout.checksum_address for sprout in sprouts]
+    assert len(learned_addresses) == len(set(learned_addresses))
+    assert set(learned_addresses) == {node.checksum_address for node in learner.known_nodes} | {learner.checksum_address}
+
+    # Once there is nothing new to learn, fewer teachers are asked each round...
+    learner.learn_from_teacher_node()
+    assert learner.teachers_per_round == 1
+
+    # ...until there is something new again.
+    teachers[0].remember_node(lonely_ursula_maker(quantity=1).pop())
+    while learner.current_teacher_node() is not teachers[0]:
+        learner.cycle_teacher_node()
+    learner.learn_from_teacher_node()
+    assert learner.teachers_per_round == 2
+    assert len(learner.known_nodes) == 3 + 1 + 3 * 3 + 1
+
+
+def test_number_of_concurrent_teachers_is_bounded(lonely_ursula_maker):
+    with pytest.raises(ValueError):
+        lonely_ursula_maker(quantity=1, max_concurrent_teachers=0)
+    with pytest.raises(ValueError):
+        lonely_ursula_maker(quantity=1, max_concurrent_teachers=Learner.MAX_CONCURRENT_TEACHERS + 1)
+
+
+@pytest.fixture(scope='function')
+def teachers_and_learner(lonely_ursula_maker, mocker):
+    """
+    Three teachers, each of them knowing about two nodes nobody else knows about, and a learner that asks them
+    all at once.  Each test decides how every teacher answers the learner.
+    """
+    teachers = list(lonely_ursula_maker(quantity=3))
+    nodes_taught = dict()
+    for teacher in teachers:
+        nodes_taught[teacher] = lonely_ursula_maker(quantity=2)
+        for node in nodes_taught[teacher]:
+            teacher.remember_node(node)
+
+    learner = lonely_ursula_maker(quantity=1, max_concurrent_teachers=3).pop()
+    learner.done_seeding = True  # Only learn from the teachers.
+    for teacher in teachers:
+        learner.remember_node(teacher)
+
+    get_nodes_via_rest = learner.network_middleware.get_nodes_via_rest
+    behaviours = dict()
+
+    def fake_get_nodes_via_rest(node, *args, **kwargs):
+        behaviour = behaviours.get(node.checksum_address, get_nodes_via_rest)
+        return behaviour(node, *args, **kwargs)
+
+    mocker.patch.object(learner.network_middleware, 'get_nodes_via_rest', side_effect=fake_get_nodes_via_rest)
+    return teachers, nodes_taught, learner, behaviours, get_nodes_via_rest
+
+
+def test_one_failing_teacher_doesnt_spoil_the_learning_round(teachers_and_learner):
+    teachers, nodes_taught, learner, behaviours, _get_nodes_via_rest = teachers_and_learner
+
+    def broken(node, *args, **kwargs):
+        raise RuntimeError("Something unexpected")
+
+    failing_teacher, *good_teachers = teachers
+    behaviours[failing_teacher.checksum_address] = broken
+
+    # The error still surfaces...
+    with pytest.raises(RuntimeError, match="Something unexpected"):
+        learner.learn_from_teacher_node()
+
+    # ...but only after learning all the others had to teach.
+    for teacher in good_teachers:
+        for node in nodes_taught[teacher]:
+            assert node in learner.known_nodes
+    for node in nodes_taught[failing_teacher]:
+        assert node not in learner.known_nodes
+
+
+def test_late_teachers_are_ignored_in_the_learning_round(teachers_and_learner, monkeypatch):
+    teachers, nodes_taught, learner, behaviours, get_nodes_via_rest = teachers_and_learner
+    monkeypatch.setattr(learner, 'TEACHER_RESPONSE_TIMEOUT', 0.5)
+    release = threading.Event()
+
+    def hanging(node, *args, **kwargs):
+        release.wait()
+        return get_nodes_via_rest(node, *args, **kwargs)
+
+    late_teacher, *good_teachers = teachers
+    behaviours[late_teacher.checksum_address] = hanging
+    try:
+        learner.learn_from_teacher_node()
+    finally:
+        release.set()
+
+    for teacher in good_teachers:
+        for node in nodes_taught[teacher]:
+            assert node in learner.known_nodes
+    for node in nodes_taught[late_teacher]:
+        assert node not in learner.known_nodes
+
+
+def test_number_of_concurrent_teachers_is_configurable():
+    config = UrsulaConfiguration(**assemble(federated=True), rest_port=MOCK_URSULA_STARTING_PORT, max_concurrent_teachers=3)
+    try:
+        assert config.static_payload()['max_concurrent_teachers'] == 3
+        assert config.generate_parameters()['max_concurrent_teachers'] == 3
+    finally:
+        config.cleanup()
+
+    config = make_ursula_test_configuration(federated=True)
+    try:
+        assert config.max_concurrent_teachers == config.DEFAULT_MAX_CONCURRENT_TEACHERS
+    finally:
+        config.cleanup()
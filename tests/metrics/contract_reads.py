@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+"""
+Measures enumerating the stakers of StakingEscrow, as done by `nucypher status`, with one `eth_call`
+per staker and with `BlockchainInterface.batch_call`, on a local eth-tester chain with thousands of stakers.
+
+The chain is served over HTTP, with a simulated round trip time per request, as a remote node would be,
+and requests go through the retry middleware, as they do for a connected `BlockchainInterface`.
+
+Deploying StakingEscrow itself takes solc, so the contract read here is a minimal stand-in for it,
+assembled below, with the same `stakers(uint256)` and `getStakersLength()` view functions.
+Executing the calls takes eth-tester far longer than it takes a node, so that time is also reported apart.
+
+Usage: python tests/metrics/contract_reads.py [STAKERS] [ROUND_TRIP_MILLISECONDS]
+"""
+
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+from eth_tester import EthereumTester
+from web3 import EthereumTesterProvider, HTTPProvider, Web3
+
+from nucypher.blockchain.eth.interfaces import BlockchainInterface
+from nucypher.blockchain.middleware.retry import RetryRequestMiddleware
+
+DEFAULT_STAKERS = 2000
+DEFAULT_ROUND_TRIP = 20  # milliseconds
+
+STAKERS_ABI = [
+    {'type': 'function', 'name': 'stakers', 'stateMutability': 'view',
+     'inputs': [{'name': 'index', 'type': 'uint256'}],
+     'outputs': [{'name': '', 'type': 'address'}]},
+    {'type': 'function', 'name': 'getStakersLength', 'stateMutability': 'view',
+     'inputs': [],
+     'outputs': [{'name': '', 'type': 'uint256'}]},
+]
+
+
+def stakers_contract_bytecode(stakers: int) -> bytes:
+    """
+    `getStakersLength()` returns `stakers`, and `stakers(index)` returns the last 20 bytes of keccak256(index).
+    """
+    get_stakers_length = bytes(Web3.keccak(text='getStakersLength()')[:4])
+    runtime = bytes.fromhex(
+        '600035'                    # calldataload(0)
+        '60e060020a900463'          # / 2 ** 224: the function selector
+        + get_stakers_length.hex() +
+        '14603c57'                  # == getStakersLength() ? jump to 0x3c
+        '600435600052'              # mstore(0, calldataload(4)): the index
+        '6020600020'                # keccak256(0, 32)
+        '73' + 'ff' * 20 +          # & (2 ** 160 - 1)
+        '16600052'                  # mstore(0, ...)
+        '60206000f3'                # return(0, 32)
+        '5b63'                      # 0x3c:
+        + stakers.to_bytes(4, 'big').hex() +
+        '60005260206000f3'          # return(0, 32) the number of stakers
+    )
+    constructor = bytes.fromhex('61' + len(runtime).to_bytes(2, 'big').hex() + '80600c6000396000f3')
+    return constructor + runtime
+
+
+def deploy(w3: Web3, stakers: int) -> str:
+    transaction_hash = w3.eth.sendTransaction({'from': w3.eth.accounts[0],
+                                               'data': stakers_contract_bytecode(stakers),
+                                               'gas': 1_000_000})
+    return w3.eth.waitForTransactionReceipt(transaction_hash)['contractAddress']
+
+
+class TesterChainServer:
+    """
+    Serves JSON-RPC requests (single or batched) to the tester chain, taking `round_trip` seconds for each one.
+    The time the tester chain takes to execute the calls, far longer than a node's, is kept in `execution_time`.
+    """
+
+    def __init__(self, w3: Web3, round_trip: float):
+        self.w3 = w3
+        self.round_trip = round_trip
+        self.execution_time = 0.0
+        self.uri = self.__serve()
+
+    def __serve(self) -> str:
+        chain = self
+
+        class JSONRPCHandler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                batch = payload if isinstance(payload, list) else [payload]
+                responses = []
+                start = time.perf_counter()
+                for request in batch:
+                    result = chain.w3.manager.request_blocking(request['method'], request['params'])
+                    if isinstance(result, int):
+                        result = hex(result)
+                    responses.append({'jsonrpc': '2.0', 'id': request['id'], 'result': json.loads(Web3.toJSON(result))})
+                chain.execution_time += time.perf_counter() - start
+                time.sleep(chain.round_trip)
+                body = json.dumps(responses if isinstance(payload, list) else responses[0]).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), JSONRPCHandler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        return f'http://127.0.0.1:{server.server_port}'
+
+
+def benchmark(stakers: int = DEFAULT_STAKERS, round_trip: int = DEFAULT_ROUND_TRIP) -> None:
+    testerchain = Web3(EthereumTesterProvider(EthereumTester()))
+    contract_address = deploy(testerchain, stakers)
+
+    chain = TesterChainServer(testerchain, round_trip=round_trip / 1000)
+    provider = HTTPProvider(chain.uri, request_kwargs={'timeout': 120})  # A batch takes the tester chain a while
+    remote = BlockchainInterface(provider=provider)
+    remote._attach_provider(provider=provider)
+    remote.w3 = Web3(provider)
+    remote.w3.middleware_onion.add(RetryRequestMiddleware)
+    contract = remote.w3.eth.contract(address=contract_address, abi=STAKERS_ABI)
+    population = contract.functions.getStakersLength().call()
+
+    print(f"{population} stakers, {round_trip} ms per round trip")
+
+    def measure(read_stakers):
+        chain.execution_time = 0.0
+        start = time.perf_counter()
+        result = read_stakers()
+        elapsed = time.perf_counter() - start
+        return result, elapsed, elapsed - chain.execution_time
+
+    one_by_one, one_by_one_time, one_by_one_rest = measure(
+        lambda: [contract.functions.stakers(index).call() for index in range(population)])
+    batched, batched_time, batched_rest = measure(
+        lambda: remote.batch_call(contract.functions.stakers(index) for index in range(population)))
+    assert batched == one_by_one
+
+    print(f"one eth_call per staker: {one_by_one_time:7.2f}s, {one_by_one_rest:7.2f}s besides executing the calls")
+    print(f"                batched: {batched_time:7.2f}s, {batched_rest:7.2f}s besides executing the calls "
+          f"({one_by_one_rest / batched_rest:.0f}x)")
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures the datastore reads done by Ursula on the reencryption and treasure map
+hot paths, per request: each request reads each of the fields it uses once, as
+Ursula does. The records are read straight from the database, either with a key
+per field (as older versions stored them) or with a key per record (as they are
+stored now), and through `DatastoreRecord`.
+Also measures the memory taken by records, which have no instance `__dict__`
+(see `DatastoreRecord.__slots__`), against the same state kept in a `__dict__`.
+
+Usage: python tests/metrics/datastore_reads.py [REQUESTS]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+import lmdb
+import maya
+import msgpack
+from umbral import pre
+from umbral.keys import UmbralPrivateKey
+from umbral.signing import Signer
+
+from nucypher.datastore.datastore import Datastore
+from nucypher.datastore.models import PolicyArrangement, TreasureMap
+
+DEFAULT_REQUESTS = 1000
+ARRANGEMENTS = 100
+RUNS = 5  # the best one is kept
+
+REENCRYPT_FIELDS = (PolicyArrangement, ('kfrag', 'alice_verifying_key'))
+TREASURE_MAP_FIELDS = (TreasureMap, ('treasure_map', ))
+
+
+class RecordStateInDict:
+    """The state of a record, kept in an instance `__dict__` as it was before `__slots__`."""
+
+    def __init__(self, db_transaction, record_id, writeable=False, index_db=None):
+        self._record_id = record_id
+        self._DatastoreRecord__db_transaction = db_transaction
+        self._DatastoreRecord__index_db = index_db
+        self._DatastoreRecord__storage_key = f'{type(self).__name__}:{record_id}'.encode()
+        self._DatastoreRecord__encoded_fields = None
+        self._DatastoreRecord__field_cache = dict()
+        self._DatastoreRecord__writeable = writeable
+
+
+def populate(datastore: Datastore) -> None:
+    delegating_key = UmbralPrivateKey.gen_key()
+    signing_key = UmbralPrivateKey.gen_key()
+    receiving_key = UmbralPrivateKey.gen_key().get_pubkey()
+    kfrags = pre.generate_kfrags(delegating_privkey=delegating_key,
+                                 receiving_pubkey=receiving_key,
+                                 threshold=1,
+                                 N=ARRANGEMENTS,
+                                 signer=Signer(signing_key))
+    expiration = maya.now().add(days=1)
+    for index, kfrag in enumerate(kfrags):
+        with datastore.describe(PolicyArrangement, str(index), writeable=True) as arrangement:
+            arrangement.arrangement_id = str(index).encode()
+            arrangement.expiration = expiration
+            arrangement.alice_verifying_key = signing_key.get_pubkey()
+            arrangement.kfrag = kfrag
+        with datastore.describe(TreasureMap, str(index), writeable=True) as treasure_map:
+            treasure_map.treasure_map = os.urandom(1024)
+            treasure_map.expiration = expiration
+
+
+def copy_with_a_key_per_field(db_env: lmdb.Environment, field_keys_env: lmdb.Environment) -> None:
+    """Copies the records of `db_env` to `field_keys_env`, with a `Type:field:id` key per field."""
+    with db_env.begin() as db_tx, field_keys_env.begin(write=True) as field_keys_tx:
+        for record_key, packed_fields in db_tx.cursor():
+            record_type, _separator, record_id = record_key.partition(b':')
+            if not record_id:
+                continue  # Not a record (eg. the index sub-database)
+            for record_field, encoded_value in msgpack.unpackb(packed_fields).items():
+                field_key = record_type + b':' + record_field.encode() + b':' + record_id
+                field_keys_tx.put(field_key, msgpack.packb(encoded_value))
+
+
+def key_per_field_request(db_env: lmdb.Environment, fields: Tuple, record_id: str) -> None:
+    """Reads each field straight from its own key."""
+    record_type, field_names = fields
+    with db_env.begin() as db_tx:
+        for field_name in field_names:
+            key = f'{record_type.__name__}:{field_name}:{record_id}'.encode()
+            getattr(record_type, f'_{field_name}').decode(msgpack.unpackb(db_tx.get(key)))
+
+
+def key_per_record_request(db_env: lmdb.Environment, fields: Tuple, record_id: str) -> None:
+    """Reads the record straight from its key, then decodes each field."""
+    record_type, field_names = fields
+    with db_env.begin() as db_tx:
+        encoded_fields = msgpack.unpackb(db_tx.get(f'{record_type.__name__}:{record_id}'.encode()))
+        for field_name in field_names:
+            getattr(record_type, f'_{field_name}').decode(encoded_fields[field_name])
+
+
+def record_request(datastore: Datastore, fields: Tuple, record_id: str) -> None:
+    """Reads the fields through a `DatastoreRecord`, as Ursula does."""
+    record_type, field_names = fields
+    with datastore.describe(record_type, record_id) as record:
+        for field_name in field_names:
+            getattr(record, field_name)
+
+
+def measure(request: Callable, db, fields: Tuple, requests: int) -> float:
+    """Returns the mean time per request of the best of `RUNS` runs, in microseconds."""
+    best = None
+    for _run in range(RUNS):
+        start = time.perf_counter()
+        for index in range(requests):
+            request(db, fields, str(index % ARRANGEMENTS))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / requests * 1_000_000
+
+
+def record_size(record_type, records: int) -> float:
+    """Returns the memory taken by each record of `record_type`, in bytes."""
+    tracemalloc.start()
+    before, _peak = tracemalloc.get_traced_memory()
+    kept = [record_type(None, index) for index in range(records)]
+    after, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / len(kept)
+
+
+def benchmark(requests: int = DEFAULT_REQUESTS) -> None:
+    datastore = Datastore(tempfile.mkdtemp())
+    populate(datastore)
+    db_env = datastore._Datastore__db_env
+    field_keys_env = lmdb.open(tempfile.mkdtemp(), map_size=Datastore.LMDB_MAP_SIZE)
+    copy_with_a_key_per_field(db_env, field_keys_env)
+
+    print(f"{requests} requests, one read of each field per request (us/request, best of {RUNS})")
+    print(f"{'':>14}  {'key per field':>13}  {'key per record':>14}  {'DatastoreRecord':>15}")
+    for name, fields in (('reencrypt', REENCRYPT_FIELDS), ('treasure map', TREASURE_MAP_FIELDS)):
+        key_per_field = measure(key_per_field_request, field_keys_env, fields, requests)
+        key_per_record = measure(key_per_record_request, db_env, fields, requests)
+        through_records = measure(record_request, datastore, fields, requests)
+        print(f"{name:>14}  {key_per_field:13.1f}  {key_per_record:14.1f}  {through_records:15.1f}")
+
+    slotted = record_size(PolicyArrangement, requests)
+    with_dict = record_size(RecordStateInDict, requests)
+    print(f"Record size: {slotted:.0f} bytes with __slots__, {with_dict:.0f} bytes with a __dict__ "
+          f"({1 - slotted / with_dict:.0%} saved)")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS)
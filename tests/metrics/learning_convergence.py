@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures the time it takes a new learner to know about a whole (simulated) fleet,
+learning from one teacher per round, and from several teachers at once.
+
+In the simulated fleet, each node only knows about a random sample of the others,
+teachers answer after some network latency, and some of them are down (and only
+fail after a timeout).  Keys, certificates and REST apps are mocked out.
+
+Usage: python tests/metrics/learning_convergence.py [NODES] [MAX_CONCURRENT_TEACHERS ...]
+"""
+
+import random
+import sys
+import time
+from typing import Dict
+
+import requests
+
+from nucypher.characters.lawful import Ursula
+from nucypher.config.characters import AliceConfiguration
+from nucypher.config.constants import TEMPORARY_DOMAIN
+from nucypher.utilities.logging import GlobalLoggerSettings
+from tests.mock.performance_mocks import (
+    mock_cert_generation,
+    mock_cert_loading,
+    mock_cert_storage,
+    mock_keep_learning,
+    mock_message_verification,
+    mock_metadata_validation,
+    mock_pubkey_from_bytes,
+    mock_remember_node,
+    mock_rest_app_creation,
+    mock_secret_source,
+    mock_signature_bytes,
+    mock_stamp_call,
+    mock_verify_node
+)
+from tests.utils.config import make_ursula_test_configuration
+from tests.utils.middleware import MockRestMiddlewareForLargeFleetTests
+from tests.utils.ursula import make_federated_ursulas
+
+DEFAULT_NODES = 500
+DEFAULT_MAX_CONCURRENT_TEACHERS = (1, 4, 8, 16)
+
+NODES_KNOWN_BY_EACH_NODE = 25
+NETWORK_LATENCY = 0.02  # seconds
+DOWN_NODES_RATIO = 0.1
+DOWN_NODE_TIMEOUT = 0.5  # seconds
+MAX_ROUNDS = 1000
+
+
+class SimulatedFleetMiddleware(MockRestMiddlewareForLargeFleetTests):
+
+    def __init__(self, fleet: Dict[str, Ursula], down_nodes: set, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fleet = fleet
+        self.down_nodes = down_nodes
+
+    def get_nodes_via_rest(self, node, *args, **kwargs):
+        if node.checksum_address in self.down_nodes:
+            time.sleep(DOWN_NODE_TIMEOUT)
+            raise requests.exceptions.ConnectTimeout
+        time.sleep(NETWORK_LATENCY)
+        return super().get_nodes_via_rest(self.fleet[node.checksum_address], *args, **kwargs)
+
+
+def make_fleet(nodes: int) -> Dict[str, Ursula]:
+    config = make_ursula_test_configuration(federated=True)
+    with mock_secret_source():
+        with mock_cert_storage, mock_cert_loading, mock_rest_app_creation, mock_cert_generation, mock_remember_node:
+            ursulas = list(make_federated_ursulas(ursula_config=config, quantity=nodes, know_each_other=False))
+            for ursula in ursulas:
+                for other_ursula in random.sample(ursulas, NODES_KNOWN_BY_EACH_NODE):
+                    if other_ursula is not ursula:
+                        ursula.remember_node(other_ursula)
+                ursula.known_nodes.record_fleet_state()
+    return {ursula.checksum_address: ursula for ursula in ursulas}
+
+
+def time_to_full_fleet_knowledge(fleet: Dict[str, Ursula], down_nodes: set, max_concurrent_teachers: int):
+    """Returns the number of learning rounds, and the seconds, until the learner knows about the whole fleet."""
+    config = AliceConfiguration(dev_mode=True,
+                                domain=TEMPORARY_DOMAIN,
+                                network_middleware=SimulatedFleetMiddleware(fleet, down_nodes),
+                                federated_only=True,
+                                save_metadata=False,
+                                reload_metadata=False)
+    first_teacher = next(ursula for address, ursula in fleet.items() if address not in down_nodes)
+    with mock_cert_storage, mock_verify_node, mock_message_verification, mock_keep_learning:
+        learner = config.produce(known_nodes=[first_teacher], max_concurrent_teachers=max_concurrent_teachers)
+
+    with mock_cert_storage, mock_cert_loading, mock_verify_node, mock_message_verification, mock_metadata_validation:
+        with mock_pubkey_from_bytes(), mock_stamp_call, mock_signature_bytes:
+            start = time.perf_counter()
+            rounds = 0
+            while len(learner.known_nodes) < len(fleet) and rounds < MAX_ROUNDS:
+                learner.learn_from_teacher_node()
+                rounds += 1
+            elapsed = time.perf_counter() - start
+
+    learner.stop_learning_loop()
+    config.cleanup()
+    return rounds, elapsed
+
+
+def benchmark(nodes: int = DEFAULT_NODES, concurrent_teachers=DEFAULT_MAX_CONCURRENT_TEACHERS) -> None:
+    random.seed(0)
+    with GlobalLoggerSettings.pause_all_logging_while():
+        fleet = make_fleet(nodes)
+        down_nodes = set(random.sample(list(fleet), int(nodes * DOWN_NODES_RATIO)))
+        print(f"{nodes} nodes ({len(down_nodes)} down), each one knowing about {NODES_KNOWN_BY_EACH_NODE} others")
+        for max_concurrent_teachers in concurrent_teachers:
+            random.seed(max_concurrent_teachers)
+            rounds, elapsed = time_to_full_fleet_knowledge(fleet, down_nodes, max_concurrent_teachers)
+            print(f"up to {max_concurrent_teachers:2} teachers per round: "
+                  f"full fleet knowledge after {rounds:4} rounds, {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    benchmark(*arguments[:1], *([arguments[1:]] if arguments[1:] else []))
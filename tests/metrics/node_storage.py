@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+"""
+Measures storing the metadata of a fleet of known nodes, as done while learning about them,
+and reading all of it back, as done on startup, with one file per node (`LocalFileBasedNodeStorage`)
+and with a single LMDB database (`LMDBNodeStorage`).
+
+Usage: python tests/metrics/node_storage.py [NODES]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from eth_utils import to_checksum_address
+
+from nucypher.characters.lawful import Ursula
+from nucypher.config.storages import LMDBNodeStorage, LocalFileBasedNodeStorage, NodeStorage
+from tests.utils.config import make_ursula_test_configuration
+from tests.utils.ursula import MOCK_URSULA_STARTING_PORT
+
+DEFAULT_NODES = 5000
+
+
+class StoredNode:
+    """The metadata of a real Ursula, under a made up address, to build a large fleet cheaply."""
+
+    def __init__(self, ursula: Ursula):
+        self.checksum_address = to_checksum_address(os.urandom(20))
+        self.__metadata = bytes(ursula)
+
+    def __bytes__(self):
+        return self.__metadata
+
+
+def measure(storage: NodeStorage, fleet) -> (float, float):
+    """Returns the time it takes to store the fleet, and to read it back, in seconds."""
+    start = time.perf_counter()
+    for node in fleet:
+        storage.store_node_metadata(node=node)
+    storage.flush()
+    stored = time.perf_counter()
+    nodes = storage.all(federated_only=True)
+    read = time.perf_counter()
+    assert len(nodes) == len(fleet)
+    return stored - start, read - stored
+
+
+def benchmark(nodes: int = DEFAULT_NODES) -> None:
+    config = make_ursula_test_configuration(federated=True)
+    try:
+        ursula = config.produce(rest_port=MOCK_URSULA_STARTING_PORT, db_filepath=tempfile.mkdtemp())
+        fleet = [StoredNode(ursula) for _ in range(nodes)]
+
+        file_storage = LocalFileBasedNodeStorage(federated_only=True, storage_root=tempfile.mkdtemp())
+        file_storage.initialize()
+        lmdb_storage = LMDBNodeStorage(federated_only=True, storage_root=tempfile.mkdtemp())
+        lmdb_storage.initialize()
+
+        print(f"{nodes} nodes")
+        for name, storage in (('one file per node', file_storage), ('LMDB', lmdb_storage)):
+            store_time, read_time = measure(storage, fleet)
+            print(f"{name:>17}: {store_time:6.2f}s to store, {read_time:6.2f}s to read on startup")
+    finally:
+        config.cleanup()
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:2]))
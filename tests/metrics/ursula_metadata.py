@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Measures the serialization of a fleet of Ursulas, as done by a teacher answering
+a learning round (every known node is serialized), with and without the cached
+metadata of `Ursula`.
+
+Usage: python tests/metrics/ursula_metadata.py [NODES] [ROUNDS]
+"""
+
+import sys
+import time
+from typing import Iterable
+
+import lmdb
+
+from nucypher.characters.lawful import Ursula
+from tests.mock.datastore import MOCK_DB, mock_lmdb_open
+from tests.utils.config import make_ursula_test_configuration
+from tests.utils.ursula import MOCK_URSULA_STARTING_PORT
+
+DEFAULT_NODES = 1000
+DEFAULT_ROUNDS = 20
+
+
+def learning_round(fleet: Iterable[Ursula], cached: bool) -> bytes:
+    if not cached:
+        for ursula in fleet:
+            ursula._Ursula__metadata_cache = (None, None)
+    return bytes().join(bytes(ursula) for ursula in fleet)
+
+
+def measure(fleet: Iterable[Ursula], rounds: int, cached: bool) -> float:
+    """Returns the mean time per learning round, in microseconds."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        learning_round(fleet, cached)
+    return (time.perf_counter() - start) / rounds * 1_000_000
+
+
+def benchmark(nodes: int = DEFAULT_NODES, rounds: int = DEFAULT_ROUNDS) -> None:
+    # As in the tests, the datastores of the Ursulas are kept in memory: a fleet of real ones doesn't fit.
+    lmdb.open = mock_lmdb_open
+    config = make_ursula_test_configuration(federated=True)
+    try:
+        fleet = [config.produce(rest_port=MOCK_URSULA_STARTING_PORT + index, db_filepath=MOCK_DB)
+                 for index in range(nodes)]
+        assert learning_round(fleet, cached=False) == learning_round(fleet, cached=True)
+        uncached = measure(fleet, rounds, cached=False)
+        cached = measure(fleet, rounds, cached=True)
+        print(f"{nodes} nodes, {rounds} learning rounds")
+        print(f"{uncached:9.1f} us/round uncached, {cached:9.1f} us/round cached ({1 - cached / uncached:.0%} saved)")
+    finally:
+        config.cleanup()
+
+
+if __name__ == "__main__":
+    benchmark(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+"""
+Measures the time it takes to sample stakers for a policy, with the Fenwick tree of `WeightedSampler`
+and with the cumulative totals it used to keep, at 10k and 100k stakers.
+
+Building the sampler once per period and copying it for each policy (as `StakingEscrowAgent` does)
+is measured separately from building it from the stakers map every time.
+
+Usage: python tests/metrics/weighted_sampling.py [POLICIES] [SHARES]
+"""
+
+import os
+import random
+import sys
+import time
+from bisect import bisect_right
+from itertools import accumulate
+
+from eth_utils import to_checksum_address
+
+from nucypher.blockchain.eth.agents import WeightedSampler
+
+DEFAULT_POLICIES = 20
+DEFAULT_SHARES = 30
+POPULATIONS = (10_000, 100_000)
+
+
+class BisectingSampler:
+    """The former `WeightedSampler`: every draw subtracts the drawn weight from the following totals."""
+
+    def __init__(self, weighted_elements):
+        elements, weights = zip(*weighted_elements.items())
+        self.totals = list(accumulate(weights))
+        self.elements = elements
+
+    def sample_no_replacement(self, rng, quantity):
+        samples = []
+        for _ in range(quantity):
+            position = rng.randint(0, self.totals[-1] - 1)
+            idx = bisect_right(self.totals, position)
+            samples.append(self.elements[idx])
+            weight = self.totals[idx] - self.totals[idx - 1] if idx > 0 else self.totals[idx]
+            for j in range(idx, len(self.totals)):
+                self.totals[j] -= weight
+        return samples
+
+
+def random_stakers(population: int) -> dict:
+    return {to_checksum_address(os.urandom(20)): random.randint(15_000, 4_000_000) * 10 ** 18
+            for _ in range(population)}
+
+
+def measure(sample_policy, policies: int) -> float:
+    """Returns the mean time per policy, in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(policies):
+        sample_policy()
+    return (time.perf_counter() - start) / policies * 1000
+
+
+def benchmark(policies: int = DEFAULT_POLICIES, shares: int = DEFAULT_SHARES) -> None:
+    rng = random.SystemRandom()
+    print(f"{policies} policies of {shares} shares, drawing one staker at a time")
+    for population in POPULATIONS:
+        stakers = random_stakers(population)
+
+        def draw_one_at_a_time(sampler):
+            return [sampler.sample_no_replacement(rng, 1)[0] for _ in range(shares)]
+
+        bisecting = measure(lambda: draw_one_at_a_time(BisectingSampler(stakers)), policies)
+        fenwick = measure(lambda: draw_one_at_a_time(WeightedSampler(stakers)), policies)
+        period_sampler = WeightedSampler(stakers)
+        reused = measure(lambda: draw_one_at_a_time(period_sampler.copy()), policies)
+
+        print(f"{population:>7} stakers: {bisecting:9.1f} ms/policy bisecting, "
+              f"{fenwick:9.1f} ms/policy Fenwick tree, "
+              f"{reused:9.1f} ms/policy reusing the sampler of the period ({bisecting / reused:.0f}x)")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:3]))
@@ -23,19 +23,28 @@ from threading import Lock
 from constant_sorrow.constants import MOCK_DB
 
 
-def mock_lmdb_open(db_path, map_size=10485760):
+def mock_lmdb_open(db_path, map_size=10485760, max_dbs=0):
     if db_path == MOCK_DB:
         return MockEnvironment()
     else:
-        return lmdb.Environment(db_path, map_size=map_size)
+        return lmdb.Environment(db_path, map_size=map_size, max_dbs=max_dbs)
 
 
 class MockEnvironment:
 
     def __init__(self):
-        self._storage = {}
+        # Named sub-databases are keyed by their names, the main database by `None`.
+        self._storages = {None: {}}
         self._lock = Lock()
 
+    @property
+    def _storage(self):
+        return self._storages[None]
+
+    def open_db(self, key=None):
+        self._storages.setdefault(key, {})
+        return key
+
     @contextmanager
     def begin(self, write=False):
         with self._lock:
@@ -47,10 +56,14 @@ class MockTransaction:
 
     def __init__(self, env, write=False):
         self._env = env
-        self._storage = dict(env._storage)
+        self._storages = {db: dict(storage) for db, storage in env._storages.items()}
         self._write = write
         self._invalid = False
 
+    @property
+    def _storage(self):
+        return self._storages[None]
+
     def __enter__(self):
         if self._invalid:
             raise lmdb.Error()
@@ -62,26 +75,28 @@ class MockTransaction:
         else:
             self.commit()
 
-    def put(self, key, value, overwrite=True):
+    def put(self, key, value, overwrite=True, db=None):
         if self._invalid:
             raise lmdb.Error()
         assert self._write
-        if not overwrite and key in self._storage:
+        storage = self._storages[db]
+        if not overwrite and key in storage:
             return False
-        self._storage[key] = value
+        storage[key] = value
         return True
 
-    def get(self, key, default=None):
+    def get(self, key, default=None, db=None):
         if self._invalid:
             raise lmdb.Error()
-        return self._storage.get(key, default)
+        return self._storages[db].get(key, default)
 
-    def delete(self, key):
+    def delete(self, key, db=None):
         if self._invalid:
             raise lmdb.Error()
         assert self._write
-        if key in self._storage:
-            del self._storage[key]
+        storage = self._storages[db]
+        if key in storage:
+            del storage[key]
             return True
         else:
             return False
@@ -90,26 +105,26 @@ class MockTransaction:
         if self._invalid:
             raise lmdb.Error()
         self._invalidate()
-        self._env._storage = self._storage
+        self._env._storages = self._storages
 
     def abort(self):
         self._invalidate()
-        self._storage = self._env._storage
+        self._storages = self._env._storages
 
     def _invalidate(self):
         self._invalid = True
 
-    def cursor(self):
-        return MockCursor(self)
+    def cursor(self, db=None):
+        return MockCursor(self, db=db)
 
 
 class MockCursor:
 
-    def __init__(self, tx):
-        self._tx = tx
+    def __init__(self, tx, db=None):
+        self._storage = tx._storages[db]
         # TODO: assuming here that the keys are not changed while the cursor exists.
         # Any way to enforce it?
-        self._keys = list(sorted(tx._storage))
+        self._keys = list(sorted(self._storage))
         self._pos = None
 
     def set_range(self, key):
@@ -125,4 +140,6 @@ class MockCursor:
         return self._keys[self._pos]
 
     def iternext(self, keys=True, values=True):
+        if keys and values:
+            return iter([(key, self._storage[key]) for key in self._keys[self._pos:]])
         return iter(self._keys[self._pos:])
@@ -0,0 +1,47 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from nucypher.crypto import api
+from nucypher.crypto.api import memoized_verify_eip_191, verify_eip_191
+
+
+def test_memoized_eip_191_verification(mocker):
+    account = Account.create()
+    message = os.urandom(100)
+    signature = bytes(Account.sign_message(encode_defunct(primitive=message), private_key=account.key).signature)
+    other_account = Account.create()
+
+    recover_spy = mocker.spy(api, 'recover_address_eip_191')
+    memoized_verify_eip_191.cache_clear()
+
+    for _ in range(3):
+        assert memoized_verify_eip_191(address=account.address, message=message, signature=signature)
+        assert not memoized_verify_eip_191(address=other_account.address, message=message, signature=signature)
+
+    # Each verification only recovered the key once
+    assert recover_spy.call_count == 2
+    cache_info = memoized_verify_eip_191.cache_info()
+    assert (cache_info.hits, cache_info.misses) == (4, 2)
+
+    # Same results as without the cache
+    assert verify_eip_191(address=account.address, message=message, signature=signature)
+    assert not verify_eip_191(address=other_account.address, message=message, signature=signature)
@@ -0,0 +1,121 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import io
+import os
+
+import pytest
+
+from nucypher.crypto.streaming import (
+    AEAD_TAG_SIZE,
+    StreamDecryptionError,
+    StreamHeader,
+    decrypt_chunks,
+    encrypt_chunks,
+    max_chunk_record_length,
+    read_file_chunks,
+    read_file_records,
+    rechunk,
+    records,
+    split_records
+)
+
+
+def test_stream_header_serialization():
+    header = StreamHeader.random(chunk_size=4096)
+    deserialized_header = StreamHeader.from_bytes(bytes(header))
+    assert deserialized_header.key == header.key
+    assert deserialized_header.chunk_size == 4096
+
+    with pytest.raises(ValueError):
+        StreamHeader(key=b'too short')
+    with pytest.raises(ValueError):
+        StreamHeader.random(chunk_size=0)
+
+
+def test_rechunking():
+    assert list(rechunk([b'ab', b'', b'cdefg', b'h'], chunk_size=3)) == [b'abc', b'def', b'gh']
+    assert list(rechunk([b'abc', b'def'], chunk_size=3)) == [b'abc', b'def']
+    assert list(rechunk([], chunk_size=3)) == []
+
+    data = os.urandom(1000)
+    assert list(read_file_chunks(io.BytesIO(data), chunk_size=300)) == list(rechunk([data], chunk_size=300))
+
+
+def test_records():
+    payloads = [b'', b'first', os.urandom(100)]
+    stream = b''.join(records(payloads))
+    max_record_length = lambda index: 100
+
+    # However the stream is split, the records are the same
+    assert list(split_records([stream], max_record_length)) == payloads
+    assert list(split_records((stream[i:i + 1] for i in range(len(stream))), max_record_length)) == payloads
+    assert list(read_file_records(io.BytesIO(stream), max_record_length)) == payloads
+
+    with pytest.raises(StreamDecryptionError):
+        list(split_records([stream[:-1]], max_record_length))
+    with pytest.raises(StreamDecryptionError):
+        list(read_file_records(io.BytesIO(stream[:-1]), max_record_length))
+
+
+def test_record_length_limits():
+    header = StreamHeader.random(chunk_size=100)
+    assert max_chunk_record_length(header) == 100 + AEAD_TAG_SIZE
+
+    payloads = [os.urandom(10), os.urandom(116), os.urandom(117)]
+    stream = b''.join(records(payloads))
+    limits = lambda index: 10 if index == 0 else max_chunk_record_length(header)
+
+    # The records within their limits are yielded, and the first one beyond them is rejected
+    for stream_records in (split_records([stream], limits), read_file_records(io.BytesIO(stream), limits)):
+        assert next(stream_records) == payloads[0]
+        assert next(stream_records) == payloads[1]
+        with pytest.raises(StreamDecryptionError, match="Record 2 of the stream is 117 bytes long"):
+            next(stream_records)
+
+    # A huge declared length is rejected as soon as it is read, without waiting for (or buffering) the record
+    huge_record_prefix = (2 ** 32 - 1).to_bytes(4, byteorder='big')
+    with pytest.raises(StreamDecryptionError):
+        list(split_records([huge_record_prefix], limits))
+    with pytest.raises(StreamDecryptionError):
+        list(read_file_records(io.BytesIO(huge_record_prefix), limits))
+
+
+def test_encrypt_and_decrypt_chunks():
+    header = StreamHeader.random(chunk_size=100)
+    plaintext_chunks = list(rechunk([os.urandom(1050)], chunk_size=header.chunk_size))
+    ciphertext_chunks = list(encrypt_chunks(header, plaintext_chunks))
+    assert len(ciphertext_chunks) == len(plaintext_chunks) == 11
+    assert list(decrypt_chunks(header, ciphertext_chunks)) == plaintext_chunks
+
+    # Empty streams work too
+    assert list(decrypt_chunks(header, encrypt_chunks(header, []))) == [b'']
+
+    # Another key can't decrypt the stream
+    with pytest.raises(StreamDecryptionError):
+        list(decrypt_chunks(StreamHeader.random(chunk_size=100), ciphertext_chunks))
+
+    # Tampered, reordered, missing or extra chunks are detected
+    tampered_chunk = bytes([ciphertext_chunks[3][0] ^ 1]) + ciphertext_chunks[3][1:]
+    for tampered_stream in ([*ciphertext_chunks[:3], tampered_chunk, *ciphertext_chunks[4:]],
+                            [ciphertext_chunks[1], ciphertext_chunks[0], *ciphertext_chunks[2:]],
+                            ciphertext_chunks[:-1],
+                            ciphertext_chunks[1:],
+                            [*ciphertext_chunks, ciphertext_chunks[0]],
+                            []):
+        with pytest.raises(StreamDecryptionError):
+            list(decrypt_chunks(header, tampered_stream))
@@ -17,10 +17,12 @@ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 import lmdb
 import msgpack
 import pytest
+import shutil
 import tempfile
 from datetime import datetime
 from nucypher.datastore import datastore
 from nucypher.datastore.base import DatastoreRecord, RecordField
+from nucypher.datastore.models import PolicyArrangement
 
 
 class TestRecord(DatastoreRecord):
@@ -158,6 +160,58 @@ def test_datastore_describe(mock_or_real_datastore):
         assert new_test_record.test == b'now it exists :)'
 
 
+def test_datastore_describe_many(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+
+    # Many records can be written in a single transaction
+    with storage.describe_many(TestRecord, ['first', 'second', 1337], writeable=True) as test_records:
+        assert len(test_records) == 3
+        for index, test_record in enumerate(test_records):
+            test_record.test = f'test data {index}'.encode()
+
+    # ...and each of them can be read back independently
+    with storage.describe(TestRecord, 1337) as test_record:
+        assert test_record.test == b'test data 2'
+
+    # Records are returned in the same order as the given IDs; a missing record can be handled per-record.
+    with storage.describe_many(TestRecord, ['second', 'missing', 'first']) as test_records:
+        second, missing, first = test_records
+        assert second.test == b'test data 1'
+        assert first.test == b'test data 0'
+        with pytest.raises(AttributeError):
+            should_error = missing.test
+
+    # Unhandled errors on any of the records raise `RecordNotFound`, as with `describe`.
+    with pytest.raises(datastore.RecordNotFound):
+        with storage.describe_many(TestRecord, ['first', 'missing']) as test_records:
+            for test_record in test_records:
+                should_error = test_record.test
+
+    # ...and abort the whole transaction when writing.
+    with pytest.raises(datastore.DatastoreTransactionError):
+        with storage.describe_many(TestRecord, ['first', 'second'], writeable=True) as (first, second):
+            first.test = b'this will not persist'
+            second.test = 1234
+
+    with storage.describe(TestRecord, 'first') as test_record:
+        assert test_record.test == b'test data 0'
+
+    # The records can't be used outside of the context manager
+    with pytest.raises(TypeError):
+        first.test = b'should not write'
+
+    # Repeated IDs share their record, so none of them reads a stale field
+    with storage.describe_many(TestRecord, ['first', 'second', 'first'], writeable=True) as test_records:
+        first, second, first_again = test_records
+        assert first is first_again
+        assert first_again.test == b'test data 0'
+        first.test = b'updated'
+        assert first_again.test == b'updated'
+
+    with storage.describe(TestRecord, 'first') as test_record:
+        assert test_record.test == b'updated'
+
+
 def test_datastore_query_by(mock_or_real_datastore):
 
     storage = mock_or_real_datastore
@@ -258,6 +312,78 @@ def test_datastore_query_by(mock_or_real_datastore):
             assert len(records) == 'this never gets executed'
 
 
+def test_datastore_query_by_range(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+
+    class IndexedRecord(DatastoreRecord):
+        _rank = RecordField(int, index=lambda rank: rank.to_bytes(4, byteorder='big'))
+        _name = RecordField(bytes)
+
+    # Records written before the field was indexed are picked up by the first range query.
+    class IndexedRecordBeforeIndex(DatastoreRecord):
+        _rank = RecordField(int)
+    IndexedRecordBeforeIndex.__name__ = IndexedRecord.__name__
+
+    with storage.describe(IndexedRecordBeforeIndex, 'old', writeable=True) as record:
+        record.rank = 4
+
+    for record_id, rank in ((1, 10), ('two', 2), ('three', 30), (4, 20)):
+        with storage.describe(IndexedRecord, record_id, writeable=True) as record:
+            record.rank = rank
+            record.name = f'rank {rank}'.encode()
+
+    with storage.query_by_range(IndexedRecord, 'rank', lower=3, upper=20) as records:
+        # In order of the indexed field
+        assert [record._record_id for record in records] == ['old', 1, 4]
+
+    # Both bounds are optional
+    with storage.query_by_range(IndexedRecord, 'rank', upper=10) as records:
+        assert [record.rank for record in records] == [2, 4, 10]
+    with storage.query_by_range(IndexedRecord, 'rank') as records:
+        assert len(records) == 5
+
+    # The index follows updates and deletions
+    with storage.query_by_range(IndexedRecord, 'rank', lower=20, writeable=True) as records:
+        records[0].rank = 1
+        records[1].delete()
+    with pytest.raises(datastore.RecordNotFound):
+        with storage.query_by_range(IndexedRecord, 'rank', lower=20) as records:
+            assert len(records) == 'this never gets executed cause it raises'
+
+    with storage.query_by_range(IndexedRecord, 'rank', upper=1) as records:
+        assert [record.name for record in records] == [b'rank 20']
+
+    # Only indexed fields can be queried by range
+    with pytest.raises(TypeError):
+        with storage.query_by_range(IndexedRecord, 'name', upper=b'z') as records:
+            assert len(records) == 'this never gets executed cause it raises'
+
+
+def test_datastore_builds_each_index_once():
+    temp_path = tempfile.mkdtemp()
+
+    class OnceIndexedRecord(DatastoreRecord):
+        _rank = RecordField(int, index=lambda rank: rank.to_bytes(4, byteorder='big'))
+
+    storage = datastore.Datastore(temp_path)
+    with storage.describe(OnceIndexedRecord, 'first', writeable=True) as record:
+        record.rank = 1
+    with storage.query_by_range(OnceIndexedRecord, 'rank') as records:
+        assert len(records) == 1
+
+    # A record written without going through the index (eg. by an older version)
+    # isn't backfilled again: the marker is read when the datastore opens.
+    db_env = storage._Datastore__db_env
+    with db_env.begin(write=True) as db_tx:
+        db_tx.put(b'OnceIndexedRecord:second', msgpack.packb({'rank': 2}))
+    db_env.close()
+
+    reopened_storage = datastore.Datastore(temp_path)
+    with reopened_storage.query_by_range(OnceIndexedRecord, 'rank') as records:
+        assert [record._record_id for record in records] == ['first']
+    shutil.rmtree(temp_path)
+
+
 def test_datastore_record_read(mock_or_real_lmdb_env):
     db_env = mock_or_real_lmdb_env
     with db_env.begin() as db_tx:
@@ -266,7 +392,7 @@ def test_datastore_record_read(mock_or_real_lmdb_env):
         assert test_rec._record_id == 'testing'
         assert test_rec._DatastoreRecord__db_transaction == db_tx
         assert test_rec._DatastoreRecord__writeable == False
-        assert test_rec._DatastoreRecord__storagekey == 'TestRecord:{record_field}:{record_id}'
+        assert test_rec._DatastoreRecord__storagekey == 'TestRecord:{record_id}'
 
         # Reading an attr with no RecordField should error
         with pytest.raises(TypeError):
@@ -290,7 +416,7 @@ def test_datastore_record_write(mock_or_real_lmdb_env):
 
         # Write an invalid serialization of `test` and test retrieving it is
         # a TypeError
-        db_tx.put(b'TestRecord:test:testing', msgpack.packb(1234))
+        db_tx.put(b'TestRecord:testing', msgpack.packb({'test': 1234}))
         with pytest.raises(TypeError):
             should_error = test_rec.test
 
@@ -306,7 +432,19 @@ def test_datastore_record_write(mock_or_real_lmdb_env):
         # Test writing a valid field and getting it.
         test_rec.test = b'good write'
         assert test_rec.test == b'good write'
-        assert msgpack.unpackb(db_tx.get(b'TestRecord:test:testing')) == b'good write'
+        assert msgpack.unpackb(db_tx.get(b'TestRecord:testing')) == {'test': b'good write'}
+
+        # All the fields of a record are stored together
+        test_date = datetime.now()
+        test_rec.test_date = test_date
+        assert msgpack.unpackb(db_tx.get(b'TestRecord:testing')) == {'test': b'good write',
+                                                                     'test_date': test_date.isoformat().encode()}
+
+        # ...and deleting the last of them deletes the record
+        test_rec.test = None
+        test_rec.test_date = None
+        assert db_tx.get(b'TestRecord:testing') is None
+        test_rec.test = b'good write'
         # TODO: Mock a `DBWriteError`
 
     # Test abort
@@ -325,34 +463,100 @@ def test_datastore_record_write(mock_or_real_lmdb_env):
         assert test_rec.test == b'good write'
 
 
+def test_datastore_record_caches_fields(mock_or_real_datastore):
+    decoded = list()
+
+    class CountingRecord(DatastoreRecord):
+        _test = RecordField(bytes, decode=lambda val: decoded.append(val) or val)
+
+    storage = mock_or_real_datastore
+    with storage.describe(CountingRecord, 'counting', writeable=True) as record:
+        record.test = b'first write'
+        # Written values are cached as they are, and don't need to be read back.
+        assert record.test == b'first write'
+        assert decoded == []
+
+    with storage.describe(CountingRecord, 'counting') as record:
+        assert record.test == b'first write'
+        assert record.test == b'first write'
+        # The field was only read and decoded once for the transaction.
+        assert decoded == [b'first write']
+
+    # The cache doesn't outlive the transaction
+    with pytest.raises(lmdb.Error):
+        should_error = record.test
+
+    with storage.describe(CountingRecord, 'counting', writeable=True) as record:
+        record.test = None
+        with pytest.raises(AttributeError):
+            should_error = record.test
+
+
+def test_datastore_records_have_no_instance_dict(mock_or_real_datastore):
+    storage = mock_or_real_datastore
+    with storage.describe(PolicyArrangement, 'slotted', writeable=True) as record:
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(AttributeError):
+            record._not_a_slot = True
+        record.arrangement_id = b'slotted'
+        assert record.arrangement_id == b'slotted'
+
+
+def test_datastore_migrates_field_keys():
+    temp_path = tempfile.mkdtemp()
+    test_date = datetime.now()
+
+    # Records written by older versions, with a key per field
+    db_env = lmdb.open(temp_path, max_dbs=1)
+    with db_env.begin(write=True) as db_tx:
+        db_tx.put(b'TestRecord:test:old', msgpack.packb(b'old record'))
+        db_tx.put(b'TestRecord:test_date:old', msgpack.packb(test_date.isoformat().encode()))
+        db_tx.put(b'TestRecord:test:1337', msgpack.packb(b'old int ID'))
+    db_env.close()
+
+    storage = datastore.Datastore(temp_path)
+    with storage.describe(TestRecord, 'old') as test_record:
+        assert test_record.test == b'old record'
+        assert test_record.test_date == test_date
+    with storage.describe(TestRecord, 1337) as test_record:
+        assert test_record.test == b'old int ID'
+    with storage.query_by(TestRecord) as records:
+        assert len(records) == 2
+
+    # The migration only happens once
+    with storage.describe(TestRecord, 'new', writeable=True) as test_record:
+        test_record.test = b'new record'
+    storage._Datastore__db_env.close()
+    storage = datastore.Datastore(temp_path)
+    with storage.query_by(TestRecord, filter_field='test') as records:
+        assert len(records) == 3
+    shutil.rmtree(temp_path)
+
+
 def test_key_tuple():
-    partial_key = datastore.DatastoreKey.from_bytestring(b'TestRecord:test_field')
+    partial_key = datastore.DatastoreKey.from_bytestring(b'TestRecord')
     assert partial_key.record_type == 'TestRecord'
-    assert partial_key.record_field == 'test_field'
     assert partial_key.record_id is None
 
-    full_key = datastore.DatastoreKey.from_bytestring(b'TestRecord:test_field:test_id')
+    full_key = datastore.DatastoreKey.from_bytestring(b'TestRecord:test_id')
     assert full_key.record_type == 'TestRecord'
-    assert full_key.record_field == 'test_field'
     assert full_key.record_id == 'test_id'
 
     # Full keys can match partial key strings and other full key strings
-    assert full_key.compare_key(b'TestRecord:test_field:test_id') is True
-    assert full_key.compare_key(b'TestRecord:test_field') is True
+    assert full_key.compare_key(b'TestRecord:test_id') is True
     assert full_key.compare_key(b'TestRecord:') is True
+    assert full_key.compare_key(b'TestRecord') is True
+    assert full_key.compare_key(b'TestRecord:bad_id') is False
     assert full_key.compare_key(b'BadRecord:') is False
-    assert full_key.compare_key(b'BadRecord:bad_field') is False
-    assert full_key.compare_key(b'BadRecord:bad_field:bad_id') is False
+    assert full_key.compare_key(b'BadRecord:test_id') is False
 
     # Partial keys can't match key strings that are more complete than themselves
-    assert partial_key.compare_key(b'TestRecord:test_field:test_id') is False
-    assert partial_key.compare_key(b'TestRecord:test_field') is True
+    assert partial_key.compare_key(b'TestRecord:test_id') is False
     assert partial_key.compare_key(b'TestRecord') is True
     assert partial_key.compare_key(b'BadRecord') is False
-    assert partial_key.compare_key(b'BadRecord:bad_field') is False
-    assert partial_key.compare_key(b'BadRecord:bad_field:bad_id') is False
+    assert partial_key.compare_key(b'BadRecord:bad_id') is False
 
     # IDs as ints
-    int_id_key = datastore.DatastoreKey.from_bytestring(b'TestRecord:test_field:1')
+    int_id_key = datastore.DatastoreKey.from_bytestring(b'TestRecord:1')
     assert int_id_key.record_id == 1
     assert type(int_id_key.record_id) == int
@@ -20,7 +20,7 @@ import pytest
 import tempfile
 from nucypher.crypto import keypairs
 from nucypher.datastore import datastore
-from nucypher.datastore.models import PolicyArrangement, TreasureMap, Workorder
+from nucypher.datastore.models import PolicyArrangement, TreasureMap, Workorder, expiration_index
 
 
 def test_policy_arrangement_model(mock_or_real_datastore):
@@ -97,3 +97,12 @@ def test_treasure_map_model(mock_or_real_datastore):
         # Should be deleted now.
         with pytest.raises(AttributeError):
             should_error = treasure_map.treasure_map
+
+
+def test_expiration_index_is_chronological():
+    dates = [maya.MayaDT(0), maya.now(), maya.now().add(years=100)]
+    assert sorted(dates, key=expiration_index) == dates
+    assert all(len(expiration_index(date)) == 8 for date in dates)
+
+    with pytest.raises(ValueError, match="only dates from 1970-01-01 onward can be indexed"):
+        expiration_index(maya.MayaDT(-1))
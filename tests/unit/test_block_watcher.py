@@ -0,0 +1,302 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+from hexbytes import HexBytes
+from web3 import Web3
+
+from nucypher.blockchain.eth.events import BlockWatcher
+
+STAKER_EVENT_INPUTS = [{'indexed': True, 'name': 'staker', 'type': 'address'},
+                       {'indexed': True, 'name': 'period', 'type': 'uint16'},
+                       {'indexed': False, 'name': 'value', 'type': 'uint256'}]
+COMMITMENT_MADE = dict(anonymous=False, name='CommitmentMade', type='event', inputs=STAKER_EVENT_INPUTS)
+MINTED = dict(anonymous=False, name='Minted', type='event', inputs=STAKER_EVENT_INPUTS)
+
+CONTRACT_ADDRESS = to_checksum_address(os.urandom(20))
+STAKER, ANOTHER_STAKER = to_checksum_address(os.urandom(20)), to_checksum_address(os.urandom(20))
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeChain:
+    """Just enough of web3 for a `BlockWatcher`"""
+
+    def __init__(self):
+        self.codec = Web3().codec
+        self.eth = self
+        self.block_hashes = [os.urandom(32) for _ in range(10)]
+        self.logs = list()
+        self.block_number_requests = 0
+        self.get_logs_requests = list()
+
+    @property
+    def blockNumber(self) -> int:
+        self.block_number_requests += 1
+        return len(self.block_hashes) - 1
+
+    def mine(self, blocks: int = 1) -> None:
+        self.block_hashes.extend(os.urandom(32) for _ in range(blocks))
+
+    def getBlock(self, block_number: int):
+        if block_number >= len(self.block_hashes):
+            return None
+        return dict(hash=HexBytes(self.block_hashes[block_number]))
+
+    def emit(self, event_abi: dict, staker: str, period: int, value: int, block_number: int = None) -> None:
+        block_number = block_number if block_number is not None else len(self.block_hashes) - 1
+        topics = [HexBytes(event_abi_to_log_topic(event_abi)),
+                  HexBytes(self.codec.encode_single('address', staker)),
+                  HexBytes(self.codec.encode_single('uint16', period))]
+        self.logs.append(dict(address=CONTRACT_ADDRESS,
+                              topics=topics,
+                              data=HexBytes(self.codec.encode_single('uint256', value)).hex(),
+                              blockNumber=block_number,
+                              blockHash=HexBytes(self.block_hashes[block_number]),
+                              transactionHash=HexBytes(os.urandom(32)),
+                              transactionIndex=0,
+                              logIndex=len(self.logs)))
+
+    def getLogs(self, log_filter: dict):
+        self.get_logs_requests.append(log_filter)
+
+        def matches(log):
+            if not log_filter['fromBlock'] <= log['blockNumber'] <= log_filter['toBlock']:
+                return False
+            if log['address'] not in log_filter['address']:
+                return False
+            return all(log['topics'][position].hex() in accepted
+                       for position, accepted in enumerate(log_filter['topics']))
+
+        return [log for log in self.logs if matches(log)]
+
+
+@pytest.fixture()
+def chain():
+    return FakeChain()
+
+
+@pytest.fixture()
+def agent():
+    contract = Web3().eth.contract(address=CONTRACT_ADDRESS, abi=[COMMITMENT_MADE, MINTED])
+    return SimpleNamespace(contract=contract)
+
+
+def test_block_watcher_fetches_the_events_of_all_subscribers_at_once(chain, agent):
+    clock = FakeClock()
+    watcher = BlockWatcher(w3=chain, confirmations=0, clock=clock)
+    from_block = chain.blockNumber
+
+    commitments, minted, other_commitments = list(), list(), list()
+    watcher.subscribe(agent, 'CommitmentMade', commitments.append, from_block=from_block, staker=STAKER)
+    watcher.subscribe(agent, 'Minted', minted.append, from_block=from_block, staker=STAKER)
+    watcher.subscribe(agent, 'CommitmentMade', other_commitments.append, from_block=from_block, staker=ANOTHER_STAKER)
+
+    chain.mine()
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=1, value=100)
+    chain.emit(MINTED, staker=STAKER, period=1, value=5)
+    chain.emit(COMMITMENT_MADE, staker=ANOTHER_STAKER, period=1, value=200)
+    chain.mine()
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=2, value=100)
+
+    assert watcher.poll() == chain.blockNumber
+    assert len(chain.get_logs_requests) == 1
+
+    # Only the stakers of interest were asked for
+    _event_topics, staker_topics = chain.get_logs_requests[0]['topics']
+    assert staker_topics == sorted(HexBytes(chain.codec.encode_single('address', staker)).hex()
+                                   for staker in (STAKER, ANOTHER_STAKER))
+
+    assert [event.args['period'] for event in commitments] == [1, 2]
+    assert [(event.args['value'], event.block_number) for event in minted] == [(5, from_block + 1)]
+    assert [event.args['staker'] for event in other_commitments] == [ANOTHER_STAKER]
+
+    # Nothing new
+    clock.now += BlockWatcher.POLLING_INTERVAL
+    watcher.poll()
+    assert len(commitments) == 2
+    assert len(chain.get_logs_requests) == 1
+
+
+def test_block_watcher_polls_at_most_once_per_interval(chain, agent):
+    clock = FakeClock()
+    watcher = BlockWatcher(w3=chain, confirmations=0, clock=clock)
+    from_block = chain.blockNumber
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=1, value=100)
+
+    commitments, late_commitments = list(), list()
+    watcher.subscribe(agent, 'CommitmentMade', commitments.append, from_block=from_block)
+    watcher.poll()
+    block_number_requests = chain.block_number_requests
+
+    # A late subscriber catches up with the last poll, without asking for the latest block again
+    watcher.subscribe(agent, 'CommitmentMade', late_commitments.append, from_block=from_block)
+    chain.mine()
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=2, value=100)
+    watcher.poll()
+    assert chain.block_number_requests == block_number_requests
+    assert len(commitments) == len(late_commitments) == 1
+
+    clock.now += BlockWatcher.POLLING_INTERVAL
+    watcher.poll()
+    assert len(commitments) == len(late_commitments) == 2
+
+
+def test_block_watcher_waits_for_confirmations(chain, agent):
+    clock = FakeClock()
+    watcher = BlockWatcher(w3=chain, confirmations=2, clock=clock)
+    commitments = list()
+    watcher.subscribe(agent, 'CommitmentMade', commitments.append, from_block=chain.blockNumber)
+
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=1, value=100)
+    for expected_commitments in (0, 0, 1):
+        watcher.poll()
+        assert len(commitments) == expected_commitments
+        chain.mine()
+        clock.now += BlockWatcher.POLLING_INTERVAL
+
+
+def test_block_watcher_rescans_reorganized_blocks(chain, agent):
+    clock = FakeClock()
+    watcher = BlockWatcher(w3=chain, confirmations=0, clock=clock)
+    commitments = list()
+    watcher.subscribe(agent, 'CommitmentMade', commitments.append, from_block=chain.blockNumber)
+
+    chain.mine()
+    watcher.poll()
+    chain.mine()
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=1, value=100)
+    clock.now += BlockWatcher.POLLING_INTERVAL
+    watcher.poll()
+    assert [event.args['value'] for event in commitments] == [100]
+
+    # The last block is replaced, with another version of the event
+    reorganized_block = chain.blockNumber
+    chain.block_hashes[reorganized_block] = os.urandom(32)
+    chain.logs.clear()
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=1, value=200, block_number=reorganized_block)
+    chain.mine()
+    clock.now += BlockWatcher.POLLING_INTERVAL
+    watcher.poll()
+    assert [event.args['value'] for event in commitments] == [100, 200]
+
+
+def test_block_watcher_survives_the_reorganization_of_its_whole_history(chain, agent):
+    clock = FakeClock()
+    watcher = BlockWatcher(w3=chain, confirmations=2, clock=clock)
+    commitments = list()
+    watcher.subscribe(agent, 'CommitmentMade', commitments.append, from_block=0)
+
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=1, value=100, block_number=1)
+    watcher.poll()
+    oldest_scanned_block = chain.blockNumber - 2
+    for _ in range(2):
+        chain.mine()
+        clock.now += BlockWatcher.POLLING_INTERVAL
+        watcher.poll()
+    assert [event.args['value'] for event in commitments] == [100]
+
+    # Every scanned block is replaced, and so is an event in one of them
+    for block_number in range(oldest_scanned_block - 2, len(chain.block_hashes)):
+        chain.block_hashes[block_number] = os.urandom(32)
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=1, value=200, block_number=oldest_scanned_block - 1)
+    chain.mine()
+    clock.now += BlockWatcher.POLLING_INTERVAL
+    watcher.poll()
+
+    # The scan goes back as far as the confirmations of the oldest scanned block, not to genesis
+    assert chain.get_logs_requests[-1]['fromBlock'] == oldest_scanned_block - 2
+    assert [event.args['value'] for event in commitments] == [100, 200]
+
+
+def test_block_watcher_waits_for_some_confirmations_by_default(chain):
+    assert BlockWatcher(w3=chain).confirmations == BlockWatcher.DEFAULT_CONFIRMATIONS > 0
+
+    blockchain = Mock(w3=chain)
+    watcher = BlockWatcher.for_blockchain(blockchain)
+    assert watcher.confirmations == BlockWatcher.DEFAULT_CONFIRMATIONS
+    assert BlockWatcher.for_blockchain(blockchain) is watcher
+    assert BlockWatcher.for_blockchain(blockchain, confirmations=2).confirmations == 2
+
+
+def test_block_watcher_hands_out_events_again_only_to_failing_subscribers(chain, agent):
+    clock = FakeClock()
+    watcher = BlockWatcher(w3=chain, confirmations=0, clock=clock)
+    from_block = chain.blockNumber
+
+    commitments, flaky_commitments = list(), list()
+    failures = [ValueError("Not now")]
+
+    def flaky(event):
+        if failures:
+            raise failures.pop()
+        flaky_commitments.append(event)
+
+    watcher.subscribe(agent, 'CommitmentMade', commitments.append, from_block=from_block)
+    watcher.subscribe(agent, 'CommitmentMade', flaky, from_block=from_block)
+
+    chain.mine()
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=1, value=100)
+    chain.mine()
+    chain.emit(COMMITMENT_MADE, staker=STAKER, period=2, value=100)
+    watcher.poll()
+    assert [event.args['period'] for event in commitments] == [1, 2]
+    assert flaky_commitments == []
+
+    clock.now += BlockWatcher.POLLING_INTERVAL
+    watcher.poll()
+    assert [event.args['period'] for event in commitments] == [1, 2]
+    assert [event.args['period'] for event in flaky_commitments] == [1, 2]
+
+
+
+def test_block_watcher_hands_out_again_only_the_events_that_failed(chain, agent):
+    clock = FakeClock()
+    watcher = BlockWatcher(w3=chain, confirmations=0, clock=clock)
+    from_block = chain.blockNumber
+
+    commitments = list()
+    failures = [None, ValueError("Not now")]  # The second event of the block fails once
+
+    def flaky(event):
+        if failures and failures.pop(0):
+            raise ValueError("Not now")
+        commitments.append(event)
+
+    watcher.subscribe(agent, 'CommitmentMade', flaky, from_block=from_block)
+
+    chain.mine()
+    for period in (1, 2, 3):
+        chain.emit(COMMITMENT_MADE, staker=STAKER, period=period, value=100)
+    watcher.poll()
+    assert [event.args['period'] for event in commitments] == [1]
+
+    clock.now += BlockWatcher.POLLING_INTERVAL
+    watcher.poll()
+    assert [event.args['period'] for event in commitments] == [1, 2, 3]
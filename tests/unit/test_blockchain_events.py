@@ -15,11 +15,20 @@
  along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, MagicMock
 
 import pytest
+import requests
+from web3 import HTTPProvider, Web3
 
-from nucypher.blockchain.eth.events import ContractEventsThrottler
+from nucypher.blockchain.eth.events import BlockTimestamps, ContractEventsThrottler, EventRecord
+from nucypher.blockchain.eth.interfaces import BlockchainInterfaceFactory
+from nucypher.blockchain.middleware.batch import BATCH_ENDPOINT
+from nucypher.utilities.events import write_events_to_csv_file
 
 
 def test_contract_events_throttler_to_block_check():
@@ -116,3 +125,259 @@ def test_contract_events_throttler_inclusive_block_ranges():
     mock_method.assert_any_call(**argument_filters, from_block=6, to_block=11)
     mock_method.assert_any_call(**argument_filters, from_block=12, to_block=17)
     mock_method.assert_any_call(**argument_filters, from_block=18, to_block=21)
+
+
+def test_block_timestamps_cache():
+    w3 = Mock()
+    w3.eth.getBlock.side_effect = lambda block_number: {'timestamp': 1000 + block_number}
+    block_timestamps = BlockTimestamps(max_size=3)
+
+    # Related blocks are fetched along with the requested one
+    assert block_timestamps.get(w3, block_number=1, related_block_numbers=(1, 2, 3)) == 1001
+    assert w3.eth.getBlock.call_count == 3
+    assert block_timestamps.get(w3, block_number=2) == 1002
+    assert block_timestamps.get(w3, block_number=3) == 1003
+    assert w3.eth.getBlock.call_count == 3
+
+    # The least recently used timestamp is evicted
+    assert block_timestamps.get(w3, block_number=4) == 1004
+    assert len(block_timestamps) == 3
+    assert block_timestamps.get(w3, block_number=1) == 1001
+    assert w3.eth.getBlock.call_count == 5
+
+
+def test_block_timestamps_batch_request(mocker):
+    w3 = Web3(HTTPProvider('http://localhost:8545'))
+    mocker.patch.object(w3.eth, 'getBlock', side_effect=lambda block_number: {'timestamp': 1000 + block_number})
+
+    # Batches go through the middleware, as any other request
+    methods = list()
+
+    def recording_middleware(make_request, w3):
+        def middleware(method, params):
+            methods.append(method)
+            return make_request(method, params)
+        return middleware
+    w3.middleware_onion.add(recording_middleware)
+
+    def batch_response(endpoint_uri, data, **kwargs):
+        requests = json.loads(data)
+        return json.dumps([dict(jsonrpc='2.0',
+                                id=request['id'],
+                                result=dict(number=request['params'][0], timestamp=hex(1000 + int(request['params'][0], 16))))
+                           for request in reversed(requests)]).encode()
+
+    make_post_request = mocker.patch('nucypher.blockchain.middleware.batch.make_post_request', side_effect=batch_response)
+    block_timestamps = BlockTimestamps()
+    assert block_timestamps.get(w3, block_number=10, related_block_numbers=(10, 11, 12)) == 1010
+    assert block_timestamps.get(w3, block_number=12) == 1012
+    assert make_post_request.call_count == 1
+    assert methods == [BATCH_ENDPOINT]
+    assert w3.eth.getBlock.call_count == 0
+
+    # Providers that don't support batch requests get one request per block
+    make_post_request.side_effect = lambda *args, **kwargs: b'{"jsonrpc": "2.0", "error": "no batches"}'
+    assert block_timestamps.get(w3, block_number=20, related_block_numbers=(20, 21)) == 1020
+    assert w3.eth.getBlock.call_count == 2
+
+    # ...and so do batches that failed over HTTP (eg. still throttled after retrying)
+    make_post_request.side_effect = requests.exceptions.HTTPError('429 Client Error: Too Many Requests')
+    assert block_timestamps.get(w3, block_number=30, related_block_numbers=(30, 31)) == 1030
+    assert w3.eth.getBlock.call_count == 4
+
+
+def test_block_timestamps_are_thread_safe():
+    w3 = Mock()
+    w3.eth.getBlock.side_effect = lambda block_number: {'timestamp': 1000 + block_number}
+    block_timestamps = BlockTimestamps(max_size=10)
+
+    def get_timestamps(offset):
+        return [block_timestamps.get(w3, block_number=(offset + n) % 50) for n in range(200)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(get_timestamps, range(8)))
+    for offset, timestamps in enumerate(results):
+        assert timestamps == [1000 + (offset + n) % 50 for n in range(200)]
+    assert len(block_timestamps) == 10
+
+
+def test_event_record_timestamps_are_lazy(mocker):
+    blockchain = MagicMock()
+    blockchain.client.w3.eth.getBlock.side_effect = lambda block_number: {'timestamp': 1000 + block_number}
+    mocker.patch.object(BlockchainInterfaceFactory, 'get_interface', return_value=blockchain)
+    mocker.patch.object(EventRecord, 'block_timestamps', BlockTimestamps())
+
+    block_numbers = (5, 6)
+    records = [EventRecord(dict(args={}, blockNumber=block_number, transactionHash=b'\x00'),
+                           related_block_numbers=block_numbers)
+               for block_number in (5, 6, 6)]
+    assert blockchain.client.w3.eth.getBlock.call_count == 0
+
+    assert [record.timestamp for record in records] == [1005, 1006, 1006]
+    assert blockchain.client.w3.eth.getBlock.call_count == len(block_numbers)
+
+
+def test_contract_events_throttler_adaptive_block_ranges():
+    event_name = 'TestEvent'
+    events_by_block = {block_number: [f'event {block_number}'] for block_number in range(40, 50)}
+    calls = list()
+
+    def get_events(from_block, to_block):
+        calls.append((from_block, to_block))
+        events = [event for block_number in range(from_block, to_block + 1)
+                  for event in events_by_block.get(block_number, [])]
+        if len(events) > 2:
+            raise ValueError({'code': -32005, 'message': 'query returned more than 2 results'})
+        return events
+
+    agent = Mock(events={event_name: get_events})
+    events_throttler = ContractEventsThrottler(agent=agent,
+                                               event_name=event_name,
+                                               from_block=0,
+                                               to_block=100,
+                                               max_blocks_per_call=3,
+                                               adaptive=True)
+    events_throttler.SPARSE_EVENTS_PER_CALL = 1
+
+    # All the events are found, in order
+    assert list(events_throttler) == [f'event {block_number}' for block_number in range(40, 50)]
+    assert events_throttler.last_scanned_block == 100
+
+    # Ranges grew while there were no events, and shrunk where there were many
+    assert calls[:3] == [(0, 3), (4, 10), (11, 23)]
+    assert max(to_block - from_block for from_block, to_block in calls) > 3
+    assert any(to_block - from_block < 3 for from_block, to_block in calls)
+
+    # Other errors aren't mistaken for too large ranges, and are raised right away
+    failing_agent = Mock(events={event_name: Mock(side_effect=ValueError({'code': -32602, 'message': 'invalid argument'}))})
+    events_throttler = ContractEventsThrottler(agent=failing_agent, event_name=event_name, from_block=0, to_block=100,
+                                               max_blocks_per_call=30, adaptive=True)
+    with pytest.raises(ValueError):
+        list(events_throttler)
+    assert failing_agent.events[event_name].call_count == 1
+    assert ContractEventsThrottler._range_too_large(ValueError({'code': -32000, 'message': 'Log response size exceeded'}))
+    assert ContractEventsThrottler._range_too_large(requests.exceptions.ReadTimeout())
+    assert not ContractEventsThrottler._range_too_large(ValueError({'code': -32000, 'message': 'header not found'}))
+
+    # Without adaptive ranges, errors are raised
+    events_throttler = ContractEventsThrottler(agent=agent, event_name=event_name, from_block=0, to_block=100,
+                                               max_blocks_per_call=30)
+    with pytest.raises(ValueError):
+        list(events_throttler)
+    # The scan can be resumed from the last checkpoint
+    assert events_throttler.last_scanned_block == 30
+    events_throttler.max_blocks_per_call = events_throttler.blocks_per_call = 1
+    assert list(events_throttler) == [f'event {block_number}' for block_number in range(40, 50)]
+
+
+def test_contract_events_throttler_concurrent_block_ranges():
+    event_name = 'TestEvent'
+    mock_method = Mock(side_effect=lambda from_block, to_block: [from_block, to_block])
+    agent = Mock(events={event_name: mock_method})
+
+    with pytest.raises(ValueError):
+        ContractEventsThrottler(agent=agent, event_name=event_name, from_block=0, to_block=10, concurrency=0)
+
+    events_throttler = ContractEventsThrottler(agent=agent,
+                                               event_name=event_name,
+                                               from_block=0,
+                                               to_block=21,
+                                               max_blocks_per_call=5,
+                                               concurrency=3)
+
+    # Events are yielded in block order
+    assert list(events_throttler) == [0, 5, 6, 11, 12, 17, 18, 21]
+    assert mock_method.call_count == 4
+
+
+def test_contract_events_throttler_checkpoints(tmpdir):
+    event_name = 'TestEvent'
+    checkpoint_file = str(tmpdir / 'events.checkpoint')
+    mock_method = Mock(side_effect=lambda from_block, to_block, **argument_filters: [from_block, to_block])
+    agent = Mock(events={event_name: mock_method}, contract_address='0xdeadbeef')
+
+    def make_throttler(**argument_filters):
+        return ContractEventsThrottler(agent=agent, event_name=event_name, from_block=0, to_block=21,
+                                       max_blocks_per_call=5, checkpoint_file=checkpoint_file, **argument_filters)
+
+    # The scan is interrupted...
+    events = iter(make_throttler())
+    assert [next(events) for _ in range(5)] == [0, 5, 6, 11, 12]
+    del events
+
+    # ...and resumed from the last block range whose events were all yielded
+    assert list(make_throttler()) == [12, 17, 18, 21]
+
+    # The checkpoint is only used for the same events
+    assert list(make_throttler(staker='0xabc')) == [0, 5, 6, 11, 12, 17, 18, 21]
+
+
+
+def test_contract_events_throttler_calls_back_before_each_checkpoint(tmpdir):
+    event_name = 'TestEvent'
+    checkpoint_file = str(tmpdir / 'events.checkpoint')
+    mock_method = Mock(side_effect=lambda from_block, to_block, **argument_filters: [from_block, to_block])
+    agent = Mock(events={event_name: mock_method}, contract_address='0xdeadbeef')
+
+    scanned_ranges = list()
+
+    def on_range_scanned(last_scanned_block):
+        saved_block = None
+        if os.path.exists(checkpoint_file):
+            with open(checkpoint_file) as file:
+                saved_block = json.load(file)['last_scanned_block']
+        scanned_ranges.append((last_scanned_block, saved_block))
+
+    events_throttler = ContractEventsThrottler(agent=agent, event_name=event_name, from_block=0, to_block=21,
+                                               max_blocks_per_call=5, concurrency=2,
+                                               checkpoint_file=checkpoint_file, on_range_scanned=on_range_scanned)
+    assert list(events_throttler) == [0, 5, 6, 11, 12, 17, 18, 21]
+
+    # Once per block range, before its checkpoint is saved
+    assert scanned_ranges == [(5, None), (11, 5), (17, 11), (21, 17)]
+
+def test_write_events_to_csv_file(tmpdir):
+    event_name = 'TestEvent'
+    csv_file = str(tmpdir / 'events.csv')
+    interrupted = [True]
+
+    def get_events(from_block, to_block):
+        if interrupted[0] and from_block > ContractEventsThrottler.DEFAULT_MAX_BLOCKS_PER_CALL:
+            raise requests.exceptions.ConnectionError()
+        return [EventRecord(dict(args={'value': block_number}, blockNumber=block_number, transactionHash=b'\x00'))
+                for block_number in range(from_block, to_block + 1) if block_number % 300 == 0]
+
+    agent = Mock(events={event_name: get_events}, contract_address='0xdeadbeef')
+    last_block = 3 * ContractEventsThrottler.DEFAULT_MAX_BLOCKS_PER_CALL
+    header = ['event_name', 'block_number', 'value']
+    expected_rows = [[event_name, str(n), str(n)] for n in range(0, last_block + 1, 300)]
+
+    def csv_rows():
+        with open(csv_file) as file:
+            return list(csv.reader(file))
+
+    # The export is interrupted after the first block range...
+    with pytest.raises(requests.exceptions.ConnectionError):
+        write_events_to_csv_file(csv_file=csv_file, agent=agent, event_name=event_name, from_block=0, to_block=last_block)
+    first_rows = [row for row in expected_rows if int(row[1]) <= ContractEventsThrottler.DEFAULT_MAX_BLOCKS_PER_CALL]
+    assert csv_rows() == [header, *first_rows]
+
+    # ...maybe even while writing the next one
+    with open(csv_file, mode='a') as file:
+        csv.writer(file).writerow(expected_rows[len(first_rows)])
+
+    # ...and resumed
+    interrupted[0] = False
+    assert write_events_to_csv_file(csv_file=csv_file, agent=agent, event_name=event_name,
+                                    from_block=0, to_block=last_block, concurrency=2, resume=True)
+    assert csv_rows() == [header, *expected_rows]
+    assert not os.path.exists(f'{csv_file}.checkpoint')
+
+    # Without resuming, the file is written again from scratch
+    assert write_events_to_csv_file(csv_file=csv_file, agent=agent, event_name=event_name, from_block=0, to_block=last_block)
+    assert csv_rows() == [header, *expected_rows]
+
+    # No events, no file
+    os.remove(csv_file)
+    assert not write_events_to_csv_file(csv_file=csv_file, agent=agent, event_name=event_name, from_block=1, to_block=2)
+    assert not os.path.exists(csv_file)
@@ -15,12 +15,24 @@
  along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import json
+import os
+from functools import partial
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
 import pytest
+from eth_abi import encode_abi
+from eth_utils import to_checksum_address
+from web3 import HTTPProvider, Web3
 from web3.gas_strategies import time_based
+from web3.providers import BaseProvider
 
 from constant_sorrow.constants import ALL_OF_THEM
 
 from nucypher.blockchain.eth.interfaces import BlockchainInterface
+from nucypher.blockchain.middleware.batch import BATCH_ENDPOINT
+from nucypher.blockchain.middleware.retry import RetryRequestMiddleware
 from nucypher.utilities.gas_strategies import WEB3_GAS_STRATEGIES
 from tests.mock.interfaces import MockBlockchain
 
@@ -123,3 +135,150 @@ def test_use_pending_nonce_when_building_payload(mock_testerchain, mocker):
     assert payload['nonce'] == 6
     payload = mock_testerchain.build_payload(sender_address=sender, payload=None, use_pending_nonce=False)
     assert payload['nonce'] == 6
+
+
+STAKERS = [to_checksum_address(os.urandom(20)) for _ in range(25)]
+BLOCK_NUMBER = 42
+
+BATCH_CALL_ABI = [
+    {'type': 'function', 'name': 'stakers', 'stateMutability': 'view',
+     'inputs': [{'name': 'index', 'type': 'uint256'}],
+     'outputs': [{'name': '', 'type': 'address'}]},
+    {'type': 'function', 'name': 'getSubStakeInfo', 'stateMutability': 'view',
+     'inputs': [{'name': 'staker', 'type': 'address'}, {'name': 'index', 'type': 'uint256'}],
+     'outputs': [{'name': 'firstPeriod', 'type': 'uint16'}, {'name': 'lockedValue', 'type': 'uint128'}]},
+]
+
+
+def mock_json_rpc(method, params):
+    """Answers eth_call as a contract with the ABI above would"""
+    if method == 'eth_blockNumber':
+        return hex(BLOCK_NUMBER)
+    assert method == 'eth_call'
+    call, block_identifier = params
+    assert block_identifier == hex(BLOCK_NUMBER)
+    data = bytes.fromhex(call['data'][2:])
+    selector, arguments = data[:4], data[4:]
+    index = int.from_bytes(arguments[-32:], 'big')
+    if selector == Web3.keccak(text='stakers(uint256)')[:4]:
+        result = encode_abi(['address'], [STAKERS[index]])
+    else:
+        result = encode_abi(['uint16', 'uint128'], [index, index * 1000])
+    return '0x' + result.hex()
+
+
+@pytest.fixture(scope='module')
+def json_rpc_server():
+    requests_received = list()
+    throttled_requests = list()  # How many of the next batch requests are answered with a 429
+
+    class JSONRPCHandler(BaseHTTPRequestHandler):
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            requests_received.append(payload)
+            if throttled_requests and isinstance(payload, list):
+                throttled_requests.pop()
+                self.send_response(429)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            batch = payload if isinstance(payload, list) else [payload]
+            responses = [{'jsonrpc': '2.0', 'id': request['id'], 'result': mock_json_rpc(request['method'],
+                                                                                         request['params'])}
+                         for request in reversed(batch)]  # Responses to a batch can come in any order
+            body = json.dumps(responses if isinstance(payload, list) else responses[0]).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), JSONRPCHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}', requests_received, throttled_requests
+    server.shutdown()
+
+
+class MockJSONRPCProvider(BaseProvider):
+
+    def __init__(self):
+        self.requests_received = list()
+
+    def make_request(self, method, params):
+        self.requests_received.append(method)
+        return {'jsonrpc': '2.0', 'id': 0, 'result': mock_json_rpc(method, params)}
+
+
+def make_interface(provider) -> BlockchainInterface:
+    interface = BlockchainInterface(provider=provider)
+    interface._attach_provider(provider=provider)
+    interface.w3 = Web3(provider)
+    return interface
+
+
+def batch_call_and_check(interface: BlockchainInterface):
+    contract = interface.w3.eth.contract(address=to_checksum_address(os.urandom(20)), abi=BATCH_CALL_ABI)
+
+    stakers = interface.batch_call(contract.functions.stakers(i) for i in range(len(STAKERS)))
+    assert stakers == STAKERS
+
+    sub_stakes = interface.batch_call(contract.functions.getSubStakeInfo(STAKERS[0], i) for i in range(3))
+    assert sub_stakes == [[0, 0], [1, 1000], [2, 2000]]
+
+    assert interface.batch_call([]) == []
+
+
+def test_batch_call_over_http(json_rpc_server, mocker):
+    uri, requests_received, _throttled_requests = json_rpc_server
+    requests_received.clear()
+    interface = make_interface(HTTPProvider(uri))
+    mocker.patch.object(BlockchainInterface, 'BATCH_CALL_SIZE', 10)
+
+    batch_call_and_check(interface)
+
+    # A request for the block number, and then batches of at most 10 calls.
+    batch_sizes = [len(request) if isinstance(request, list) else request['method'] for request in requests_received]
+    assert batch_sizes == ['eth_blockNumber', 10, 10, 5, 'eth_blockNumber', 3]
+
+
+def test_batch_call_one_by_one():
+    provider = MockJSONRPCProvider()
+    interface = make_interface(provider)
+
+    batch_call_and_check(interface)
+
+    assert provider.requests_received == ['eth_blockNumber', *['eth_call'] * len(STAKERS),
+                                          'eth_blockNumber', *['eth_call'] * 3]
+
+
+def test_batch_calls_go_through_the_middleware(json_rpc_server, mocker):
+    uri, requests_received, throttled_requests = json_rpc_server
+    requests_received.clear()
+    interface = make_interface(HTTPProvider(uri))
+    mocker.patch.object(BlockchainInterface, 'BATCH_CALL_SIZE', 10)
+
+    methods = []
+
+    def recording_middleware(make_request, w3):
+        def middleware(method, params):
+            methods.append(method)
+            return make_request(method, params)
+        return middleware
+
+    retry_middleware = partial(RetryRequestMiddleware, exponential_backoff=False)
+    interface.w3.middleware_onion.add(retry_middleware)
+    interface.w3.middleware_onion.add(recording_middleware)
+
+    # The first batch is throttled, and retried.
+    throttled_requests.append(True)
+    contract = interface.w3.eth.contract(address=to_checksum_address(os.urandom(20)), abi=BATCH_CALL_ABI)
+    stakers = interface.batch_call(contract.functions.stakers(i) for i in range(len(STAKERS)))
+    assert stakers == STAKERS
+
+    assert methods == ['eth_blockNumber', BATCH_ENDPOINT, BATCH_ENDPOINT, BATCH_ENDPOINT]
+    batch_sizes = [len(request) if isinstance(request, list) else request['method'] for request in requests_received]
+    assert batch_sizes == ['eth_blockNumber', 10, 10, 10, 5]
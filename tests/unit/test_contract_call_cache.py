@@ -0,0 +1,150 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+from constant_sorrow.constants import CONTRACT_CALL, PER_BLOCK, PER_PERIOD
+
+from nucypher.blockchain.eth.decorators import ContractCallCache, contract_api
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeChain:
+
+    def __init__(self):
+        self.block_number = 1
+        self.block_number_requests = 0
+        self.period = 100
+        self.period_requests = 0
+        self.calls = 0
+        self.clock = FakeClock()
+        self.call_cache = None
+
+    def get_block_number(self) -> int:
+        self.block_number_requests += 1
+        return self.block_number
+
+    def get_current_period(self) -> int:
+        self.period_requests += 1
+        return self.period
+
+
+class FakeAgent:
+
+    contract_address = '0xdeadbeef'
+
+    def __init__(self, blockchain: FakeChain):
+        self.blockchain = blockchain
+
+    @contract_api(CONTRACT_CALL, cache=PER_BLOCK)
+    def get_balance(self, address: str) -> int:
+        self.blockchain.calls += 1
+        return self.blockchain.block_number * 100
+
+    @contract_api(CONTRACT_CALL, cache=PER_PERIOD)
+    def parameters(self) -> tuple:
+        self.blockchain.calls += 1
+        return 1, 2, 3
+
+
+def enable_cache(blockchain: FakeChain) -> ContractCallCache:
+    blockchain.call_cache = ContractCallCache(get_block_number=blockchain.get_block_number,
+                                              get_current_period=blockchain.get_current_period,
+                                              block_number_ttl=5,
+                                              clock=blockchain.clock)
+    return blockchain.call_cache
+
+
+def test_contract_calls_are_not_cached_by_default():
+    blockchain = FakeChain()
+    agent = FakeAgent(blockchain)
+    for _ in range(3):
+        assert agent.get_balance('0x0000000000000000000000000000000000000001') == 100
+        assert agent.parameters() == (1, 2, 3)
+    assert blockchain.calls == 6
+    assert blockchain.block_number_requests == 0
+    assert blockchain.period_requests == 0
+
+
+def test_per_block_cache():
+    blockchain = FakeChain()
+    cache = enable_cache(blockchain)
+    agent = FakeAgent(blockchain)
+    address, another_address = '0x0000000000000000000000000000000000000001', '0x0000000000000000000000000000000000000002'
+
+    for _ in range(3):
+        assert agent.get_balance(address) == 100
+    assert agent.get_balance(another_address) == 100
+    assert blockchain.calls == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert blockchain.block_number_requests == 1  # The block number is reused for a while
+
+    # A new block is only noticed once the block number is re-read...
+    blockchain.block_number = 2
+    assert agent.get_balance(address) == 100
+    blockchain.clock.now += 5
+    assert agent.get_balance(address) == 200
+    assert blockchain.calls == 3
+    assert blockchain.block_number_requests == 2
+
+    # ...and results of older blocks are dropped
+    assert len(cache) == 1
+
+    # Transactions clear the cache
+    cache.clear()
+    assert len(cache) == 0
+    assert agent.get_balance(address) == 200
+    assert blockchain.calls == 4
+    assert blockchain.block_number_requests == 3
+
+
+def test_per_period_cache():
+    blockchain = FakeChain()
+    cache = enable_cache(blockchain)
+    agent = FakeAgent(blockchain)
+
+    # Reused within the period, however long it lasts
+    for _ in range(3):
+        assert agent.parameters() == (1, 2, 3)
+        blockchain.block_number += 1
+        blockchain.clock.now += 60 * 60
+    assert blockchain.calls == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert blockchain.block_number_requests == 0
+    assert blockchain.period_requests == 3
+
+    # ...but not in the next one
+    blockchain.period += 1
+    assert agent.parameters() == (1, 2, 3)
+    assert blockchain.calls == 2
+    assert len(cache) == 1
+
+
+def test_cached_contract_calls_still_validate_addresses():
+    blockchain = FakeChain()
+    enable_cache(blockchain)
+    agent = FakeAgent(blockchain)
+    with pytest.raises(TypeError):
+        agent.get_balance(address=1)
+    assert blockchain.calls == 0
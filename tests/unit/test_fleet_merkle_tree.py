@@ -0,0 +1,78 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import random
+
+from eth_utils import to_checksum_address
+
+from nucypher.acumen.perception import FleetMerkleTree
+
+
+def random_fleet(size):
+    return {to_checksum_address(os.urandom(20)): os.urandom(100) for _ in range(size)}
+
+
+def test_merkle_tree_checksum_does_not_depend_on_order_of_updates():
+    fleet = random_fleet(50)
+    assert FleetMerkleTree().checksum == FleetMerkleTree.EMPTY_CHECKSUM
+
+    all_at_once = FleetMerkleTree().with_updates(nodes_updated=fleet, nodes_removed=[])
+
+    one_by_one = FleetMerkleTree()
+    addresses = list(fleet)
+    random.shuffle(addresses)
+    for checksum_address in addresses:
+        one_by_one = one_by_one.with_updates(nodes_updated={checksum_address: fleet[checksum_address]},
+                                             nodes_removed=[])
+
+    assert one_by_one.checksum == all_at_once.checksum
+
+
+def test_merkle_tree_updates_and_removals():
+    fleet = random_fleet(50)
+    tree = FleetMerkleTree().with_updates(nodes_updated=fleet, nodes_removed=[])
+
+    removed = list(fleet)[:10]
+    updated = {checksum_address: os.urandom(100) for checksum_address in list(fleet)[10:15]}
+    new_tree = tree.with_updates(nodes_updated=updated, nodes_removed=removed)
+
+    # The old tree is not affected.
+    assert tree.checksum == FleetMerkleTree().with_updates(nodes_updated=fleet, nodes_removed=[]).checksum
+
+    # The new tree is the same as if it was built from scratch.
+    new_fleet = {checksum_address: updated.get(checksum_address, metadata)
+                 for checksum_address, metadata in fleet.items() if checksum_address not in removed}
+    assert new_tree.checksum == FleetMerkleTree().with_updates(nodes_updated=new_fleet, nodes_removed=[]).checksum
+
+    # Removing everything gets us back to the empty tree.
+    empty_tree = new_tree.with_updates(nodes_updated={}, nodes_removed=new_fleet)
+    assert empty_tree.checksum == FleetMerkleTree.EMPTY_CHECKSUM
+
+
+def test_merkle_tree_addresses_updated_since():
+    fleet = random_fleet(100)
+    old_tree = FleetMerkleTree().with_updates(nodes_updated=fleet, nodes_removed=[])
+
+    changed_address, removed_address = list(fleet)[:2]
+    new_address = to_checksum_address(os.urandom(20))
+    new_tree = old_tree.with_updates(nodes_updated={changed_address: os.urandom(100), new_address: os.urandom(100)},
+                                     nodes_removed=[removed_address])
+
+    assert sorted(new_tree.addresses_updated_since(old_tree)) == sorted((changed_address, new_address))
+    assert old_tree.addresses_updated_since(old_tree) == []
+    assert sorted(old_tree.addresses_updated_since(FleetMerkleTree())) == sorted(fleet)
@@ -0,0 +1,55 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import random
+
+from nucypher.blockchain.eth.agents import StakingEscrowAgent
+from nucypher.types import SubStakeInfo
+
+
+def locked_tokens_at(substakes, period):
+    return sum(value for first_period, last_period, value in substakes if first_period <= period <= last_period)
+
+
+def test_locked_tokens_projection_matches_period_by_period_sums():
+    current_period = 1000
+    periods = 365
+    substakes = list()
+    for _ in range(200):
+        first_period = random.randint(current_period - 50, current_period + 100)
+        last_period = first_period + random.randint(0, 400)
+        substakes.append(SubStakeInfo(first_period, last_period, random.randint(1, 10**24)))
+
+    projection = StakingEscrowAgent.project_locked_tokens(substakes=substakes,
+                                                          current_period=current_period,
+                                                          periods=periods)
+
+    assert list(projection) == list(range(1, periods + 1))
+    for offset, locked_tokens in projection.items():
+        assert locked_tokens == locked_tokens_at(substakes, current_period + offset)
+
+
+def test_locked_tokens_projection_edge_cases():
+    current_period = 10
+    substakes = [SubStakeInfo(1, 10, 1),     # Already over
+                 SubStakeInfo(11, 11, 2),    # Just the next period
+                 SubStakeInfo(5, 13, 4),     # Started in the past
+                 SubStakeInfo(13, 99, 8)]    # Outlasts the projection
+    projection = StakingEscrowAgent.project_locked_tokens(substakes=substakes, current_period=current_period, periods=4)
+    assert projection == {1: 6, 2: 4, 3: 12, 4: 8}
+
+    assert StakingEscrowAgent.project_locked_tokens(substakes=[], current_period=current_period, periods=2) == {1: 0, 2: 0}
@@ -0,0 +1,119 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from nucypher.config.keyring import _write_tls_certificate
+from nucypher.crypto.api import generate_self_signed_certificate
+from nucypher.network.middleware import NodeSessionPool, NucypherMiddlewareClient
+
+
+class _PingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        self.server.connections.append(self.connection)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "4")
+        self.end_headers()
+        self.wfile.write(b"pong")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def tls_server(tmpdir_factory):
+    host = '127.0.0.1'
+    certificate, private_key = generate_self_signed_certificate(host=host, curve=ec.SECP384R1)
+    tls_dir = tmpdir_factory.mktemp('tls')
+    certificate_filepath = _write_tls_certificate(certificate, full_filepath=str(tls_dir.join('cert.pem')))
+    key_filepath = str(tls_dir.join('key.pem'))
+    with open(key_filepath, 'wb') as key_file:
+        key_file.write(private_key.private_bytes(encoding=serialization.Encoding.PEM,
+                                                 format=serialization.PrivateFormat.TraditionalOpenSSL,
+                                                 encryption_algorithm=serialization.NoEncryption()))
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certificate_filepath, key_filepath)
+    server = ThreadingHTTPServer((host, 0), _PingHandler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    server.connections = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, certificate_filepath
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_to_a_node_reuse_connections_and_tls_sessions(tls_server):
+    server, certificate_filepath = tls_server
+    host, port = server.server_address
+    client = NucypherMiddlewareClient()
+    server.connections.clear()
+
+    for _ in range(3):
+        response = client.get(host=host, port=port, path="ping", certificate_filepath=certificate_filepath)
+        assert response.content == b"pong"
+
+    # A single connection (and TLS handshake) for all the requests.
+    assert len(server.connections) == 1
+    assert len(client.sessions) == 1
+    assert not server.connections[0].session_reused
+
+    # Once the connections are gone, new ones resume the TLS session instead of doing a full handshake.
+    client.sessions.session(f"{host}:{port}", certificate_filepath).get_adapter("https://").poolmanager.clear()
+    response = client.get(host=host, port=port, path="ping", certificate_filepath=certificate_filepath)
+    assert response.content == b"pong"
+    assert len(server.connections) == 2
+    assert server.connections[1].session_reused
+
+    client.sessions.close()
+    assert len(client.sessions) == 0
+
+
+def test_node_session_pool_eviction(mocker):
+    clock = mocker.patch('nucypher.network.middleware.time.monotonic', return_value=0)
+    pool = NodeSessionPool(max_sessions=2, idle_timeout=60)
+
+    first = pool.session('1.1.1.1:9151', 'cert_1')
+    assert pool.session('1.1.1.1:9151', 'cert_1') is first
+    assert pool.session('1.1.1.1:9151', 'cert_2') is not first  # Different certificate, different session.
+
+    # The least recently used session goes first.
+    pool.session('1.1.1.1:9151', 'cert_1')
+    pool.session('2.2.2.2:9151', 'cert_3')
+    assert len(pool) == 2
+    assert ('1.1.1.1:9151', 'cert_1') in pool
+    assert ('1.1.1.1:9151', 'cert_2') not in pool
+
+    # Idle sessions are closed.
+    clock.return_value = 30
+    pool.session('1.1.1.1:9151', 'cert_1')
+    clock.return_value = 61
+    pool.session('1.1.1.1:9151', 'cert_1')
+    assert ('2.2.2.2:9151', 'cert_3') not in pool
+    assert ('1.1.1.1:9151', 'cert_1') in pool
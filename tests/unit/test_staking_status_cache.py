@@ -0,0 +1,241 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import threading
+
+import pytest
+from eth_utils import to_checksum_address
+
+from nucypher.blockchain.economics import EconomicsFactory
+from nucypher.blockchain.eth.agents import ContractAgency
+from nucypher.blockchain.eth.constants import NULL_ADDRESS
+from nucypher.blockchain.eth.events import EventRecord
+from nucypher.network.nodes import StakingStatusCache, Teacher
+
+MIN_STAKE = 15_000
+SECONDS_PER_PERIOD = 24 * 60 * 60
+
+
+def random_address():
+    return to_checksum_address(os.urandom(20))
+
+
+def worker_bonded_event(staker: str, worker: str, block_number: int = 1001) -> EventRecord:
+    event = dict(args=dict(staker=staker, worker=worker, startPeriod=100),
+                 blockNumber=block_number,
+                 transactionHash=os.urandom(32))
+    return EventRecord(event)
+
+
+@pytest.fixture()
+def staking_agent(mocker):
+    agent = mocker.Mock()
+    agent.get_current_period.return_value = 100
+    agent.get_staker_population.return_value = 3
+    agent.blockchain.client.block_number = 1000
+    agent.events.WorkerBonded.return_value = []
+    mocker.patch.object(ContractAgency, 'get_agent', return_value=agent)
+    mocker.patch.object(EconomicsFactory, 'get_economics', return_value=mocker.Mock(minimum_allowed_locked=MIN_STAKE,
+                                                              seconds_per_period=SECONDS_PER_PERIOD))
+    return agent
+
+
+@pytest.fixture()
+def registry(mocker):
+    return mocker.Mock(id='registry')
+
+
+class Clock:
+    """Starts in the middle of period 100."""
+
+    def __init__(self):
+        self.now = 100.5 * SECONDS_PER_PERIOD
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock():
+    return Clock()
+
+
+def test_active_stakers_are_read_in_bulk_once_per_period(staking_agent, registry, clock):
+    active_staker, small_staker, committing_staker = random_address(), random_address(), random_address()
+    other_stakers = [random_address() for _ in range(StakingStatusCache.BULK_READ_THRESHOLD)]
+    active_stakers = {active_staker: MIN_STAKE * 2, small_staker: MIN_STAKE // 2}
+    active_stakers.update({staker: MIN_STAKE for staker in other_stakers})
+    staking_agent.get_all_active_stakers.return_value = (MIN_STAKE * 3, active_stakers)
+    locked_tokens = {
+        (small_staker, 0): MIN_STAKE // 2, (small_staker, 1): MIN_STAKE // 2,
+        (committing_staker, 0): MIN_STAKE, (committing_staker, 1): 0,
+    }
+    locked_tokens.update({(staker, periods): MIN_STAKE for staker in other_stakers for periods in (0, 1)})
+    staking_agent.get_locked_tokens.side_effect = lambda staker_address, periods: locked_tokens[(staker_address,
+                                                                                                periods)]
+
+    # Checking a few stakers doesn't take reading all of them...
+    cache = StakingStatusCache(clock=clock)
+    for staker in other_stakers:
+        assert cache.is_staking(registry=registry, staker_address=staker)
+    assert staking_agent.get_all_active_stakers.call_count == 0
+    assert staking_agent.get_locked_tokens.call_count == 2 * StakingStatusCache.BULK_READ_THRESHOLD
+    staking_agent.get_locked_tokens.reset_mock()
+
+    # ...but checking many of them does.
+    assert cache.is_staking(registry=registry, staker_address=active_staker)
+    assert staking_agent.get_all_active_stakers.call_count == 1
+    assert staking_agent.get_locked_tokens.call_count == 0
+
+    # Stakers not (or not enough) in the bulk answer are checked one by one...
+    assert not cache.is_staking(registry=registry, staker_address=small_staker)
+    assert cache.is_staking(registry=registry, staker_address=committing_staker)
+    assert staking_agent.get_locked_tokens.call_count == 4
+
+    # ...and only the positive answers are kept for the rest of the period.
+    for _ in range(10):
+        assert cache.is_staking(registry=registry, staker_address=active_staker)
+        assert cache.is_staking(registry=registry, staker_address=committing_staker)
+    assert not cache.is_staking(registry=registry, staker_address=small_staker)
+    assert staking_agent.get_all_active_stakers.call_count == 1
+    assert staking_agent.get_locked_tokens.call_count == 6
+
+    # A new period, and the stakers are checked anew.
+    staking_agent.get_current_period.return_value = 101
+    clock.advance(SECONDS_PER_PERIOD)
+    assert cache.is_staking(registry=registry, staker_address=committing_staker)
+    assert staking_agent.get_all_active_stakers.call_count == 1
+    assert staking_agent.get_locked_tokens.call_count == 8
+
+
+def test_bonded_workers_are_remembered_for_the_period(staking_agent, registry, clock):
+    worker, staker, unbonded_worker = random_address(), random_address(), random_address()
+    staking_agent.get_staker_from_worker.side_effect = lambda worker_address: {worker: staker}.get(worker_address,
+                                                                                                 NULL_ADDRESS)
+
+    cache = StakingStatusCache(clock=clock)
+    for _ in range(10):
+        assert cache.staker_from_worker(registry=registry, worker_address=worker) == staker
+        assert cache.staker_from_worker(registry=registry, worker_address=unbonded_worker) == NULL_ADDRESS
+    assert staking_agent.get_staker_from_worker.call_count == 1 + 10
+
+    staking_agent.get_current_period.return_value = 101
+    clock.advance(SECONDS_PER_PERIOD)
+    assert cache.staker_from_worker(registry=registry, worker_address=worker) == staker
+    assert staking_agent.get_staker_from_worker.call_count == 1 + 10 + 1
+
+
+def test_changed_bonds_are_forgotten_within_the_period(staking_agent, registry, clock, monkeypatch):
+    monkeypatch.setattr(StakingStatusCache, 'WORKER_BONDS_CHECK_INTERVAL', 0)
+    worker, staker, other_worker, other_staker = (random_address() for _ in range(4))
+    bonds = {worker: staker, other_worker: other_staker}
+    staking_agent.get_staker_from_worker.side_effect = lambda worker_address: bonds.get(worker_address, NULL_ADDRESS)
+
+    cache = StakingStatusCache(clock=clock)
+    for worker_address in (worker, other_worker):
+        assert cache.staker_from_worker(registry=registry, worker_address=worker_address) == bonds[worker_address]
+    assert staking_agent.get_staker_from_worker.call_count == 2
+
+    # No new blocks, no need to look for events.
+    assert cache.staker_from_worker(registry=registry, worker_address=worker) == staker
+    assert staking_agent.events.WorkerBonded.call_count == 0
+
+    # The staker unbonds its worker...
+    del bonds[worker]
+    staking_agent.blockchain.client.block_number = 1001
+    staking_agent.events.WorkerBonded.return_value = [worker_bonded_event(staker=staker, worker=NULL_ADDRESS)]
+    assert cache.staker_from_worker(registry=registry, worker_address=worker) == NULL_ADDRESS
+    staking_agent.events.WorkerBonded.assert_called_once_with(from_block=1001, to_block=1001)
+    assert staking_agent.get_staker_from_worker.call_count == 3
+
+    # ...and the other bonds are still known.
+    assert cache.staker_from_worker(registry=registry, worker_address=other_worker) == other_staker
+    assert staking_agent.get_staker_from_worker.call_count == 3
+
+
+def test_current_period_is_read_once_per_period(staking_agent, registry, clock):
+    staker = random_address()
+    staking_agent.get_locked_tokens.return_value = MIN_STAKE
+
+    cache = StakingStatusCache(clock=clock)
+    for _ in range(10):
+        assert cache.is_staking(registry=registry, staker_address=staker)
+    assert staking_agent.get_current_period.call_count == 1
+
+    # Read again when the period is over...
+    staking_agent.get_current_period.return_value = 101
+    clock.advance(SECONDS_PER_PERIOD / 2)
+    assert cache.is_staking(registry=registry, staker_address=staker)
+    assert staking_agent.get_current_period.call_count == 2
+    assert staking_agent.get_locked_tokens.call_count == 2 * 2
+
+    # ...and along with the worker bonds, in case the chain's clock runs ahead of ours.
+    staking_agent.get_current_period.return_value = 102
+    clock.advance(StakingStatusCache.WORKER_BONDS_CHECK_INTERVAL)
+    assert cache.is_staking(registry=registry, staker_address=staker)
+    assert staking_agent.get_current_period.call_count == 3
+    assert staking_agent.get_locked_tokens.call_count == 2 * 3
+
+
+def test_contract_calls_are_made_without_holding_the_lock(staking_agent, registry, clock):
+    worker, staker = random_address(), random_address()
+    staking_agent.get_staker_from_worker.return_value = staker
+    cache = StakingStatusCache(clock=clock)
+    assert cache.staker_from_worker(registry=registry, worker_address=worker) == staker
+
+    # Another thread checks a node while the WorkerBonded events are being read.
+    answers, other_threads = list(), list()
+
+    def read_events(from_block, to_block):
+        if other_threads:
+            return []  # That other thread's own check
+        thread = threading.Thread(target=lambda: answers.append(cache.staker_from_worker(registry=registry,
+                                                                                        worker_address=worker)))
+        other_threads.append(thread)
+        thread.start()
+        thread.join(timeout=5)
+        assert answers  # It didn't wait for this check to be over
+        return []
+
+    staking_agent.events.WorkerBonded.side_effect = read_events
+    staking_agent.blockchain.client.block_number = 1001
+    clock.advance(StakingStatusCache.WORKER_BONDS_CHECK_INTERVAL)
+    assert cache.staker_from_worker(registry=registry, worker_address=worker) == staker
+    assert answers == [staker]
+
+
+def test_nodes_are_checked_against_the_cache_of_their_verifier(staking_agent, registry, clock, mocker):
+    node = mocker.Mock(checksum_address=random_address())
+    staking_agent.get_locked_tokens.return_value = MIN_STAKE
+
+    # Each learner remembers the nodes it verified...
+    cache, other_cache = StakingStatusCache(clock=clock), StakingStatusCache(clock=clock)
+    for _ in range(10):
+        assert Teacher._staker_is_really_staking(node, registry=registry, staking_status=cache)
+    assert staking_agent.get_locked_tokens.call_count == 2
+
+    # ...but not the ones that other learners verified.
+    assert Teacher._staker_is_really_staking(node, registry=registry, staking_status=other_cache)
+    assert staking_agent.get_locked_tokens.call_count == 2 * 2
+
+    # Without a cache, the contracts are always called.
+    assert Teacher._staker_is_really_staking(node, registry=registry)
+    assert staking_agent.get_locked_tokens.call_count == 2 * 3
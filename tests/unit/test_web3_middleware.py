@@ -15,14 +15,19 @@
  along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import time
+from threading import Thread
 from typing import Any
 from unittest.mock import Mock
 
 import maya
 import pytest
+import pytest_twisted
 from requests import HTTPError
+from twisted.internet import threads
 from web3.types import RPCResponse, RPCError, RPCEndpoint
 
+from nucypher.blockchain.middleware.rate_limit import HIGH_PRIORITY, LOW_PRIORITY, RPCRateLimiter, rpc_priority
 from nucypher.blockchain.middleware.retry import RetryRequestMiddleware, AlchemyRetryRequestMiddleware, \
     InfuraRetryRequestMiddleware
 
@@ -72,6 +77,11 @@ def test_request_with_retry(retry_middleware_class):
     assert retry_response == TOO_MANY_REQUESTS
     assert make_request.call_count == (retries + 1)   # initial call, and then the number of retries
 
+    # Throttling is recorded even without backing off
+    assert retry_middleware.rate_limiter.throttled_requests == (retries + 1)
+    assert retry_middleware.rate_limiter.rate == RPCRateLimiter.MIN_RATE
+    assert not retry_middleware.rate_limiter.paused_for
+
 
 @pytest.mark.parametrize('retry_middleware_class', RETRY_REQUEST_CLASSES)
 def test_request_with_non_retry_exception(retry_middleware_class):
@@ -103,6 +113,7 @@ def test_request_success_with_no_retry(retry_middleware_class):
 
 
 # TODO - since this test does exponential backoff it takes >= 2^1 = 2s, should we only run on circleci?
+@pytest_twisted.inlineCallbacks
 def test_request_with_retry_exponential_backoff():
     retries = 1
     make_request = Mock()
@@ -115,8 +126,9 @@ def test_request_with_retry_exponential_backoff():
                                               retries=1,
                                               exponential_backoff=True)
 
+    # Back-off only happens outside of the reactor thread
     start = maya.now()
-    retry_response = retry_middleware(RPCEndpoint('web3_clientVersion'), None)
+    retry_response = yield threads.deferToThread(retry_middleware, RPCEndpoint('web3_clientVersion'), None)
     end = maya.now()
 
     assert retry_response == TOO_MANY_REQUESTS
@@ -188,3 +200,144 @@ def test_infura_request_with_retry():
 
         assert response == test_response
         assert make_request.call_count == (retries + 1)  # initial call, and then the number of retries
+
+        # The allowed rate is learned from Infura, but there's no back-off
+        assert retry_middleware.rate_limiter.rate == 10.0 * RPCRateLimiter.SAFETY_MARGIN
+        assert not retry_middleware.rate_limiter.paused_for
+
+
+def test_throttled_request_in_reactor_thread_is_not_retried():
+    make_request = Mock()
+    make_request.return_value = TOO_MANY_REQUESTS
+    retry_middleware = RetryRequestMiddleware(make_request=make_request, w3=Mock(), retries=3)
+
+    start = time.monotonic()
+    retry_response = retry_middleware(RPCEndpoint('web3_clientVersion'), None)
+    assert time.monotonic() - start < 1  # The reactor wasn't blocked
+    assert retry_response == TOO_MANY_REQUESTS
+    assert make_request.call_count == 1
+    assert retry_middleware.rate_limiter.throttled_requests == 1
+    assert retry_middleware.rate_limiter.rate == RPCRateLimiter.MIN_RATE
+
+
+def test_infura_throttling_hints():
+    retry_middleware = InfuraRetryRequestMiddleware(make_request=Mock(), w3=Mock())
+    throttled = {"jsonrpc": "2.0", "id": 1,
+                 "error": {"code": -32005,
+                           "message": "project ID request rate exceeded",
+                           "data": {"current_rps": 13.333, "allowed_rps": 10.0, "backoff_seconds": 30.0}}}
+    assert retry_middleware.throttling_hints(throttled) == dict(allowed_rps=10.0, backoff_seconds=30.0)
+    assert retry_middleware.throttling_hints(TOO_MANY_REQUESTS) == dict()
+    assert retry_middleware.throttling_hints(HTTPError(response=Mock(status_code=429))) == dict()
+
+
+def test_rate_limiter_is_shared_by_provider():
+    provider = Mock(endpoint_uri='https://rate.limited/project')
+    same_endpoint = Mock(endpoint_uri='https://rate.limited/project')
+    limiter = RPCRateLimiter.for_provider(provider)
+    assert RPCRateLimiter.for_provider(same_endpoint) is limiter
+    assert RPCRateLimiter.for_provider(Mock(endpoint_uri='https://another.one')) is not limiter
+
+
+def in_thread(function, *args, **kwargs):
+    thread = Thread(target=function, args=args, kwargs=kwargs)
+    thread.start()
+    return thread
+
+
+def test_rate_limiter_paces_requests():
+    limiter = RPCRateLimiter()
+    assert limiter.rate is None
+
+    # Not paced until throttled
+    assert all(limiter.acquire() == 0 for _ in range(100))
+
+    limiter.throttled(allowed_rps=20, backoff_seconds=0)
+    assert limiter.rate == 20 * RPCRateLimiter.SAFETY_MARGIN
+
+    start = time.monotonic()
+    in_thread(lambda: [limiter.acquire() for _ in range(9)]).join()
+    elapsed = time.monotonic() - start
+    assert elapsed >= 9 / limiter.rate * 0.9
+    assert limiter.delayed_requests > 0
+    assert limiter.wait_time > 0
+
+    # The rate slowly rises again
+    limiter.RECOVERY_INTERVAL = 0
+    limiter.succeeded()
+    assert limiter.rate == 20 * RPCRateLimiter.SAFETY_MARGIN * RPCRateLimiter.INCREASE_FACTOR
+
+
+def test_rate_limiter_serves_requests_by_priority():
+    limiter = RPCRateLimiter()
+    limiter.throttled(allowed_rps=100, backoff_seconds=0.5)
+
+    served = []
+
+    def request(priority: int, name: str):
+        with rpc_priority(priority):
+            limiter.acquire()
+        served.append(name)
+
+    low = in_thread(request, LOW_PRIORITY, 'metrics')
+    while limiter.queue_depth < 1:
+        time.sleep(0.01)
+    high = in_thread(request, HIGH_PRIORITY, 'commitment')
+    while limiter.queue_depth < 2:
+        time.sleep(0.01)
+    low.join()
+    high.join()
+
+    assert served == ['commitment', 'metrics']
+    assert limiter.queue_depth == 0
+
+
+def test_rate_limiter_refuses_reactor_requests_while_paused():
+    limiter = RPCRateLimiter()
+    limiter.throttled(allowed_rps=100, backoff_seconds=30)
+    assert 29 < limiter.paused_for <= 30
+
+    # The reactor isn't blocked, and the request isn't sent either, whatever its priority
+    start = time.monotonic()
+    with pytest.raises(RPCRateLimiter.Throttled) as e:
+        limiter.acquire(priority=HIGH_PRIORITY)
+    assert time.monotonic() - start < 1
+    assert 29 < e.value.retry_after <= 30
+    assert limiter.refused_requests == 1
+
+
+def test_rate_limiter_refuses_reactor_requests_before_more_important_ones():
+    limiter = RPCRateLimiter()
+    limiter.throttled(allowed_rps=1, backoff_seconds=0)
+
+    def commitment():
+        with rpc_priority(HIGH_PRIORITY):
+            limiter.acquire()
+
+    # No token left, and a commitment is waiting for the next one
+    waiting = in_thread(commitment)
+    while limiter.queue_depth < 1:
+        time.sleep(0.01)
+    with pytest.raises(RPCRateLimiter.Throttled) as e:
+        limiter.acquire()
+    assert e.value.retry_after > 0
+
+    # ... and so is one just as important: it would go over the rate limit
+    with pytest.raises(RPCRateLimiter.Throttled) as e:
+        limiter.acquire(priority=HIGH_PRIORITY)
+    assert e.value.retry_after > 0
+    assert limiter.refused_requests == 2
+    waiting.join()
+
+
+def test_rate_limiter_counts_reactor_requests_against_the_bucket():
+    limiter = RPCRateLimiter()
+    limiter.throttled(allowed_rps=10, backoff_seconds=0)
+    time.sleep(1 / limiter.rate * 1.5)
+
+    # One token was refilled: the first request goes right away, the next one is refused
+    assert limiter.acquire(priority=HIGH_PRIORITY) == 0
+    with pytest.raises(RPCRateLimiter.Throttled) as e:
+        limiter.acquire(priority=HIGH_PRIORITY)
+    assert 0 < e.value.retry_after <= 1 / limiter.rate
+    assert limiter.refused_requests == 1
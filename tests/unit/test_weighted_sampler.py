@@ -0,0 +1,106 @@
+"""
+ This file is part of nucypher.
+
+ nucypher is free software: you can redistribute it and/or modify
+ it under the terms of the GNU Affero General Public License as published by
+ the Free Software Foundation, either version 3 of the License, or
+ (at your option) any later version.
+
+ nucypher is distributed in the hope that it will be useful,
+ but WITHOUT ANY WARRANTY; without even the implied warranty of
+ MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ GNU Affero General Public License for more details.
+
+ You should have received a copy of the GNU Affero General Public License
+ along with nucypher.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+import pytest
+
+from nucypher.blockchain.eth.agents import StakersReservoir, WeightedSampler
+
+
+def bisecting_sample_no_replacement(weighted_elements, rng, quantity):
+    """Samples like `WeightedSampler` used to, subtracting each drawn weight from the cumulative totals."""
+    elements = list(weighted_elements)
+    totals = list(accumulate(weighted_elements.values()))
+    samples = []
+    for _ in range(quantity):
+        position = rng.randint(0, totals[-1] - 1)
+        idx = bisect_right(totals, position)
+        samples.append(elements[idx])
+        weight = totals[idx] - totals[idx - 1] if idx > 0 else totals[idx]
+        for j in range(idx, len(totals)):
+            totals[j] -= weight
+    return samples
+
+
+def test_weighted_sampler_samples_like_the_bisecting_sampler():
+    weighted_elements = {f'staker-{i}': random.randint(1, 10 ** 6) for i in range(257)}
+    weighted_elements['zero-staker'] = 0
+
+    for seed in range(10):
+        expected = bisecting_sample_no_replacement(weighted_elements, random.Random(seed), 100)
+        sampled = WeightedSampler(weighted_elements).sample_no_replacement(random.Random(seed), 100)
+        assert sampled == expected
+        assert len(set(sampled)) == 100
+        assert 'zero-staker' not in sampled
+
+
+def test_weighted_sampler_removes_drawn_elements():
+    weighted_elements = {'a': 1, 'b': 2, 'c': 3}
+    sampler = WeightedSampler(weighted_elements)
+    assert sampler.total == 6
+
+    drawn = sampler.sample_no_replacement(random.Random(), 2)
+    assert len(sampler) == 1
+    assert all(element not in sampler for element in drawn)
+    remaining = (set(weighted_elements) - set(drawn)).pop()
+    assert remaining in sampler
+    assert sampler.total == weighted_elements[remaining]
+
+    assert sampler.sample_no_replacement(random.Random(), 1) == [remaining]
+    assert sampler.sample_no_replacement(random.Random(), 0) == []
+    with pytest.raises(ValueError):
+        sampler.sample_no_replacement(random.Random(), 1)
+
+
+def test_weighted_sampler_copies_and_removals():
+    weighted_elements = {f'staker-{i}': i + 1 for i in range(10)}
+    sampler = WeightedSampler(weighted_elements)
+
+    copy = sampler.copy()
+    copy.remove('staker-9')
+    assert 'staker-9' not in copy and 'staker-9' in sampler
+    assert copy.total == sampler.total - 10
+    with pytest.raises(KeyError):
+        copy.remove('staker-9')
+
+    # Draws from the copy don't affect the original.
+    drawn = copy.sample_no_replacement(random.Random(), len(copy))
+    assert sorted(drawn) == sorted(set(weighted_elements) - {'staker-9'})
+    assert len(copy) == 0 and copy.total == 0
+    assert len(sampler) == 10 and sampler.total == sum(weighted_elements.values())
+
+    # A removed element is never sampled.
+    for _ in range(20):
+        copy = sampler.copy()
+        copy.remove('staker-0')
+        assert 'staker-0' not in copy.sample_no_replacement(random.Random(), 9)
+
+    reservoir = StakersReservoir.from_sampler(sampler.copy())
+    assert len(reservoir) == 10
+    assert sorted(reservoir.draw(10)) == sorted(weighted_elements)
+
+
+def test_empty_weighted_sampler():
+    sampler = WeightedSampler({})
+    assert len(sampler) == 0 and sampler.total == 0
+    assert 'anyone' not in sampler
+    assert sampler.sample_no_replacement(random.Random(), 0) == []
+    with pytest.raises(ValueError):
+        sampler.sample_no_replacement(random.Random(), 1)
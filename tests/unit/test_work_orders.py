@@ -178,6 +178,10 @@ def test_work_order_with_multiple_capsules(mock_ursula_reencrypts,
     for capsule, task_signature in zip(capsules, signatures):
         work_order.tasks[capsule].signature = task_signature
 
+    # The results can be checked without completing the WorkOrder
+    assert work_order.verify_work_results(list(zip(cfrags, cfrag_signatures))) == list(cfrags)
+    assert not work_order.completed
+
     # Now, complete() works as intended
     good_cfrags = work_order.complete(list(zip(cfrags, cfrag_signatures)))
     assert work_order.completed
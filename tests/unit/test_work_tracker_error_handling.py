@@ -26,6 +26,7 @@ from twisted.logger import globalLogPublisher, LogLevel
 from nucypher.utilities.gas_strategies import GasStrategyError
 
 from nucypher.blockchain.eth.token import WorkTracker
+from nucypher.blockchain.middleware.rate_limit import RPCRateLimiter
 from nucypher.utilities.logging import Logger, GlobalLoggerSettings
 
 logger = Logger("test-logging")
@@ -46,6 +47,8 @@ class WorkTrackerArbitraryFailureConditions(WorkTracker):
         self._tracking_task.clock = self.CLOCK
         self._abort_on_error = abort_on_error
         self._consecutive_fails = 0
+        self._throttled_retries = 0
+        self._throttled_retry = None
 
     def _do_work(self) -> None:
         self.attempts += 1
@@ -208,3 +211,59 @@ def test_worker_rate_limiting():
     yield d
 
     assert worktracker.workdone
+
+
+class WorkTrackerThrottledAtFirst(WorkTrackerArbitraryFailureConditions):
+
+    THROTTLED_ATTEMPTS = 3
+    RETRY_AFTER = 5
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tracking_task = task.LoopingCall(self._work_unless_throttled)
+        self._tracking_task.clock = self.CLOCK
+
+    def check_success_conditions(self):
+        if self.attempts <= self.THROTTLED_ATTEMPTS:
+            raise RPCRateLimiter.Throttled(self.RETRY_AFTER, "RPC requests are paused")
+
+
+def test_throttled_work_is_retried_quickly():
+    clock = Clock()
+    worktracker = WorkTrackerThrottledAtFirst(clock, False)
+    worktracker.start()
+    assert worktracker.attempts == 1
+    assert worktracker.workdone == 0
+
+    # Retried as soon as the requests are resumed, rather than at the next (much later) interval
+    for attempts in range(2, worktracker.THROTTLED_RETRIES + 2):
+        clock.advance(worktracker.RETRY_AFTER)
+        assert worktracker.attempts == attempts
+    assert worktracker.workdone == 1
+    assert worktracker._consecutive_fails == 0
+
+    # Nothing else until the next interval
+    clock.advance(worktracker.INTERVAL_FLOOR - 1)
+    assert worktracker.attempts == worktracker.THROTTLED_RETRIES + 1
+    worktracker.stop()
+
+
+def test_throttled_work_retries_are_bounded():
+    clock = Clock()
+    worktracker = WorkTrackerThrottledAtFirst(clock, False)
+    worktracker.THROTTLED_ATTEMPTS = 100
+    worktracker.start()
+    for _ in range(worktracker.THROTTLED_RETRIES + 1):
+        clock.advance(worktracker.RETRY_AFTER)
+
+    # Given up on the quick retries, the error is handled as any other
+    assert worktracker.attempts == worktracker.THROTTLED_RETRIES + 1
+    assert worktracker._consecutive_fails == 1
+    assert worktracker._tracking_task.running
+
+    # The next round of work gets its quick retries again, until stopped
+    clock.advance(worktracker.INTERVAL_CEIL)
+    assert worktracker.attempts == worktracker.THROTTLED_RETRIES + 2
+    worktracker.stop()
+    clock.advance(worktracker.RETRY_AFTER)
+    assert worktracker.attempts == worktracker.THROTTLED_RETRIES + 2
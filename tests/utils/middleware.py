@@ -111,7 +111,8 @@ class MockRestMiddlewareForLargeFleetTests(MockRestMiddleware):
                            node,
                            announce_nodes=None,
                            nodes_i_need=None,
-                           fleet_checksum=None):
+                           fleet_checksum=None,
+                           teacher_fleet_checksum=None):
         known_nodes_bytestring = node.bytestring_of_known_nodes()
         signature = node.stamp(known_nodes_bytestring)
         r = Response(bytes(signature) + known_nodes_bytestring)